@@ -0,0 +1,69 @@
+"""Create resource store tables
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEXED_COLUMNS = ("status", "user_name", "project_name", "cloud_platform", "created_at")
+
+
+def _inventory_columns():
+    """Columns shared by request and discovered-resource tables"""
+    return [
+        sa.Column("user_name", sa.String(255)),
+        sa.Column("cloud_platform", sa.String(32)),
+        sa.Column("resource_type", sa.String(64)),
+        sa.Column("resource_group_name", sa.String(255)),
+        sa.Column("project_name", sa.String(255)),
+        sa.Column("status", sa.String(32)),
+        sa.Column("location", sa.String(64)),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("azure_resource_group_id", sa.String(512)),
+        sa.Column("github_repo_url", sa.String(512)),
+        sa.Column("error_message", sa.Text()),
+        sa.Column("synced_at", sa.DateTime(), nullable=False),
+    ]
+
+
+def upgrade():
+    op.create_table(
+        "resource_requests",
+        sa.Column("id", sa.String(64), primary_key=True),
+        *_inventory_columns(),
+        sa.Column("resource_id", sa.String(512)),
+        sa.Column("subscription_id", sa.String(64)),
+    )
+    op.create_table(
+        "discovered_resources",
+        sa.Column("id", sa.String(512), primary_key=True),
+        *_inventory_columns(),
+    )
+    for table in ("resource_requests", "discovered_resources"):
+        for column in INDEXED_COLUMNS:
+            op.create_index(f"ix_{table}_{column}", table, [column])
+    
+    op.create_table(
+        "inventory_syncs",
+        sa.Column("source", sa.String(32), primary_key=True),
+        sa.Column("synced_at", sa.DateTime(), nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=False),
+        sa.Column("complete", sa.Boolean(), nullable=False),
+        sa.Column("headers", sa.JSON()),
+    )
+
+
+def downgrade():
+    op.drop_table("inventory_syncs")
+    for table in ("discovered_resources", "resource_requests"):
+        for column in INDEXED_COLUMNS:
+            op.drop_index(f"ix_{table}_{column}", table_name=table)
+        op.drop_table(table)
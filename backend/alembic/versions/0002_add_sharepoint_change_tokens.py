@@ -0,0 +1,27 @@
+"""Add SharePoint change tokens
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "sharepoint_change_tokens",
+        sa.Column("list_key", sa.String(512), primary_key=True),
+        sa.Column("change_token", sa.String(512), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("sharepoint_change_tokens")
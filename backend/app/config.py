@@ -25,6 +25,13 @@ class Settings(BaseSettings):
         "ManagedBy": "AzureResourcesTracker",
         "AutoCreated": "true"
     }
+    AZURE_LIST_CONCURRENCY: int = 8  # Subscriptions listed in parallel (1 = sequential)
+    AZURE_LIST_SUBSCRIPTION_TIMEOUT: float = 30.0  # Seconds per subscription
+    AZURE_CLIENT_POOL_SIZE: int = 64  # Cached ResourceManagementClient instances
+    AZURE_SDK_MODE: str = "sync"  # "sync" (thread-offloaded SDK) or "async" (aio SDK)
+    AZURE_INVENTORY_BACKEND: str = "arm"  # "arm" (per-subscription) or "resource_graph"
+    AZURE_RESOURCE_GRAPH_ENDPOINT: str = "https://management.azure.com"
+    AZURE_RESOURCE_GRAPH_PAGE_SIZE: int = 1000
     
     # GitHub Configuration
     GITHUB_TOKEN: str
@@ -32,6 +39,19 @@ class Settings(BaseSettings):
     GITHUB_DEFAULT_BRANCH: str = "main"
     GITHUB_AUTO_INIT: bool = True
     GITHUB_PRIVATE: bool = False
+    GITHUB_API_URL: str = "https://api.github.com"
+    GITHUB_CLIENT_MODE: str = "sync"  # "sync" (thread-offloaded PyGithub) or "async" (httpx)
+    GITHUB_HTTP2: bool = True  # Multiplex async client requests over HTTP/2 (falls back to HTTP/1.1 without h2)
+    GITHUB_HTTP_POOL_SIZE: int = 10  # Pooled keep-alive connections shared by all GitHub calls
+    GITHUB_ETAG_CACHE_SIZE: int = 1000  # Repositories/users kept for conditional (If-None-Match) reads
+    GITHUB_REPO_INDEX_TTL_SECONDS: float = 60.0  # Name checks list repositories created since the last refresh
+    GITHUB_REPO_INDEX_FULL_REFRESH_SECONDS: float = 3600.0  # Full reload, dropping repositories deleted elsewhere
+    GITHUB_WRITES_PER_MINUTE: float = 60.0  # Content-creating calls per minute (GitHub's secondary limit is 80)
+    GITHUB_WRITE_BURST: int = 5  # Content-creating calls allowed back to back
+    GITHUB_RATE_LIMIT_RESERVE: int = 50  # Calls wait for X-RateLimit-Reset once this few requests remain
+    GITHUB_RATE_LIMIT_MAX_RETRIES: int = 3  # Retries of a call GitHub rejected as rate limited
+    GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS: float = 3600.0  # Calls rate limited for longer fail instead of waiting
+    GITHUB_SECONDARY_LIMIT_WAIT_SECONDS: float = 60.0  # Wait after a secondary limit without Retry-After
     
     # SharePoint Configuration (Optional)
     SHAREPOINT_SITE_URL: str = ""
@@ -39,13 +59,57 @@ class Settings(BaseSettings):
     SHAREPOINT_CLIENT_ID: str = ""
     SHAREPOINT_CLIENT_SECRET: str = ""
     SHAREPOINT_ENABLED: bool = False
+    SHAREPOINT_PAGE_SIZE: int = 500  # Items per page when reading the whole list
+    SHAREPOINT_HTTP_POOL_SIZE: int = 10  # Pooled HTTPS connections shared by all SharePoint calls
+    SHAREPOINT_BATCH_ENABLED: bool = True  # Send item creates/updates as $batch requests
+    SHAREPOINT_BATCH_WINDOW_SECONDS: float = 0.05  # How long writes are gathered before a batch is sent
+    SHAREPOINT_BATCH_MAX_OPERATIONS: int = 50  # Writes per $batch request (sent early when reached)
     
     # Webhook Configuration (Optional)
     WEBHOOK_SECRET: str = "default-webhook-secret"
     WEBHOOK_VALIDATION_TIMEOUT: int = 5
+    WEBHOOK_DEBOUNCE_SECONDS: float = 2.0  # Notifications per list/subscription coalesced into one sync
+    
+    # Inventory cache for GET /api/resources
+    INVENTORY_CACHE_TTL_SECONDS: float = 30.0
+    INVENTORY_CACHE_STALE_SECONDS: float = 300.0  # Served while refreshing in background
+    INVENTORY_STORE_MAX_AGE_SECONDS: float = 86400.0  # Oldest stored inventory served after a restart
+    TAG_INDEX_MAX_AGE_SECONDS: float = 300.0  # /resources/by-tag relists Azure once the index is older
+    
+    # Provisioning job queue
+    JOB_BROKER: str = "sqlite"  # "sqlite" (durable, shared with workers) or "memory"
+    JOB_QUEUE_PATH: str = "./jobs.db"
+    JOB_WORKER_IN_PROCESS: bool = True  # Run a worker in the API process; disable when running app.worker
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BACKOFF_SECONDS: float = 2.0  # Doubles after every failed attempt
+    JOB_RETRY_BACKOFF_MAX_SECONDS: float = 300.0
+    JOB_VISIBILITY_TIMEOUT_SECONDS: float = 300.0  # Lease after which a crashed worker's job is retried
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_CREATE_WAIT_SECONDS: float = 120.0  # POST /api/resources/create waits this long for its job
+    
+    # Long-running cloud operations (Azure deletes, GCP projects, AWS accounts)
+    AZURE_OPERATION_POLL_SECONDS: float = 5.0  # First poll of an Azure operation
+    GCP_OPERATION_POLL_SECONDS: float = 2.0  # First poll of a GCP operation
+    AWS_OPERATION_POLL_SECONDS: float = 10.0  # First poll of an AWS account creation (takes minutes)
+    OPERATION_POLL_BACKOFF: float = 1.5  # Interval multiplier after each poll of a running operation
+    OPERATION_POLL_MAX_SECONDS: float = 60.0  # Longest interval between polls (and longest provider pause)
+    OPERATION_POLL_CONCURRENCY: int = 8  # Polls in flight at once across all providers
+    OPERATION_MAX_POLL_ERRORS: int = 5  # Consecutive failed polls before an operation is failed
+    OPERATION_RETENTION_SECONDS: float = 3600.0  # Finished operations stay queryable this long
+    
+    # AWS Organizations (credentials come from the standard boto3 chain)
+    AWS_REGION: str = "us-east-1"  # Organizations is served from us-east-1
+    AWS_HTTP_POOL_SIZE: int = 10  # Pooled connections of the shared Organizations client
+    AWS_MAX_ATTEMPTS: int = 8  # Adaptive retries back off and rate-limit on throttling
+    AWS_INVENTORY_ENABLED: bool = False  # List organization accounts in /api/resources (requires boto3)
+    AWS_ACCOUNT_INVENTORY_TTL_SECONDS: float = 300.0  # Full list_accounts listing is reused this long
     
     # Database (Optional - for tracking)
-    DATABASE_URL: str = "sqlite:///./azure_tracker.db"
+    DATABASE_URL: str = "sqlite:///./azure_tracker.db"  # Empty disables the store; postgresql:// uses asyncpg
+    DATABASE_ECHO: bool = False
+    DATABASE_POOL_SIZE: int = 5  # Ignored for SQLite
+    DATABASE_CREATE_TABLES: bool = True  # Create missing tables on first use; disable when using Alembic
     
     # Redis (Optional - for Celery)
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -0,0 +1,167 @@
+"""
+Database Engine and Tables
+"""
+import structlog
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import JSON, Boolean, DateTime, Index, Integer, String, Text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.pool import StaticPool
+
+from app.config import get_settings
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+# Async drivers used when DATABASE_URL names only the database
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg"
+}
+
+
+class Base(DeclarativeBase):
+    """Declarative base for all tables"""
+
+
+class _InventoryColumns:
+    """Columns shared by request and discovered-resource rows"""
+    user_name: Mapped[Optional[str]] = mapped_column(String(255))
+    cloud_platform: Mapped[Optional[str]] = mapped_column(String(32))
+    resource_type: Mapped[Optional[str]] = mapped_column(String(64))
+    resource_group_name: Mapped[Optional[str]] = mapped_column(String(255))
+    project_name: Mapped[Optional[str]] = mapped_column(String(255))
+    status: Mapped[Optional[str]] = mapped_column(String(32))
+    location: Mapped[Optional[str]] = mapped_column(String(64))
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    azure_resource_group_id: Mapped[Optional[str]] = mapped_column(String(512))
+    github_repo_url: Mapped[Optional[str]] = mapped_column(String(512))
+    error_message: Mapped[Optional[str]] = mapped_column(Text)
+    # Set on every write; rows not seen by a complete sync are deleted
+    synced_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class ResourceRequestRecord(_InventoryColumns, Base):
+    """Resource creation request, keyed by SharePoint item ID"""
+    __tablename__ = "resource_requests"
+    
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    resource_id: Mapped[Optional[str]] = mapped_column(String(512))
+    subscription_id: Mapped[Optional[str]] = mapped_column(String(64))
+    
+    __table_args__ = (
+        Index("ix_resource_requests_status", "status"),
+        Index("ix_resource_requests_user_name", "user_name"),
+        Index("ix_resource_requests_project_name", "project_name"),
+        Index("ix_resource_requests_cloud_platform", "cloud_platform"),
+        Index("ix_resource_requests_created_at", "created_at"),
+    )
+
+
+class DiscoveredResourceRecord(_InventoryColumns, Base):
+    """Resource discovered by listing a cloud provider"""
+    __tablename__ = "discovered_resources"
+    
+    id: Mapped[str] = mapped_column(String(512), primary_key=True)
+    
+    __table_args__ = (
+        Index("ix_discovered_resources_status", "status"),
+        Index("ix_discovered_resources_user_name", "user_name"),
+        Index("ix_discovered_resources_project_name", "project_name"),
+        Index("ix_discovered_resources_cloud_platform", "cloud_platform"),
+        Index("ix_discovered_resources_created_at", "created_at"),
+    )
+
+
+class InventorySyncRecord(Base):
+    """Last inventory sync per source"""
+    __tablename__ = "inventory_syncs"
+    
+    source: Mapped[str] = mapped_column(String(32), primary_key=True)
+    synced_at: Mapped[datetime] = mapped_column(DateTime)
+    row_count: Mapped[int] = mapped_column(Integer)
+    complete: Mapped[bool] = mapped_column(Boolean)
+    headers: Mapped[Optional[dict]] = mapped_column(JSON)
+
+
+class ChangeTokenRecord(Base):
+    """Last processed change token per SharePoint list"""
+    __tablename__ = "sharepoint_change_tokens"
+    
+    list_key: Mapped[str] = mapped_column(String(512), primary_key=True)
+    change_token: Mapped[str] = mapped_column(String(512))
+    updated_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+def async_database_url(url: str) -> str:
+    """
+    Select the async driver for a database URL
+    
+    "sqlite:///./db" becomes "sqlite+aiosqlite:///./db" and "postgresql://..."
+    becomes "postgresql+asyncpg://..."; URLs naming a driver are kept.
+    
+    Args:
+        url: SQLAlchemy database URL
+    
+    Returns:
+        URL usable with create_async_engine
+    """
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.drivername)
+    if driver:
+        parsed = parsed.set(drivername=driver)
+    return parsed.render_as_string(hide_password=False)
+
+
+def create_engine_for_url(url: str) -> AsyncEngine:
+    """
+    Create an async engine for a database URL
+    
+    Args:
+        url: SQLAlchemy database URL
+    
+    Returns:
+        AsyncEngine
+    """
+    url = async_database_url(url)
+    if make_url(url).get_backend_name() == "sqlite":
+        kwargs = {"echo": settings.DATABASE_ECHO}
+        if make_url(url).database in (None, "", ":memory:"):
+            # One shared connection, otherwise every connection gets its own empty database
+            kwargs["poolclass"] = StaticPool
+        return create_async_engine(url, **kwargs)
+    return create_async_engine(
+        url,
+        echo=settings.DATABASE_ECHO,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        pool_pre_ping=True
+    )
+
+
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker] = None
+
+
+def get_sessionmaker() -> Optional[async_sessionmaker]:
+    """Get the process-wide session factory, or None if no DATABASE_URL is configured"""
+    global _engine, _sessionmaker
+    if not settings.DATABASE_URL:
+        return None
+    if _sessionmaker is None:
+        _engine = create_engine_for_url(settings.DATABASE_URL)
+        _sessionmaker = async_sessionmaker(_engine, expire_on_commit=False)
+        logger.info("database_engine_created", backend=_engine.url.get_backend_name())
+    return _sessionmaker
+
+
+async def close_engine():
+    """Dispose of the process-wide engine (on application shutdown)"""
+    global _engine, _sessionmaker
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _sessionmaker = None
@@ -7,7 +7,14 @@ from contextlib import asynccontextmanager
 import structlog
 
 from app.config import get_settings
-from app.routers import webhook, resources, health
+from app.routers import webhook, resources, health, jobs, operations
+from app.services.azure_service import get_azure_client_pool
+from app.services.inventory_service import get_inventory_service
+from app.services.job_queue import JobWorker, get_job_queue
+from app.services.lifecycle import close_services
+from app.services.provisioning import JOB_HANDLERS, resume_account_creations
+from app.services.repo_name_index import get_repo_name_index
+from app.services.webhook_ingest import close_webhook_coalescer
 from app.utils.logger import setup_logging
 
 # Setup logging
@@ -21,8 +28,27 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     logger.info("application_starting", version=settings.APP_VERSION)
+    if settings.AZURE_SDK_MODE == "async":
+        from app.services.azure_async_service import get_async_azure_client_pool
+        get_async_azure_client_pool()
+    else:
+        get_azure_client_pool()
+    await get_inventory_service().warm_from_store()
+    # Built in the background so repository name checks never page the owner's repositories
+    get_repo_name_index().refresh_in_background()
+    if settings.JOB_WORKER_IN_PROCESS:
+        app.state.job_worker = JobWorker(get_job_queue(), JOB_HANDLERS)
+        app.state.job_worker.start()
+        await resume_account_creations()
+    else:
+        app.state.job_worker = None
     yield
     logger.info("application_shutting_down")
+    # Open debounce windows queue their jobs before the worker stops
+    await close_webhook_coalescer()
+    if app.state.job_worker:
+        await app.state.job_worker.stop()
+    await close_services()
 
 
 # Initialize FastAPI application
@@ -45,6 +71,8 @@ app.add_middleware(
 # Include routers
 app.include_router(health.router, prefix="/api", tags=["Health"])
 app.include_router(webhook.router, prefix="/api/webhook", tags=["Webhook"])
+app.include_router(jobs.router, prefix="/api", tags=["Jobs"])
+app.include_router(operations.router, prefix="/api", tags=["Operations"])
 app.include_router(resources.router, prefix="/api", tags=["Resources"])
 
 
@@ -2,7 +2,7 @@
 Data Models
 """
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, Optional, List
 from datetime import datetime
 from enum import Enum
 
@@ -101,8 +101,10 @@ class ResourceCreationResponse(BaseModel):
     sharepoint_item_id: Optional[str] = None
     message: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    
+    job_id: Optional[str] = None
+    operation_id: Optional[str] = None  # Cloud operation still running when the job finished
+
+
 class AzureResourceGroup(BaseModel):
     """Azure Resource Group model"""
     id: str
@@ -112,6 +114,27 @@ class AzureResourceGroup(BaseModel):
     provisioning_state: str
 
 
+class SubscriptionFailure(BaseModel):
+    """Subscription that could not be listed"""
+    subscription_id: str
+    subscription_name: Optional[str] = None
+    reason: str  # "timeout", "error"; "subscriptions_error" or "resource_graph_error" with subscription_id "*"
+    error: Optional[str] = None
+
+
+class ResourceGroupInventory(BaseModel):
+    """Resource groups gathered across subscriptions, with per-subscription failures"""
+    resource_groups: List[AzureResourceGroup] = Field(default_factory=list)
+    subscriptions_total: int = 0
+    failed_subscriptions: List[SubscriptionFailure] = Field(default_factory=list)
+    completed: bool = False  # Set once the listing ran to the end
+    
+    @property
+    def partial(self) -> bool:
+        """True unless the listing finished and every subscription was listed"""
+        return not self.completed or bool(self.failed_subscriptions)
+
+
 class GitHubRepository(BaseModel):
     """GitHub Repository model"""
     id: int
@@ -123,15 +146,94 @@ class GitHubRepository(BaseModel):
     private: bool
 
 
+class RepoNameStatus(str, Enum):
+    """Outcome of a repository name pre-check"""
+    AVAILABLE = "available"
+    TAKEN = "taken"
+    INVALID = "invalid"  # GitHub would reject or rename it
+    DUPLICATE = "duplicate"  # Same name (ignoring case) proposed earlier in the check
+
+
+class RepoNameCheckRequest(BaseModel):
+    """Proposed GitHub repository names"""
+    names: List[str] = Field(..., max_length=1000, description="Repository names to check")
+
+
+class RepoNameCheckResponse(BaseModel):
+    """Status of each proposed repository name"""
+    results: Dict[str, RepoNameStatus]
+    available: int
+    index_size: int
+    index_age_seconds: Optional[float] = None
+
+
 class WebhookPayload(BaseModel):
-    """SharePoint webhook payload"""
-    subscription_id: str
-    client_state: Optional[str] = None
-    expiration_date_time: Optional[datetime] = None
-    resource: str
-    tenant_id: str
-    site_url: str
-    web_id: str
+    """SharePoint webhook notification (one entry of the payload's "value" array)"""
+    subscription_id: str = Field(..., alias="subscriptionId")
+    client_state: Optional[str] = Field(None, alias="clientState")
+    expiration_date_time: Optional[datetime] = Field(None, alias="expirationDateTime")
+    resource: str  # List ID
+    tenant_id: str = Field(..., alias="tenantId")
+    site_url: str = Field(..., alias="siteUrl")
+    web_id: str = Field(..., alias="webId")
+    
+    model_config = {"populate_by_name": True}
+
+
+class JobStatus(str, Enum):
+    """Provisioning job status"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(BaseModel):
+    """Provisioning job held by the job queue"""
+    id: str
+    name: str
+    payload: dict
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    max_attempts: int
+    available_at: float  # Epoch seconds; lease expiry while running
+    dedupe_key: Optional[str] = None
+    result: Optional[dict] = None
+    last_error: Optional[str] = None
+    created_at: float
+    updated_at: float
+    
+    @property
+    def finished(self) -> bool:
+        """True once the job succeeded or failed permanently"""
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+class OperationStatus(str, Enum):
+    """Long-running cloud operation status"""
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Operation(BaseModel):
+    """Long-running cloud operation followed by the operation tracker"""
+    id: str
+    provider: CloudPlatform
+    kind: str  # e.g. "delete_resource_group", "create_project", "create_account"
+    resource_name: str
+    status: OperationStatus = OperationStatus.RUNNING
+    polls: int = 0
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    next_poll_at: Optional[float] = None  # Epoch seconds; None once finished
+    created_at: float
+    updated_at: float
+    
+    @property
+    def finished(self) -> bool:
+        """True once the operation succeeded or failed"""
+        return self.status != OperationStatus.RUNNING
 
 
 class HealthResponse(BaseModel):
@@ -1,6 +1,6 @@
 """
 Routers Initialization
 """
-from app.routers import health, webhook, resources
+from app.routers import health, webhook, resources, jobs, operations
 
-__all__ = ["health", "webhook", "resources"]
+__all__ = ["health", "webhook", "resources", "jobs", "operations"]
@@ -1,7 +1,7 @@
 """
 Health Check Router
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from datetime import datetime
 import structlog
 
@@ -24,8 +24,8 @@ async def health_check():
     
     # Check Azure connectivity
     try:
-        from app.services.azure_service import AzureService
-        azure_service = AzureService()
+        from app.services.azure_service import get_azure_service
+        azure_service = get_azure_service()
         # Try to list resource groups as a connectivity test
         await azure_service.list_resource_groups()
         services_status["azure"] = "healthy"
@@ -35,10 +35,13 @@ async def health_check():
     
     # Check GitHub connectivity
     try:
-        from app.services.github_service import GitHubService
-        github_service = GitHubService()
-        # Test connection
-        github_service.client.get_user()
+        # Owner lookup is cached; it is repeated only after an auth error
+        if settings.GITHUB_CLIENT_MODE == "async":
+            from app.services.github_async_service import get_async_github_client
+            await get_async_github_client().owner()
+        else:
+            from app.services.github_service import get_github_connection
+            get_github_connection().resolve_owner()
         services_status["github"] = "healthy"
     except Exception as e:
         logger.error("github_health_check_failed", error=str(e))
@@ -68,3 +71,66 @@ async def health_check():
         timestamp=datetime.utcnow(),
         services=services_status
     )
+
+
+@router.get("/health/metrics")
+async def health_metrics(request: Request):
+    """
+    Connection pool and cache metrics
+    
+    Returns counters for shared clients held by the process
+    """
+    if settings.AZURE_SDK_MODE == "async":
+        from app.services.azure_async_service import get_async_azure_client_pool
+        azure_pool = get_async_azure_client_pool()
+    else:
+        from app.services.azure_service import get_azure_client_pool
+        azure_pool = get_azure_client_pool()
+    
+    if settings.GITHUB_CLIENT_MODE == "async":
+        from app.services.github_async_service import get_async_github_client
+        github_client = get_async_github_client()
+    else:
+        from app.services.github_service import get_github_connection
+        github_client = get_github_connection()
+    
+    from app.services.aws_account_poller import account_creation_stats
+    from app.services.aws_inventory import aws_account_inventory_stats
+    from app.services.github_scheduler import get_github_scheduler
+    from app.services.inventory_service import get_inventory_service
+    from app.services.job_queue import get_job_queue
+    from app.services.operation_tracker import get_operation_tracker
+    from app.services.provisioning import step_stats
+    from app.services.repo_name_index import get_repo_name_index
+    from app.services.resource_store import get_resource_store
+    from app.services.sharepoint_batch import get_sharepoint_write_batcher
+    from app.services.sharepoint_context import get_sharepoint_connection
+    from app.services.sharepoint_sync import get_sharepoint_change_sync
+    from app.services.tag_index import get_tag_index
+    from app.services.webhook_ingest import get_webhook_coalescer
+    
+    store = get_resource_store()
+    worker = getattr(request.app.state, "job_worker", None)
+    return {
+        "azure_client_pool": azure_pool.stats(),
+        "github_connection": github_client.stats(),
+        "github_etag_cache": github_client.cache.stats(),
+        "github_scheduler": get_github_scheduler().stats(),
+        "inventory_cache": get_inventory_service().stats(),
+        "tag_index": get_tag_index().stats(),
+        "resource_store": store.stats() if store else None,
+        "job_queue": await get_job_queue().stats(),
+        "job_worker": worker.stats() if worker else None,
+        "operation_tracker": get_operation_tracker().stats(),
+        "aws_account_creation": account_creation_stats(),
+        "aws_account_inventory": aws_account_inventory_stats(),
+        "provisioning_steps": step_stats(),
+        "repo_name_index": get_repo_name_index().stats(),
+        "sharepoint_sync": get_sharepoint_change_sync().stats(),
+        "sharepoint_connection": get_sharepoint_connection().stats() if settings.SHAREPOINT_ENABLED else None,
+        "sharepoint_batch": (
+            get_sharepoint_write_batcher().stats()
+            if settings.SHAREPOINT_ENABLED and settings.SHAREPOINT_BATCH_ENABLED else None
+        ),
+        "webhook_ingest": get_webhook_coalescer().stats()
+    }
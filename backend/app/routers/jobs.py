@@ -0,0 +1,25 @@
+"""
+Jobs Router
+"""
+from fastapi import APIRouter, HTTPException
+import structlog
+
+from app.models import Job
+from app.services.job_queue import get_job_queue
+
+router = APIRouter()
+logger = structlog.get_logger()
+
+
+@router.get("/jobs/{job_id}", response_model=Job)
+async def get_job(job_id: str):
+    """
+    Get a provisioning job's status, attempts and result
+    
+    Args:
+        job_id: Job ID returned when the job was queued
+    """
+    job = await get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,28 @@
+"""
+Cloud Operations Router
+"""
+from fastapi import APIRouter, HTTPException
+import structlog
+
+from app.models import Operation
+from app.services.operation_tracker import get_operation_tracker
+
+router = APIRouter()
+logger = structlog.get_logger()
+
+
+@router.get("/operations/{operation_id}", response_model=Operation)
+async def get_operation(operation_id: str):
+    """
+    Get a long-running cloud operation's status and result
+    
+    Operations are followed by the process that started them; finished
+    operations remain available for OPERATION_RETENTION_SECONDS.
+    
+    Args:
+        operation_id: Operation ID returned when the operation was started
+    """
+    operation = get_operation_tracker().get(operation_id)
+    if operation is None:
+        raise HTTPException(status_code=404, detail="Operation not found")
+    return operation
@@ -1,12 +1,14 @@
 """
 Resources Router
 """
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse, Response
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from typing import AsyncIterator, List, Optional
+import asyncio
 import structlog
 from datetime import datetime
 import json
+import time
 
 from app.models import (
     ResourceCreationRequest,
@@ -15,22 +17,24 @@ from app.models import (
     ResourceStatus,
     AzureResourceGroup,
     CloudPlatform,
+    JobStatus,
+    RepoNameCheckRequest,
+    RepoNameCheckResponse,
+    RepoNameStatus,
     ResourceType
 )
-from app.services import AzureService, GitHubService, SharePointService
-# Optional cloud service imports
-try:
-    from app.services.gcp_service import GCPService
-    GCP_AVAILABLE = True
-except ImportError:
-    GCP_AVAILABLE = False
-    
-try:
-    from app.services.aws_service import AWSService
-    AWS_AVAILABLE = True
-except ImportError:
-    AWS_AVAILABLE = False
-    
+from app.services import get_azure_service, SharePointService
+from app.services.inventory_service import (
+    get_inventory_service,
+    inventory_headers,
+    InventoryFilter
+)
+from app.services.job_queue import get_job_queue
+from app.services.provisioning import CREATE_RESOURCES, repository_name_conflict
+from app.services.repo_name_index import get_repo_name_index
+from app.services.resource_store import get_resource_store, record_request
+from app.services.tag_index import get_tag_index
+from app.utils.cache import CacheResult
 from app.config import get_settings
 
 router = APIRouter()
@@ -50,100 +54,124 @@ async def test_snake_case():
     return Response(content=json.dumps(test_data), media_type="application/json")
 
 
+def _cache_headers(result: CacheResult) -> dict:
+    """Build response headers describing how the inventory cache served a request"""
+    stats = get_inventory_service().stats()
+    return {
+        "X-Cache": result.status.upper(),
+        "Age": str(int(result.age)),
+        "X-Cache-Hits": str(stats["hits"] + stats["stale_hits"]),
+        "X-Cache-Misses": str(stats["misses"])
+    }
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def _ndjson_lines(batches: AsyncIterator[List[dict]], filters: InventoryFilter) -> AsyncIterator[str]:
+    """Encode batches of rows as newline-delimited JSON, one chunk per batch"""
+    count = 0
+    async for rows in batches:
+        lines = [json.dumps(row) + "\n" for row in rows if filters.matches_row(row)]
+        count += len(lines)
+        if lines:
+            yield "".join(lines)
+    logger.info("streamed_inventory_entries", count=count)
+
+
+async def _batched(rows: List[dict], size: int = 500) -> AsyncIterator[List[dict]]:
+    """Split an in-memory row list into batches for streaming"""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
 @router.get("/resources")
-async def list_resources():
+async def list_resources(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size (all rows if omitted)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    sort: Optional[str] = Query(None, description="Sort field, prefix with '-' for descending (default -date_of_creation when paginating)"),
+    user_name: Optional[str] = Query(None, description="Case-insensitive substring of the requesting user"),
+    project_name: Optional[str] = Query(None, description="Case-insensitive substring of the project name"),
+    status: Optional[str] = Query(None, description="Resource status"),
+    cloud_platform: Optional[str] = Query(None, description="Cloud platform"),
+    location: Optional[str] = Query(None, description="Region/location"),
+    created_after: Optional[datetime] = Query(None, description="Created at or after this time"),
+    created_before: Optional[datetime] = Query(None, description="Created at or before this time")
+):
     """
     List all resource creation entries
     
-    Returns SharePoint list items if enabled, otherwise returns Azure resource groups as entries
+    Returns SharePoint list items if enabled, otherwise returns Azure resource groups as entries.
+    Served from the in-process inventory cache; X-Cache and Age headers describe the cached copy.
+    Filtering, sorting and keyset pagination run against the cached inventory. When more rows
+    are available the next page's cursor is returned in X-Next-Cursor and a Link header.
+    
+    With "Accept: application/x-ndjson" rows are streamed one JSON object per line. If nothing
+    is cached (and no sort/pagination is requested) rows are streamed as each subscription or
+    SharePoint page arrives, and the completed inventory is cached for later requests. For
+    SharePoint, a status filter (with any user filter) is then applied on the server instead.
     """
-    if not settings.SHAREPOINT_ENABLED or not settings.SHAREPOINT_SITE_URL:
-        logger.info("sharepoint_disabled_returning_azure_resource_groups")
-        # Return Azure resource groups as SharePoint-like entries
-        try:
-            azure_service = AzureService()
-            resource_groups = await azure_service.list_resource_groups()
-            
-            logger.info("fetched_azure_resource_groups", count=len(resource_groups))
-            
-            # Build response dict directly without Pydantic models
-            data = []
-            for rg in resource_groups:
-                user_name = rg.tags.get("CreatedBy", "Created outside app") if rg.tags else "Created outside app"
-                project_name = rg.tags.get("ProjectName", rg.name) if rg.tags else rg.name
-                
-                # Parse date from tags
-                date_of_creation = None
-                if rg.tags and "CreatedAt" in rg.tags:
-                    date_of_creation = rg.tags["CreatedAt"]
-                
-                # Construct dict directly with snake_case keys - NO PYDANTIC
-                data.append({
-                    "id": rg.id,
-                    "user_name": user_name,
-                    "resource_group_name": rg.name,
-                    "date_of_creation": date_of_creation,
-                    "project_name": project_name,
-                    "status": "Completed",
-                    "azure_resource_group_id": rg.id,
-                    "github_repo_url": None,
-                    "error_message": None
-                })
-
-            logger.info("returned_azure_resource_groups_as_entries", count=len(data))
-            # Log first entry to verify snake_case
-            if data:
-                logger.info("first_entry", entry=data[0])
-            # Use Response with explicit json.dumps to bypass any Pydantic serialization
-            json_content = json.dumps(data)
-            logger.info("json_content_preview", preview=json_content[:500] if len(json_content) > 500 else json_content)
-            return Response(content=json_content, media_type="application/json")
-        except Exception as e:
-            logger.error("list_azure_resource_groups_failed", error=str(e))
-            return []
+    inventory_service = get_inventory_service()
+    filters = InventoryFilter(
+        user_name=user_name,
+        project_name=project_name,
+        status=status,
+        cloud_platform=cloud_platform,
+        location=location,
+        created_after=created_after,
+        created_before=created_before
+    )
     
-    try:
-        sharepoint_service = SharePointService()
-        
-        # Get all items (not just pending)
-        list_obj = sharepoint_service.ctx.web.lists.get_by_title(
-            sharepoint_service.list_name
+    streaming = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+    if streaming and inventory_service.peek() is None and not (sort or limit or cursor):
+        return StreamingResponse(
+            _ndjson_lines(inventory_service.iter_rows(filters), filters),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={"X-Cache": "MISS"}
         )
-        items = list_obj.items.get().execute_query()
-        
-        entries = []
-        for item in items:
-            try:
-                entry = sharepoint_service._item_to_entry(item)
-                entries.append(entry)
-            except Exception as e:
-                logger.warning(
-                    "failed_to_parse_item",
-                    item_id=item.properties.get("ID"),
-                    error=str(e)
-                )
-        
-        # Manually construct response to ensure snake_case field names
-        data = [
-            {
-                "id": entry.id,
-                "user_name": entry.user_name,
-                "resource_group_name": entry.resource_group_name,
-                "date_of_creation": entry.date_of_creation.isoformat() if entry.date_of_creation else None,
-                "project_name": entry.project_name,
-                "status": entry.status,
-                "azure_resource_group_id": entry.azure_resource_group_id,
-                "github_repo_url": entry.github_repo_url,
-                "error_message": entry.error_message
-            }
-            for entry in entries
-        ]
-        # Use Response with explicit json.dumps to bypass any Pydantic serialization
-        return Response(content=json.dumps(data), media_type="application/json")
-        
+    
+    try:
+        result = await inventory_service.get_inventory()
     except Exception as e:
+        if inventory_service.source == "azure":
+            logger.error("list_azure_resource_groups_failed", error=str(e))
+            return []
         logger.error("list_resources_failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
+    
+    snapshot = result.value
+    try:
+        rows, next_cursor = snapshot.query(filters, sort=sort, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    headers = {**snapshot.headers, **_cache_headers(result)}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+    
+    if streaming:
+        # Rows are already filtered by the snapshot query
+        return StreamingResponse(
+            _ndjson_lines(_batched(rows), InventoryFilter()),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=headers
+        )
+    
+    logger.info(
+        "returned_inventory_entries",
+        source=snapshot.source,
+        count=len(rows),
+        total=len(snapshot.rows),
+        cache=result.status
+    )
+    # Use Response with explicit json.dumps to bypass any Pydantic serialization
+    return Response(
+        content=json.dumps(rows),
+        media_type="application/json",
+        headers=headers
+    )
 
 
 @router.get("/resources/subscriptions")
@@ -154,7 +182,7 @@ async def list_subscriptions():
     Returns a list of subscriptions with their IDs, names, and states
     """
     try:
-        azure_service = AzureService()
+        azure_service = get_azure_service()
         subscriptions = await azure_service.list_subscriptions()
         
         logger.info("listed_subscriptions", count=len(subscriptions))
@@ -168,147 +196,84 @@ async def list_subscriptions():
 @router.post("/resources/create", response_model=ResourceCreationResponse)
 async def create_resources(
     request: ResourceCreationRequest,
-    background_tasks: BackgroundTasks
+    wait: bool = Query(True, description="Wait for the provisioning job to finish (up to JOB_CREATE_WAIT_SECONDS)")
 ):
     """
     Create cloud resources (Azure/GCP/AWS) and optionally GitHub repository
     
-    Creates resources directly. If SharePoint is enabled, also creates an entry there.
+    Queues a provisioning job. By default waits for it and returns its result; if the job
+    has not finished in time (or wait=false) returns 202 with the job ID to poll at
+    /api/jobs/{job_id}. If SharePoint is enabled, also creates an entry there.
+    
+    AWS accounts take minutes to create: their job finishes with status In Progress
+    (also 202) and an operation ID to poll at /api/operations/{operation_id}.
+    
+    Returns 409 before queuing if the GitHub repository to create already exists.
     """
+    if request.create_github_repo:
+        conflict = await repository_name_conflict(request.resource_group_name)
+        if conflict:
+            raise HTTPException(status_code=409, detail=conflict)
+    
     try:
-        logger.info("manual_resource_creation_requested", 
-                   platform=request.cloud_platform, 
-                   resource_type=request.resource_type,
-                   request=request.dict())
-        
-        item_id: Optional[str] = None
-        resource_id = None
-        github_repo_url = None
-        error_message = None
-        status = ResourceStatus.COMPLETED
-        
-        # Optionally create SharePoint entry
-        if settings.SHAREPOINT_ENABLED and settings.SHAREPOINT_SITE_URL:
-            try:
-                sharepoint_service = SharePointService()
-                entry = SharePointEntry(
-                    user_name=request.user_name,
-                    cloud_platform=request.cloud_platform,
-                    resource_type=request.resource_type,
-                    resource_group_name=request.resource_group_name,
-                    project_name=request.project_name,
-                    status=ResourceStatus.IN_PROGRESS
-                )
-                item_id = await sharepoint_service.create_item(entry)
-                logger.info("sharepoint_entry_created", item_id=item_id)
-            except Exception as sp_error:
-                logger.warning("sharepoint_entry_creation_failed", error=str(sp_error))
-                # Continue without SharePoint
-        
-        try:
-            creation_time = datetime.utcnow()
-            
-            # Route to appropriate cloud service based on platform
-            if request.cloud_platform == CloudPlatform.AZURE:
-                azure_service = AzureService()
-                tags = {
-                    "ProjectName": request.project_name,
-                    "CreatedBy": request.user_name,
-                    "CreatedAt": creation_time.isoformat(),
-                    **request.tags
-                } if request.tags else {
-                    "ProjectName": request.project_name,
-                    "CreatedBy": request.user_name,
-                    "CreatedAt": creation_time.isoformat()
-                }
-                
-                logger.info("creating_azure_resource_group", name=request.resource_group_name)
-                rg = await azure_service.create_resource_group(
-                    resource_group_name=request.resource_group_name,
-                    location=request.location or "eastus",
-                    tags=tags,
-                    subscription_id=request.subscription_id
-                )
-                resource_id = rg.id
-                logger.info("azure_resource_group_created", id=resource_id)
-                
-            elif request.cloud_platform == CloudPlatform.GCP:
-                if not GCP_AVAILABLE:
-                    raise HTTPException(status_code=501, detail="GCP support not available. Install google-cloud-resourcemanager.")
-                gcp_service = GCPService()
-                logger.info("creating_gcp_project", project_id=request.resource_group_name)
-                labels = {
-                    "project-name": request.project_name.lower().replace(" ", "-"),
-                    "created-by": request.user_name.lower().replace(" ", "-")
-                }
-                project = await gcp_service.create_project(
-                    project_id=request.resource_group_name,
-                    display_name=request.project_name,
-                    labels=labels
-                )
-                resource_id = project["project_id"]
-                logger.info("gcp_project_created", project_id=resource_id)
-                
-            elif request.cloud_platform == CloudPlatform.AWS:
-                if not AWS_AVAILABLE:
-                    raise HTTPException(status_code=501, detail="AWS support not available. Install boto3.")
-                aws_service = AWSService()
-                logger.info("creating_aws_account", account_name=request.project_name)
-                # For AWS, we need an email address - could be derived from user or passed in
-                email = request.tags.get("email") if request.tags else f"{request.user_name.lower().replace(' ', '.')}@example.com"  
-                account = await aws_service.create_account(
-                    account_name=request.project_name,
-                    email=email,
-                    tags=[{"Key": "CreatedBy", "Value": request.user_name}] if request.tags is None else [
-                        {"Key": k, "Value": v} for k, v in request.tags.items()
-                    ]
-                )
-                resource_id = account.get("account_id") or account["request_id"]
-                logger.info("aws_account_created", account_id=resource_id)
-            
-            # Create GitHub Repository if requested
-            if request.create_github_repo:
-                github_service = GitHubService()
-                logger.info("creating_github_repository", name=request.resource_group_name)
-                repo = await github_service.create_repository(
-                    repo_name=request.resource_group_name,
-                    description=f"{request.project_name} ({request.cloud_platform.value}) - Created for {request.user_name}"
-                )
-                github_repo_url = repo.html_url
-                logger.info("github_repository_created", url=github_repo_url)
-            
-        except Exception as e:
-            error_message = str(e)
-            status = ResourceStatus.FAILED
-            logger.error("resource_creation_failed", error=error_message)
-        
-        # Update SharePoint entry if it was created
-        if item_id and settings.SHAREPOINT_ENABLED:
-            try:
-                sharepoint_service = SharePointService()
-                await sharepoint_service.update_item_status(
-                    item_id,
-                    status,
-                    resource_id=resource_id,
-                    github_repo_url=github_repo_url,
-                    error_message=error_message
-                )
-            except Exception as sp_error:
-                logger.warning("sharepoint_update_failed", error=str(sp_error))
-        
-        return ResourceCreationResponse(
-            status=status,
-            resource_group_id=resource_id,
-            resource_group_name=request.resource_group_name if resource_id else None,
-            github_repo_url=github_repo_url,
-            sharepoint_item_id=item_id,
-            message="Resources created successfully" if status == ResourceStatus.COMPLETED 
-                    else f"Failed: {error_message}",
-            created_at=datetime.utcnow().isoformat()
-        )
+        job_queue = get_job_queue()
+        job = await job_queue.enqueue(CREATE_RESOURCES, request.model_dump(mode="json"))
+        if wait:
+            job = await job_queue.wait(job.id, settings.JOB_CREATE_WAIT_SECONDS)
     except Exception as e:
         logger.error("create_resources_failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if job.status == JobStatus.SUCCEEDED:
+        response = ResourceCreationResponse(**job.result)
+        response.job_id = job.id
+        if response.status == ResourceStatus.COMPLETED:
+            # The job may have run in a separate worker process
+            get_inventory_service().invalidate()
+        elif response.status == ResourceStatus.IN_PROGRESS:
+            # AWS account still being created; follow response.operation_id
+            return JSONResponse(status_code=202, content=response.model_dump(mode="json"))
+        return response
+    if job.status == JobStatus.FAILED:
+        logger.error("create_resources_failed", job_id=job.id, error=job.last_error)
+        raise HTTPException(status_code=500, detail=job.last_error)
+    
+    pending = ResourceCreationResponse(
+        status=ResourceStatus.PENDING,
+        resource_group_name=request.resource_group_name,
+        message=f"Queued as job {job.id}",
+        job_id=job.id
+    )
+    return JSONResponse(status_code=202, content=pending.model_dump(mode="json"))
+
+
+@router.post("/resources/github/check-names", response_model=RepoNameCheckResponse)
+async def check_repository_names(request: RepoNameCheckRequest):
+    """
+    Check proposed GitHub repository names against the owner's repositories
+    
+    Served from the in-memory repository name index. Once it is older than
+    GITHUB_REPO_INDEX_TTL_SECONDS a refresh runs in the background; only a
+    request arriving before the index was first built waits for the listing.
+    """
+    repo_name_index = get_repo_name_index()
+    if repo_name_index.is_built:
+        repo_name_index.refresh_in_background()
+    else:
+        try:
+            await repo_name_index.ensure_fresh()
+        except Exception as e:
+            logger.error("repo_name_index_build_failed", error=str(e))
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    results = repo_name_index.check(request.names)
+    stats = repo_name_index.stats()
+    return RepoNameCheckResponse(
+        results=results,
+        available=sum(status == RepoNameStatus.AVAILABLE for status in results.values()),
+        index_size=stats["names"],
+        index_age_seconds=stats["age_seconds"]
+    )
 
 
 @router.get("/resources/cloud-platforms")
@@ -351,30 +316,103 @@ async def list_resource_types(cloud_platform: Optional[str] = None):
 
 
 @router.get("/resources/azure/resource-groups", response_model=List[AzureResourceGroup])
-async def list_azure_resource_groups():
+async def list_azure_resource_groups(response: Response):
     """
     List all Azure Resource Groups in the subscription
+    
+    Subscriptions that failed or timed out are reported in X-* response headers
     """
     try:
-        azure_service = AzureService()
-        resource_groups = await azure_service.list_resource_groups()
+        azure_service = get_azure_service()
+        inventory = await azure_service.list_resource_groups_detailed()
+        response.headers.update(inventory_headers(inventory))
         
-        return resource_groups
+        return inventory.resource_groups
         
     except Exception as e:
         logger.error("list_azure_resource_groups_failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _rebuild_tag_index(tag_index) -> Optional[str]:
+    """
+    Relist Azure resource groups into the tag index
+    
+    Returns:
+        Error message if the listing failed (the index is left as it was), otherwise None
+    """
+    try:
+        inventory = await get_azure_service().list_resource_groups_detailed()
+        if inventory.partial and not inventory.resource_groups:
+            raise RuntimeError("Azure listing returned no resource groups: " + ", ".join(
+                f"{failure.subscription_id}:{failure.reason}" for failure in inventory.failed_subscriptions
+            ))
+        tag_index.rebuild(inventory.resource_groups, complete=not inventory.partial)
+        return None
+    except Exception as e:
+        logger.error("tag_index_build_failed", error=str(e))
+        return str(e)
+
+
+@router.get("/resources/by-tag", response_model=List[AzureResourceGroup])
+async def list_resources_by_tag(
+    response: Response,
+    key: str = Query(..., description="Tag key, e.g. CreatedBy or ProjectName (case-insensitive)"),
+    value: Optional[str] = Query(None, description="Tag value (case-insensitive); any value if omitted")
+):
+    """
+    List Azure Resource Groups by tag from the in-memory tag index
+    
+    The index is rebuilt whenever the Azure inventory is loaded and kept
+    current on create and delete. It is per process, and in SharePoint mode
+    the inventory never lists Azure, so an index older than
+    TAG_INDEX_MAX_AGE_SECONDS is served with X-Index-Stale while one
+    background relisting rebuilds it. Only a request arriving before the
+    index was ever built waits for that listing; if it fails, 503 is returned.
+    """
+    tag_index = get_tag_index()
+    if not tag_index.is_fresh(settings.TAG_INDEX_MAX_AGE_SECONDS):
+        rebuild = tag_index.refresh_in_background(lambda: _rebuild_tag_index(tag_index))
+        if tag_index.is_built:
+            response.headers["X-Index-Stale"] = "true"
+        else:
+            # Shielded: a cancelled request must not cancel the listing other requests wait on
+            error = await asyncio.shield(rebuild)
+            if not tag_index.is_built:
+                raise HTTPException(status_code=503, detail=f"Tag index unavailable: {error}")
+    
+    started = time.perf_counter()
+    matches = tag_index.lookup(key, value)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    
+    stats = tag_index.stats()
+    response.headers["X-Index-Lookup-Ms"] = f"{elapsed_ms:.3f}"
+    response.headers["X-Index-Age"] = str(int(stats["age_seconds"] or 0))
+    response.headers["X-Index-Size"] = str(stats["resources"])
+    return matches
+
+
 # Catch-all route - MUST BE LAST to avoid intercepting specific routes
 @router.get("/{item_id}", response_model=SharePointEntry)
 async def get_resource(item_id: str):
     """
     Get a specific resource entry
     
+    Served from the local store when the request is known there; otherwise
+    read from SharePoint and stored for later lookups.
+    
     Args:
         item_id: SharePoint list item ID
     """
+    store = get_resource_store()
+    if store is not None:
+        try:
+            entry = await store.get_request(item_id)
+            if entry:
+                return entry
+        except Exception as e:
+            logger.warning("resource_store_read_failed", item_id=item_id, error=str(e))
+    
     if not settings.SHAREPOINT_ENABLED or not settings.SHAREPOINT_SITE_URL:
         raise HTTPException(status_code=501, detail="SharePoint is not configured")
     
@@ -385,6 +423,7 @@ async def get_resource(item_id: str):
         if not entry:
             raise HTTPException(status_code=404, detail="Resource not found")
         
+        await record_request(entry)
         return entry
         
     except HTTPException:
@@ -1,8 +1,8 @@
 """
 Service Initialization
 """
-from app.services.azure_service import AzureService
+from app.services.azure_service import AzureService, get_azure_service
 from app.services.github_service import GitHubService
 from app.services.sharepoint_service import SharePointService
 
-__all__ = ["AzureService", "GitHubService", "SharePointService"]
+__all__ = ["AzureService", "get_azure_service", "GitHubService", "SharePointService"]
@@ -0,0 +1,199 @@
+"""
+AWS Account Creation Polling
+"""
+import asyncio
+import time
+import structlog
+from typing import Dict, Optional, Set
+
+from app.config import get_settings
+from app.models import CloudPlatform, Operation, OperationStatus
+from app.services.aws_inventory import account_created
+from app.services.operation_tracker import OperationFailed, OperationHandle, get_operation_tracker
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+# list_create_account_status page size (the API maximum)
+STATUS_PAGE_SIZE = 20
+
+
+class AccountCreationPoller:
+    """Follows outstanding create-account requests with one batched status listing"""
+    
+    def __init__(self, organizations_client, min_interval: Optional[float] = None):
+        """
+        Initialize the poller
+        
+        Every refresh lists the organization's IN_PROGRESS requests once
+        (list_create_account_status, paged) instead of describing each
+        outstanding request; only requests that dropped out of that listing
+        are described, once each, to read their account ID or failure
+        reason. Handles polled within min_interval of a refresh share it.
+        
+        Args:
+            organizations_client: boto3 Organizations client (or compatible)
+            min_interval: Seconds between refreshes (defaults to AWS_OPERATION_POLL_SECONDS / 2)
+        """
+        self.organizations_client = organizations_client
+        self.min_interval = (
+            min_interval if min_interval is not None else settings.AWS_OPERATION_POLL_SECONDS / 2
+        )
+        self._outstanding: Set[str] = set()
+        self._finished: Dict[str, dict] = {}  # Request ID -> final CreateAccountStatus
+        self._lock = asyncio.Lock()
+        self._refreshed_at: Optional[float] = None
+        self.refreshes = 0
+        self.list_calls = 0
+        self.describe_calls = 0
+        self.describe_errors = 0
+        self.succeeded = 0
+        self.failed = 0
+    
+    def add(self, request_id: str):
+        """Start following a create-account request"""
+        if request_id not in self._finished:
+            self._outstanding.add(request_id)
+    
+    async def status(self, request_id: str) -> Optional[dict]:
+        """
+        Get a request's final status, refreshing the batch if it is due
+        
+        Args:
+            request_id: Create-account request ID
+        
+        Returns:
+            Final CreateAccountStatus (State SUCCEEDED or FAILED), or None while in progress
+        """
+        self.add(request_id)
+        async with self._lock:
+            fresh = self._refreshed_at is not None and time.monotonic() - self._refreshed_at < self.min_interval
+            if request_id not in self._finished and not fresh:
+                await self._refresh()
+        return self._finished.pop(request_id, None)
+    
+    def discard(self, request_id: str):
+        """Stop following a request and drop its unread final status (its operation finished)"""
+        self._outstanding.discard(request_id)
+        self._finished.pop(request_id, None)
+    
+    def stats(self) -> dict:
+        """Return request and API call counters"""
+        return {
+            "outstanding": len(self._outstanding),
+            "refreshes": self.refreshes,
+            "list_calls": self.list_calls,
+            "describe_calls": self.describe_calls,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "describe_errors": self.describe_errors
+        }
+    
+    async def _refresh(self):
+        """List in-progress requests and describe the outstanding ones that finished"""
+        outstanding = set(self._outstanding)
+        if not outstanding:
+            return
+        in_progress = await asyncio.to_thread(self._list_in_progress)
+        self._refreshed_at = time.monotonic()
+        self.refreshes += 1
+        
+        for request_id in outstanding - in_progress:
+            try:
+                response = await asyncio.to_thread(
+                    self.organizations_client.describe_create_account_status,
+                    CreateAccountRequestId=request_id
+                )
+            except Exception as e:
+                # Throttled or unknown request: it stays outstanding and is described next refresh
+                self.describe_errors += 1
+                logger.warning("aws_account_creation_describe_failed", request_id=request_id, error=str(e))
+                continue
+            self.describe_calls += 1
+            status = response["CreateAccountStatus"]
+            if status["State"] == "IN_PROGRESS":
+                # Not yet visible in the listing
+                continue
+            self._outstanding.discard(request_id)
+            self._finished[request_id] = status
+            if status["State"] == "SUCCEEDED":
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            logger.info("aws_account_creation_finished", request_id=request_id, state=status["State"],
+                        account_id=status.get("AccountId"), failure_reason=status.get("FailureReason"))
+    
+    def _list_in_progress(self) -> Set[str]:
+        """Return the IDs of every IN_PROGRESS create-account request (blocking)"""
+        request_ids: Set[str] = set()
+        kwargs = {"States": ["IN_PROGRESS"], "MaxResults": STATUS_PAGE_SIZE}
+        while True:
+            response = self.organizations_client.list_create_account_status(**kwargs)
+            self.list_calls += 1
+            request_ids.update(status["Id"] for status in response.get("CreateAccountStatuses", []))
+            if not response.get("NextToken"):
+                return request_ids
+            kwargs["NextToken"] = response["NextToken"]
+
+
+class CreateAccountHandle(OperationHandle):
+    """Polls one create-account request through the shared poller"""
+    
+    def __init__(self, poller: AccountCreationPoller, request_id: str):
+        self.poller = poller
+        self.request_id = request_id
+        poller.add(request_id)
+    
+    async def poll(self) -> Optional[dict]:
+        status = await self.poller.status(self.request_id)
+        if status is None:
+            return None
+        if status["State"] != "SUCCEEDED":
+            raise OperationFailed(status.get("FailureReason") or f"Account creation {status['State']}")
+        return {
+            "request_id": status["Id"],
+            "account_id": status.get("AccountId"),
+            "account_name": status.get("AccountName")
+        }
+
+
+_account_creation_poller: Optional[AccountCreationPoller] = None
+
+
+def get_account_creation_poller(organizations_client) -> AccountCreationPoller:
+    """Get the process-wide create-account poller, creating it with the given client on first use"""
+    global _account_creation_poller
+    if _account_creation_poller is None:
+        _account_creation_poller = AccountCreationPoller(organizations_client)
+    return _account_creation_poller
+
+
+def account_creation_stats() -> Optional[dict]:
+    """Return the create-account poller's counters, or None if no account was created"""
+    return _account_creation_poller.stats() if _account_creation_poller else None
+
+
+def track_account_creation(organizations_client, request_id: str, account_name: str) -> Operation:
+    """
+    Follow a create-account request with the operation tracker
+    
+    Args:
+        organizations_client: Organizations client used for status calls
+        request_id: Create-account request ID
+        account_name: Name of the account being created
+    
+    Returns:
+        The tracked operation; its result holds the account ID
+    """
+    poller = get_account_creation_poller(organizations_client)
+    handle = CreateAccountHandle(poller, request_id)
+    
+    async def on_complete(operation: Operation):
+        # Also covers operations failed by the tracker before their status was read
+        poller.discard(request_id)
+        if operation.status == OperationStatus.SUCCEEDED and operation.result.get("account_id"):
+            await account_created(operation.result["account_id"])
+    
+    return get_operation_tracker().track(
+        CloudPlatform.AWS, "create_account", account_name, handle, on_complete=on_complete
+    )
@@ -0,0 +1,205 @@
+"""
+AWS Organizations Account Inventory
+"""
+import asyncio
+import time
+import structlog
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+from app.config import get_settings
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+# list_accounts page size (the API maximum)
+ACCOUNT_PAGE_SIZE = 20
+
+
+def account_info(account: dict) -> dict:
+    """Convert an Organizations Account to the dict returned by AWSService"""
+    return {
+        "account_id": account["Id"],
+        "arn": account.get("Arn"),
+        "account_name": account["Name"],
+        "email": account["Email"],
+        "status": account["Status"],
+        "joined_method": account["JoinedMethod"],
+        "joined_timestamp": account.get("JoinedTimestamp")
+    }
+
+
+def iter_account_pages(organizations_client) -> Iterator[List[dict]]:
+    """
+    Yield the organization's accounts one list_accounts page at a time
+    
+    Blocking; each page is requested only when the previous one has been consumed.
+    
+    Args:
+        organizations_client: boto3 Organizations client (or compatible)
+    
+    Yields:
+        Lists of account dicts
+    """
+    kwargs = {"MaxResults": ACCOUNT_PAGE_SIZE}
+    while True:
+        response = organizations_client.list_accounts(**kwargs)
+        yield [account_info(account) for account in response.get("Accounts", [])]
+        if not response.get("NextToken"):
+            return
+        kwargs["NextToken"] = response["NextToken"]
+
+
+class AWSAccountInventory:
+    """Cached list of the organization's accounts"""
+    
+    def __init__(self, organizations_client, ttl: Optional[float] = None):
+        """
+        Initialize an empty inventory
+        
+        The full listing is repeated once it is older than ttl. In between,
+        accounts this service creates or closes are applied one by one
+        (a single describe_account each), so the cache stays current without
+        relisting the organization.
+        
+        Args:
+            organizations_client: boto3 Organizations client (or compatible)
+            ttl: Seconds a full listing is served (defaults to settings)
+        """
+        self.organizations_client = organizations_client
+        self.ttl = ttl if ttl is not None else settings.AWS_ACCOUNT_INVENTORY_TTL_SECONDS
+        self._accounts: Dict[str, dict] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.full_loads = 0
+        self.incremental_updates = 0
+        self.hits = 0
+        self.pages = 0
+    
+    @property
+    def fresh(self) -> bool:
+        """True if the last full listing is younger than the TTL"""
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+    
+    async def get_accounts(self) -> List[dict]:
+        """
+        Get every account, listing the organization only if the cache expired
+        
+        Returns:
+            List of account dicts
+        """
+        if not self.fresh:
+            async with self._lock:
+                if not self.fresh:
+                    async for _ in self.iter_accounts():
+                        pass
+                    return list(self._accounts.values())
+        self.hits += 1
+        return list(self._accounts.values())
+    
+    async def iter_accounts(self) -> AsyncIterator[List[dict]]:
+        """
+        Yield accounts page by page as they are listed
+        
+        While the cache is fresh its accounts are yielded as one batch.
+        Otherwise pages are yielded as they arrive, and a listing that runs
+        to the end replaces the cache; one abandoned early does not.
+        
+        Yields:
+            Lists of account dicts
+        """
+        if self.fresh:
+            self.hits += 1
+            yield list(self._accounts.values())
+            return
+        
+        accounts: Dict[str, dict] = {}
+        pages = iter_account_pages(self.organizations_client)
+        while True:
+            page = await asyncio.to_thread(next, pages, None)
+            if page is None:
+                break
+            self.pages += 1
+            for account in page:
+                accounts[account["account_id"]] = account
+            yield page
+        
+        self._accounts = accounts
+        self._loaded_at = time.monotonic()
+        self.full_loads += 1
+        logger.info("aws_account_inventory_loaded", count=len(accounts))
+    
+    async def refresh_account(self, account_id: str):
+        """
+        Add or update one account in a loaded inventory
+        
+        Args:
+            account_id: AWS account ID (e.g. of an account just created)
+        """
+        if self._loaded_at is None:
+            return
+        response = await asyncio.to_thread(self.organizations_client.describe_account, AccountId=account_id)
+        self._accounts[account_id] = account_info(response["Account"])
+        self.incremental_updates += 1
+    
+    def set_status(self, account_id: str, status: str):
+        """
+        Record a status change made by this service
+        
+        Args:
+            account_id: AWS account ID
+            status: New Organizations account status (e.g. PENDING_CLOSURE)
+        """
+        account = self._accounts.get(account_id)
+        if account is not None:
+            self._accounts[account_id] = {**account, "status": status}
+            self.incremental_updates += 1
+    
+    def invalidate(self):
+        """Force a full listing on next use"""
+        self._loaded_at = None
+    
+    def stats(self) -> dict:
+        """Return cache counters"""
+        return {
+            "accounts": len(self._accounts),
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at is not None else None,
+            "full_loads": self.full_loads,
+            "pages": self.pages,
+            "incremental_updates": self.incremental_updates,
+            "hits": self.hits
+        }
+
+
+_aws_account_inventory: Optional[AWSAccountInventory] = None
+
+
+def get_aws_account_inventory() -> AWSAccountInventory:
+    """Get the process-wide account inventory on the shared Organizations client (requires boto3)"""
+    global _aws_account_inventory
+    if _aws_account_inventory is None:
+        from app.services.aws_service import get_organizations_client
+        _aws_account_inventory = AWSAccountInventory(get_organizations_client())
+    return _aws_account_inventory
+
+
+def aws_account_inventory_stats() -> Optional[dict]:
+    """Return the account inventory's counters, or None if it was never used"""
+    return _aws_account_inventory.stats() if _aws_account_inventory else None
+
+
+async def account_created(account_id: str):
+    """Add a newly created account to the inventory, if one is loaded"""
+    if _aws_account_inventory is None:
+        return
+    try:
+        await _aws_account_inventory.refresh_account(account_id)
+    except Exception as e:
+        # The next full listing picks the account up
+        logger.warning("aws_account_inventory_update_failed", account_id=account_id, error=str(e))
+        _aws_account_inventory.invalidate()
+
+
+def account_closed(account_id: str):
+    """Mark a closed account in the inventory, if one is loaded"""
+    if _aws_account_inventory is not None:
+        _aws_account_inventory.set_status(account_id, "PENDING_CLOSURE")
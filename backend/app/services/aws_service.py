@@ -2,21 +2,47 @@
 AWS Service - Handles AWS account creation and management
 """
 import logging
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Iterator, List
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
-from ..core.config import settings
+
+from app.config import get_settings
+from app.models import Operation
+from app.services.aws_account_poller import track_account_creation
+from app.services.aws_inventory import account_closed, get_aws_account_inventory, iter_account_pages
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def organizations_config() -> Config:
+    """Client config with a pool sized for concurrent calls and adaptive (client-side rate limited) retries"""
+    return Config(
+        region_name=settings.AWS_REGION,
+        max_pool_connections=settings.AWS_HTTP_POOL_SIZE,
+        retries={"mode": "adaptive", "max_attempts": settings.AWS_MAX_ATTEMPTS}
+    )
+
+
+_organizations_client = None
+
+
+def get_organizations_client():
+    """Get the process-wide Organizations client (boto3 clients are thread-safe), creating it on first use"""
+    global _organizations_client
+    if _organizations_client is None:
+        _organizations_client = boto3.client('organizations', config=organizations_config())
+    return _organizations_client
 
 
 class AWSService:
     """Service for managing AWS accounts"""
     
     def __init__(self):
-        """Initialize AWS service with credentials"""
+        """Initialize AWS service with the shared Organizations client"""
         try:
-            self.organizations_client = boto3.client('organizations')
+            self.organizations_client = get_organizations_client()
             logger.info("AWS service initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize AWS service: {str(e)}")
@@ -37,9 +63,10 @@ class AWSService:
             email: Unique email address for the account
             role_name: Name of IAM role for organization access
             tags: Account tags
-            
+        
         Returns:
-            Dict containing account creation information
+            Dict containing account creation information; the request is
+            followed by the operation tracker under operation_id
         """
         try:
             logger.info(f"Creating AWS account: {account_name}")
@@ -59,6 +86,7 @@ class AWSService:
             
             create_request_id = response['CreateAccountStatus']['Id']
             logger.info(f"AWS account creation initiated: {create_request_id}")
+            operation = self.track_account_creation(create_request_id, account_name)
             
             # Return the status - account creation is async in AWS
             return {
@@ -66,7 +94,8 @@ class AWSService:
                 "account_name": account_name,
                 "email": email,
                 "status": response['CreateAccountStatus']['State'],
-                "account_id": response['CreateAccountStatus'].get('AccountId')
+                "account_id": response['CreateAccountStatus'].get('AccountId'),
+                "operation_id": operation.id
             }
             
         except ClientError as e:
@@ -84,13 +113,26 @@ class AWSService:
             logger.error(f"Error creating AWS account: {str(e)}")
             raise
     
+    def track_account_creation(self, request_id: str, account_name: str) -> Operation:
+        """
+        Follow an existing create-account request with the operation tracker
+        
+        Args:
+            request_id: The create account request ID
+            account_name: Name of the account being created
+        
+        Returns:
+            The tracked operation; its result holds the account ID
+        """
+        return track_account_creation(self.organizations_client, request_id, account_name)
+    
     async def get_account_creation_status(self, request_id: str) -> Dict:
         """
         Check the status of an account creation request
         
         Args:
             request_id: The create account request ID
-            
+        
         Returns:
             Dict containing account creation status
         """
@@ -119,7 +161,7 @@ class AWSService:
         
         Args:
             account_id: AWS account ID
-            
+        
         Returns:
             Dict containing account information or None if not found
         """
@@ -149,24 +191,14 @@ class AWSService:
         """
         List all AWS accounts in the organization
         
+        Served from the shared account inventory, which relists the
+        organization only once its TTL expires.
+        
         Returns:
             List of account dictionaries
         """
         try:
-            accounts = []
-            paginator = self.organizations_client.get_paginator('list_accounts')
-            
-            for page in paginator.paginate():
-                for account in page['Accounts']:
-                    accounts.append({
-                        "account_id": account['Id'],
-                        "account_name": account['Name'],
-                        "email": account['Email'],
-                        "status": account['Status'],
-                        "joined_method": account['JoinedMethod'],
-                        "joined_timestamp": account.get('JoinedTimestamp')
-                    })
-            
+            accounts = await get_aws_account_inventory().get_accounts()
             logger.info(f"Found {len(accounts)} AWS accounts")
             return accounts
             
@@ -174,13 +206,26 @@ class AWSService:
             logger.error(f"Error listing AWS accounts: {str(e)}")
             raise
     
+    def iter_accounts(self) -> Iterator[Dict]:
+        """
+        Stream the organization's accounts without holding the full list
+        
+        Blocking; each list_accounts page is requested only when the
+        previous one has been consumed.
+        
+        Yields:
+            Account dictionaries
+        """
+        for page in iter_account_pages(self.organizations_client):
+            yield from page
+    
     async def close_account(self, account_id: str) -> bool:
         """
         Close an AWS account
         
         Args:
             account_id: Account ID to close
-            
+        
         Returns:
             True if successful
         """
@@ -189,6 +234,7 @@ class AWSService:
                 AccountId=account_id
             )
             
+            account_closed(account_id)
             logger.info(f"AWS account {account_id} closed successfully")
             return True
             
@@ -0,0 +1,492 @@
+"""
+Azure Resource Management Service (async SDK)
+"""
+import asyncio
+import aiohttp
+from azure.identity.aio import ClientSecretCredential
+from azure.mgmt.resource.resources.aio import ResourceManagementClient
+from azure.mgmt.resource.subscriptions.aio import SubscriptionClient
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.core.exceptions import AzureError
+from azure.mgmt.core.polling.async_arm_polling import AsyncARMPolling
+import structlog
+from collections import OrderedDict
+from typing import AsyncIterator, Optional, List
+
+from app.config import get_settings
+from app.models import AzureResourceGroup, Operation, ResourceGroupInventory, SubscriptionFailure
+from app.services.azure_service import operation_outcome, track_resource_group_delete
+from app.services.operation_tracker import OperationFailed, OperationHandle, get_operation_tracker
+from app.services.resource_graph_service import ResourceGraphService
+from app.services.tag_index import get_tag_index
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+class AsyncAzureClientPool:
+    """Process-wide async Azure credential and LRU cache of aio resource clients"""
+    
+    def __init__(self, max_clients: Optional[int] = None):
+        """
+        Initialize the pool with one aiohttp session shared by every client
+        
+        Must be created while an event loop is running.
+        
+        Args:
+            max_clients: Maximum cached resource clients (defaults to settings)
+        """
+        self.session = aiohttp.ClientSession()
+        
+        self.credential = ClientSecretCredential(
+            tenant_id=settings.AZURE_TENANT_ID,
+            client_id=settings.AZURE_CLIENT_ID,
+            client_secret=settings.AZURE_CLIENT_SECRET,
+            transport=self._transport()
+        )
+        
+        self.subscription_client = SubscriptionClient(
+            credential=self.credential,
+            transport=self._transport()
+        )
+        
+        self.max_clients = max(1, max_clients or settings.AZURE_CLIENT_POOL_SIZE)
+        self._resource_clients: OrderedDict[str, ResourceManagementClient] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def _transport(self) -> AioHttpTransport:
+        """Build a transport over the shared session (the pool owns the session)"""
+        return AioHttpTransport(session=self.session, session_owner=False)
+    
+    def get_resource_client(self, subscription_id: str) -> ResourceManagementClient:
+        """
+        Get a cached aio resource client for a subscription, creating it on a miss
+        
+        Args:
+            subscription_id: Azure subscription ID
+        
+        Returns:
+            Async ResourceManagementClient bound to the subscription
+        """
+        client = self._resource_clients.get(subscription_id)
+        if client is not None:
+            self._resource_clients.move_to_end(subscription_id)
+            self.hits += 1
+            return client
+        
+        self.misses += 1
+        client = ResourceManagementClient(
+            credential=self.credential,
+            subscription_id=subscription_id,
+            transport=self._transport()
+        )
+        self._resource_clients[subscription_id] = client
+        
+        # Clients share the pool's session, so evicted ones hold nothing to close
+        while len(self._resource_clients) > self.max_clients:
+            self._resource_clients.popitem(last=False)
+            self.evictions += 1
+        
+        return client
+    
+    def stats(self) -> dict:
+        """Return pool counters"""
+        return {
+            "size": len(self._resource_clients),
+            "max_size": self.max_clients,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+    
+    async def close(self):
+        """Close all cached clients, the credential and the shared session"""
+        clients = list(self._resource_clients.values())
+        self._resource_clients.clear()
+        
+        for client in clients + [self.subscription_client, self.credential]:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning("azure_client_close_failed", error=str(e))
+        
+        await self.session.close()
+
+
+_async_client_pool: Optional[AsyncAzureClientPool] = None
+
+
+def get_async_azure_client_pool() -> AsyncAzureClientPool:
+    """Get the process-wide async Azure client pool, creating it on first use"""
+    global _async_client_pool
+    if _async_client_pool is None:
+        _async_client_pool = AsyncAzureClientPool()
+        logger.info("azure_async_client_pool_created", max_size=_async_client_pool.max_clients)
+    return _async_client_pool
+
+
+async def close_async_azure_client_pool():
+    """Close the process-wide async Azure client pool"""
+    global _async_client_pool
+    if _async_client_pool is not None:
+        logger.info("azure_async_client_pool_closing", **_async_client_pool.stats())
+        await _async_client_pool.close()
+        _async_client_pool = None
+
+
+def _to_resource_group(rg) -> AzureResourceGroup:
+    """Convert an SDK resource group to AzureResourceGroup model"""
+    return AzureResourceGroup(
+        id=rg.id,
+        name=rg.name,
+        location=rg.location,
+        tags=rg.tags or {},
+        provisioning_state=rg.properties.provisioning_state
+    )
+
+
+class TrackedAsyncARMPolling(AsyncARMPolling):
+    """Async ARM polling advanced by the operation tracker instead of the poller"""
+    
+    async def run(self):
+        """Return at once; OperationTracker calls update_status on its own schedule"""
+
+
+class AsyncAzureOperationHandle(OperationHandle):
+    """Polls an ARM long-running operation with the aio SDK"""
+    
+    def __init__(self, polling: AsyncARMPolling):
+        self.polling = polling
+    
+    async def poll(self) -> Optional[dict]:
+        if not self.polling.finished():
+            await self.polling.update_status()
+        return operation_outcome(self.polling)
+
+
+class AsyncAzureService:
+    """Service for Azure Resource Group management on the async (aio) SDK"""
+    
+    def __init__(self, pool: Optional[AsyncAzureClientPool] = None):
+        """
+        Initialize async Azure service
+        
+        Method signatures match AzureService, but every SDK call is awaited
+        on the event loop instead of blocking it.
+        
+        Args:
+            pool: Shared async client pool (defaults to the process-wide pool)
+        """
+        self.pool = pool or get_async_azure_client_pool()
+        self.credential = self.pool.credential
+        self.resource_client = self.pool.get_resource_client(settings.AZURE_SUBSCRIPTION_ID)
+        self.subscription_client = self.pool.subscription_client
+    
+    async def list_subscriptions(self) -> List[dict]:
+        """
+        List all Azure subscriptions accessible by the service principal
+        
+        Returns:
+            List of subscription dictionaries with id, name, and state
+        """
+        try:
+            logger.info("listing_subscriptions")
+            subscriptions = []
+            
+            async for sub in self.subscription_client.subscriptions.list():
+                subscriptions.append({
+                    "subscription_id": sub.subscription_id,
+                    "display_name": sub.display_name,
+                    "state": sub.state
+                })
+            
+            logger.info("subscriptions_listed", count=len(subscriptions))
+            return subscriptions
+            
+        except AzureError as e:
+            logger.error("list_subscriptions_failed", error=str(e))
+            raise
+    
+    async def create_resource_group(
+        self,
+        resource_group_name: str,
+        location: Optional[str] = None,
+        tags: Optional[dict] = None,
+        subscription_id: Optional[str] = None
+    ) -> AzureResourceGroup:
+        """
+        Create an Azure Resource Group
+        
+        Args:
+            resource_group_name: Name of the resource group
+            location: Azure region (defaults to settings)
+            tags: Additional tags (merged with default tags)
+            subscription_id: Azure subscription ID (defaults to settings)
+        
+        Returns:
+            AzureResourceGroup model
+        
+        Raises:
+            AzureError: If creation fails
+        """
+        try:
+            location = location or settings.AZURE_DEFAULT_LOCATION
+            sub_id = subscription_id or settings.AZURE_SUBSCRIPTION_ID
+            resource_client = self._resource_client_for(sub_id)
+            
+            # Merge tags with defaults
+            merged_tags = {**settings.AZURE_DEFAULT_TAGS}
+            if tags:
+                merged_tags.update(tags)
+            
+            logger.info(
+                "creating_resource_group",
+                name=resource_group_name,
+                location=location,
+                subscription_id=sub_id,
+                tags=merged_tags
+            )
+            
+            rg_result = await resource_client.resource_groups.create_or_update(
+                resource_group_name,
+                {
+                    "location": location,
+                    "tags": merged_tags
+                }
+            )
+            
+            logger.info(
+                "resource_group_created",
+                id=rg_result.id,
+                name=rg_result.name,
+                state=rg_result.properties.provisioning_state
+            )
+            
+            resource_group = _to_resource_group(rg_result)
+            get_tag_index().add(resource_group)
+            return resource_group
+            
+        except AzureError as e:
+            logger.error(
+                "resource_group_creation_failed",
+                name=resource_group_name,
+                error=str(e)
+            )
+            raise
+    
+    async def get_resource_group(self, resource_group_name: str) -> Optional[AzureResourceGroup]:
+        """
+        Get an existing resource group
+        
+        Args:
+            resource_group_name: Name of the resource group
+        
+        Returns:
+            AzureResourceGroup model or None if not found
+        """
+        try:
+            rg = await self.resource_client.resource_groups.get(resource_group_name)
+            return _to_resource_group(rg)
+        except AzureError as e:
+            logger.warning(
+                "resource_group_not_found",
+                name=resource_group_name,
+                error=str(e)
+            )
+            return None
+    
+    async def begin_delete_resource_group(self, resource_group_name: str) -> Operation:
+        """
+        Start deleting a resource group without waiting for it to finish
+        
+        Args:
+            resource_group_name: Name of the resource group
+        
+        Returns:
+            Operation followed by the operation tracker
+        
+        Raises:
+            AzureError: If the delete is rejected
+        """
+        logger.info("deleting_resource_group", name=resource_group_name)
+        polling = TrackedAsyncARMPolling(settings.AZURE_OPERATION_POLL_SECONDS)
+        await self.resource_client.resource_groups.begin_delete(
+            resource_group_name,
+            polling=polling
+        )
+        return track_resource_group_delete(resource_group_name, AsyncAzureOperationHandle(polling))
+    
+    async def delete_resource_group(self, resource_group_name: str) -> bool:
+        """
+        Delete a resource group
+        
+        Args:
+            resource_group_name: Name of the resource group
+        
+        Returns:
+            True if deleted successfully
+        """
+        try:
+            operation = await self.begin_delete_resource_group(resource_group_name)
+            await get_operation_tracker().result(operation.id)
+            return True
+            
+        except (AzureError, OperationFailed) as e:
+            logger.error(
+                "resource_group_deletion_failed",
+                name=resource_group_name,
+                error=str(e)
+            )
+            return False
+    
+    async def list_resource_groups(self) -> list[AzureResourceGroup]:
+        """
+        List all resource groups across all subscriptions
+        
+        Returns:
+            List of AzureResourceGroup models from all subscriptions
+        """
+        inventory = await self.list_resource_groups_detailed()
+        return inventory.resource_groups
+    
+    async def list_resource_groups_detailed(self) -> ResourceGroupInventory:
+        """
+        List resource groups across all enabled subscriptions concurrently
+        
+        Same limits and failure reporting as AzureService; timed-out
+        subscriptions are cancelled rather than left running in a thread.
+        
+        Returns:
+            ResourceGroupInventory with partial results and failed subscriptions
+        """
+        inventory = ResourceGroupInventory()
+        async for resource_groups in self.iter_resource_groups(inventory):
+            inventory.resource_groups.extend(resource_groups)
+        
+        logger.info(
+            "list_resource_groups_completed",
+            total_count=len(inventory.resource_groups),
+            subscriptions=inventory.subscriptions_total,
+            failed_subscriptions=len(inventory.failed_subscriptions)
+        )
+        return inventory
+    
+    async def iter_resource_groups(
+        self,
+        inventory: Optional[ResourceGroupInventory] = None
+    ) -> AsyncIterator[list[AzureResourceGroup]]:
+        """
+        Yield resource groups in batches as each subscription (or page) arrives
+        
+        Args:
+            inventory: Optional accumulator; subscriptions_total and
+                failed_subscriptions are recorded on it as listing progresses
+        
+        Yields:
+            Lists of AzureResourceGroup models
+        """
+        inventory = inventory if inventory is not None else ResourceGroupInventory()
+        
+        if settings.AZURE_INVENTORY_BACKEND == "resource_graph":
+            async for resource_groups in ResourceGraphService(self.credential).iter_resource_groups(inventory):
+                yield resource_groups
+            return
+        
+        try:
+            subscriptions = [
+                sub async for sub in self.subscription_client.subscriptions.list()
+                if sub.state.lower() == 'enabled'
+            ]
+        except AzureError as e:
+            logger.error("list_resource_groups_failed", error=str(e))
+            inventory.failed_subscriptions.append(
+                SubscriptionFailure(subscription_id="*", reason="subscriptions_error", error=str(e))
+            )
+            return
+        
+        inventory.subscriptions_total = len(subscriptions)
+        semaphore = asyncio.Semaphore(max(1, settings.AZURE_LIST_CONCURRENCY))
+        tasks = [
+            asyncio.create_task(self._list_subscription_resource_groups(sub, semaphore))
+            for sub in subscriptions
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                resource_groups, failure = await next_done
+                if failure:
+                    inventory.failed_subscriptions.append(failure)
+                if resource_groups:
+                    yield resource_groups
+            inventory.completed = True
+        finally:
+            # Consumer stopped early (e.g. client disconnected mid-stream)
+            for task in tasks:
+                task.cancel()
+    
+    def _resource_client_for(self, subscription_id: str) -> ResourceManagementClient:
+        """Get an aio resource client for the given subscription"""
+        if subscription_id == settings.AZURE_SUBSCRIPTION_ID:
+            return self.resource_client
+        return self.pool.get_resource_client(subscription_id)
+    
+    async def _fetch_resource_groups(self, subscription_id: str) -> list[AzureResourceGroup]:
+        """Drain resource_groups.list() for one subscription"""
+        resource_client = self._resource_client_for(subscription_id)
+        return [
+            _to_resource_group(rg)
+            async for rg in resource_client.resource_groups.list()
+        ]
+    
+    async def _list_subscription_resource_groups(
+        self,
+        sub,
+        semaphore: asyncio.Semaphore
+    ) -> tuple[list[AzureResourceGroup], Optional[SubscriptionFailure]]:
+        """
+        List resource groups for one subscription within the fan-out limits
+        
+        Returns:
+            Tuple of (resource_groups, failure); failure is None on success
+        """
+        async with semaphore:
+            try:
+                resource_groups = await asyncio.wait_for(
+                    self._fetch_resource_groups(sub.subscription_id),
+                    timeout=settings.AZURE_LIST_SUBSCRIPTION_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "list_resource_groups_for_subscription_timed_out",
+                    subscription_id=sub.subscription_id,
+                    subscription_name=sub.display_name,
+                    timeout=settings.AZURE_LIST_SUBSCRIPTION_TIMEOUT
+                )
+                return [], SubscriptionFailure(
+                    subscription_id=sub.subscription_id,
+                    subscription_name=sub.display_name,
+                    reason="timeout"
+                )
+            except Exception as e:
+                # Credential, transport or SDK errors are reported per subscription, not raised
+                logger.warning(
+                    "failed_to_list_resource_groups_for_subscription",
+                    subscription_id=sub.subscription_id,
+                    subscription_name=sub.display_name,
+                    error=str(e)
+                )
+                return [], SubscriptionFailure(
+                    subscription_id=sub.subscription_id,
+                    subscription_name=sub.display_name,
+                    reason="error",
+                    error=str(e)
+                )
+        
+        logger.info(
+            "listed_resource_groups_for_subscription",
+            subscription_id=sub.subscription_id,
+            subscription_name=sub.display_name,
+            count=len(resource_groups)
+        )
+        return resource_groups, None
@@ -4,35 +4,241 @@ Azure Resource Management Service
 from azure.identity import ClientSecretCredential
 from azure.mgmt.resource import ResourceManagementClient, SubscriptionClient
 from azure.core.exceptions import AzureError
+from azure.mgmt.core.polling.arm_polling import ARMPolling
+import asyncio
+import threading
 import structlog
-from typing import Optional, List
+from collections import OrderedDict
+from typing import AsyncIterator, Optional, List
 
 from app.config import get_settings
-from app.models import AzureResourceGroup
+from app.models import (
+    AzureResourceGroup,
+    CloudPlatform,
+    Operation,
+    OperationStatus,
+    ResourceGroupInventory,
+    SubscriptionFailure
+)
+from app.services.operation_tracker import OperationFailed, OperationHandle, get_operation_tracker
+from app.services.resource_graph_service import ResourceGraphService
+from app.services.tag_index import get_tag_index
 
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Terminal ARM operation states other than Succeeded
+FAILED_OPERATION_STATES = ("failed", "canceled", "cancelled")
 
-class AzureService:
-    """Service for Azure Resource Group management"""
+
+class AzureClientPool:
+    """Process-wide Azure credential and LRU cache of resource clients"""
     
-    def __init__(self):
-        """Initialize Azure service with credentials"""
+    def __init__(self, max_clients: Optional[int] = None):
+        """
+        Initialize the pool with a single credential
+        
+        The credential keeps its own in-memory token cache, so sharing it
+        means AAD tokens are acquired once and reused until they expire.
+        
+        Args:
+            max_clients: Maximum cached resource clients (defaults to settings)
+        """
         self.credential = ClientSecretCredential(
             tenant_id=settings.AZURE_TENANT_ID,
             client_id=settings.AZURE_CLIENT_ID,
             client_secret=settings.AZURE_CLIENT_SECRET
         )
         
-        self.resource_client = ResourceManagementClient(
-            credential=self.credential,
-            subscription_id=settings.AZURE_SUBSCRIPTION_ID
-        )
-        
         self.subscription_client = SubscriptionClient(
             credential=self.credential
         )
+        
+        self.max_clients = max(1, max_clients or settings.AZURE_CLIENT_POOL_SIZE)
+        self._resource_clients: OrderedDict[str, ResourceManagementClient] = OrderedDict()
+        # Clients are requested from worker threads during subscription fan-out
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get_resource_client(self, subscription_id: str) -> ResourceManagementClient:
+        """
+        Get a cached resource client for a subscription, creating it on a miss
+        
+        Args:
+            subscription_id: Azure subscription ID
+        
+        Returns:
+            ResourceManagementClient bound to the subscription
+        """
+        with self._lock:
+            client = self._resource_clients.get(subscription_id)
+            if client is not None:
+                self._resource_clients.move_to_end(subscription_id)
+                self.hits += 1
+                return client
+            
+            self.misses += 1
+            client = ResourceManagementClient(
+                credential=self.credential,
+                subscription_id=subscription_id
+            )
+            self._resource_clients[subscription_id] = client
+            
+            # Evicted clients are only dereferenced; another thread may still be using them
+            while len(self._resource_clients) > self.max_clients:
+                self._resource_clients.popitem(last=False)
+                self.evictions += 1
+            
+            return client
+    
+    def stats(self) -> dict:
+        """Return pool counters"""
+        with self._lock:
+            return {
+                "size": len(self._resource_clients),
+                "max_size": self.max_clients,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+    
+    def close(self):
+        """Close all cached clients and the credential"""
+        with self._lock:
+            clients = list(self._resource_clients.values())
+            self._resource_clients.clear()
+        
+        for client in clients + [self.subscription_client, self.credential]:
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning("azure_client_close_failed", error=str(e))
+
+
+_client_pool: Optional[AzureClientPool] = None
+
+
+def get_azure_client_pool() -> AzureClientPool:
+    """Get the process-wide Azure client pool, creating it on first use"""
+    global _client_pool
+    if _client_pool is None:
+        _client_pool = AzureClientPool()
+        logger.info("azure_client_pool_created", max_size=_client_pool.max_clients)
+    return _client_pool
+
+
+def close_azure_client_pool():
+    """Close the process-wide Azure client pool"""
+    global _client_pool
+    if _client_pool is not None:
+        logger.info("azure_client_pool_closing", **_client_pool.stats())
+        _client_pool.close()
+        _client_pool = None
+
+
+class TrackedARMPolling(ARMPolling):
+    """ARM polling advanced by the operation tracker instead of a poller thread"""
+    
+    def run(self):
+        """Return at once; OperationTracker calls update_status on its own schedule"""
+
+
+class AzureOperationHandle(OperationHandle):
+    """Polls an ARM long-running operation with the blocking SDK"""
+    
+    def __init__(self, polling: ARMPolling):
+        self.polling = polling
+    
+    async def poll(self) -> Optional[dict]:
+        if not self.polling.finished():
+            await asyncio.to_thread(self.polling.update_status)
+        return operation_outcome(self.polling)
+
+
+def operation_outcome(polling) -> Optional[dict]:
+    """
+    Get the outcome of an ARM operation from its polling method
+    
+    Returns:
+        {"status": ...} once it succeeded, None while it is running
+    
+    Raises:
+        OperationFailed: If it failed or was canceled
+    """
+    if not polling.finished():
+        return None
+    status = polling.status()
+    if status.lower() in FAILED_OPERATION_STATES:
+        raise OperationFailed(f"Azure operation {status}")
+    return {"status": status}
+
+
+def track_resource_group_delete(resource_group_name: str, handle: OperationHandle) -> Operation:
+    """
+    Follow a resource group delete with the operation tracker
+    
+    The resource group leaves the tag index once the delete succeeds.
+    
+    Args:
+        resource_group_name: Name of the resource group being deleted
+        handle: Handle polling the delete
+    
+    Returns:
+        The tracked operation
+    """
+    resource_id = f"/subscriptions/{settings.AZURE_SUBSCRIPTION_ID}/resourceGroups/{resource_group_name}"
+    
+    async def on_complete(operation: Operation):
+        if operation.status == OperationStatus.SUCCEEDED:
+            get_tag_index().remove(resource_id)
+            logger.info("resource_group_deleted", name=resource_group_name)
+    
+    return get_operation_tracker().track(
+        CloudPlatform.AZURE,
+        "delete_resource_group",
+        resource_group_name,
+        handle,
+        on_complete=on_complete
+    )
+
+
+def get_azure_service():
+    """
+    Get an Azure service bound to the process-wide client pool
+    
+    Returns AsyncAzureService when AZURE_SDK_MODE is "async", otherwise
+    AzureService. Both expose the same methods.
+    """
+    if settings.AZURE_SDK_MODE == "async":
+        from app.services.azure_async_service import AsyncAzureService
+        return AsyncAzureService()
+    return AzureService(pool=get_azure_client_pool())
+
+
+def _release_after_fetch(fetch: asyncio.Future, semaphore: asyncio.Semaphore):
+    """Free a listing slot once its worker thread has returned"""
+    semaphore.release()
+    if not fetch.cancelled():
+        # Retrieve the error of a fetch whose caller already timed out, so it is not reported as unhandled
+        fetch.exception()
+
+
+class AzureService:
+    """Service for Azure Resource Group management"""
+    
+    def __init__(self, pool: Optional[AzureClientPool] = None):
+        """
+        Initialize Azure service with credentials
+        
+        Args:
+            pool: Shared client pool (a private pool is created if omitted)
+        """
+        self.pool = pool or AzureClientPool()
+        self.credential = self.pool.credential
+        self.resource_client = self.pool.get_resource_client(settings.AZURE_SUBSCRIPTION_ID)
+        self.subscription_client = self.pool.subscription_client
     
     async def list_subscriptions(self) -> List[dict]:
         """
@@ -74,10 +280,10 @@ class AzureService:
             location: Azure region (defaults to settings)
             tags: Additional tags (merged with default tags)
             subscription_id: Azure subscription ID (defaults to settings)
-            
+        
         Returns:
             AzureResourceGroup model
-            
+        
         Raises:
             AzureError: If creation fails
         """
@@ -85,14 +291,8 @@ class AzureService:
             location = location or settings.AZURE_DEFAULT_LOCATION
             sub_id = subscription_id or settings.AZURE_SUBSCRIPTION_ID
             
-            # Create resource client for specific subscription if different
-            if subscription_id and subscription_id != settings.AZURE_SUBSCRIPTION_ID:
-                resource_client = ResourceManagementClient(
-                    credential=self.credential,
-                    subscription_id=subscription_id
-                )
-            else:
-                resource_client = self.resource_client
+            # Use pooled resource client for specific subscription if different
+            resource_client = self._resource_client_for(sub_id)
             
             # Merge tags with defaults
             merged_tags = {**settings.AZURE_DEFAULT_TAGS}
@@ -123,13 +323,15 @@ class AzureService:
                 state=rg_result.properties.provisioning_state
             )
             
-            return AzureResourceGroup(
+            resource_group = AzureResourceGroup(
                 id=rg_result.id,
                 name=rg_result.name,
                 location=rg_result.location,
                 tags=rg_result.tags or {},
                 provisioning_state=rg_result.properties.provisioning_state
             )
+            get_tag_index().add(resource_group)
+            return resource_group
             
         except AzureError as e:
             logger.error(
@@ -145,7 +347,7 @@ class AzureService:
         
         Args:
             resource_group_name: Name of the resource group
-            
+        
         Returns:
             AzureResourceGroup model or None if not found
         """
@@ -167,28 +369,47 @@ class AzureService:
             )
             return None
     
+    async def begin_delete_resource_group(self, resource_group_name: str) -> Operation:
+        """
+        Start deleting a resource group without waiting for it to finish
+        
+        Args:
+            resource_group_name: Name of the resource group
+        
+        Returns:
+            Operation followed by the operation tracker
+        
+        Raises:
+            AzureError: If the delete is rejected
+        """
+        logger.info("deleting_resource_group", name=resource_group_name)
+        polling = TrackedARMPolling(settings.AZURE_OPERATION_POLL_SECONDS)
+        await asyncio.to_thread(
+            self.resource_client.resource_groups.begin_delete,
+            resource_group_name,
+            polling=polling
+        )
+        return track_resource_group_delete(resource_group_name, AzureOperationHandle(polling))
+    
     async def delete_resource_group(self, resource_group_name: str) -> bool:
         """
         Delete a resource group
         
+        Waits for the delete without holding a thread; the operation is
+        polled by the operation tracker.
+        
         Args:
             resource_group_name: Name of the resource group
-            
+        
         Returns:
             True if deleted successfully
         """
         try:
-            logger.info("deleting_resource_group", name=resource_group_name)
-            
-            poller = self.resource_client.resource_groups.begin_delete(
-                resource_group_name
-            )
-            poller.result()  # Wait for deletion to complete
-            
-            logger.info("resource_group_deleted", name=resource_group_name)
+            operation = await self.begin_delete_resource_group(resource_group_name)
+            await get_operation_tracker().result(operation.id)
             return True
             
-        except AzureError as e:
+        except (AzureError, OperationFailed) as e:
             logger.error(
                 "resource_group_deletion_failed",
                 name=resource_group_name,
@@ -203,56 +424,164 @@ class AzureService:
         Returns:
             List of AzureResourceGroup models from all subscriptions
         """
+        inventory = await self.list_resource_groups_detailed()
+        return inventory.resource_groups
+    
+    async def list_resource_groups_detailed(self) -> ResourceGroupInventory:
+        """
+        List resource groups across all enabled subscriptions concurrently
+        
+        Subscriptions are fanned out with at most AZURE_LIST_CONCURRENCY in
+        flight, each bounded by AZURE_LIST_SUBSCRIPTION_TIMEOUT. Subscriptions
+        that fail or time out are reported in the result instead of aborting
+        the whole listing. With AZURE_INVENTORY_BACKEND="resource_graph" a
+        single paged Resource Graph query is used instead.
+        
+        Returns:
+            ResourceGroupInventory with partial results and failed subscriptions
+        """
+        inventory = ResourceGroupInventory()
+        async for resource_groups in self.iter_resource_groups(inventory):
+            inventory.resource_groups.extend(resource_groups)
+        
+        logger.info(
+            "list_resource_groups_completed",
+            total_count=len(inventory.resource_groups),
+            subscriptions=inventory.subscriptions_total,
+            failed_subscriptions=len(inventory.failed_subscriptions)
+        )
+        return inventory
+    
+    async def iter_resource_groups(
+        self,
+        inventory: Optional[ResourceGroupInventory] = None
+    ) -> AsyncIterator[list[AzureResourceGroup]]:
+        """
+        Yield resource groups in batches as each subscription (or page) arrives
+        
+        Args:
+            inventory: Optional accumulator; subscriptions_total and
+                failed_subscriptions are recorded on it as listing progresses
+        
+        Yields:
+            Lists of AzureResourceGroup models
+        """
+        inventory = inventory if inventory is not None else ResourceGroupInventory()
+        
+        if settings.AZURE_INVENTORY_BACKEND == "resource_graph":
+            async for resource_groups in ResourceGraphService(self.credential).iter_resource_groups(inventory):
+                yield resource_groups
+            return
+        
         try:
-            resource_groups = []
-            
-            # Get all subscriptions
-            subscriptions = self.subscription_client.subscriptions.list()
-            
-            for sub in subscriptions:
-                # Skip disabled subscriptions
-                if sub.state.lower() != 'enabled':
-                    continue
-                
-                try:
-                    # Create resource client for this subscription
-                    sub_resource_client = ResourceManagementClient(
-                        credential=self.credential,
-                        subscription_id=sub.subscription_id
-                    )
-                    
-                    # List resource groups in this subscription
-                    for rg in sub_resource_client.resource_groups.list():
-                        resource_groups.append(
-                            AzureResourceGroup(
-                                id=rg.id,
-                                name=rg.name,
-                                location=rg.location,
-                                tags=rg.tags or {},
-                                provisioning_state=rg.properties.provisioning_state
-                            )
-                        )
-                    
-                    logger.info(
-                        "listed_resource_groups_for_subscription",
-                        subscription_id=sub.subscription_id,
-                        subscription_name=sub.display_name,
-                        count=len([rg for rg in resource_groups if sub.subscription_id in rg.id])
-                    )
-                    
-                except AzureError as e:
-                    logger.warning(
-                        "failed_to_list_resource_groups_for_subscription",
-                        subscription_id=sub.subscription_id,
-                        subscription_name=sub.display_name,
-                        error=str(e)
-                    )
-                    # Continue with other subscriptions even if one fails
-                    continue
-            
-            logger.info("list_resource_groups_completed", total_count=len(resource_groups))
-            return resource_groups
-            
+            subscriptions = await asyncio.to_thread(self._list_enabled_subscriptions)
         except AzureError as e:
             logger.error("list_resource_groups_failed", error=str(e))
-            return []
+            inventory.failed_subscriptions.append(
+                SubscriptionFailure(subscription_id="*", reason="subscriptions_error", error=str(e))
+            )
+            return
+        
+        inventory.subscriptions_total = len(subscriptions)
+        semaphore = asyncio.Semaphore(max(1, settings.AZURE_LIST_CONCURRENCY))
+        tasks = [
+            asyncio.create_task(self._list_subscription_resource_groups(sub, semaphore))
+            for sub in subscriptions
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                resource_groups, failure = await next_done
+                if failure:
+                    inventory.failed_subscriptions.append(failure)
+                if resource_groups:
+                    yield resource_groups
+            inventory.completed = True
+        finally:
+            # Consumer stopped early (e.g. client disconnected mid-stream)
+            for task in tasks:
+                task.cancel()
+    
+    def _list_enabled_subscriptions(self) -> list:
+        """Return enabled subscriptions (blocking SDK call)"""
+        return [
+            sub for sub in self.subscription_client.subscriptions.list()
+            if sub.state.lower() == 'enabled'
+        ]
+    
+    def _resource_client_for(self, subscription_id: str) -> ResourceManagementClient:
+        """Get a resource client for the given subscription"""
+        if subscription_id == settings.AZURE_SUBSCRIPTION_ID:
+            return self.resource_client
+        return self.pool.get_resource_client(subscription_id)
+    
+    def _fetch_resource_groups(self, subscription_id: str) -> list[AzureResourceGroup]:
+        """Drain resource_groups.list() for one subscription (blocking SDK call)"""
+        resource_client = self._resource_client_for(subscription_id)
+        return [
+            AzureResourceGroup(
+                id=rg.id,
+                name=rg.name,
+                location=rg.location,
+                tags=rg.tags or {},
+                provisioning_state=rg.properties.provisioning_state
+            )
+            for rg in resource_client.resource_groups.list()
+        ]
+    
+    async def _list_subscription_resource_groups(
+        self,
+        sub,
+        semaphore: asyncio.Semaphore
+    ) -> tuple[list[AzureResourceGroup], Optional[SubscriptionFailure]]:
+        """
+        List resource groups for one subscription within the fan-out limits
+        
+        Returns:
+            Tuple of (resource_groups, failure); failure is None on success
+        """
+        # The worker thread cannot be interrupted, so the slot is released when the
+        # thread returns rather than on timeout; otherwise timed-out threads would
+        # keep calling ARM beyond AZURE_LIST_CONCURRENCY
+        await semaphore.acquire()
+        fetch = asyncio.get_running_loop().run_in_executor(None, self._fetch_resource_groups, sub.subscription_id)
+        fetch.add_done_callback(lambda future: _release_after_fetch(future, semaphore))
+        try:
+            # On timeout the thread's result is discarded
+            resource_groups = await asyncio.wait_for(
+                asyncio.shield(fetch),
+                timeout=settings.AZURE_LIST_SUBSCRIPTION_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                "list_resource_groups_for_subscription_timed_out",
+                subscription_id=sub.subscription_id,
+                subscription_name=sub.display_name,
+                timeout=settings.AZURE_LIST_SUBSCRIPTION_TIMEOUT
+            )
+            return [], SubscriptionFailure(
+                subscription_id=sub.subscription_id,
+                subscription_name=sub.display_name,
+                reason="timeout"
+            )
+        except Exception as e:
+            # Credential, transport or SDK errors are reported per subscription, not raised
+            logger.warning(
+                "failed_to_list_resource_groups_for_subscription",
+                subscription_id=sub.subscription_id,
+                subscription_name=sub.display_name,
+                error=str(e)
+            )
+            return [], SubscriptionFailure(
+                subscription_id=sub.subscription_id,
+                subscription_name=sub.display_name,
+                reason="error",
+                error=str(e)
+            )
+        
+        logger.info(
+            "listed_resource_groups_for_subscription",
+            subscription_id=sub.subscription_id,
+            subscription_name=sub.display_name,
+            count=len(resource_groups)
+        )
+        return resource_groups, None
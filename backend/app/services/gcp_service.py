@@ -1,13 +1,47 @@
 """
 GCP Service - Handles GCP project creation and management
 """
+import asyncio
 import logging
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List
 from google.cloud import resourcemanager_v3
 from google.api_core import exceptions
-from ..core.config import settings
+from google.api_core.operation import Operation as GoogleOperation
+
+from app.config import get_settings
+from app.models import CloudPlatform, Operation
+from app.services.operation_tracker import OperationFailed, OperationHandle, get_operation_tracker
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def _project_info(project: resourcemanager_v3.Project) -> Dict:
+    """Convert a Project message to the dict returned by GCPService"""
+    return {
+        "project_id": project.project_id,
+        "project_number": project.name.split("/")[1],
+        "display_name": project.display_name,
+        "lifecycle_state": project.state.name,
+        "create_time": project.create_time.isoformat() if project.create_time else None
+    }
+
+
+class GCPOperationHandle(OperationHandle):
+    """Polls a Resource Manager long-running operation"""
+    
+    def __init__(self, operation: GoogleOperation, to_result: Callable[[resourcemanager_v3.Project], Dict]):
+        self.operation = operation
+        self.to_result = to_result
+    
+    async def poll(self) -> Optional[Dict]:
+        # done() makes a single GetOperation call; it does not wait
+        if not await asyncio.to_thread(self.operation.done):
+            return None
+        error = self.operation.exception()
+        if error is not None:
+            raise OperationFailed(str(error)) from error
+        return self.to_result(self.operation.result())
 
 
 class GCPService:
@@ -22,6 +56,48 @@ class GCPService:
             logger.error(f"Failed to initialize GCP service: {str(e)}")
             raise
     
+    async def begin_create_project(
+        self,
+        project_id: str,
+        display_name: str,
+        parent: Optional[str] = None,
+        labels: Optional[Dict[str, str]] = None
+    ) -> Operation:
+        """
+        Start creating a GCP project without waiting for it to finish
+        
+        Args:
+            project_id: Unique project ID
+            display_name: Human-readable project name
+            parent: Parent organization or folder (format: organizations/{org_id} or folders/{folder_id})
+            labels: Project labels/tags
+            
+        Returns:
+            Operation followed by the operation tracker; its result is the project information
+        """
+        logger.info(f"Creating GCP project: {project_id}")
+        
+        # Prepare project request
+        project = resourcemanager_v3.Project(
+            project_id=project_id,
+            display_name=display_name,
+            labels=labels or {}
+        )
+        
+        if parent:
+            project.parent = parent
+        
+        request = resourcemanager_v3.CreateProjectRequest(
+            project=project
+        )
+        operation = await asyncio.to_thread(self.projects_client.create_project, request=request)
+        return get_operation_tracker().track(
+            CloudPlatform.GCP,
+            "create_project",
+            project_id,
+            GCPOperationHandle(operation, _project_info)
+        )
+    
     async def create_project(
         self,
         project_id: str,
@@ -32,6 +108,9 @@ class GCPService:
         """
         Create a new GCP project
         
+        Waits for the project without holding a thread; the operation is
+        polled by the operation tracker.
+        
         Args:
             project_id: Unique project ID
             display_name: Human-readable project name
@@ -42,37 +121,12 @@ class GCPService:
             Dict containing project information
         """
         try:
-            logger.info(f"Creating GCP project: {project_id}")
-            
-            # Prepare project request
-            project = resourcemanager_v3.Project(
-                project_id=project_id,
-                display_name=display_name,
-                labels=labels or {}
-            )
-            
-            if parent:
-                project.parent = parent
-            
-            # Create the project
-            request = resourcemanager_v3.CreateProjectRequest(
-                project=project
-            )
-            
-            operation = self.projects_client.create_project(request=request)
+            operation = await self.begin_create_project(project_id, display_name, parent, labels)
+            project = await get_operation_tracker().result(operation.id)
             
-            # Wait for the operation to complete
-            response = operation.result()
+            logger.info(f"GCP project created successfully: projects/{project['project_number']}")
             
-            logger.info(f"GCP project created successfully: {response.name}")
-            
-            return {
-                "project_id": response.project_id,
-                "project_number": response.name.split("/")[1],
-                "display_name": response.display_name,
-                "lifecycle_state": response.state.name,
-                "create_time": response.create_time.isoformat() if response.create_time else None
-            }
+            return project
             
         except exceptions.AlreadyExists:
             logger.warning(f"Project {project_id} already exists")
@@ -100,13 +154,7 @@ class GCPService:
             )
             project = self.projects_client.get_project(request=request)
             
-            return {
-                "project_id": project.project_id,
-                "project_number": project.name.split("/")[1],
-                "display_name": project.display_name,
-                "lifecycle_state": project.state.name,
-                "create_time": project.create_time.isoformat() if project.create_time else None
-            }
+            return _project_info(project)
         except exceptions.NotFound:
             logger.warning(f"Project {project_id} not found")
             return None
@@ -131,13 +179,7 @@ class GCPService:
             
             projects = []
             for project in self.projects_client.list_projects(request=request):
-                projects.append({
-                    "project_id": project.project_id,
-                    "project_number": project.name.split("/")[1],
-                    "display_name": project.display_name,
-                    "lifecycle_state": project.state.name,
-                    "create_time": project.create_time.isoformat() if project.create_time else None
-                })
+                projects.append(_project_info(project))
             
             logger.info(f"Found {len(projects)} GCP projects")
             return projects
@@ -146,6 +188,27 @@ class GCPService:
             logger.error(f"Error listing GCP projects: {str(e)}")
             raise
     
+    async def begin_delete_project(self, project_id: str) -> Operation:
+        """
+        Start deleting a GCP project without waiting for it to finish
+        
+        Args:
+            project_id: Project ID to delete
+            
+        Returns:
+            Operation followed by the operation tracker
+        """
+        request = resourcemanager_v3.DeleteProjectRequest(
+            name=f"projects/{project_id}"
+        )
+        operation = await asyncio.to_thread(self.projects_client.delete_project, request=request)
+        return get_operation_tracker().track(
+            CloudPlatform.GCP,
+            "delete_project",
+            project_id,
+            GCPOperationHandle(operation, _project_info)
+        )
+    
     async def delete_project(self, project_id: str) -> bool:
         """
         Delete a GCP project (marks for deletion)
@@ -157,11 +220,8 @@ class GCPService:
             True if successful
         """
         try:
-            request = resourcemanager_v3.DeleteProjectRequest(
-                name=f"projects/{project_id}"
-            )
-            operation = self.projects_client.delete_project(request=request)
-            operation.result()  # Wait for completion
+            operation = await self.begin_delete_project(project_id)
+            await get_operation_tracker().result(operation.id)
             
             logger.info(f"GCP project {project_id} marked for deletion")
             return True
@@ -0,0 +1,479 @@
+"""
+GitHub Repository Management Service (async httpx client)
+"""
+import asyncio
+import httpx
+import importlib.util
+import structlog
+from github import BadCredentialsException, GithubException, UnknownObjectException
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from app.config import get_settings
+from app.models import GitHubRepository
+from app.services.github_cache import GitHubObjectCache
+from app.services.github_scheduler import GitHubScheduler, get_github_scheduler
+from app.services.github_service import REPO_PAGE_SIZE
+from app.services.repo_name_index import get_repo_name_index
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+class CachedResponse(NamedTuple):
+    """JSON body of a GET with the validators to revalidate it"""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    data: Dict[str, Any]
+
+
+def _github_exception(response: httpx.Response) -> GithubException:
+    """Build the PyGithub exception for an error response, so callers handle both clients alike"""
+    try:
+        data = response.json()
+    except ValueError:
+        data = {"message": response.text}
+    headers = dict(response.headers)
+    if response.status_code == 401:
+        return BadCredentialsException(response.status_code, data, headers)
+    if response.status_code == 404:
+        return UnknownObjectException(response.status_code, data, headers)
+    return GithubException(response.status_code, data, headers)
+
+
+def _to_repository(data: Dict[str, Any]) -> GitHubRepository:
+    """Convert a repository JSON object to GitHubRepository model"""
+    return GitHubRepository(
+        id=data["id"],
+        name=data["name"],
+        full_name=data["full_name"],
+        html_url=data["html_url"],
+        clone_url=data["clone_url"],
+        created_at=data["created_at"],
+        private=data["private"]
+    )
+
+
+class AsyncGitHubClient:
+    """Process-wide httpx client for the GitHub REST API with the resolved repository owner"""
+    
+    def __init__(
+        self,
+        token: str,
+        org: str,
+        base_url: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        http2: Optional[bool] = None,
+        cache_size: Optional[int] = None
+    ):
+        """
+        Initialize the client
+        
+        Over HTTP/2 concurrent requests share one connection as separate
+        streams; otherwise up to pool_size keep-alive connections are reused.
+        
+        Args:
+            token: GitHub token
+            org: Organization to create repositories in (the token's user if it is not an org)
+            base_url: API root (defaults to settings)
+            pool_size: Maximum pooled connections (defaults to settings)
+            http2: Negotiate HTTP/2 (defaults to settings; HTTP/1.1 is used if the h2 package is missing)
+            cache_size: Maximum responses in the conditional-request cache (defaults to settings)
+        """
+        self.org = org
+        self.pool_size = pool_size or settings.GITHUB_HTTP_POOL_SIZE
+        self.http2 = http2 if http2 is not None else settings.GITHUB_HTTP2
+        if self.http2 and importlib.util.find_spec("h2") is None:
+            # httpx raises at construction without it
+            logger.warning("github_http2_unavailable", reason="h2 package not installed")
+            self.http2 = False
+        self.http = httpx.AsyncClient(
+            base_url=base_url or settings.GITHUB_API_URL,
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+                "User-Agent": settings.APP_NAME
+            },
+            http2=self.http2,
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            timeout=15.0
+        )
+        self.cache = GitHubObjectCache(cache_size or settings.GITHUB_ETAG_CACHE_SIZE)
+        self._owner: Optional[Tuple[str, bool]] = None
+        self._owner_lock = asyncio.Lock()
+        self.requests = 0
+        self.http2_responses = 0
+        self.owner_lookups = 0
+        self.owner_reuses = 0
+        self.auth_failures = 0
+    
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """
+        Send an API request
+        
+        Args:
+            method: HTTP method
+            path: Path below the API root
+            **kwargs: Passed to httpx (json, headers)
+        
+        Returns:
+            Successful or 304 Not Modified response
+        
+        Raises:
+            GithubException: For error responses (BadCredentialsException for 401,
+                UnknownObjectException for 404)
+        """
+        response = await self.http.request(method, path, **kwargs)
+        self.requests += 1
+        self.http2_responses += response.http_version == "HTTP/2"
+        if response.is_success or response.status_code == 304:
+            return response
+        if response.status_code == 401:
+            self.invalidate_owner()
+        raise _github_exception(response)
+    
+    async def owner(self) -> Tuple[str, bool]:
+        """
+        Get the repository owner, looking it up only if none is cached
+        
+        Returns:
+            Tuple of the owner login and whether it is an organization
+        
+        Raises:
+            BadCredentialsException: If the token is rejected (nothing is cached)
+        """
+        async with self._owner_lock:
+            if self._owner is not None:
+                self.owner_reuses += 1
+                return self._owner
+            
+            self.owner_lookups += 1
+            # Try to get as organization first, fallback to user
+            try:
+                await self.request("GET", f"/orgs/{self.org}")
+                self._owner = (self.org, True)
+                logger.info("github_initialized_as_org", org=self.org)
+            except BadCredentialsException:
+                raise
+            except GithubException:
+                # For personal accounts, use authenticated user
+                response = await self.request("GET", "/user")
+                self._owner = (response.json()["login"], False)
+                logger.info("github_initialized_as_user", user=self._owner[0])
+            return self._owner
+    
+    def invalidate_owner(self):
+        """Drop the cached owner (and responses read through it) so the next call looks it up again"""
+        self._owner = None
+        self.auth_failures += 1
+        self.cache.clear()
+        logger.warning("github_owner_invalidated", org=self.org)
+    
+    def stats(self) -> dict:
+        """Return request and owner reuse counters"""
+        return {
+            "pool_size": self.pool_size,
+            "http2": self.http2,
+            "requests": self.requests,
+            "http2_responses": self.http2_responses,
+            "owner_cached": self._owner is not None,
+            "owner_is_org": self._owner[1] if self._owner else False,
+            "owner_lookups": self.owner_lookups,
+            "owner_reuses": self.owner_reuses,
+            "auth_failures": self.auth_failures
+        }
+    
+    async def close(self):
+        """Close pooled connections"""
+        await self.http.aclose()
+
+
+_async_github_client: Optional[AsyncGitHubClient] = None
+
+
+def get_async_github_client() -> AsyncGitHubClient:
+    """Get the process-wide async GitHub client, creating it on first use"""
+    global _async_github_client
+    if _async_github_client is None:
+        _async_github_client = AsyncGitHubClient(settings.GITHUB_TOKEN, settings.GITHUB_ORG)
+        logger.info(
+            "github_async_client_created",
+            pool_size=_async_github_client.pool_size,
+            http2=_async_github_client.http2
+        )
+    return _async_github_client
+
+
+async def close_async_github_client():
+    """Close the process-wide async GitHub client"""
+    global _async_github_client
+    if _async_github_client is not None:
+        logger.info("github_async_client_closing", **_async_github_client.stats())
+        await _async_github_client.close()
+        _async_github_client = None
+
+
+class AsyncGitHubService:
+    """Service for GitHub repository management on an async HTTP client"""
+    
+    def __init__(
+        self,
+        client: Optional[AsyncGitHubClient] = None,
+        scheduler: Optional[GitHubScheduler] = None
+    ):
+        """
+        Initialize async GitHub service
+        
+        Method signatures match GitHubService, but requests are awaited on
+        the event loop, so many repository creations can overlap in one
+        worker. Errors are raised as PyGithub exceptions.
+        
+        Args:
+            client: Shared client (defaults to the process-wide one)
+            scheduler: Rate-limit scheduler requests go through (defaults to the process-wide one)
+        """
+        self.client = client or get_async_github_client()
+        self.scheduler = scheduler or get_github_scheduler()
+    
+    async def _send(self, method: str, path: str, write: bool = False, **kwargs) -> httpx.Response:
+        """Send a request through the rate-limit scheduler"""
+        async def send() -> Tuple[httpx.Response, Dict[str, str]]:
+            response = await self.client.request(method, path, **kwargs)
+            return response, dict(response.headers)
+        
+        return await self.scheduler.run(send, write=write)
+    
+    async def _cached_get(self, key: str, path: str) -> Dict[str, Any]:
+        """
+        GET a JSON object, revalidating the shared cached copy with a conditional request
+        
+        Args:
+            key: Cache key
+            path: Path below the API root
+        
+        Returns:
+            Response JSON
+        
+        Raises:
+            GithubException: If the object can not be read (the cached copy is dropped)
+        """
+        cache = self.client.cache
+        cached = cache.get(key)
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        
+        try:
+            response = await self._send("GET", path, headers=headers)
+        except GithubException:
+            cache.discard(key)
+            raise
+        
+        if cached is not None:
+            cache.revalidated(response.status_code != 304)
+            if response.status_code == 304:
+                return cached.data
+        data = response.json()
+        cache.put(key, CachedResponse(response.headers.get("ETag"), response.headers.get("Last-Modified"), data))
+        return data
+    
+    async def create_repository(
+        self,
+        repo_name: str,
+        description: Optional[str] = None,
+        private: Optional[bool] = None,
+        auto_init: Optional[bool] = None
+    ) -> GitHubRepository:
+        """
+        Create a GitHub repository
+        
+        Args:
+            repo_name: Repository name
+            description: Repository description
+            private: Whether the repo is private
+            auto_init: Initialize with README
+        
+        Returns:
+            GitHubRepository model
+        
+        Raises:
+            GithubException: If creation fails (rate limits are waited out, not raised)
+        """
+        try:
+            private = private if private is not None else settings.GITHUB_PRIVATE
+            auto_init = auto_init if auto_init is not None else settings.GITHUB_AUTO_INIT
+            owner, is_org = await self.client.owner()
+            
+            logger.info(
+                "creating_github_repository",
+                name=repo_name,
+                owner=owner,
+                private=private
+            )
+            
+            body = {
+                "name": repo_name,
+                "description": description or f"Repository for {repo_name}",
+                "private": private,
+                "auto_init": auto_init
+            }
+            if auto_init:
+                body["gitignore_template"] = "Python"
+            path = f"/orgs/{owner}/repos" if is_org else "/user/repos"
+            response = await self._send("POST", path, write=True, json=body)
+            repo = _to_repository(response.json())
+            get_repo_name_index().add(repo.name)
+            
+            logger.info(
+                "github_repository_created",
+                id=repo.id,
+                name=repo.name,
+                url=repo.html_url
+            )
+            return repo
+            
+        except GithubException as e:
+            if e.status == 422 and "already exists" in str(e.data):
+                get_repo_name_index().add(repo_name)
+            logger.error(
+                "github_repository_creation_failed",
+                name=repo_name,
+                error=str(e)
+            )
+            raise
+    
+    async def get_repository(self, repo_name: str) -> Optional[GitHubRepository]:
+        """
+        Get an existing repository
+        
+        Args:
+            repo_name: Repository name
+        
+        Returns:
+            GitHubRepository model or None if not found
+        """
+        try:
+            owner, _ = await self.client.owner()
+            data = await self._cached_get(f"repo:{repo_name.lower()}", f"/repos/{owner}/{repo_name}")
+            return _to_repository(data)
+        except GithubException as e:
+            logger.warning(
+                "github_repository_not_found",
+                name=repo_name,
+                error=str(e)
+            )
+            return None
+    
+    async def delete_repository(self, repo_name: str) -> bool:
+        """
+        Delete a repository
+        
+        Args:
+            repo_name: Repository name
+        
+        Returns:
+            True if deleted successfully
+        """
+        try:
+            logger.info("deleting_github_repository", name=repo_name)
+            
+            owner, _ = await self.client.owner()
+            await self._send("DELETE", f"/repos/{owner}/{repo_name}", write=True)
+            self.client.cache.discard(f"repo:{repo_name.lower()}")
+            get_repo_name_index().remove(repo_name)
+            
+            logger.info("github_repository_deleted", name=repo_name)
+            return True
+            
+        except GithubException as e:
+            logger.error(
+                "github_repository_deletion_failed",
+                name=repo_name,
+                error=str(e)
+            )
+            return False
+    
+    async def list_repository_names(self, created_after: Optional[datetime] = None) -> List[str]:
+        """
+        List the names of the owner's repositories, newest first
+        
+        Args:
+            created_after: Stop at the first repository created before this (timezone-aware);
+                list every repository if omitted
+        
+        Returns:
+            Repository names
+        
+        Raises:
+            GithubException: If listing fails
+        """
+        owner, is_org = await self.client.owner()
+        path = f"/orgs/{owner}/repos" if is_org else "/user/repos"
+        params = {
+            "type": "all" if is_org else "owner",
+            "sort": "created",
+            "direction": "desc",
+            "per_page": REPO_PAGE_SIZE
+        }
+        
+        names = []
+        page = 1
+        while True:
+            response = await self._send("GET", path, params={**params, "page": page})
+            batch = response.json()
+            for repo in batch:
+                created_at = datetime.fromisoformat(repo["created_at"].replace("Z", "+00:00"))
+                if created_after is not None and created_at < created_after:
+                    return names
+                names.append(repo["name"])
+            if len(batch) < REPO_PAGE_SIZE:
+                return names
+            page += 1
+    
+    async def add_collaborator(
+        self,
+        repo_name: str,
+        username: str,
+        permission: str = "push"
+    ) -> bool:
+        """
+        Add a collaborator to a repository
+        
+        Args:
+            repo_name: Repository name
+            username: GitHub username
+            permission: Permission level (pull, push, admin)
+        
+        Returns:
+            True if added successfully
+        """
+        try:
+            owner, _ = await self.client.owner()
+            # GitHub answers 404 for an unknown repository or user, so neither is fetched first
+            await self._send(
+                "PUT",
+                f"/repos/{owner}/{repo_name}/collaborators/{username}",
+                write=True,
+                json={"permission": permission}
+            )
+            
+            logger.info(
+                "collaborator_added",
+                repo=repo_name,
+                user=username,
+                permission=permission
+            )
+            return True
+            
+        except GithubException as e:
+            logger.error(
+                "add_collaborator_failed",
+                repo=repo_name,
+                user=username,
+                error=str(e)
+            )
+            return False
@@ -0,0 +1,91 @@
+"""
+GitHub Conditional-Request Cache
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class GitHubObjectCache:
+    """Bounded LRU of fetched GitHub objects or responses, revalidated with conditional GETs"""
+    
+    def __init__(self, max_entries: int):
+        """
+        Initialize the cache
+        
+        Entries keep the ETag and Last-Modified of the response they were
+        built from (PyGithub objects hold them; the async client stores them
+        next to the JSON). Revalidating sends If-None-Match /
+        If-Modified-Since; GitHub answers 304 without counting the request
+        against the rate limit, and the entry is reused as is.
+        
+        Args:
+            max_entries: Maximum cached objects; the least recently used is evicted
+        """
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        # Shared by all services, which call it from the event loop and worker threads
+        self._lock = threading.Lock()
+        self.misses = 0
+        self.not_modified = 0
+        self.modified = 0
+        self.evictions = 0
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached object to revalidate
+        
+        Args:
+            key: Cache key (e.g. "repo:name")
+        
+        Returns:
+            Cached object, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry
+    
+    def put(self, key: str, entry: Any):
+        """Cache an object fetched after a miss"""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def revalidated(self, changed: bool):
+        """Count a conditional GET answered with 200 (changed) or 304"""
+        with self._lock:
+            if changed:
+                self.modified += 1
+            else:
+                self.not_modified += 1
+    
+    def discard(self, key: str):
+        """Drop an object that was deleted or could not be revalidated"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        """Drop every object (e.g. after the owner changed)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> dict:
+        """Return size and revalidation counters"""
+        with self._lock:
+            lookups = self.misses + self.not_modified + self.modified
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "modified": self.modified,
+                "evictions": self.evictions,
+                "not_modified_ratio": round(self.not_modified / lookups, 3) if lookups else 0.0
+            }
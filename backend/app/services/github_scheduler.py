@@ -0,0 +1,243 @@
+"""
+GitHub Rate-Limit-Aware Request Scheduler
+"""
+import asyncio
+import time
+import structlog
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from github import GithubException
+from github.GithubObject import GithubObject
+
+from app.config import get_settings
+from app.utils.rate_limit import TokenBucket
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+def _lower_headers(headers: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Header names lower-cased (PyGithub passes them through as received)"""
+    return {str(name).lower(): str(value) for name, value in (headers or {}).items()}
+
+
+class GitHubScheduler:
+    """Paces GitHub calls within GitHub's primary and secondary rate limits"""
+    
+    def __init__(
+        self,
+        max_concurrent: int,
+        writes_per_minute: Optional[float] = None,
+        write_burst: Optional[int] = None,
+        reserve: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        max_wait: Optional[float] = None
+    ):
+        """
+        Initialize the scheduler
+        
+        Content-creating calls take a token from a bucket refilled at
+        writes_per_minute, which keeps bulk provisioning under the secondary
+        limit. When X-RateLimit-Remaining drops to the reserve, calls are held
+        until X-RateLimit-Reset; a rate-limited response (Retry-After, or an
+        exhausted budget) holds every call for the indicated time and the
+        call is retried instead of failing.
+        
+        Args:
+            max_concurrent: Calls running at once (the HTTP pool size, so connections are reused)
+            writes_per_minute: Content-creating calls per minute (defaults to settings)
+            write_burst: Content-creating calls allowed back to back (defaults to settings)
+            reserve: Remaining primary budget at which calls wait for the reset (defaults to settings)
+            max_retries: Retries of a rate-limited call (defaults to settings)
+            max_wait: Longest a call is delayed; rate limits lasting longer fail the call (defaults to settings)
+        """
+        writes_per_minute = writes_per_minute or settings.GITHUB_WRITES_PER_MINUTE
+        self.writes = TokenBucket(writes_per_minute / 60, write_burst or settings.GITHUB_WRITE_BURST)
+        self.max_concurrent = max_concurrent
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self.reserve = reserve if reserve is not None else settings.GITHUB_RATE_LIMIT_RESERVE
+        self.max_retries = max_retries if max_retries is not None else settings.GITHUB_RATE_LIMIT_MAX_RETRIES
+        self.max_wait = max_wait or settings.GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS
+        
+        # Primary budget as last reported by GitHub; reset_at is epoch seconds
+        self.remaining: Optional[int] = None
+        self.limit: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self._blocked_until = 0.0  # Epoch seconds; set by rate-limited responses
+        
+        self.queued = 0
+        self.running = 0
+        self.calls = 0
+        self.write_calls = 0
+        self.delayed = 0
+        self.delay_seconds = 0.0
+        self.rate_limited = 0
+    
+    async def call(self, func: Callable[..., Any], *args, write: bool = False, **kwargs) -> Any:
+        """
+        Run a blocking PyGithub call in a worker thread once the rate limits allow it
+        
+        Args:
+            func: PyGithub method to call
+            *args: Positional arguments for func
+            write: Whether the call creates or changes content (POST/PATCH/PUT/DELETE)
+            **kwargs: Keyword arguments for func
+        
+        Returns:
+            The call's return value
+        
+        Raises:
+            GithubException: If the call fails, or is still rate limited after max_retries
+                or for longer than max_wait
+        """
+        return await self.run(lambda: asyncio.to_thread(self._run, func, args, kwargs), write=write)
+    
+    async def run(
+        self,
+        send: Callable[[], Awaitable[Tuple[Any, Optional[Dict[str, Any]]]]],
+        write: bool = False
+    ) -> Any:
+        """
+        Await a GitHub request once the rate limits allow it
+        
+        Args:
+            send: Coroutine function sending the request and returning its result and response headers
+            write: Whether the request creates or changes content (POST/PATCH/PUT/DELETE)
+        
+        Returns:
+            The request's result
+        
+        Raises:
+            GithubException: If the request fails, or is still rate limited after max_retries
+                or for longer than max_wait
+        """
+        self.calls += 1
+        self.write_calls += write
+        retries = 0
+        while True:
+            self.queued += 1
+            try:
+                await self._wait(write)
+                await self._slots.acquire()
+            finally:
+                self.queued -= 1
+            
+            self.running += 1
+            try:
+                result, headers = await send()
+                self._observe(headers)
+                return result
+            except GithubException as e:
+                self._observe(e.headers)
+                delay = self._rate_limit_delay(e)
+                if delay is None or retries >= self.max_retries or delay > self.max_wait:
+                    raise
+                retries += 1
+                self.rate_limited += 1
+                self._blocked_until = max(self._blocked_until, time.time() + delay)
+                logger.warning(
+                    "github_rate_limited",
+                    status=e.status,
+                    retry_in_seconds=round(delay, 1),
+                    retry=retries
+                )
+            finally:
+                self.running -= 1
+                self._slots.release()
+    
+    def stats(self) -> dict:
+        """Return remaining budget, queue depth and delay counters"""
+        now = time.time()
+        return {
+            "remaining": self.remaining,
+            "limit": self.limit,
+            "reset_in_seconds": round(max(self.reset_at - now, 0.0), 1) if self.reset_at else None,
+            "blocked_for_seconds": round(max(self._blocked_until - now, 0.0), 1),
+            "write_tokens": round(self.writes.tokens, 2),
+            "queue_depth": self.queued,
+            "running": self.running,
+            "max_concurrent": self.max_concurrent,
+            "calls": self.calls,
+            "write_calls": self.write_calls,
+            "delayed": self.delayed,
+            "delay_seconds": round(self.delay_seconds, 2),
+            "rate_limited": self.rate_limited
+        }
+    
+    @staticmethod
+    def _run(func: Callable[..., Any], args: tuple, kwargs: dict) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        """Call func in a worker thread and return its result with the response headers"""
+        result = func(*args, **kwargs)
+        # Objects returned by these calls are complete, so this makes no request
+        headers = result.raw_headers if isinstance(result, GithubObject) else None
+        return result, headers
+    
+    async def _wait(self, write: bool):
+        """Wait until the primary budget and, for writes, the write bucket allow a call"""
+        waited = 0.0
+        while waited < self.max_wait:
+            delay = self._delay()
+            if delay <= 0:
+                break
+            delay = min(delay, self.max_wait - waited)
+            await asyncio.sleep(delay)
+            waited += delay
+        if write:
+            waited += await self.writes.acquire()
+        if waited > 0:
+            self.delayed += 1
+            self.delay_seconds += waited
+    
+    def _delay(self) -> float:
+        """Seconds until calls may be sent"""
+        now = time.time()
+        delay = self._blocked_until - now
+        if self.remaining is not None and self.remaining <= self.reserve and self.reset_at:
+            if self.reset_at > now:
+                delay = max(delay, self.reset_at - now)
+            else:
+                # The window has reset since the last response
+                self.remaining = self.limit
+        return delay
+    
+    def _observe(self, headers: Optional[Dict[str, Any]]):
+        """Record the primary budget reported in response headers"""
+        headers = _lower_headers(headers)
+        try:
+            if "x-ratelimit-remaining" in headers:
+                self.remaining = int(float(headers["x-ratelimit-remaining"]))
+            if "x-ratelimit-limit" in headers:
+                self.limit = int(float(headers["x-ratelimit-limit"]))
+            if "x-ratelimit-reset" in headers:
+                self.reset_at = float(headers["x-ratelimit-reset"])
+        except ValueError:
+            logger.warning("github_rate_limit_headers_invalid", headers=headers)
+    
+    def _rate_limit_delay(self, error: GithubException) -> Optional[float]:
+        """Seconds to wait before retrying a rate-limited call, or None if it was not rate limited"""
+        if error.status not in (403, 429):
+            return None
+        headers = _lower_headers(error.headers)
+        if "retry-after" in headers:
+            try:
+                return float(headers["retry-after"])
+            except ValueError:
+                return float(settings.GITHUB_SECONDARY_LIMIT_WAIT_SECONDS)
+        if headers.get("x-ratelimit-remaining") == "0" and self.reset_at:
+            return max(self.reset_at - time.time(), 0.0) + 1
+        message = error.data.get("message", "") if isinstance(error.data, dict) else ""
+        if "secondary rate limit" in str(message).lower():
+            # GitHub asks for at least a minute when no Retry-After is given
+            return float(settings.GITHUB_SECONDARY_LIMIT_WAIT_SECONDS)
+        return None
+
+
+_github_scheduler: Optional[GitHubScheduler] = None
+
+
+def get_github_scheduler() -> GitHubScheduler:
+    """Get the process-wide GitHub scheduler, creating it on first use"""
+    global _github_scheduler
+    if _github_scheduler is None:
+        _github_scheduler = GitHubScheduler(max_concurrent=settings.GITHUB_HTTP_POOL_SIZE)
+    return _github_scheduler
@@ -1,34 +1,238 @@
 """
 GitHub Repository Management Service
 """
-from github import Github, GithubException
+from github import Github, GithubException, BadCredentialsException
+from urllib3.util.retry import Retry
+from github.AuthenticatedUser import AuthenticatedUser
+from github.Organization import Organization
+import threading
 import structlog
-from typing import Optional
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple, Union
 
 from app.config import get_settings
 from app.models import GitHubRepository
+from app.services.github_cache import GitHubObjectCache
+from app.services.github_scheduler import GitHubScheduler, get_github_scheduler
+from app.services.repo_name_index import get_repo_name_index
 
 logger = structlog.get_logger()
 settings = get_settings()
 
 
+Owner = Union[Organization, AuthenticatedUser]
+
+# Repositories per page when listing (GitHub's maximum)
+REPO_PAGE_SIZE = 100
+
+
+class GitHubConnection:
+    """Process-wide GitHub client with a pooled HTTP session and the resolved repository owner"""
+    
+    def __init__(
+        self,
+        token: str,
+        org: str,
+        pool_size: Optional[int] = None,
+        cache_size: Optional[int] = None
+    ):
+        """
+        Initialize the connection
+        
+        PyGithub keeps one requests session per client, so sharing the client
+        reuses its keep-alive connections and token across services. The
+        owner is looked up on first use and kept until an auth error.
+        
+        PyGithub's own throttling and rate-limit retries sleep in the calling
+        thread; they are turned off because GitHubScheduler paces calls and
+        waits out rate limits without holding a thread. Idempotent requests
+        are still retried on 5xx responses.
+        
+        Args:
+            token: GitHub token
+            org: Organization to create repositories in (the token's user if it is not an org)
+            pool_size: Maximum pooled connections (defaults to settings)
+            cache_size: Maximum objects in the conditional-request cache (defaults to settings)
+        """
+        self.org = org
+        self.pool_size = pool_size or settings.GITHUB_HTTP_POOL_SIZE
+        self.client = Github(
+            token,
+            base_url=settings.GITHUB_API_URL,
+            pool_size=self.pool_size,
+            per_page=REPO_PAGE_SIZE,
+            retry=Retry(total=3, backoff_factor=0.5, status_forcelist=list(range(500, 600))),
+            seconds_between_requests=None,
+            seconds_between_writes=None
+        )
+        self.cache = GitHubObjectCache(cache_size or settings.GITHUB_ETAG_CACHE_SIZE)
+        self._owner: Optional[Owner] = None
+        self._is_org = False
+        # Services are created from the event loop and from worker threads
+        self._lock = threading.Lock()
+        self.services_created = 0
+        self.owner_lookups = 0
+        self.owner_reuses = 0
+        self.auth_failures = 0
+    
+    def service_created(self):
+        """Count a service reusing the shared client and token"""
+        with self._lock:
+            self.services_created += 1
+    
+    def resolve_owner(self) -> Tuple[Owner, bool]:
+        """
+        Get the repository owner, looking it up only if none is cached
+        
+        Returns:
+            Tuple of the owner and whether it is an organization
+        
+        Raises:
+            BadCredentialsException: If the token is rejected (nothing is cached)
+        """
+        with self._lock:
+            if self._owner is not None:
+                self.owner_reuses += 1
+                return self._owner, self._is_org
+            
+            self.owner_lookups += 1
+            # Try to get as organization first, fallback to user
+            try:
+                owner = self.client.get_organization(self.org)
+                is_org = True
+                logger.info("github_initialized_as_org", org=self.org)
+            except BadCredentialsException:
+                self.auth_failures += 1
+                raise
+            except GithubException:
+                # For personal accounts, use authenticated user
+                try:
+                    owner = self.client.get_user()
+                    logger.info("github_initialized_as_user", user=owner.login)
+                except BadCredentialsException:
+                    self.auth_failures += 1
+                    raise
+                is_org = False
+            
+            self._owner, self._is_org = owner, is_org
+            return owner, is_org
+    
+    def invalidate_owner(self):
+        """Drop the cached owner (and objects read through it) so the next service looks it up again"""
+        with self._lock:
+            self._owner = None
+            self.auth_failures += 1
+        self.cache.clear()
+        logger.warning("github_owner_invalidated", org=self.org)
+    
+    def stats(self) -> dict:
+        """Return client and owner reuse counters"""
+        with self._lock:
+            return {
+                "pool_size": self.pool_size,
+                "services_created": self.services_created,
+                "client_reuses": max(self.services_created - 1, 0),
+                "owner_cached": self._owner is not None,
+                "owner_is_org": self._is_org,
+                "owner_lookups": self.owner_lookups,
+                "owner_reuses": self.owner_reuses,
+                "auth_failures": self.auth_failures
+            }
+    
+    def close(self):
+        """Close pooled connections"""
+        self.client.close()
+
+
+_github_connection: Optional[GitHubConnection] = None
+
+
+def get_github_connection() -> GitHubConnection:
+    """Get the process-wide GitHub connection, creating it on first use"""
+    global _github_connection
+    if _github_connection is None:
+        _github_connection = GitHubConnection(settings.GITHUB_TOKEN, settings.GITHUB_ORG)
+        logger.info("github_connection_created", pool_size=_github_connection.pool_size)
+    return _github_connection
+
+
+def close_github_connection():
+    """Close the process-wide GitHub connection"""
+    global _github_connection
+    if _github_connection is not None:
+        logger.info("github_connection_closing", **_github_connection.stats())
+        _github_connection.close()
+        _github_connection = None
+
+
+def get_github_service():
+    """
+    Get a GitHub service bound to the process-wide client
+    
+    Returns AsyncGitHubService when GITHUB_CLIENT_MODE is "async", otherwise
+    GitHubService. Both expose the same methods.
+    """
+    if settings.GITHUB_CLIENT_MODE == "async":
+        from app.services.github_async_service import AsyncGitHubService
+        return AsyncGitHubService()
+    return GitHubService()
+
+
 class GitHubService:
     """Service for GitHub repository management"""
     
-    def __init__(self):
-        """Initialize GitHub service with token"""
-        self.client = Github(settings.GITHUB_TOKEN)
+    def __init__(
+        self,
+        connection: Optional[GitHubConnection] = None,
+        scheduler: Optional[GitHubScheduler] = None
+    ):
+        """
+        Initialize GitHub service on the shared connection
+        
+        Args:
+            connection: Connection to use (defaults to the process-wide one)
+            scheduler: Rate-limit scheduler API calls go through (defaults to the process-wide one)
+        """
+        self.connection = connection or get_github_connection()
+        self.scheduler = scheduler or get_github_scheduler()
+        self.connection.service_created()
+        self.client = self.connection.client
+        self.owner, self.is_org = self.connection.resolve_owner()
+    
+    async def _cached_get(self, key: str, fetch: Callable[..., Any], *args) -> Any:
+        """
+        Fetch an object, or revalidate the shared cached copy with a conditional GET
+        
+        Args:
+            key: Cache key
+            fetch: PyGithub getter called on a miss
+            *args: Arguments for fetch
+        
+        Returns:
+            The fetched or revalidated object
+        
+        Raises:
+            GithubException: If the object can not be read (the cached copy is dropped)
+        """
+        cache = self.connection.cache
+        cached = cache.get(key)
+        if cached is None:
+            entry = await self.scheduler.call(fetch, *args)
+            cache.put(key, entry)
+            return entry
         
-        # Try to get as organization first, fallback to user
         try:
-            self.owner = self.client.get_organization(settings.GITHUB_ORG)
-            self.is_org = True
-            logger.info("github_initialized_as_org", org=settings.GITHUB_ORG)
+            changed = await self.scheduler.call(cached.update)
         except GithubException:
-            # For personal accounts, use authenticated user
-            self.owner = self.client.get_user()
-            self.is_org = False
-            logger.info("github_initialized_as_user", user=self.owner.login)
+            cache.discard(key)
+            raise
+        cache.revalidated(changed)
+        return cached
+    
+    def _check_auth_error(self, error: GithubException):
+        """Forget the cached owner if the token was rejected"""
+        if isinstance(error, BadCredentialsException) or error.status == 401:
+            self.connection.invalidate_owner()
     
     async def create_repository(
         self,
@@ -50,7 +254,7 @@ class GitHubService:
             GitHubRepository model
             
         Raises:
-            GithubException: If creation fails
+            GithubException: If creation fails (rate limits are waited out, not raised)
         """
         try:
             private = private if private is not None else settings.GITHUB_PRIVATE
@@ -63,15 +267,24 @@ class GitHubService:
                 private=private
             )
             
+            # PyGithub rejects None for optional arguments; leave them out instead
+            options = {"gitignore_template": "Python"} if auto_init else {}
+            
             # Create repository (works for both org and user)
-            repo = self.owner.create_repo(
+            repo = await self.scheduler.call(
+                self.owner.create_repo,
+                write=True,
                 name=repo_name,
                 description=description or f"Repository for {repo_name}",
                 private=private,
                 auto_init=auto_init,
-                gitignore_template="Python" if auto_init else None
+                **options
             )
             
+            # Later reads of the new repository start with a conditional GET
+            self.connection.cache.put(f"repo:{repo_name.lower()}", repo)
+            get_repo_name_index().add(repo.name)
+            
             logger.info(
                 "github_repository_created",
                 id=repo.id,
@@ -90,6 +303,9 @@ class GitHubService:
             )
             
         except GithubException as e:
+            self._check_auth_error(e)
+            if e.status == 422 and "already exists" in str(e.data):
+                get_repo_name_index().add(repo_name)
             logger.error(
                 "github_repository_creation_failed",
                 name=repo_name,
@@ -108,7 +324,7 @@ class GitHubService:
             GitHubRepository model or None if not found
         """
         try:
-            repo = self.owner.get_repo(repo_name)
+            repo = await self._cached_get(f"repo:{repo_name.lower()}", self.owner.get_repo, repo_name)
             
             return GitHubRepository(
                 id=repo.id,
@@ -120,6 +336,7 @@ class GitHubService:
                 private=repo.private
             )
         except GithubException as e:
+            self._check_auth_error(e)
             logger.warning(
                 "github_repository_not_found",
                 name=repo_name,
@@ -140,13 +357,16 @@ class GitHubService:
         try:
             logger.info("deleting_github_repository", name=repo_name)
             
-            repo = self.owner.get_repo(repo_name)
-            repo.delete()
+            repo = await self._cached_get(f"repo:{repo_name.lower()}", self.owner.get_repo, repo_name)
+            await self.scheduler.call(repo.delete, write=True)
+            self.connection.cache.discard(f"repo:{repo_name.lower()}")
+            get_repo_name_index().remove(repo_name)
             
             logger.info("github_repository_deleted", name=repo_name)
             return True
             
         except GithubException as e:
+            self._check_auth_error(e)
             logger.error(
                 "github_repository_deletion_failed",
                 name=repo_name,
@@ -154,6 +374,37 @@ class GitHubService:
             )
             return False
     
+    async def list_repository_names(self, created_after: Optional[datetime] = None) -> List[str]:
+        """
+        List the names of the owner's repositories, newest first
+        
+        Args:
+            created_after: Stop at the first repository created before this (timezone-aware);
+                list every repository if omitted
+        
+        Returns:
+            Repository names
+        
+        Raises:
+            GithubException: If listing fails
+        """
+        if self.is_org:
+            repos = self.owner.get_repos(type="all", sort="created", direction="desc")
+        else:
+            repos = self.owner.get_repos(type="owner", sort="created", direction="desc")
+        
+        names = []
+        page = 0
+        while True:
+            batch = await self.scheduler.call(repos.get_page, page)
+            for repo in batch:
+                if created_after is not None and repo.created_at < created_after:
+                    return names
+                names.append(repo.name)
+            if len(batch) < REPO_PAGE_SIZE:
+                return names
+            page += 1
+    
     async def add_collaborator(
         self,
         repo_name: str,
@@ -172,10 +423,10 @@ class GitHubService:
             True if added successfully
         """
         try:
-            repo = self.owner.get_repo(repo_name)
-            user = self.client.get_user(username)
+            repo = await self._cached_get(f"repo:{repo_name.lower()}", self.owner.get_repo, repo_name)
+            user = await self._cached_get(f"user:{username.lower()}", self.client.get_user, username)
             
-            repo.add_to_collaborators(user, permission=permission)
+            await self.scheduler.call(repo.add_to_collaborators, user, write=True, permission=permission)
             
             logger.info(
                 "collaborator_added",
@@ -186,6 +437,7 @@ class GitHubService:
             return True
             
         except GithubException as e:
+            self._check_auth_error(e)
             logger.error(
                 "add_collaborator_failed",
                 repo=repo_name,
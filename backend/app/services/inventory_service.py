@@ -0,0 +1,562 @@
+"""
+Resource Inventory Service
+"""
+import structlog
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable, List, Optional, Tuple
+
+from app.config import get_settings
+from app.models import ResourceGroupInventory, ResourceStatus
+from app.services.aws_inventory import get_aws_account_inventory
+from app.services.azure_service import get_azure_service
+from app.services.resource_store import get_resource_store
+from app.services.sharepoint_service import (
+    CLOUD_PLATFORMS,
+    RESOURCE_TYPES,
+    STATUSES,
+    SharePointService,
+    default_resource_type,
+    item_date,
+    item_filter
+)
+from app.services.tag_index import get_tag_index
+from app.utils.cache import SWRCache, CacheResult
+from app.utils.dates import to_naive_utc, parse_datetime
+from app.utils.pagination import encode_cursor, decode_cursor, parse_sort, InvalidCursorError
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+SORTABLE_FIELDS = {
+    "date_of_creation",
+    "user_name",
+    "project_name",
+    "resource_group_name",
+    "status",
+    "cloud_platform",
+    "location"
+}
+DEFAULT_SORT = "-date_of_creation"
+
+
+@dataclass
+class InventoryFilter:
+    """Row filters for /api/resources"""
+    user_name: Optional[str] = None
+    project_name: Optional[str] = None
+    status: Optional[str] = None
+    cloud_platform: Optional[str] = None
+    location: Optional[str] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    
+    def __post_init__(self):
+        """Normalize filter values once per request"""
+        self.user_name = self.user_name.lower() if self.user_name else None
+        self.project_name = self.project_name.lower() if self.project_name else None
+        self.status = self.status.lower() if self.status else None
+        self.cloud_platform = self.cloud_platform.lower() if self.cloud_platform else None
+        self.location = self.location.lower() if self.location else None
+        self.created_after = to_naive_utc(self.created_after) if self.created_after else None
+        self.created_before = to_naive_utc(self.created_before) if self.created_before else None
+    
+    @property
+    def active(self) -> bool:
+        """True if any filter is set"""
+        return any(value is not None for value in vars(self).values())
+    
+    def matches(self, row: dict, created_at: Optional[datetime]) -> bool:
+        """
+        Check a row against the filters
+        
+        user_name and project_name match case-insensitive substrings; status,
+        cloud_platform and location match case-insensitively; the date range
+        is inclusive.
+        
+        Args:
+            row: Inventory row
+            created_at: Pre-parsed date_of_creation of the row
+        
+        Returns:
+            True if the row passes every filter
+        """
+        if self.user_name and self.user_name not in (row.get("user_name") or "").lower():
+            return False
+        if self.project_name and self.project_name not in (row.get("project_name") or "").lower():
+            return False
+        if self.status and (row.get("status") or "").lower() != self.status:
+            return False
+        if self.cloud_platform and (row.get("cloud_platform") or "").lower() != self.cloud_platform:
+            return False
+        if self.location and (row.get("location") or "").lower() != self.location:
+            return False
+        if self.created_after and (created_at is None or created_at < self.created_after):
+            return False
+        if self.created_before and (created_at is None or created_at > self.created_before):
+            return False
+        return True
+    
+    def matches_row(self, row: dict) -> bool:
+        """Check a row whose date_of_creation has not been parsed yet"""
+        created_at = parse_datetime(row.get("date_of_creation")) if self.created_after or self.created_before else None
+        return self.matches(row, created_at)
+
+
+@dataclass
+class InventorySnapshot:
+    """Inventory rows for /api/resources plus response metadata"""
+    source: str  # "azure" or "sharepoint"
+    rows: List[dict] = field(default_factory=list)
+    headers: dict = field(default_factory=dict)
+    # Snapshots are immutable once cached, so these are built lazily and shared by every page
+    _created_at: Optional[List[Optional[datetime]]] = field(default=None, repr=False)
+    _sort_orders: dict = field(default_factory=dict, repr=False)
+    
+    @property
+    def created_at(self) -> List[Optional[datetime]]:
+        """Parsed date_of_creation per row"""
+        if self._created_at is None:
+            self._created_at = [parse_datetime(row.get("date_of_creation")) for row in self.rows]
+        return self._created_at
+    
+    def _sort_order(self, field_name: str, descending: bool) -> tuple[list, list]:
+        """
+        Get the ascending sort order for a field
+        
+        Descending queries walk the same order backwards, so their keys
+        place missing values first.
+        
+        Returns:
+            Tuple of (sort keys, row positions) in ascending key order
+        """
+        if (field_name, descending) not in self._sort_orders:
+            keyed = sorted(
+                (self._sort_key(row, field_name, descending), position)
+                for position, row in enumerate(self.rows)
+            )
+            self._sort_orders[field_name, descending] = (
+                [key for key, _ in keyed],
+                [position for _, position in keyed]
+            )
+        return self._sort_orders[field_name, descending]
+    
+    @staticmethod
+    def _sort_key(row: dict, field_name: str, descending: bool = False) -> tuple:
+        """Build a unique, JSON-serializable sort key (missing values are walked last in either direction)"""
+        value = row.get(field_name)
+        return ((value is None) != descending, str(value).lower() if value is not None else "", str(row.get("id")))
+    
+    def query(
+        self,
+        filters: InventoryFilter,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> tuple[List[dict], Optional[str]]:
+        """
+        Filter, sort and paginate rows
+        
+        Without sort, limit or cursor rows keep their source order. Otherwise
+        rows are walked in sort order from the cursor position (found by
+        bisection) until the page is full, so later pages do not rescan
+        earlier ones.
+        
+        Args:
+            filters: Row filters
+            sort: Sort expression, e.g. "user_name" or "-date_of_creation"
+            limit: Page size (all matching rows if omitted)
+            cursor: Cursor returned with the previous page
+        
+        Returns:
+            Tuple of (rows, next_cursor); next_cursor is None on the last page
+        
+        Raises:
+            ValueError: If sort is not allowed or cursor is invalid
+        """
+        if sort is None and limit is None and cursor is None:
+            if not filters.active:
+                return self.rows, None
+            created_at = self.created_at
+            return [
+                row for position, row in enumerate(self.rows)
+                if filters.matches(row, created_at[position])
+            ], None
+        
+        expression, field_name, descending = parse_sort(sort, SORTABLE_FIELDS, DEFAULT_SORT)
+        keys, positions = self._sort_order(field_name, descending)
+        created_at = self.created_at
+        
+        step = -1 if descending else 1
+        if cursor:
+            last_key = decode_cursor(cursor, expression)
+            try:
+                index = bisect_left(keys, last_key) - 1 if descending else bisect_right(keys, last_key)
+            except TypeError as e:
+                raise InvalidCursorError("Malformed cursor") from e
+        else:
+            index = len(keys) - 1 if descending else 0
+        
+        page = []
+        page_keys = []
+        # Look one row past the page to know whether another page exists
+        wanted = limit + 1 if limit is not None else None
+        while 0 <= index < len(keys) and (wanted is None or len(page) < wanted):
+            position = positions[index]
+            if filters.matches(self.rows[position], created_at[position]):
+                page.append(self.rows[position])
+                page_keys.append(keys[index])
+            index += step
+        
+        if limit is not None and len(page) > limit:
+            return page[:limit], encode_cursor(expression, page_keys[limit - 1])
+        return page, None
+
+
+def inventory_headers(inventory: ResourceGroupInventory) -> dict:
+    """Build response headers describing subscriptions that could not be listed"""
+    return {
+        "X-Subscriptions-Total": str(inventory.subscriptions_total),
+        "X-Subscriptions-Failed": str(len(inventory.failed_subscriptions)),
+        "X-Failed-Subscriptions": ",".join(
+            f"{failure.subscription_id}:{failure.reason}"
+            for failure in inventory.failed_subscriptions
+        ),
+        "X-Partial-Results": "true" if inventory.partial else "false"
+    }
+
+
+def resource_group_to_row(rg) -> dict:
+    """
+    Convert an Azure resource group to an inventory row
+    
+    Args:
+        rg: AzureResourceGroup model
+    
+    Returns:
+        Dict with snake_case keys matching SharePoint-backed rows
+    """
+    tags = rg.tags or {}
+    return {
+        "id": rg.id,
+        "user_name": tags.get("CreatedBy", "Created outside app"),
+        "resource_group_name": rg.name,
+        "date_of_creation": tags.get("CreatedAt"),
+        "project_name": tags.get("ProjectName", rg.name),
+        "status": "Completed",
+        "azure_resource_group_id": rg.id,
+        "github_repo_url": None,
+        "error_message": None,
+        "cloud_platform": "Azure",
+        "location": rg.location
+    }
+
+
+def account_to_row(account: dict) -> dict:
+    """
+    Convert an AWS Organizations account to an inventory row
+    
+    Args:
+        account: Account dict as returned by AWSService.list_accounts
+    
+    Returns:
+        Dict with snake_case keys matching SharePoint-backed rows
+    """
+    joined = account.get("joined_timestamp")
+    return {
+        "id": account.get("arn") or account["account_id"],
+        "user_name": "Created outside app",
+        "resource_group_name": account["account_name"],
+        "date_of_creation": joined.isoformat() if isinstance(joined, datetime) else joined,
+        "project_name": account["account_name"],
+        "status": "Completed" if account["status"] == "ACTIVE" else account["status"],
+        "azure_resource_group_id": None,
+        "github_repo_url": None,
+        "error_message": None,
+        "cloud_platform": "AWS",
+        "location": None
+    }
+
+
+def entry_to_row(entry) -> dict:
+    """
+    Convert a SharePoint entry to an inventory row
+    
+    Args:
+        entry: SharePointEntry model
+    
+    Returns:
+        Dict with snake_case keys
+    """
+    return {
+        "id": entry.id,
+        "user_name": entry.user_name,
+        "resource_group_name": entry.resource_group_name,
+        "date_of_creation": entry.date_of_creation.isoformat() if entry.date_of_creation else None,
+        "project_name": entry.project_name,
+        "status": entry.status,
+        "azure_resource_group_id": entry.azure_resource_group_id,
+        "github_repo_url": entry.github_repo_url,
+        "error_message": entry.error_message,
+        "cloud_platform": entry.cloud_platform,
+        "location": None
+    }
+
+
+def _text(value: Any) -> str:
+    """Require a string column value (as SharePointEntry validation does)"""
+    if not isinstance(value, str):
+        raise TypeError(f"expected text, got {type(value).__name__}")
+    return value
+
+
+def _optional_text(value: Any) -> Optional[str]:
+    """Require a string or empty column value"""
+    return None if value is None else _text(value)
+
+
+def properties_to_rows(properties: Iterable[dict]) -> Tuple[List[dict], List[Tuple[Any, str]]]:
+    """
+    Convert raw SharePoint item properties straight to inventory rows
+    
+    Produces the same rows as entry_to_row(SharePointService._item_to_entry(item))
+    without building a validated SharePointEntry per item: enum columns are
+    resolved through lookup tables and dates are parsed once per distinct value.
+    Items that entry conversion would reject are reported instead.
+    
+    Args:
+        properties: Item property dicts (e.g. ListItem.properties of one page)
+    
+    Returns:
+        Tuple of (rows, [(item ID, error), ...] for items that could not be converted)
+    """
+    rows = []
+    failures = []
+    for props in properties:
+        get = props.get
+        try:
+            cloud_platform = CLOUD_PLATFORMS[get("CloudPlatform", "Azure")]
+            RESOURCE_TYPES[get("ResourceType") or default_resource_type(cloud_platform)]
+            # Validated by entry conversion although not part of the row
+            _optional_text(get("ResourceId"))
+            _optional_text(get("SubscriptionId"))
+            date_str = get("DateOfCreation")
+            rows.append({
+                "id": str(get("ID")),
+                "user_name": _text(get("UserName", "")),
+                "resource_group_name": _text(get("ResourceGroupName", "")),
+                "date_of_creation": item_date(date_str).isoformat() if date_str else datetime.utcnow().isoformat(),
+                "project_name": _text(get("ProjectName", "")),
+                "status": STATUSES[get("Status", "Pending")],
+                "azure_resource_group_id": _optional_text(get("AzureResourceGroupId")),
+                "github_repo_url": _optional_text(get("GitHubRepoUrl")),
+                "error_message": _optional_text(get("ErrorMessage")),
+                "cloud_platform": cloud_platform,
+                "location": None
+            })
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            failures.append((get("ID"), repr(e)))
+    return rows, failures
+
+
+def _status_value(status: Optional[str]) -> Optional[str]:
+    """Map a normalized (lowercase) status filter to the value stored in SharePoint"""
+    if not status:
+        return None
+    for value in ResourceStatus:
+        if value.value.lower() == status:
+            return value.value
+    return status
+
+
+class InventoryService:
+    """Service building the resource inventory behind a stale-while-revalidate cache"""
+    
+    def __init__(self):
+        """Initialize inventory cache from settings"""
+        self.cache = SWRCache(
+            ttl=settings.INVENTORY_CACHE_TTL_SECONDS,
+            stale_ttl=settings.INVENTORY_CACHE_STALE_SECONDS
+        )
+    
+    @property
+    def source(self) -> str:
+        """Inventory source for the current configuration"""
+        if settings.SHAREPOINT_ENABLED and settings.SHAREPOINT_SITE_URL:
+            return "sharepoint"
+        return "azure"
+    
+    async def get_inventory(self) -> CacheResult:
+        """
+        Get inventory rows, served from cache when possible
+        
+        Returns:
+            CacheResult whose value is an InventorySnapshot
+        """
+        return await self.cache.get(self.source, self._load)
+    
+    def invalidate(self):
+        """Drop cached inventory so the next read reloads it"""
+        self.cache.invalidate()
+    
+    def stats(self) -> dict:
+        """Return cache counters"""
+        return self.cache.stats()
+    
+    def peek(self) -> Optional[CacheResult]:
+        """Return the cached inventory without loading it, or None"""
+        return self.cache.peek(self.source)
+    
+    async def iter_rows(self, filters: Optional[InventoryFilter] = None) -> AsyncIterator[List[dict]]:
+        """
+        Yield inventory rows in batches as each subscription or SharePoint page arrives
+        
+        Once the stream completes, the assembled snapshot is stored in the cache.
+        For SharePoint, a status filter (and a user filter alongside it) is
+        applied on the server instead; such a partial stream is not cached.
+        Callers still apply filters to the rows.
+        
+        Args:
+            filters: Filters the caller will apply (optional)
+        
+        Yields:
+            Lists of inventory rows
+        """
+        source = self.source
+        server_filter = item_filter(_status_value(filters.status), filters.user_name) if filters else None
+        if source == "sharepoint" and server_filter:
+            async for rows in self._stream_sharepoint(server_filter):
+                yield rows
+            return
+        
+        generation = self.cache.generation
+        snapshot = InventorySnapshot(source=source)
+        async for rows in self._stream(snapshot):
+            yield rows
+        self.cache.set(source, snapshot, generation)
+        await self._persist(snapshot)
+    
+    async def warm_from_store(self) -> bool:
+        """
+        Seed the cache from the persistent store (on startup)
+        
+        Stored inventory younger than INVENTORY_STORE_MAX_AGE_SECONDS is served
+        without a remote round-trip; if it is older than the cache TTL it is
+        served as stale, so the first request revalidates it in the background.
+        
+        Returns:
+            True if the cache was seeded
+        """
+        store = get_resource_store()
+        if store is None:
+            return False
+        
+        source = self.source
+        try:
+            stored = await store.load_source(source)
+        except Exception as e:
+            logger.warning("inventory_store_read_failed", source=source, error=str(e))
+            return False
+        if stored is None:
+            return False
+        
+        age = (datetime.utcnow() - stored.synced_at).total_seconds()
+        if age > settings.INVENTORY_STORE_MAX_AGE_SECONDS:
+            logger.info("inventory_store_too_old", source=source, age=int(age))
+            return False
+        
+        snapshot = InventorySnapshot(source=source, rows=stored.rows, headers=stored.headers)
+        self.cache.set(source, snapshot, age=min(max(age, 0.0), self.cache.ttl))
+        logger.info("inventory_restored_from_store", source=source, count=len(stored.rows), age=int(age))
+        return True
+    
+    async def _stream(self, snapshot: InventorySnapshot) -> AsyncIterator[List[dict]]:
+        """Fill snapshot from the live source, yielding each batch of rows"""
+        if snapshot.source == "sharepoint":
+            batches = self._stream_sharepoint()
+        else:
+            batches = self._stream_discovered(snapshot)
+        
+        async for rows in batches:
+            snapshot.rows.extend(rows)
+            yield rows
+        
+        logger.info("fetched_inventory", source=snapshot.source, count=len(snapshot.rows))
+    
+    async def _stream_discovered(self, snapshot: InventorySnapshot) -> AsyncIterator[List[dict]]:
+        """Yield Azure resource groups, then AWS accounts if enabled"""
+        async for rows in self._stream_azure(snapshot):
+            yield rows
+        if settings.AWS_INVENTORY_ENABLED:
+            async for rows in self._stream_aws(snapshot):
+                yield rows
+    
+    async def _stream_azure(self, snapshot: InventorySnapshot) -> AsyncIterator[List[dict]]:
+        """Yield Azure resource groups as SharePoint-like rows"""
+        azure_service = get_azure_service()
+        inventory = ResourceGroupInventory()
+        
+        async for resource_groups in azure_service.iter_resource_groups(inventory):
+            inventory.resource_groups.extend(resource_groups)
+            yield [resource_group_to_row(rg) for rg in resource_groups]
+        
+        get_tag_index().rebuild(inventory.resource_groups, complete=not inventory.partial)
+        if inventory.failed_subscriptions:
+            logger.warning(
+                "azure_inventory_partial",
+                failed_subscriptions=len(inventory.failed_subscriptions)
+            )
+        snapshot.headers = inventory_headers(inventory)
+    
+    async def _stream_aws(self, snapshot: InventorySnapshot) -> AsyncIterator[List[dict]]:
+        """Yield the organization's AWS accounts as rows, page by page unless cached"""
+        try:
+            async for accounts in get_aws_account_inventory().iter_accounts():
+                yield [account_to_row(account) for account in accounts]
+        except Exception as e:
+            # Azure rows are still served; the snapshot is marked partial so the store keeps its rows
+            logger.warning("aws_inventory_failed", error=str(e))
+            snapshot.headers["X-AWS-Accounts-Failed"] = "true"
+            snapshot.headers["X-Partial-Results"] = "true"
+    
+    async def _stream_sharepoint(self, filter_query: Optional[str] = None) -> AsyncIterator[List[dict]]:
+        """Yield SharePoint list items (all, not just pending, unless filtered) as rows"""
+        sharepoint_service = SharePointService()
+        
+        async for items in sharepoint_service.iter_item_pages(filter_query=filter_query):
+            rows, failures = properties_to_rows(item.properties for item in items)
+            for item_id, error in failures:
+                logger.warning("failed_to_parse_item", item_id=item_id, error=error)
+            yield rows
+    
+    async def _load(self) -> InventorySnapshot:
+        """Load a complete snapshot for the cache"""
+        snapshot = InventorySnapshot(source=self.source)
+        async for _ in self._stream(snapshot):
+            pass
+        await self._persist(snapshot)
+        return snapshot
+    
+    async def _persist(self, snapshot: InventorySnapshot):
+        """Write a live snapshot through to the persistent store (failures are only logged)"""
+        store = get_resource_store()
+        if store is None:
+            return
+        
+        try:
+            await store.replace_source(snapshot, complete=snapshot.headers.get("X-Partial-Results") != "true")
+        except Exception as e:
+            logger.warning("inventory_store_write_failed", source=snapshot.source, error=str(e))
+
+
+_inventory_service: Optional[InventoryService] = None
+
+
+def get_inventory_service() -> InventoryService:
+    """Get the process-wide inventory service"""
+    global _inventory_service
+    if _inventory_service is None:
+        _inventory_service = InventoryService()
+    return _inventory_service
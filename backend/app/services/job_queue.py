@@ -0,0 +1,570 @@
+"""
+Provisioning Job Queue
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+import structlog
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.config import get_settings
+from app.models import Job, JobStatus
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+JobHandler = Callable[[dict], Awaitable[Optional[dict]]]
+
+_ACTIVE = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+class MemoryJobBroker:
+    """In-process job broker (jobs are lost on restart and not shared between processes)"""
+    
+    blocking = False
+    
+    def __init__(self):
+        """Initialize empty broker"""
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+    
+    def enqueue(self, job: Job) -> Job:
+        """Add a job, or return the active job with the same dedupe key"""
+        with self._lock:
+            if job.dedupe_key:
+                for existing in self._jobs.values():
+                    if existing.dedupe_key == job.dedupe_key and existing.status in _ACTIVE:
+                        return existing.model_copy()
+            self._jobs[job.id] = job
+            return job.model_copy()
+    
+    def reserve(self, visibility_timeout: float, now: float) -> Optional[Job]:
+        """Lease the next due job (queued, or running with an expired lease)"""
+        with self._lock:
+            while True:
+                due = [job for job in self._jobs.values() if job.status in _ACTIVE and job.available_at <= now]
+                if not due:
+                    return None
+                job = min(due, key=lambda j: j.available_at)
+                if job.status == JobStatus.RUNNING and job.attempts >= job.max_attempts:
+                    job.status = JobStatus.FAILED
+                    job.last_error = job.last_error or "Visibility timeout expired"
+                    job.updated_at = now
+                    continue
+                job.status = JobStatus.RUNNING
+                job.attempts += 1
+                job.available_at = now + visibility_timeout
+                job.updated_at = now
+                return job.model_copy()
+    
+    def extend(self, job_id: str, attempt: int, visibility_timeout: float, now: float) -> bool:
+        """Extend the lease of a running job"""
+        with self._lock:
+            job = self._leased(job_id, attempt)
+            if job is None:
+                return False
+            job.available_at = now + visibility_timeout
+            return True
+    
+    def complete(self, job_id: str, attempt: int, result: Optional[dict], now: float) -> bool:
+        """Mark a leased job as succeeded"""
+        with self._lock:
+            job = self._leased(job_id, attempt)
+            if job is None:
+                return False
+            job.status = JobStatus.SUCCEEDED
+            job.result = result
+            job.updated_at = now
+            return True
+    
+    def fail(self, job_id: str, attempt: int, error: str, retry_at: Optional[float], now: float) -> bool:
+        """Requeue a leased job at retry_at, or fail it permanently if retry_at is None"""
+        with self._lock:
+            job = self._leased(job_id, attempt)
+            if job is None:
+                return False
+            job.status = JobStatus.QUEUED if retry_at is not None else JobStatus.FAILED
+            job.available_at = retry_at if retry_at is not None else job.available_at
+            job.last_error = error
+            job.updated_at = now
+            return True
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy() if job else None
+    
+    def counts(self) -> Dict[str, int]:
+        """Count jobs per status"""
+        with self._lock:
+            counts = {status.value: 0 for status in JobStatus}
+            for job in self._jobs.values():
+                counts[job.status.value] += 1
+            return counts
+    
+    def close(self):
+        """Nothing to release"""
+    
+    def _leased(self, job_id: str, attempt: int) -> Optional[Job]:
+        """Return the job if it is still running under the given attempt's lease"""
+        job = self._jobs.get(job_id)
+        if job is None or job.status != JobStatus.RUNNING or job.attempts != attempt:
+            return None
+        return job
+
+
+class SQLiteJobBroker:
+    """Durable job broker in a SQLite file, shared by API and worker processes"""
+    
+    blocking = True
+    
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL,
+            max_attempts INTEGER NOT NULL,
+            available_at REAL NOT NULL,
+            dedupe_key TEXT,
+            result TEXT,
+            last_error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_jobs_due ON jobs (status, available_at)",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_dedupe_key ON jobs (dedupe_key)"
+    )
+    
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) the queue database
+        
+        Args:
+            path: SQLite file path
+        """
+        self.path = path
+        # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            for statement in self._SCHEMA:
+                self._conn.execute(statement)
+    
+    @contextmanager
+    def _transaction(self):
+        """Run statements in a write transaction (serialized across processes)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> Job:
+        """Convert a database row to a Job"""
+        values = dict(row)
+        values["payload"] = json.loads(values["payload"])
+        values["result"] = json.loads(values["result"]) if values["result"] else None
+        return Job(**values)
+    
+    def enqueue(self, job: Job) -> Job:
+        """Add a job, or return the active job with the same dedupe key"""
+        with self._transaction() as conn:
+            if job.dedupe_key:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE dedupe_key = ? AND status IN (?, ?) LIMIT 1",
+                    (job.dedupe_key, JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+                ).fetchone()
+                if row is not None:
+                    return self._to_job(row)
+            conn.execute(
+                "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id, job.name, json.dumps(job.payload), job.status.value, job.attempts,
+                    job.max_attempts, job.available_at, job.dedupe_key, None, None,
+                    job.created_at, job.updated_at
+                )
+            )
+        return job
+    
+    def reserve(self, visibility_timeout: float, now: float) -> Optional[Job]:
+        """Lease the next due job (queued, or running with an expired lease)"""
+        with self._transaction() as conn:
+            while True:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE status IN (?, ?) AND available_at <= ? "
+                    "ORDER BY available_at LIMIT 1",
+                    (JobStatus.QUEUED.value, JobStatus.RUNNING.value, now)
+                ).fetchone()
+                if row is None:
+                    return None
+                if row["status"] == JobStatus.RUNNING.value and row["attempts"] >= row["max_attempts"]:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, last_error = COALESCE(last_error, ?), updated_at = ? WHERE id = ?",
+                        (JobStatus.FAILED.value, "Visibility timeout expired", now, row["id"])
+                    )
+                    continue
+                conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, available_at = ?, updated_at = ? WHERE id = ?",
+                    (JobStatus.RUNNING.value, now + visibility_timeout, now, row["id"])
+                )
+                return self._to_job(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+    
+    def extend(self, job_id: str, attempt: int, visibility_timeout: float, now: float) -> bool:
+        """Extend the lease of a running job"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET available_at = ? WHERE id = ? AND status = ? AND attempts = ?",
+                (now + visibility_timeout, job_id, JobStatus.RUNNING.value, attempt)
+            )
+            return cursor.rowcount == 1
+    
+    def complete(self, job_id: str, attempt: int, result: Optional[dict], now: float) -> bool:
+        """Mark a leased job as succeeded"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, updated_at = ? WHERE id = ? AND status = ? AND attempts = ?",
+                (
+                    JobStatus.SUCCEEDED.value, json.dumps(result) if result is not None else None, now,
+                    job_id, JobStatus.RUNNING.value, attempt
+                )
+            )
+            return cursor.rowcount == 1
+    
+    def fail(self, job_id: str, attempt: int, error: str, retry_at: Optional[float], now: float) -> bool:
+        """Requeue a leased job at retry_at, or fail it permanently if retry_at is None"""
+        with self._transaction() as conn:
+            if retry_at is not None:
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = ?, available_at = ?, last_error = ?, updated_at = ? "
+                    "WHERE id = ? AND status = ? AND attempts = ?",
+                    (JobStatus.QUEUED.value, retry_at, error, now, job_id, JobStatus.RUNNING.value, attempt)
+                )
+            else:
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = ?, last_error = ?, updated_at = ? "
+                    "WHERE id = ? AND status = ? AND attempts = ?",
+                    (JobStatus.FAILED.value, error, now, job_id, JobStatus.RUNNING.value, attempt)
+                )
+            return cursor.rowcount == 1
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+    
+    def counts(self) -> Dict[str, int]:
+        """Count jobs per status"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status.value: 0 for status in JobStatus}
+        counts.update({status: count for status, count in rows})
+        return counts
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+class JobQueue:
+    """Queue of provisioning jobs on top of a memory or SQLite broker"""
+    
+    def __init__(self, broker):
+        """
+        Initialize queue
+        
+        Args:
+            broker: MemoryJobBroker or SQLiteJobBroker
+        """
+        self.broker = broker
+        self._wakeup = asyncio.Event()
+        self.deduplicated = 0
+    
+    async def _call(self, method: Callable, *args) -> Any:
+        """Call a broker method, off the event loop if it blocks on I/O"""
+        if self.broker.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+    
+    async def enqueue(
+        self,
+        name: str,
+        payload: dict,
+        dedupe_key: Optional[str] = None,
+        max_attempts: Optional[int] = None
+    ) -> Job:
+        """
+        Add a job to the queue
+        
+        Args:
+            name: Handler name
+            payload: JSON-serializable handler arguments
+            dedupe_key: If set, an active job with the same key is returned instead
+            max_attempts: Attempts before the job fails permanently (JOB_MAX_ATTEMPTS if omitted)
+        
+        Returns:
+            The queued job (or the existing active job with the same dedupe key)
+        """
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        job = await self._call(self.broker.enqueue, Job(
+            id=job_id,
+            name=name,
+            payload=payload,
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+            available_at=now,
+            dedupe_key=dedupe_key,
+            created_at=now,
+            updated_at=now
+        ))
+        if job.id != job_id:
+            self.deduplicated += 1
+            logger.info("job_already_active", job_id=job.id, name=name, dedupe_key=dedupe_key, status=job.status.value)
+            return job
+        
+        self._wakeup.set()
+        logger.info("job_enqueued", job_id=job.id, name=name, dedupe_key=dedupe_key)
+        return job
+    
+    async def reserve(self, visibility_timeout: float) -> Optional[Job]:
+        """Lease the next due job for visibility_timeout seconds, or return None"""
+        return await self._call(self.broker.reserve, visibility_timeout, time.time())
+    
+    async def extend(self, job: Job, visibility_timeout: float) -> bool:
+        """Extend a job's lease; False if the lease was lost to another worker"""
+        return await self._call(self.broker.extend, job.id, job.attempts, visibility_timeout, time.time())
+    
+    async def complete(self, job: Job, result: Optional[dict] = None) -> bool:
+        """Mark a leased job as succeeded"""
+        return await self._call(self.broker.complete, job.id, job.attempts, result, time.time())
+    
+    async def fail(self, job: Job, error: str, retry_delay: Optional[float]) -> bool:
+        """Requeue a leased job after retry_delay seconds, or fail it permanently if None"""
+        now = time.time()
+        retry_at = now + retry_delay if retry_delay is not None else None
+        return await self._call(self.broker.fail, job.id, job.attempts, error, retry_at, now)
+    
+    async def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID"""
+        return await self._call(self.broker.get, job_id)
+    
+    async def wait(self, job_id: str, timeout: float, poll_interval: float = 0.25) -> Optional[Job]:
+        """
+        Wait for a job to finish
+        
+        Args:
+            job_id: Job ID
+            timeout: Seconds to wait
+            poll_interval: Seconds between broker reads
+        
+        Returns:
+            The job as last seen (check job.finished), or None if unknown
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            job = await self.get(job_id)
+            if job is None or job.finished or time.monotonic() >= deadline:
+                return job
+            await asyncio.sleep(min(poll_interval, max(deadline - time.monotonic(), 0)))
+    
+    async def wait_for_work(self, timeout: float):
+        """Sleep until a job is enqueued in this process or timeout elapses"""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+    
+    async def stats(self) -> Dict[str, int]:
+        """Count jobs per status, plus enqueues answered by an already active job"""
+        counts = await self._call(self.broker.counts)
+        counts["deduplicated"] = self.deduplicated
+        return counts
+    
+    def close(self):
+        """Release broker resources"""
+        self.broker.close()
+
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff before retrying a job that failed on the given attempt"""
+    return min(
+        settings.JOB_RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1)),
+        settings.JOB_RETRY_BACKOFF_MAX_SECONDS
+    )
+
+
+class JobWorker:
+    """Runs queued jobs with bounded concurrency"""
+    
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, JobHandler],
+        concurrency: Optional[int] = None,
+        visibility_timeout: Optional[float] = None,
+        poll_interval: Optional[float] = None
+    ):
+        """
+        Initialize worker
+        
+        A job's lease is extended while its handler runs, so the visibility
+        timeout only reclaims jobs from workers that crashed or were killed.
+        
+        Args:
+            queue: Job queue to consume
+            handlers: Handler coroutine per job name
+            concurrency: Jobs run at once (JOB_WORKER_CONCURRENCY if omitted)
+            visibility_timeout: Lease length in seconds (JOB_VISIBILITY_TIMEOUT_SECONDS if omitted)
+            poll_interval: Idle seconds between polls (JOB_POLL_INTERVAL_SECONDS if omitted)
+        """
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency or settings.JOB_WORKER_CONCURRENCY
+        self.visibility_timeout = visibility_timeout or settings.JOB_VISIBILITY_TIMEOUT_SECONDS
+        self.poll_interval = poll_interval or settings.JOB_POLL_INTERVAL_SECONDS
+        self._tasks: List[asyncio.Task] = []
+        self.running = 0
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+    
+    def start(self):
+        """Start the worker loops"""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._loop()) for _ in range(self.concurrency)]
+            logger.info("job_worker_started", concurrency=self.concurrency)
+    
+    async def stop(self):
+        """
+        Stop the worker loops
+        
+        Jobs interrupted here keep their lease and are retried by any worker
+        once the visibility timeout expires.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("job_worker_stopped")
+    
+    async def run_until_cancelled(self):
+        """Run the worker until the calling task is cancelled"""
+        self.start()
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            await self.stop()
+    
+    def stats(self) -> dict:
+        """Return worker counters"""
+        return {
+            "concurrency": self.concurrency,
+            "running": self.running,
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": self.failed
+        }
+    
+    async def _loop(self):
+        """Reserve and run jobs one at a time"""
+        while True:
+            try:
+                job = await self.queue.reserve(self.visibility_timeout)
+            except Exception as e:
+                logger.error("job_reserve_failed", error=str(e))
+                job = None
+            if job is None:
+                await self.queue.wait_for_work(self.poll_interval)
+                continue
+            try:
+                await self._execute(job)
+            except Exception as e:
+                # Recording the outcome failed (e.g. the database is locked); the
+                # lease then expires and the job is retried
+                logger.error("job_outcome_not_recorded", job_id=job.id, name=job.name, error=str(e))
+    
+    async def _execute(self, job: Job):
+        """Run one job and record its outcome"""
+        handler = self.handlers.get(job.name)
+        if handler is None:
+            logger.error("job_handler_missing", job_id=job.id, name=job.name)
+            await self.queue.fail(job, f"No handler for job '{job.name}'", retry_delay=None)
+            self.failed += 1
+            return
+        
+        self.running += 1
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            logger.info("job_started", job_id=job.id, name=job.name, attempt=job.attempts)
+            result = await handler(job.payload)
+        except Exception as e:
+            if job.attempts < job.max_attempts:
+                delay = retry_delay(job.attempts)
+                self.retried += 1
+                logger.warning("job_retry_scheduled", job_id=job.id, name=job.name, attempt=job.attempts, delay=delay, error=str(e))
+                await self.queue.fail(job, str(e), retry_delay=delay)
+            else:
+                self.failed += 1
+                logger.error("job_failed", job_id=job.id, name=job.name, attempts=job.attempts, error=str(e))
+                await self.queue.fail(job, str(e), retry_delay=None)
+        else:
+            completed = await self.queue.complete(job, result)
+            self.succeeded += 1
+            if not completed:
+                logger.warning("job_lease_lost", job_id=job.id, name=job.name)
+            logger.info("job_succeeded", job_id=job.id, name=job.name)
+        finally:
+            heartbeat.cancel()
+            self.running -= 1
+    
+    async def _heartbeat(self, job: Job):
+        """Keep extending a job's lease while its handler runs"""
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 2)
+            try:
+                if not await self.queue.extend(job, self.visibility_timeout):
+                    logger.warning("job_lease_lost", job_id=job.id, name=job.name)
+                    return
+            except Exception as e:
+                logger.warning("job_lease_extend_failed", job_id=job.id, error=str(e))
+
+
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get the process-wide job queue for the configured broker"""
+    global _job_queue
+    if _job_queue is None:
+        if settings.JOB_BROKER == "memory":
+            broker = MemoryJobBroker()
+        else:
+            broker = SQLiteJobBroker(settings.JOB_QUEUE_PATH)
+        _job_queue = JobQueue(broker)
+        logger.info("job_queue_created", broker=settings.JOB_BROKER)
+    return _job_queue
+
+
+def close_job_queue():
+    """Close the process-wide job queue (on shutdown)"""
+    global _job_queue
+    if _job_queue is not None:
+        _job_queue.close()
+    _job_queue = None
@@ -0,0 +1,46 @@
+"""
+Process Shutdown
+"""
+import structlog
+
+from app.config import get_settings
+from app.services.azure_service import close_azure_client_pool
+from app.services.github_service import close_github_connection
+from app.services.job_queue import close_job_queue
+from app.services.operation_tracker import close_operation_tracker
+from app.services.repo_name_index import close_repo_name_index
+from app.services.resource_store import close_resource_store
+from app.services.sharepoint_batch import close_sharepoint_write_batcher
+from app.services.sharepoint_context import close_sharepoint_connection
+from app.services.tag_index import close_tag_index
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+async def close_services():
+    """
+    Close the process-wide services and connections
+    
+    Shared by the API lifespan and the standalone worker; call it once the
+    job worker has stopped, so pending SharePoint writes are flushed and
+    no job is left holding a closed client.
+    """
+    await close_operation_tracker()
+    await close_repo_name_index()
+    await close_tag_index()
+    await close_sharepoint_write_batcher()
+    close_sharepoint_connection()
+    if settings.GITHUB_CLIENT_MODE == "async":
+        from app.services.github_async_service import close_async_github_client
+        await close_async_github_client()
+    else:
+        close_github_connection()
+    close_job_queue()
+    await close_resource_store()
+    if settings.AZURE_SDK_MODE == "async":
+        from app.services.azure_async_service import close_async_azure_client_pool
+        await close_async_azure_client_pool()
+    else:
+        close_azure_client_pool()
+    logger.info("services_closed")
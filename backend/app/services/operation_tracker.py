@@ -0,0 +1,407 @@
+"""
+Long-Running Cloud Operation Tracker
+"""
+import asyncio
+import heapq
+import itertools
+import time
+import uuid
+import structlog
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from app.config import get_settings
+from app.models import CloudPlatform, Operation, OperationStatus
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+OperationCallback = Callable[[Operation], Awaitable[None]]
+
+
+class OperationFailed(Exception):
+    """The cloud provider reported a long-running operation as failed or canceled"""
+
+
+class OperationHandle:
+    """Provider-specific handle that checks one long-running operation"""
+    
+    async def poll(self) -> Optional[dict]:
+        """
+        Check the operation once
+        
+        Returns:
+            Result once the operation succeeded, None while it is running
+        
+        Raises:
+            OperationFailed: If the provider reports the operation failed;
+                any other exception is treated as a failed poll and retried
+        """
+        raise NotImplementedError
+
+
+class PollPolicy(NamedTuple):
+    """Polling cadence for one provider's operations"""
+    initial: float  # Seconds before the first poll
+    maximum: float  # Longest interval between polls
+    multiplier: float  # Interval growth after each poll of a running operation
+
+
+class TrackedOperation:
+    """Tracker-side state of a running operation"""
+    
+    def __init__(self, operation: Operation, handle: OperationHandle, on_complete: Optional[OperationCallback]):
+        self.operation = operation
+        self.handle = handle
+        self.callbacks: List[OperationCallback] = [on_complete] if on_complete else []
+        self.interval = 0.0
+        self.errors = 0  # Consecutive failed polls
+        self.exception: Optional[BaseException] = None
+        self.done = asyncio.Event()
+
+
+def default_policies() -> Dict[CloudPlatform, PollPolicy]:
+    """Build per-provider poll policies from settings"""
+    return {
+        CloudPlatform.AZURE: PollPolicy(
+            settings.AZURE_OPERATION_POLL_SECONDS, settings.OPERATION_POLL_MAX_SECONDS, settings.OPERATION_POLL_BACKOFF
+        ),
+        CloudPlatform.GCP: PollPolicy(
+            settings.GCP_OPERATION_POLL_SECONDS, settings.OPERATION_POLL_MAX_SECONDS, settings.OPERATION_POLL_BACKOFF
+        ),
+        CloudPlatform.AWS: PollPolicy(
+            settings.AWS_OPERATION_POLL_SECONDS, settings.OPERATION_POLL_MAX_SECONDS, settings.OPERATION_POLL_BACKOFF
+        )
+    }
+
+
+class OperationTracker:
+    """Polls Azure, GCP and AWS long-running operations from one schedule"""
+    
+    def __init__(
+        self,
+        policies: Optional[Dict[CloudPlatform, PollPolicy]] = None,
+        concurrency: Optional[int] = None,
+        max_poll_errors: Optional[int] = None,
+        retention: Optional[float] = None
+    ):
+        """
+        Initialize an empty tracker
+        
+        Running operations sit in a heap keyed on their next poll time; a
+        single task sleeps until the earliest is due, so a thousand running
+        operations cost no more than the polls themselves. Each poll of a
+        running operation stretches its interval by the provider's
+        multiplier. A failed poll pauses every operation of that provider,
+        doubling the pause on each further failure, so a throttled API is
+        not hammered by its other operations.
+        
+        Args:
+            policies: Poll cadence per provider (defaults to settings)
+            concurrency: Polls in flight at once (defaults to settings)
+            max_poll_errors: Consecutive failed polls before an operation is failed (defaults to settings)
+            retention: Seconds finished operations remain queryable (defaults to settings)
+        """
+        self.policies = policies or default_policies()
+        self.max_poll_errors = max_poll_errors or settings.OPERATION_MAX_POLL_ERRORS
+        self.retention = retention if retention is not None else settings.OPERATION_RETENTION_SECONDS
+        self._semaphore = asyncio.Semaphore(max(1, concurrency or settings.OPERATION_POLL_CONCURRENCY))
+        self._operations: Dict[str, TrackedOperation] = {}  # Running and recently finished
+        self._active: Dict[str, TrackedOperation] = {}
+        self._finished_at: Deque[Tuple[float, str]] = deque()
+        self._heap: List[Tuple[float, int, str]] = []  # (due, sequence, operation ID)
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._polls: Set[asyncio.Task] = set()
+        self._callback_tasks: Set[asyncio.Task] = set()
+        self._provider_errors: Dict[CloudPlatform, int] = {}
+        self._provider_paused_until: Dict[CloudPlatform, float] = {}
+        self.tracked = 0
+        self.polls = 0
+        self.poll_errors = 0
+        self.provider_pauses = 0
+        self.succeeded = 0
+        self.failed = 0
+    
+    def track(
+        self,
+        provider: CloudPlatform,
+        kind: str,
+        resource_name: str,
+        handle: OperationHandle,
+        on_complete: Optional[OperationCallback] = None
+    ) -> Operation:
+        """
+        Start following an operation
+        
+        Args:
+            provider: Cloud the operation runs in
+            kind: Operation type (e.g. "delete_resource_group")
+            resource_name: Resource the operation acts on
+            handle: Handle polled until the operation finishes
+            on_complete: Coroutine function called with the finished operation
+        
+        Returns:
+            The operation, with the ID to query it by
+        """
+        now = time.time()
+        operation = Operation(
+            id=str(uuid.uuid4()),
+            provider=provider,
+            kind=kind,
+            resource_name=resource_name,
+            created_at=now,
+            updated_at=now
+        )
+        tracked = TrackedOperation(operation, handle, on_complete)
+        tracked.interval = self.policies[provider].initial
+        self._operations[operation.id] = tracked
+        self._active[operation.id] = tracked
+        self.tracked += 1
+        self._schedule(tracked, tracked.interval)
+        logger.info("operation_tracked", operation_id=operation.id, provider=provider.value, kind=kind,
+                    resource_name=resource_name)
+        return operation.model_copy()
+    
+    def get(self, operation_id: str) -> Optional[Operation]:
+        """Get an operation by ID (finished ones are kept for the retention period)"""
+        self._prune()
+        tracked = self._operations.get(operation_id)
+        return tracked.operation.model_copy() if tracked else None
+    
+    def add_callback(self, operation_id: str, callback: OperationCallback) -> bool:
+        """
+        Call a coroutine function with an operation once it finishes
+        
+        Used when what to do on completion is known only after the operation
+        started (e.g. the SharePoint item was created alongside it).
+        
+        Args:
+            operation_id: Operation ID
+            callback: Coroutine function called with the finished operation
+                (at once if it already finished)
+        
+        Returns:
+            False if the operation is unknown
+        """
+        tracked = self._operations.get(operation_id)
+        if tracked is None:
+            return False
+        if tracked.operation.finished:
+            task = asyncio.create_task(self._run_callback(callback, tracked.operation.model_copy()))
+            self._callback_tasks.add(task)
+            task.add_done_callback(self._callback_tasks.discard)
+        else:
+            tracked.callbacks.append(callback)
+        return True
+    
+    async def wait(self, operation_id: str, timeout: Optional[float] = None) -> Optional[Operation]:
+        """
+        Wait for an operation to finish
+        
+        Args:
+            operation_id: Operation ID
+            timeout: Seconds to wait (None waits until it finishes)
+        
+        Returns:
+            The operation (still running if the timeout expired), or None if unknown
+        """
+        tracked = self._operations.get(operation_id)
+        if tracked is not None:
+            try:
+                await asyncio.wait_for(tracked.done.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.get(operation_id)
+    
+    async def result(self, operation_id: str) -> dict:
+        """
+        Wait for an operation and return its result
+        
+        Args:
+            operation_id: Operation ID
+        
+        Returns:
+            The operation's result
+        
+        Raises:
+            KeyError: If the operation is unknown
+            Exception: The provider error that failed the operation
+        """
+        tracked = self._operations.get(operation_id)
+        if tracked is None:
+            raise KeyError(operation_id)
+        await tracked.done.wait()
+        operation = tracked.operation
+        if operation.status == OperationStatus.FAILED:
+            exception = tracked.exception
+            if isinstance(exception, OperationFailed) and exception.__cause__ is not None:
+                # Re-raise the provider's own error so callers can tell its type
+                raise exception.__cause__
+            raise exception or OperationFailed(operation.error)
+        return operation.result or {}
+    
+    def stats(self) -> dict:
+        """Return operation and poll counters"""
+        now = time.monotonic()
+        return {
+            "running": len(self._active),
+            "tracked": self.tracked,
+            "polls": self.polls,
+            "poll_errors": self.poll_errors,
+            "provider_pauses": self.provider_pauses,
+            "paused_providers": sorted(
+                provider.value for provider, until in self._provider_paused_until.items() if until > now
+            ),
+            "succeeded": self.succeeded,
+            "failed": self.failed
+        }
+    
+    async def close(self):
+        """Stop polling; running operations are no longer followed"""
+        # Completion callbacks already running are allowed to finish
+        await asyncio.gather(*self._callback_tasks, return_exceptions=True)
+        tasks = list(self._polls) + ([self._task] if self._task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+    
+    def _schedule(self, tracked: TrackedOperation, delay: float):
+        """Queue an operation's next poll and make sure the scheduler is running"""
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._sequence), tracked.operation.id))
+        tracked.operation.next_poll_at = time.time() + delay
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+    
+    async def _run(self):
+        """Start each poll when it falls due, sleeping until the earliest one"""
+        while self._heap:
+            due, _, operation_id = self._heap[0]
+            now = time.monotonic()
+            if due > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=due - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            heapq.heappop(self._heap)
+            tracked = self._active.get(operation_id)
+            if tracked is None:
+                continue
+            paused_until = self._provider_paused_until.get(tracked.operation.provider, 0.0)
+            if paused_until > now:
+                heapq.heappush(self._heap, (paused_until, next(self._sequence), operation_id))
+                continue
+            
+            task = asyncio.create_task(self._poll(tracked))
+            self._polls.add(task)
+            task.add_done_callback(self._polls.discard)
+    
+    async def _poll(self, tracked: TrackedOperation):
+        """Poll one operation and reschedule or finish it"""
+        operation = tracked.operation
+        policy = self.policies[operation.provider]
+        async with self._semaphore:
+            try:
+                result = await tracked.handle.poll()
+            except OperationFailed as e:
+                operation.polls += 1
+                self.polls += 1
+                tracked.exception = e
+                await self._finish(tracked, OperationStatus.FAILED, error=str(e))
+                return
+            except Exception as e:
+                self.polls += 1
+                self.poll_errors += 1
+                tracked.errors += 1
+                errors = self._provider_errors.get(operation.provider, 0) + 1
+                self._provider_errors[operation.provider] = errors
+                pause = min(policy.initial * 2 ** errors, policy.maximum)
+                self._provider_paused_until[operation.provider] = time.monotonic() + pause
+                self.provider_pauses += 1
+                logger.warning("operation_poll_failed", operation_id=operation.id, provider=operation.provider.value,
+                               error=str(e), pause_seconds=pause)
+                if tracked.errors >= self.max_poll_errors:
+                    tracked.exception = e
+                    await self._finish(tracked, OperationStatus.FAILED, error=f"Polling failed: {e}")
+                else:
+                    self._schedule(tracked, pause)
+                return
+        
+        self.polls += 1
+        operation.polls += 1
+        operation.updated_at = time.time()
+        tracked.errors = 0
+        self._provider_errors[operation.provider] = 0
+        if result is None:
+            tracked.interval = min(tracked.interval * policy.multiplier, policy.maximum)
+            self._schedule(tracked, tracked.interval)
+        else:
+            await self._finish(tracked, OperationStatus.SUCCEEDED, result=result)
+    
+    async def _finish(
+        self,
+        tracked: TrackedOperation,
+        status: OperationStatus,
+        result: Optional[dict] = None,
+        error: Optional[str] = None
+    ):
+        """Record an operation's outcome, run its callbacks and wake its waiters"""
+        operation = tracked.operation
+        operation.status = status
+        operation.result = result
+        operation.error = error
+        operation.next_poll_at = None
+        operation.updated_at = time.time()
+        self._active.pop(operation.id, None)
+        self._finished_at.append((time.monotonic(), operation.id))
+        if status == OperationStatus.SUCCEEDED:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        logger.info("operation_finished", operation_id=operation.id, provider=operation.provider.value,
+                    kind=operation.kind, status=status.value, polls=operation.polls, error=error)
+        
+        # Waiters resume once callbacks have applied the outcome
+        for callback in tracked.callbacks:
+            await self._run_callback(callback, operation.model_copy())
+        tracked.done.set()
+    
+    async def _run_callback(self, callback: OperationCallback, operation: Operation):
+        """Run a completion callback; failures are logged"""
+        try:
+            await callback(operation)
+        except Exception as e:
+            logger.error("operation_callback_failed", operation_id=operation.id, error=str(e))
+    
+    def _prune(self):
+        """Forget finished operations older than the retention period"""
+        cutoff = time.monotonic() - self.retention
+        while self._finished_at and self._finished_at[0][0] < cutoff:
+            _, operation_id = self._finished_at.popleft()
+            self._operations.pop(operation_id, None)
+
+
+_operation_tracker: Optional[OperationTracker] = None
+
+
+def get_operation_tracker() -> OperationTracker:
+    """Get the process-wide operation tracker"""
+    global _operation_tracker
+    if _operation_tracker is None:
+        _operation_tracker = OperationTracker()
+    return _operation_tracker
+
+
+async def close_operation_tracker():
+    """Stop and drop the process-wide operation tracker (on shutdown)"""
+    global _operation_tracker
+    if _operation_tracker is not None:
+        logger.info("operation_tracker_closing", **_operation_tracker.stats())
+        await _operation_tracker.close()
+    _operation_tracker = None
@@ -0,0 +1,587 @@
+"""
+Resource Provisioning Jobs
+"""
+import structlog
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+
+from github import GithubException
+
+from app.config import get_settings
+from app.models import (
+    CloudPlatform,
+    Operation,
+    OperationStatus,
+    RepoNameStatus,
+    ResourceCreationRequest,
+    ResourceCreationResponse,
+    ResourceStatus,
+    SharePointEntry
+)
+from app.services.azure_service import get_azure_service
+from app.services.github_service import get_github_service
+from app.services.inventory_service import get_inventory_service
+from app.services.operation_tracker import OperationCallback, get_operation_tracker
+from app.services.repo_name_index import get_repo_name_index
+from app.services.resource_store import get_resource_store, record_request
+from app.services.sharepoint_service import SharePointService
+from app.utils.steps import StepGraph, StepRun, StepTimings
+
+# Optional cloud service imports
+try:
+    from app.services.gcp_service import GCPService
+    GCP_AVAILABLE = True
+except ImportError:
+    GCP_AVAILABLE = False
+
+try:
+    from app.services.aws_service import AWSService
+    AWS_AVAILABLE = True
+except ImportError:
+    AWS_AVAILABLE = False
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+# Job names
+PROCESS_SHAREPOINT_UPDATE = "process_sharepoint_update"
+CREATE_RESOURCES = "create_resources"
+
+_step_timings = StepTimings()
+
+
+async def _ensure_repository(github_service, repo_name: str, **options) -> Tuple[str, bool]:
+    """
+    Create a repository, accepting one that already exists under the name
+    
+    A retried job may find the repository its earlier attempt created, so a
+    422 "already exists" counts as success if the repository can be read.
+    
+    Args:
+        github_service: GitHub service to create the repository with
+        repo_name: Repository name
+        **options: Further create_repository arguments
+    
+    Returns:
+        Tuple of (repository URL, whether this call created it)
+    
+    Raises:
+        GithubException: If creation fails for any other reason
+    """
+    try:
+        repo = await github_service.create_repository(repo_name=repo_name, **options)
+        return repo.html_url, True
+    except GithubException as e:
+        if e.status != 422:
+            raise
+        existing = await github_service.get_repository(repo_name)
+        if existing is None:
+            raise
+        logger.info("github_repository_already_exists", name=repo_name, url=existing.html_url)
+        return existing.html_url, False
+
+
+async def _discard_repository(github_service, run: StepRun, repo_name: str):
+    """Delete the repository a failed run created, so it is not left orphaned"""
+    url, created = run.results.get("github_repo", (None, False))
+    if not created:
+        return
+    if await github_service.delete_repository(repo_name):
+        logger.info("orphaned_github_repository_deleted", name=repo_name, url=url)
+    else:
+        logger.warning("orphaned_github_repository_not_deleted", name=repo_name, url=url)
+
+
+async def process_sharepoint_update(item_id: str):
+    """
+    Process a SharePoint list item: create its resource group and repository
+    
+    Marking the item In Progress, creating the resource group and creating
+    the repository run concurrently; a repository that already exists (left
+    by an earlier attempt) is reused, and one created for an item whose
+    resource group failed is deleted again. The final status is written
+    once all steps finish. Resource creation failures are recorded on the
+    item; if SharePoint does not accept the final status, an error is raised
+    so the job queue retries the item.
+    
+    Args:
+        item_id: SharePoint list item ID
+    """
+    try:
+        logger.info("processing_sharepoint_update", item_id=item_id)
+        
+        # Initialize services
+        sharepoint_service = SharePointService()
+        azure_service = get_azure_service()
+        github_service = get_github_service()
+        
+        # Get SharePoint item
+        entry = await sharepoint_service.get_item_by_id(item_id)
+        if not entry:
+            logger.error("sharepoint_item_not_found", item_id=item_id)
+            return
+        if entry.status == ResourceStatus.COMPLETED:
+            # Redelivered notification or retried job
+            logger.info("sharepoint_item_already_processed", item_id=item_id)
+            return
+        
+        async def mark_in_progress(run: StepRun):
+            # Intermediate status only: the final write below is the one that must succeed
+            if not await sharepoint_service.update_item_status(item_id, ResourceStatus.IN_PROGRESS):
+                logger.warning("sharepoint_mark_in_progress_failed", item_id=item_id)
+        
+        async def create_resource_group(run: StepRun) -> str:
+            logger.info("creating_azure_resource_group", name=entry.resource_group_name)
+            rg = await azure_service.create_resource_group(
+                resource_group_name=entry.resource_group_name,
+                tags={
+                    "ProjectName": entry.project_name,
+                    "CreatedBy": entry.user_name,
+                    "CreatedAt": entry.date_of_creation.isoformat()
+                }
+            )
+            return rg.id
+        
+        async def create_repository(run: StepRun) -> Tuple[str, bool]:
+            logger.info("creating_github_repository", name=entry.resource_group_name)
+            return await _ensure_repository(
+                github_service,
+                entry.resource_group_name,
+                description=f"{entry.project_name} - Created for {entry.user_name}",
+                auto_init=True
+            )
+        
+        async def record_outcome(run: StepRun):
+            azure_rg_id = run.results.get("resource_group")
+            github_repo_url, _ = run.results.get("github_repo", (None, False))
+            error = run.first_error()
+            
+            if error is None:
+                # Update SharePoint with success
+                updated = await sharepoint_service.update_item_status(
+                    item_id,
+                    ResourceStatus.COMPLETED,
+                    resource_id=azure_rg_id,
+                    github_repo_url=github_repo_url
+                )
+                if not updated:
+                    raise RuntimeError(f"SharePoint item {item_id} could not be marked Completed")
+                await record_request(entry.model_copy(update={
+                    "status": ResourceStatus.COMPLETED,
+                    "azure_resource_group_id": azure_rg_id,
+                    "github_repo_url": github_repo_url
+                }))
+                get_inventory_service().invalidate()
+                
+                logger.info(
+                    "sharepoint_update_processed_successfully",
+                    item_id=item_id,
+                    azure_rg_id=azure_rg_id,
+                    github_repo_url=github_repo_url
+                )
+                return
+            
+            error_message = str(error)
+            logger.error(
+                "resource_creation_failed",
+                item_id=item_id,
+                error=error_message
+            )
+            await _discard_repository(github_service, run, entry.resource_group_name)
+            
+            # Update SharePoint with failure
+            updated = await sharepoint_service.update_item_status(
+                item_id,
+                ResourceStatus.FAILED,
+                error_message=error_message
+            )
+            if not updated:
+                raise RuntimeError(f"SharePoint item {item_id} could not be marked Failed")
+            await record_request(entry.model_copy(update={
+                "status": ResourceStatus.FAILED,
+                "error_message": error_message
+            }))
+        
+        graph = (
+            StepGraph()
+            .add("mark_in_progress", mark_in_progress)
+            .add("resource_group", create_resource_group)
+            .add("github_repo", create_repository)
+            .add("record_outcome", record_outcome,
+                 after=["mark_in_progress", "resource_group", "github_repo"], always=True)
+        )
+        run = await graph.run()
+        _record_timings(PROCESS_SHAREPOINT_UPDATE, run, item_id=item_id)
+        if "record_outcome" in run.errors:
+            raise run.errors["record_outcome"]
+            
+    except Exception as e:
+        logger.error(
+            "process_sharepoint_update_failed",
+            item_id=item_id,
+            error=str(e)
+        )
+        raise
+
+
+async def _create_cloud_resource(
+    request: ResourceCreationRequest,
+    creation_time: datetime
+) -> Tuple[str, Optional[str]]:
+    """
+    Create the requested Azure resource group, GCP project or AWS account
+    
+    GCP projects are awaited through the operation tracker. AWS accounts take
+    minutes, so their creation request is tracked but not awaited.
+    
+    Args:
+        request: Resource creation request
+        creation_time: Timestamp recorded in the resource's tags
+    
+    Returns:
+        Tuple of (resource ID, ID of the operation still running or None)
+    """
+    # Route to appropriate cloud service based on platform
+    if request.cloud_platform == CloudPlatform.AZURE:
+        azure_service = get_azure_service()
+        tags = {
+            "ProjectName": request.project_name,
+            "CreatedBy": request.user_name,
+            "CreatedAt": creation_time.isoformat(),
+            **request.tags
+        } if request.tags else {
+            "ProjectName": request.project_name,
+            "CreatedBy": request.user_name,
+            "CreatedAt": creation_time.isoformat()
+        }
+        
+        logger.info("creating_azure_resource_group", name=request.resource_group_name)
+        rg = await azure_service.create_resource_group(
+            resource_group_name=request.resource_group_name,
+            location=request.location or "eastus",
+            tags=tags,
+            subscription_id=request.subscription_id
+        )
+        logger.info("azure_resource_group_created", id=rg.id)
+        return rg.id, None
+        
+    elif request.cloud_platform == CloudPlatform.GCP:
+        if not GCP_AVAILABLE:
+            raise RuntimeError("GCP support not available. Install google-cloud-resourcemanager.")
+        gcp_service = GCPService()
+        logger.info("creating_gcp_project", project_id=request.resource_group_name)
+        labels = {
+            "project-name": request.project_name.lower().replace(" ", "-"),
+            "created-by": request.user_name.lower().replace(" ", "-")
+        }
+        project = await gcp_service.create_project(
+            project_id=request.resource_group_name,
+            display_name=request.project_name,
+            labels=labels
+        )
+        logger.info("gcp_project_created", project_id=project["project_id"])
+        return project["project_id"], None
+        
+    elif request.cloud_platform == CloudPlatform.AWS:
+        if not AWS_AVAILABLE:
+            raise RuntimeError("AWS support not available. Install boto3.")
+        aws_service = AWSService()
+        logger.info("creating_aws_account", account_name=request.project_name)
+        # For AWS, we need an email address - could be derived from user or passed in
+        email = request.tags.get("email") if request.tags else f"{request.user_name.lower().replace(' ', '.')}@example.com"
+        account = await aws_service.create_account(
+            account_name=request.project_name,
+            email=email,
+            tags=[{"Key": "CreatedBy", "Value": request.user_name}] if request.tags is None else [
+                {"Key": k, "Value": v} for k, v in request.tags.items()
+            ]
+        )
+        resource_id = account.get("account_id") or account["request_id"]
+        logger.info("aws_account_created", account_id=resource_id, operation_id=account["operation_id"])
+        return resource_id, account["operation_id"]
+
+
+async def repository_name_conflict(name: str) -> Optional[str]:
+    """
+    Check a repository name against the repository name index before any work starts
+    
+    Only the in-memory index is consulted; if it is due for a refresh, one
+    is started in the background (the index is first built at startup).
+    Until that first build completes, the name is looked up directly with a
+    single (conditional) read. If that read fails the check passes and
+    GitHub decides as before.
+    
+    Args:
+        name: Proposed repository name
+    
+    Returns:
+        Error message if the repository already exists, otherwise None
+    """
+    index = get_repo_name_index()
+    try:
+        github_service = get_github_service()
+        index.refresh_in_background(github_service)
+        if not index.is_built and await github_service.get_repository(name) is None:
+            return None
+    except Exception as e:
+        logger.warning("repo_name_index_unavailable", error=str(e))
+        return None
+    
+    if index.is_built and index.check([name])[name] != RepoNameStatus.TAKEN:
+        return None
+    return f"GitHub repository '{name}' already exists"
+
+
+async def create_resources(request: ResourceCreationRequest) -> ResourceCreationResponse:
+    """
+    Create cloud resources (Azure/GCP/AWS) and optionally a GitHub repository
+    
+    If SharePoint is enabled, also creates an entry there and keeps its status
+    current. The SharePoint entry, the cloud resource and the repository are
+    created concurrently; if the request fails, a repository it created is
+    deleted again. The entry's final status is written once all steps have
+    finished.
+    
+    Args:
+        request: Resource creation request
+    
+    Returns:
+        ResourceCreationResponse with the outcome
+    """
+    logger.info("manual_resource_creation_requested",
+               platform=request.cloud_platform,
+               resource_type=request.resource_type,
+               request=request.model_dump())
+    
+    if request.create_github_repo:
+        conflict = await repository_name_conflict(request.resource_group_name)
+        if conflict:
+            logger.warning("resource_creation_rejected", reason=conflict)
+            return ResourceCreationResponse(
+                status=ResourceStatus.FAILED,
+                resource_group_name=request.resource_group_name,
+                message=f"Failed: {conflict}"
+            )
+    
+    sharepoint_enabled = settings.SHAREPOINT_ENABLED and settings.SHAREPOINT_SITE_URL
+    entry = SharePointEntry(
+        user_name=request.user_name,
+        cloud_platform=request.cloud_platform,
+        resource_type=request.resource_type,
+        resource_group_name=request.resource_group_name,
+        project_name=request.project_name,
+        status=ResourceStatus.IN_PROGRESS
+    )
+    creation_time = datetime.utcnow()
+    
+    async def create_sharepoint_item(run: StepRun) -> Optional[str]:
+        try:
+            item_id = await SharePointService().create_item(entry)
+            logger.info("sharepoint_entry_created", item_id=item_id)
+            return item_id
+        except Exception as sp_error:
+            logger.warning("sharepoint_entry_creation_failed", error=str(sp_error))
+            # Continue without SharePoint
+            return None
+    
+    async def create_cloud_resource(run: StepRun) -> Tuple[str, Optional[str]]:
+        return await _create_cloud_resource(request, creation_time)
+    
+    async def create_repository(run: StepRun) -> Tuple[str, bool]:
+        logger.info("creating_github_repository", name=request.resource_group_name)
+        url, created = await _ensure_repository(
+            get_github_service(),
+            request.resource_group_name,
+            description=f"{request.project_name} ({request.cloud_platform.value}) - Created for {request.user_name}"
+        )
+        logger.info("github_repository_created", url=url)
+        return url, created
+    
+    graph = StepGraph()
+    if sharepoint_enabled:
+        graph.add("sharepoint_item", create_sharepoint_item)
+    graph.add("cloud_resource", create_cloud_resource)
+    if request.create_github_repo:
+        graph.add("github_repo", create_repository)
+    run = await graph.run()
+    
+    item_id = run.results.get("sharepoint_item")
+    resource_id, operation_id = run.results.get("cloud_resource", (None, None))
+    github_repo_url, _ = run.results.get("github_repo", (None, False))
+    error = run.first_error()
+    error_message = str(error) if error else None
+    status = ResourceStatus.FAILED if error else ResourceStatus.COMPLETED
+    if error:
+        logger.error("resource_creation_failed", error=error_message)
+        await _discard_repository(get_github_service(), run, request.resource_group_name)
+        github_repo_url = None
+    elif operation_id:
+        # AWS account still being created; its completion is pushed to SharePoint and the store
+        status = ResourceStatus.IN_PROGRESS
+    
+    # Update SharePoint entry if it was created
+    if item_id and settings.SHAREPOINT_ENABLED:
+        started = time.monotonic()
+        try:
+            sharepoint_service = SharePointService()
+            await sharepoint_service.update_item_status(
+                item_id,
+                status,
+                resource_id=resource_id,
+                github_repo_url=github_repo_url,
+                error_message=error_message
+            )
+        except Exception as sp_error:
+            logger.warning("sharepoint_update_failed", error=str(sp_error))
+        run.timings["sharepoint_status"] = time.monotonic() - started
+        run.elapsed += run.timings["sharepoint_status"]
+        
+        stored_entry = entry.model_copy(update={
+            "id": item_id,
+            "status": status,
+            "resource_id": resource_id,
+            "azure_resource_group_id": resource_id if request.cloud_platform == CloudPlatform.AZURE else None,
+            "github_repo_url": github_repo_url,
+            "error_message": error_message,
+            "subscription_id": request.subscription_id
+        })
+        await record_request(stored_entry)
+        if status == ResourceStatus.IN_PROGRESS:
+            get_operation_tracker().add_callback(operation_id, record_account_creation(stored_entry))
+    _record_timings(CREATE_RESOURCES, run)
+    
+    if status == ResourceStatus.COMPLETED:
+        get_inventory_service().invalidate()
+    
+    return ResourceCreationResponse(
+        status=status,
+        resource_group_id=resource_id,
+        resource_group_name=request.resource_group_name if resource_id else None,
+        github_repo_url=github_repo_url,
+        sharepoint_item_id=item_id,
+        operation_id=operation_id,
+        message=_creation_message(status, error_message, operation_id)
+    )
+
+
+def _creation_message(status: ResourceStatus, error_message: Optional[str], operation_id: Optional[str]) -> str:
+    """Summarize a create_resources outcome"""
+    if status == ResourceStatus.COMPLETED:
+        return "Resources created successfully"
+    if status == ResourceStatus.IN_PROGRESS:
+        return f"Account creation in progress; follow /api/operations/{operation_id}"
+    return f"Failed: {error_message}"
+
+
+def record_account_creation(entry: SharePointEntry) -> OperationCallback:
+    """
+    Build a callback writing a finished AWS account creation back to its request
+    
+    The SharePoint item and stored request get the final account ID, or the
+    failure reason, in place of the create-account request ID.
+    
+    Args:
+        entry: Stored request (with SharePoint item ID) recorded while the account was created
+    
+    Returns:
+        Coroutine function for OperationTracker.add_callback
+    """
+    async def record(operation: Operation):
+        succeeded = operation.status == OperationStatus.SUCCEEDED
+        status = ResourceStatus.COMPLETED if succeeded else ResourceStatus.FAILED
+        resource_id = operation.result["account_id"] if succeeded else entry.resource_id
+        error_message = None if succeeded else operation.error
+        
+        if settings.SHAREPOINT_ENABLED:
+            try:
+                await SharePointService().update_item_status(
+                    entry.id,
+                    status,
+                    resource_id=resource_id,
+                    github_repo_url=entry.github_repo_url,
+                    error_message=error_message
+                )
+            except Exception as sp_error:
+                logger.warning("sharepoint_update_failed", item_id=entry.id, error=str(sp_error))
+        
+        await record_request(entry.model_copy(update={
+            "status": status,
+            "resource_id": resource_id,
+            "error_message": error_message
+        }))
+        if succeeded:
+            get_inventory_service().invalidate()
+        logger.info(
+            "aws_account_creation_recorded",
+            item_id=entry.id,
+            status=status.value,
+            account_id=resource_id,
+            error=error_message
+        )
+    
+    return record
+
+
+async def resume_account_creations() -> int:
+    """
+    Follow AWS account creations a previous process left In Progress
+    
+    Returns:
+        Number of create-account requests tracked again
+    """
+    store = get_resource_store()
+    if store is None or not AWS_AVAILABLE:
+        return 0
+    try:
+        entries = await store.list_requests(CloudPlatform.AWS, ResourceStatus.IN_PROGRESS)
+        pending = [entry for entry in entries if entry.resource_id and entry.resource_id.startswith("car-")]
+        if not pending:
+            return 0
+        aws_service = AWSService()
+    except Exception as e:
+        logger.warning("aws_account_creation_resume_failed", error=str(e))
+        return 0
+    
+    tracker = get_operation_tracker()
+    for entry in pending:
+        operation = aws_service.track_account_creation(entry.resource_id, entry.project_name)
+        tracker.add_callback(operation.id, record_account_creation(entry))
+    logger.info("aws_account_creations_resumed", count=len(pending))
+    return len(pending)
+
+
+def _record_timings(name: str, run: StepRun, **context):
+    """Log a run's step timings and add them to the provisioning metrics"""
+    _step_timings.record(name, run)
+    logger.info(
+        "provisioning_steps_timed",
+        job=name,
+        elapsed_ms=round(run.elapsed * 1000, 2),
+        steps={step: round(seconds * 1000, 2) for step, seconds in run.timings.items()},
+        failed=sorted(run.errors),
+        skipped=run.skipped,
+        **context
+    )
+
+
+def step_stats() -> dict:
+    """Return provisioning step timings aggregated since startup"""
+    return _step_timings.stats()
+
+
+async def _run_process_sharepoint_update(payload: dict) -> None:
+    """Job handler for process_sharepoint_update"""
+    await process_sharepoint_update(payload["item_id"])
+
+
+async def _run_create_resources(payload: dict) -> dict:
+    """Job handler for create_resources; the response is stored as the job result"""
+    response = await create_resources(ResourceCreationRequest(**payload))
+    return response.model_dump(mode="json")
+
+
+JOB_HANDLERS = {
+    PROCESS_SHAREPOINT_UPDATE: _run_process_sharepoint_update,
+    CREATE_RESOURCES: _run_create_resources
+}
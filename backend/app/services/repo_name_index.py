@@ -0,0 +1,218 @@
+"""
+GitHub Repository Name Index
+"""
+import asyncio
+import re
+import time
+import structlog
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Set
+
+from app.config import get_settings
+from app.models import RepoNameStatus
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+# Letters, digits, '.', '-' and '_'; GitHub replaces other characters with '-'
+_VALID_NAME = re.compile(r"[A-Za-z0-9._-]{1,100}")
+
+# Incremental listings reach this far behind the previous one, covering clock skew
+LISTING_OVERLAP = timedelta(minutes=5)
+
+
+class RepoNameIndex:
+    """In-memory set of the repository names taken in the GitHub owner"""
+    
+    def __init__(self, ttl: Optional[float] = None, full_refresh: Optional[float] = None):
+        """
+        Initialize an empty index
+        
+        The first refresh lists every repository. Later refreshes, once the
+        index is older than ttl, list only repositories created since the
+        previous one (newest first, so usually a single page); every
+        full_refresh seconds the whole list is reloaded to drop repositories
+        deleted or renamed elsewhere. Repositories created or deleted through
+        GitHubService are applied at once.
+        
+        Args:
+            ttl: Seconds before checks trigger an incremental refresh (defaults to settings)
+            full_refresh: Seconds between full reloads (defaults to settings)
+        """
+        self.ttl = ttl if ttl is not None else settings.GITHUB_REPO_INDEX_TTL_SECONDS
+        self.full_refresh = full_refresh or settings.GITHUB_REPO_INDEX_FULL_REFRESH_SECONDS
+        # GitHub repository names are case-insensitive
+        self._names: Set[str] = set()
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._listed_at: Optional[datetime] = None  # When the last listing started (UTC)
+        self.built_at: Optional[float] = None
+        self.refreshed_at: Optional[float] = None
+        self.full_loads = 0
+        self.incremental_refreshes = 0
+        self.refresh_failures = 0
+        self.names_checked = 0
+    
+    @property
+    def is_built(self) -> bool:
+        """True once every repository name has been loaded"""
+        return self.built_at is not None
+    
+    def _refresh_due(self) -> Optional[bool]:
+        """Return True if a full reload is due, False if an incremental refresh is, None if neither"""
+        now = time.monotonic()
+        if self.built_at is None or now - self.built_at >= self.full_refresh:
+            return True
+        if now - self.refreshed_at >= self.ttl:
+            return False
+        return None
+    
+    async def ensure_fresh(self, service=None):
+        """
+        Refresh the index if it is older than the TTL
+        
+        Concurrent callers share one refresh. If a refresh fails after the
+        index was built, the existing names keep being served until the TTL
+        passes again.
+        
+        Args:
+            service: GitHub service to list repositories with (defaults to get_github_service())
+        
+        Raises:
+            GithubException: If the index was never built and listing failed
+        """
+        async with self._lock:
+            full = self._refresh_due()
+            if full is None:
+                return
+            
+            try:
+                await self._refresh(service, full)
+            except Exception as e:
+                self.refresh_failures += 1
+                if not self.is_built:
+                    raise
+                self.refreshed_at = time.monotonic()
+                logger.warning("repo_name_index_refresh_failed", full=full, error=str(e))
+    
+    def refresh_in_background(self, service=None) -> Optional[asyncio.Task]:
+        """
+        Start ensure_fresh in a background task if a refresh is due
+        
+        Request handlers call this instead of awaiting ensure_fresh, so no
+        request waits for a listing (a full one pages every repository).
+        At most one background refresh runs at a time.
+        
+        Args:
+            service: GitHub service to list repositories with (defaults to get_github_service())
+        
+        Returns:
+            The running refresh task, or None if the index is fresh
+        """
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return self._refresh_task
+        if self._refresh_due() is None:
+            return None
+        self._refresh_task = asyncio.create_task(self._refresh_quietly(service))
+        return self._refresh_task
+    
+    async def close(self):
+        """Cancel a running background refresh"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+    
+    async def _refresh_quietly(self, service):
+        """Run ensure_fresh, logging instead of raising"""
+        try:
+            await self.ensure_fresh(service)
+        except Exception as e:
+            logger.warning("repo_name_index_build_failed", error=str(e))
+    
+    def add(self, name: str):
+        """Record a repository that now exists"""
+        self._names.add(name.lower())
+    
+    def remove(self, name: str):
+        """Record a repository that no longer exists"""
+        self._names.discard(name.lower())
+    
+    def check(self, names: Iterable[str]) -> Dict[str, RepoNameStatus]:
+        """
+        Check proposed repository names against the index
+        
+        Args:
+            names: Proposed names
+        
+        Returns:
+            Status per distinct name, in input order
+        """
+        results: Dict[str, RepoNameStatus] = {}
+        seen: Set[str] = set()
+        for name in names:
+            if name in results:
+                continue
+            key = name.lower()
+            if key in seen:
+                results[name] = RepoNameStatus.DUPLICATE
+            elif not _VALID_NAME.fullmatch(name) or name in (".", ".."):
+                results[name] = RepoNameStatus.INVALID
+            elif key in self._names:
+                results[name] = RepoNameStatus.TAKEN
+            else:
+                results[name] = RepoNameStatus.AVAILABLE
+            seen.add(key)
+        self.names_checked += len(results)
+        return results
+    
+    def stats(self) -> dict:
+        """Return index size, age and refresh counters"""
+        return {
+            "names": len(self._names),
+            "age_seconds": round(time.monotonic() - self.refreshed_at, 1) if self.refreshed_at else None,
+            "full_loads": self.full_loads,
+            "incremental_refreshes": self.incremental_refreshes,
+            "refresh_failures": self.refresh_failures,
+            "names_checked": self.names_checked
+        }
+    
+    async def _refresh(self, service, full: bool):
+        """List repositories (all, or those created since the last listing) into the index"""
+        if service is None:
+            from app.services.github_service import get_github_service
+            service = get_github_service()
+        
+        listed_at = datetime.now(timezone.utc)
+        created_after = None if full else self._listed_at - LISTING_OVERLAP
+        names = await service.list_repository_names(created_after=created_after)
+        
+        if full:
+            self._names = {name.lower() for name in names}
+            self.built_at = time.monotonic()
+            self.full_loads += 1
+        else:
+            self._names.update(name.lower() for name in names)
+            self.incremental_refreshes += 1
+        self._listed_at = listed_at
+        self.refreshed_at = time.monotonic()
+        logger.info("repo_name_index_refreshed", full=full, listed=len(names), size=len(self._names))
+
+
+_repo_name_index: Optional[RepoNameIndex] = None
+
+
+def get_repo_name_index() -> RepoNameIndex:
+    """Get the process-wide repository name index"""
+    global _repo_name_index
+    if _repo_name_index is None:
+        _repo_name_index = RepoNameIndex()
+    return _repo_name_index
+
+
+async def close_repo_name_index():
+    """Stop the process-wide index's background refresh and drop it (on shutdown)"""
+    global _repo_name_index
+    if _repo_name_index is not None:
+        await _repo_name_index.close()
+        _repo_name_index = None
@@ -0,0 +1,147 @@
+"""
+Azure Resource Graph Inventory Service
+"""
+import asyncio
+import inspect
+import httpx
+import structlog
+from typing import AsyncIterator, Optional
+
+from app.config import get_settings
+from app.models import AzureResourceGroup, ResourceGroupInventory, SubscriptionFailure
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+RESOURCE_GRAPH_API_VERSION = "2021-03-01"
+RESOURCE_GRAPH_SCOPE = "https://management.azure.com/.default"
+RESOURCE_GROUPS_QUERY = (
+    "ResourceContainers"
+    " | where type == 'microsoft.resources/subscriptions/resourcegroups'"
+    " | project id, name, location, tags, subscriptionId,"
+    " provisioningState = tostring(properties.provisioningState)"
+)
+
+
+class ResourceGraphService:
+    """Service for cross-subscription inventory queries via Azure Resource Graph"""
+    
+    def __init__(self, credential, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Initialize Resource Graph service
+        
+        Args:
+            credential: Azure credential (sync or aio) used to acquire ARM tokens
+            transport: Optional httpx transport (used by tests to plug in a fake endpoint)
+        """
+        self.credential = credential
+        self.transport = transport
+        self.url = (
+            f"{settings.AZURE_RESOURCE_GRAPH_ENDPOINT.rstrip('/')}"
+            f"/providers/Microsoft.ResourceGraph/resources"
+        )
+    
+    async def list_resource_groups(self) -> ResourceGroupInventory:
+        """
+        List resource groups in all accessible subscriptions with one paged query
+        
+        Returns:
+            ResourceGroupInventory built from the query rows
+        """
+        inventory = ResourceGroupInventory()
+        async for resource_groups in self.iter_resource_groups(inventory):
+            inventory.resource_groups.extend(resource_groups)
+        return inventory
+    
+    async def iter_resource_groups(
+        self,
+        inventory: Optional[ResourceGroupInventory] = None
+    ) -> AsyncIterator[list[AzureResourceGroup]]:
+        """
+        Yield resource groups page by page, following skip tokens
+        
+        Args:
+            inventory: Optional accumulator; subscriptions_total is updated as pages arrive,
+                and a failed query is recorded in failed_subscriptions so the listing reads as partial
+        
+        Yields:
+            Lists of AzureResourceGroup models, one per result page
+        """
+        inventory = inventory if inventory is not None else ResourceGroupInventory()
+        try:
+            if inspect.iscoroutinefunction(self.credential.get_token):
+                token = await self.credential.get_token(RESOURCE_GRAPH_SCOPE)
+            else:
+                token = await asyncio.to_thread(self.credential.get_token, RESOURCE_GRAPH_SCOPE)
+            headers = {"Authorization": f"Bearer {token.token}"}
+            
+            subscription_ids = set()
+            skip_token = None
+            pages = 0
+            total = 0
+            
+            async with httpx.AsyncClient(transport=self.transport, timeout=60.0) as client:
+                while True:
+                    options = {
+                        "resultFormat": "objectArray",
+                        "$top": settings.AZURE_RESOURCE_GRAPH_PAGE_SIZE
+                    }
+                    if skip_token:
+                        options["$skipToken"] = skip_token
+                    
+                    response = await client.post(
+                        self.url,
+                        params={"api-version": RESOURCE_GRAPH_API_VERSION},
+                        headers=headers,
+                        json={"query": RESOURCE_GROUPS_QUERY, "options": options}
+                    )
+                    response.raise_for_status()
+                    body = response.json()
+                    pages += 1
+                    
+                    rows = body.get("data", [])
+                    subscription_ids.update(row["subscriptionId"] for row in rows if row.get("subscriptionId"))
+                    inventory.subscriptions_total = len(subscription_ids)
+                    total += len(rows)
+                    if rows:
+                        yield [self._row_to_resource_group(row) for row in rows]
+                    
+                    skip_token = body.get("$skipToken")
+                    if not skip_token:
+                        break
+            
+            inventory.completed = True
+            logger.info(
+                "resource_graph_query_completed",
+                total_count=total,
+                subscriptions=len(subscription_ids),
+                pages=pages
+            )
+            
+        except Exception as e:
+            # Token, HTTP or decoding failure: rows already yielded are only part of the listing
+            logger.error("resource_graph_query_failed", error=str(e))
+            inventory.failed_subscriptions.append(SubscriptionFailure(
+                subscription_id="*",
+                reason="resource_graph_error",
+                error=str(e)
+            ))
+    
+    @staticmethod
+    def _row_to_resource_group(row: dict) -> AzureResourceGroup:
+        """
+        Convert a Resource Graph row to AzureResourceGroup model
+        
+        Args:
+            row: Row from an objectArray result
+        
+        Returns:
+            AzureResourceGroup model
+        """
+        return AzureResourceGroup(
+            id=row["id"],
+            name=row["name"],
+            location=row.get("location") or "",
+            tags=row.get("tags") or {},
+            provisioning_state=row.get("provisioningState") or "Succeeded"
+        )
@@ -0,0 +1,383 @@
+"""
+Persistent Resource Store
+"""
+import asyncio
+import structlog
+from datetime import datetime
+from enum import Enum
+from typing import TYPE_CHECKING, List, NamedTuple, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import get_settings
+from app.database import (
+    Base,
+    ChangeTokenRecord,
+    DiscoveredResourceRecord,
+    InventorySyncRecord,
+    ResourceRequestRecord,
+    get_sessionmaker,
+    close_engine
+)
+from app.models import CloudPlatform, ResourceStatus, ResourceType, SharePointEntry
+from app.utils.dates import to_naive_utc
+
+if TYPE_CHECKING:
+    from app.services.inventory_service import InventorySnapshot
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+# Inventory source -> table holding its rows
+SOURCE_MODELS = {
+    "sharepoint": ResourceRequestRecord,
+    "azure": DiscoveredResourceRecord
+}
+
+# Inventory row keys, in the order the API returns them
+ROW_FIELDS = (
+    "id",
+    "user_name",
+    "resource_group_name",
+    "date_of_creation",
+    "project_name",
+    "status",
+    "azure_resource_group_id",
+    "github_repo_url",
+    "error_message",
+    "cloud_platform",
+    "location"
+)
+
+# Each platform currently has a single resource type
+DEFAULT_RESOURCE_TYPES = {
+    CloudPlatform.AZURE.value: ResourceType.AZURE_RESOURCE_GROUP,
+    CloudPlatform.GCP.value: ResourceType.GCP_PROJECT,
+    CloudPlatform.AWS.value: ResourceType.AWS_ACCOUNT
+}
+
+_UPSERT_CHUNK_SIZE = 500
+
+
+class StoredInventory(NamedTuple):
+    """Inventory rows loaded from the store"""
+    rows: List[dict]
+    headers: dict
+    synced_at: datetime
+    complete: bool
+
+
+def _plain(value):
+    """Store enum members by value"""
+    return value.value if isinstance(value, Enum) else value
+
+
+class ResourceStore:
+    """SQLAlchemy-backed store for resource requests and discovered resources"""
+    
+    def __init__(self, sessionmaker: async_sessionmaker):
+        """
+        Initialize store
+        
+        Args:
+            sessionmaker: Async session factory bound to the database engine
+        """
+        self._sessionmaker = sessionmaker
+        self._tables_ready = not settings.DATABASE_CREATE_TABLES
+        self._tables_lock = asyncio.Lock()
+        self.reads = 0
+        self.writes = 0
+        self.request_hits = 0
+        self.request_misses = 0
+    
+    async def create_tables(self):
+        """Create missing tables (local development; production uses Alembic migrations)"""
+        if self._tables_ready:
+            return
+        async with self._tables_lock:
+            if not self._tables_ready:
+                engine = self._sessionmaker.kw["bind"]
+                async with engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.create_all)
+                self._tables_ready = True
+    
+    async def replace_source(self, snapshot: "InventorySnapshot", complete: bool = True):
+        """
+        Persist a freshly loaded inventory snapshot
+        
+        Rows are upserted; after a complete listing, rows of the source that
+        were not seen are deleted. A complete listing with no rows never
+        empties a non-empty table: that is far more likely a failed listing
+        than a source that lost everything.
+        
+        Args:
+            snapshot: InventorySnapshot with rows from the live source
+            complete: False if the listing was partial; stale rows are then kept
+        """
+        await self.create_tables()
+        model = SOURCE_MODELS[snapshot.source]
+        synced_at = datetime.utcnow()
+        values = [
+            self._row_values(model, row, created_at, synced_at)
+            for row, created_at in zip(snapshot.rows, snapshot.created_at)
+        ]
+        
+        async with self._sessionmaker() as session:
+            for start in range(0, len(values), _UPSERT_CHUNK_SIZE):
+                await session.execute(self._upsert(session, model, values[start:start + _UPSERT_CHUNK_SIZE]))
+            if complete and not values and (await session.execute(select(model).limit(1))).first():
+                logger.warning("inventory_store_prune_refused", source=snapshot.source)
+                complete = False
+            if complete:
+                await session.execute(delete(model).where(model.synced_at < synced_at))
+            await session.merge(InventorySyncRecord(
+                source=snapshot.source,
+                synced_at=synced_at,
+                row_count=len(values),
+                complete=complete,
+                headers=snapshot.headers
+            ))
+            await session.commit()
+        
+        self.writes += 1
+        logger.info("inventory_stored", source=snapshot.source, count=len(values), complete=complete)
+    
+    async def load_source(self, source: str) -> Optional[StoredInventory]:
+        """
+        Load the last synced inventory for a source
+        
+        Args:
+            source: "sharepoint" or "azure"
+        
+        Returns:
+            StoredInventory, or None if the source was never synced
+        """
+        await self.create_tables()
+        model = SOURCE_MODELS[source]
+        async with self._sessionmaker() as session:
+            sync = await session.get(InventorySyncRecord, source)
+            if sync is None:
+                return None
+            result = await session.execute(
+                select(model).order_by(model.created_at.is_(None), model.created_at.desc(), model.id)
+            )
+            rows = [self._record_to_row(record) for record in result.scalars()]
+        
+        self.reads += 1
+        return StoredInventory(rows, sync.headers or {}, sync.synced_at, sync.complete)
+    
+    async def get_request(self, item_id: str) -> Optional[SharePointEntry]:
+        """
+        Get a resource request by SharePoint item ID
+        
+        Args:
+            item_id: SharePoint list item ID
+        
+        Returns:
+            SharePointEntry, or None if not stored
+        """
+        await self.create_tables()
+        async with self._sessionmaker() as session:
+            record = await session.get(ResourceRequestRecord, str(item_id))
+        
+        if record is None:
+            self.request_misses += 1
+            return None
+        self.request_hits += 1
+        return self._record_to_entry(record)
+    
+    async def list_requests(self, cloud_platform: CloudPlatform, status: ResourceStatus) -> List[SharePointEntry]:
+        """
+        List resource requests of one platform in one status
+        
+        Args:
+            cloud_platform: Platform to match
+            status: Status to match (e.g. In Progress)
+        
+        Returns:
+            Matching SharePointEntry models
+        """
+        await self.create_tables()
+        async with self._sessionmaker() as session:
+            result = await session.execute(
+                select(ResourceRequestRecord).where(
+                    ResourceRequestRecord.cloud_platform == cloud_platform.value,
+                    ResourceRequestRecord.status == status.value
+                )
+            )
+            entries = [self._record_to_entry(record) for record in result.scalars()]
+        
+        self.reads += 1
+        return entries
+    
+    async def upsert_request(self, entry: SharePointEntry):
+        """
+        Insert or update a resource request
+        
+        Args:
+            entry: SharePointEntry with its SharePoint item ID set
+        """
+        await self.create_tables()
+        values = {
+            "id": str(entry.id),
+            "user_name": entry.user_name,
+            "cloud_platform": _plain(entry.cloud_platform),
+            "resource_type": _plain(entry.resource_type),
+            "resource_group_name": entry.resource_group_name,
+            "project_name": entry.project_name,
+            "status": _plain(entry.status),
+            "location": None,
+            "created_at": to_naive_utc(entry.date_of_creation) if entry.date_of_creation else None,
+            "azure_resource_group_id": entry.azure_resource_group_id,
+            "resource_id": entry.resource_id,
+            "github_repo_url": entry.github_repo_url,
+            "error_message": entry.error_message,
+            "subscription_id": entry.subscription_id,
+            "synced_at": datetime.utcnow()
+        }
+        async with self._sessionmaker() as session:
+            await session.execute(self._upsert(session, ResourceRequestRecord, [values]))
+            await session.commit()
+        self.writes += 1
+    
+    async def get_change_token(self, list_key: str) -> Optional[str]:
+        """
+        Get the last processed SharePoint change token for a list
+        
+        Args:
+            list_key: Site URL and list name identifying the list
+        
+        Returns:
+            Serialized change token, or None if none was stored
+        """
+        await self.create_tables()
+        async with self._sessionmaker() as session:
+            record = await session.get(ChangeTokenRecord, list_key)
+        self.reads += 1
+        return record.change_token if record else None
+    
+    async def set_change_token(self, list_key: str, change_token: str):
+        """
+        Store the last processed SharePoint change token for a list
+        
+        Args:
+            list_key: Site URL and list name identifying the list
+            change_token: Serialized change token
+        """
+        await self.create_tables()
+        async with self._sessionmaker() as session:
+            await session.merge(ChangeTokenRecord(
+                list_key=list_key,
+                change_token=change_token,
+                updated_at=datetime.utcnow()
+            ))
+            await session.commit()
+        self.writes += 1
+    
+    def stats(self) -> dict:
+        """Return store counters"""
+        return {
+            "reads": self.reads,
+            "writes": self.writes,
+            "request_hits": self.request_hits,
+            "request_misses": self.request_misses
+        }
+    
+    @staticmethod
+    def _row_values(model, row: dict, created_at: Optional[datetime], synced_at: datetime) -> dict:
+        """
+        Map an inventory row onto table columns
+        
+        Only columns carried by rows are set, so upserts keep request details
+        (resource type, resource ID, subscription) written by upsert_request.
+        """
+        columns = model.__table__.columns
+        values = {key: _plain(row.get(key)) for key in ROW_FIELDS if key in columns}
+        values["id"] = str(row["id"])
+        values["created_at"] = created_at
+        values["synced_at"] = synced_at
+        return values
+    
+    @staticmethod
+    def _record_to_entry(record: ResourceRequestRecord) -> SharePointEntry:
+        """Convert a resource request record to a SharePointEntry"""
+        return SharePointEntry(
+            id=record.id,
+            user_name=record.user_name,
+            cloud_platform=record.cloud_platform,
+            resource_type=record.resource_type or DEFAULT_RESOURCE_TYPES[record.cloud_platform],
+            resource_group_name=record.resource_group_name,
+            date_of_creation=record.created_at,
+            project_name=record.project_name,
+            status=record.status,
+            azure_resource_group_id=record.azure_resource_group_id,
+            resource_id=record.resource_id,
+            github_repo_url=record.github_repo_url,
+            error_message=record.error_message,
+            subscription_id=record.subscription_id
+        )
+    
+    @staticmethod
+    def _record_to_row(record) -> dict:
+        """Convert a stored record back to an inventory row"""
+        row = {key: getattr(record, key, None) for key in ROW_FIELDS if key != "date_of_creation"}
+        row["date_of_creation"] = record.created_at.isoformat() if record.created_at else None
+        return {key: row[key] for key in ROW_FIELDS}
+    
+    @staticmethod
+    def _upsert(session, model, values: List[dict]):
+        """Build an INSERT ... ON CONFLICT (id) DO UPDATE for SQLite or PostgreSQL"""
+        dialect = session.bind.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise ValueError(f"Unsupported database dialect: {dialect}")
+        
+        statement = insert(model).values(values)
+        return statement.on_conflict_do_update(
+            index_elements=["id"],
+            set_={column: statement.excluded[column] for column in values[0] if column != "id"}
+        )
+
+
+_resource_store: Optional[ResourceStore] = None
+
+
+def get_resource_store() -> Optional[ResourceStore]:
+    """Get the process-wide resource store, or None if no DATABASE_URL is configured"""
+    global _resource_store
+    if _resource_store is None:
+        sessionmaker = get_sessionmaker()
+        if sessionmaker is None:
+            return None
+        _resource_store = ResourceStore(sessionmaker)
+    return _resource_store
+
+
+async def close_resource_store():
+    """Close the process-wide resource store (on application shutdown)"""
+    global _resource_store
+    _resource_store = None
+    await close_engine()
+
+
+async def record_request(entry: SharePointEntry):
+    """
+    Write a resource request through to the store, if one is configured
+    
+    Failures are logged and never fail the caller; the next inventory sync
+    repairs the stored copy.
+    
+    Args:
+        entry: SharePointEntry with its SharePoint item ID set
+    """
+    store = get_resource_store()
+    if store is None or not entry.id:
+        return
+    try:
+        await store.upsert_request(entry)
+    except Exception as e:
+        logger.warning("resource_store_write_failed", item_id=entry.id, error=str(e))
@@ -0,0 +1,169 @@
+"""
+SharePoint Write Batching
+"""
+import asyncio
+import structlog
+from typing import List, Optional, Tuple
+
+from app.config import get_settings
+from app.services.sharepoint_service import ItemWrite, SharePointService
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+class SharePointWriteBatcher:
+    """Gathers item creates and updates from concurrent callers into $batch requests"""
+    
+    def __init__(self, sharepoint_service: SharePointService, window: float, max_operations: int):
+        """
+        Initialize batcher
+        
+        Writes submitted within window seconds of the first pending write are
+        sent together; a batch is sent early once max_operations are pending.
+        Writes SharePoint rejects inside a batch, or all writes of a batch
+        request that failed as a whole, are retried one request each.
+        
+        Args:
+            sharepoint_service: Service whose context sends the requests
+            window: Seconds writes are gathered before a batch is sent
+            max_operations: Maximum writes per batch request
+        """
+        self._service = sharepoint_service
+        self.window = window
+        self.max_operations = max_operations
+        self._pending: List[Tuple[ItemWrite, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._flushes = set()
+        # The client context is not thread-safe; one request at a time
+        self._lock = asyncio.Lock()
+        self.operations = 0
+        self.batches = 0
+        self.batched_operations = 0
+        self.fallback_operations = 0
+        self.failed_operations = 0
+    
+    async def submit(self, write: ItemWrite) -> str:
+        """
+        Queue a write and wait until it is applied
+        
+        Args:
+            write: Item create or update
+        
+        Returns:
+            ID of the created or updated item
+        
+        Raises:
+            Exception: If SharePoint rejected the write
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((write, future))
+        self.operations += 1
+        
+        if len(self._pending) >= self.max_operations:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_window())
+        return await future
+    
+    async def flush(self):
+        """Send all pending writes now"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            await self._flush_pending()
+        await asyncio.gather(*self._flushes, return_exceptions=True)
+    
+    async def close(self):
+        """Send pending writes (on shutdown)"""
+        await self.flush()
+    
+    def stats(self) -> dict:
+        """Return batching counters"""
+        return {
+            "window_seconds": self.window,
+            "max_operations": self.max_operations,
+            "operations": self.operations,
+            "batches": self.batches,
+            "batched_operations": self.batched_operations,
+            "avg_batch_size": round(self.batched_operations / self.batches, 2) if self.batches else 0.0,
+            "fallback_operations": self.fallback_operations,
+            "failed_operations": self.failed_operations,
+            "pending": len(self._pending)
+        }
+    
+    def _start_flush(self):
+        """Send the pending writes in the background"""
+        task = asyncio.create_task(self._flush_pending())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+    
+    async def _flush_after_window(self):
+        """Send pending writes once the window closes"""
+        await asyncio.sleep(self.window)
+        self._timer = None
+        while self._pending:
+            await self._flush_pending()
+    
+    async def _flush_pending(self):
+        """Send up to max_operations pending writes and resolve their callers"""
+        async with self._lock:
+            entries = self._pending[:self.max_operations]
+            del self._pending[:self.max_operations]
+            if not entries:
+                return
+            writes = [write for write, _ in entries]
+            
+            try:
+                results = await asyncio.to_thread(self._service.write_items_batch, writes)
+                self.batches += 1
+                self.batched_operations += len(writes)
+            except Exception as e:
+                logger.warning("sharepoint_batch_failed", operations=len(writes), error=str(e))
+                results = [e] * len(writes)
+            
+            for index, result in enumerate(results):
+                if isinstance(result, Exception):
+                    results[index] = await self._write_individually(writes[index], result)
+        
+        for (_, future), result in zip(entries, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
+    async def _write_individually(self, write: ItemWrite, batch_error: Exception):
+        """Retry a write outside a batch; returns the item ID or the error"""
+        self.fallback_operations += 1
+        logger.info("sharepoint_batch_write_retried", item_id=write.item_id, error=str(batch_error))
+        try:
+            return await asyncio.to_thread(self._service.write_item, write)
+        except Exception as e:
+            self.failed_operations += 1
+            return e
+
+
+_sharepoint_write_batcher: Optional[SharePointWriteBatcher] = None
+
+
+def get_sharepoint_write_batcher() -> SharePointWriteBatcher:
+    """Get the process-wide SharePoint write batcher"""
+    global _sharepoint_write_batcher
+    if _sharepoint_write_batcher is None:
+        _sharepoint_write_batcher = SharePointWriteBatcher(
+            SharePointService(),
+            settings.SHAREPOINT_BATCH_WINDOW_SECONDS,
+            settings.SHAREPOINT_BATCH_MAX_OPERATIONS
+        )
+    return _sharepoint_write_batcher
+
+
+async def close_sharepoint_write_batcher():
+    """Send pending writes and drop the process-wide batcher (on shutdown)"""
+    global _sharepoint_write_batcher
+    if _sharepoint_write_batcher is not None:
+        await _sharepoint_write_batcher.close()
+    _sharepoint_write_batcher = None
@@ -0,0 +1,304 @@
+"""
+Shared SharePoint Connection
+"""
+import threading
+import time
+import requests
+import structlog
+from requests.adapters import HTTPAdapter
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from office365.runtime.auth.providers.acs_token_provider import ACSTokenProvider
+from office365.runtime.http.http_method import HttpMethod
+from office365.runtime.http.request_options import RequestOptions
+from office365.runtime.odata.request import ODataRequest
+from office365.runtime.odata.v3.json_light_format import JsonLightFormat
+from office365.sharepoint.client_context import ClientContext
+from office365.sharepoint.lists.list import List as SPList
+
+from app.config import get_settings
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+# Tokens are renewed this long before they expire
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+
+class ListMetadata(NamedTuple):
+    """List properties item operations need"""
+    id: str
+    entity_type_name: str  # ListItemEntityTypeFullName
+
+
+class PooledRequestMixin:
+    """Sends a client request through the shared connection's HTTP session"""
+    
+    def __init__(self, connection: "SharePointConnection", *args):
+        self.connection = connection
+        super().__init__(*args)
+    
+    def execute_request_direct(self, request: RequestOptions) -> requests.Response:
+        self.beforeExecute.notify(request)
+        response = self.connection.send(request)
+        if response.status_code == 401:
+            # Token revoked or expired early: renew it and resend once
+            self.connection.invalidate_token()
+            request.set_header("Authorization", self.connection.authorization_header())
+            response = self.connection.send(request)
+        return response
+
+
+class PooledODataRequest(PooledRequestMixin, ODataRequest):
+    """OData request sent through the shared HTTP session"""
+
+
+class SharePointClientContext(ClientContext):
+    """ClientContext using the shared token, form digest and HTTP session"""
+    
+    def __init__(self, connection: "SharePointConnection"):
+        super().__init__(connection.site_url)
+        self.connection = connection
+    
+    def pending_request(self) -> ODataRequest:
+        if self._pending_request is None:
+            self._pending_request = PooledODataRequest(self.connection, JsonLightFormat())
+            self._pending_request.beforeExecute += self._authenticate_request
+            self._pending_request.beforeExecute += self._build_modification_query
+        return self._pending_request
+    
+    def _authenticate_request(self, request: RequestOptions):
+        request.set_header("Authorization", self.connection.authorization_header())
+    
+    def _ensure_form_digest(self, request: RequestOptions):
+        request.set_header("X-RequestDigest", self.connection.form_digest(self))
+
+
+class SharePointConnection:
+    """Process-wide SharePoint app-only token, HTTP session, form digest and list metadata"""
+    
+    def __init__(self, site_url: str, client_id: str, client_secret: str, pool_size: Optional[int] = None):
+        """
+        Initialize the connection
+        
+        Client contexts are cheap and hold per-call query state, so each
+        SharePointService gets its own; everything that costs a round-trip
+        (the token, the form digest, the list GUID and entity type) and the
+        pooled HTTP connections are shared between them.
+        
+        Args:
+            site_url: SharePoint site URL
+            client_id: App-only client ID
+            client_secret: App-only client secret
+            pool_size: Maximum pooled connections (defaults to settings)
+        """
+        self.site_url = site_url
+        self._token_provider = ACSTokenProvider(site_url, client_id, client_secret)
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._web_info = None
+        self._lists: Dict[str, ListMetadata] = {}
+        
+        self.pool_size = pool_size or settings.SHAREPOINT_HTTP_POOL_SIZE
+        self._adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        
+        # Contexts are used from the event loop and from worker threads
+        self._lock = threading.Lock()
+        self.contexts_created = 0
+        self.requests = 0
+        self.token_acquisitions = 0
+        self.token_reuses = 0
+        self.token_invalidations = 0
+        self.form_digest_loads = 0
+        self.form_digest_reuses = 0
+        self.list_metadata_loads = 0
+        self.list_metadata_reuses = 0
+    
+    def create_context(self) -> SharePointClientContext:
+        """Create a client context bound to this connection"""
+        with self._lock:
+            self.contexts_created += 1
+        return SharePointClientContext(self)
+    
+    def authorization_header(self) -> str:
+        """
+        Get the Authorization header, acquiring a token only if none is valid
+        
+        Returns:
+            Bearer header value
+        """
+        with self._lock:
+            if self._token is not None and time.monotonic() < self._token_expires_at:
+                self.token_reuses += 1
+                return f"Bearer {self._token}"
+            
+            token, expires_in = self._acquire_token()
+            self._token = token
+            self._token_expires_at = time.monotonic() + max(expires_in - TOKEN_REFRESH_MARGIN_SECONDS, 0.0)
+            self.token_acquisitions += 1
+            logger.info("sharepoint_token_acquired", expires_in=int(expires_in))
+            return f"Bearer {token}"
+    
+    def invalidate_token(self):
+        """Drop the cached token so the next request acquires a new one"""
+        with self._lock:
+            self._token = None
+            self.token_invalidations += 1
+    
+    def form_digest(self, ctx: ClientContext) -> str:
+        """
+        Get a request digest for POSTs, loading it only once it expires
+        
+        Args:
+            ctx: Context to load the digest with
+        
+        Returns:
+            X-RequestDigest header value
+        """
+        with self._lock:
+            web_info = self._web_info
+        if web_info is not None and web_info.is_valid:
+            with self._lock:
+                self.form_digest_reuses += 1
+            return web_info.FormDigestValue
+        
+        web_info = ctx._get_context_web_information()
+        with self._lock:
+            self._web_info = web_info
+            self.form_digest_loads += 1
+        return web_info.FormDigestValue
+    
+    def get_list(self, ctx: ClientContext, list_name: str) -> SPList:
+        """
+        Get a list addressed by its GUID, with its entity type already known
+        
+        The GUID and ListItemEntityTypeFullName are loaded once per list;
+        afterwards no request is made to resolve the list.
+        
+        Args:
+            ctx: Context the list handle is bound to
+            list_name: List title
+        
+        Returns:
+            List handle (a new one per call, so item handles are not retained)
+        """
+        with self._lock:
+            metadata = self._lists.get(list_name)
+            if metadata is not None:
+                self.list_metadata_reuses += 1
+        
+        if metadata is None:
+            list_obj = ctx.web.lists.get_by_title(list_name)
+            list_obj.select(["Id", "ListItemEntityTypeFullName"]).get().execute_query()
+            metadata = ListMetadata(
+                id=list_obj.properties["Id"],
+                entity_type_name=list_obj.properties["ListItemEntityTypeFullName"]
+            )
+            with self._lock:
+                self._lists[list_name] = metadata
+                self.list_metadata_loads += 1
+            logger.info("sharepoint_list_metadata_loaded", list_name=list_name, list_id=metadata.id)
+        
+        list_obj = ctx.web.lists.get_by_id(metadata.id)
+        list_obj.set_property("Id", metadata.id, False)
+        list_obj.set_property("ListItemEntityTypeFullName", metadata.entity_type_name, False)
+        return list_obj
+    
+    def invalidate_list(self, list_name: str):
+        """Forget a list's cached metadata (e.g. after the list was recreated)"""
+        with self._lock:
+            self._lists.pop(list_name, None)
+    
+    def send(self, request: RequestOptions) -> requests.Response:
+        """
+        Send a prepared request over the pooled session
+        
+        Args:
+            request: Request with URL, method, headers and body set
+        
+        Returns:
+            HTTP response
+        """
+        with self._lock:
+            self.requests += 1
+        
+        kwargs = {
+            "headers": request.headers,
+            "auth": request.auth,
+            "verify": request.verify,
+            "proxies": request.proxies
+        }
+        # Bodies are encoded the same way as ClientRequest.execute_request_direct
+        if request.method == HttpMethod.Post:
+            if request.is_bytes or request.is_file:
+                kwargs["data"] = request.data
+            else:
+                kwargs["json"] = request.data
+        elif request.method == HttpMethod.Patch:
+            kwargs["json"] = request.data
+        elif request.method == HttpMethod.Put:
+            kwargs["data"] = request.data
+        elif request.method == HttpMethod.Get:
+            kwargs["stream"] = request.stream
+        return self.session.request(request.method, request.url, **kwargs)
+    
+    def stats(self) -> dict:
+        """Return token, metadata and connection reuse counters"""
+        connections_opened = sum(
+            self._adapter.poolmanager.pools[key].num_connections
+            for key in list(self._adapter.poolmanager.pools.keys())
+        )
+        with self._lock:
+            return {
+                "contexts_created": self.contexts_created,
+                "requests": self.requests,
+                "connections_opened": connections_opened,
+                "connection_reuse_ratio": (
+                    round(1 - connections_opened / self.requests, 3) if self.requests else 0.0
+                ),
+                "pool_size": self.pool_size,
+                "token_acquisitions": self.token_acquisitions,
+                "token_reuses": self.token_reuses,
+                "token_invalidations": self.token_invalidations,
+                "form_digest_loads": self.form_digest_loads,
+                "form_digest_reuses": self.form_digest_reuses,
+                "list_metadata_loads": self.list_metadata_loads,
+                "list_metadata_reuses": self.list_metadata_reuses
+            }
+    
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+    
+    def _acquire_token(self) -> Tuple[str, float]:
+        """Request an app-only token; returns the token and its lifetime in seconds"""
+        token = self._token_provider.get_app_only_access_token()
+        return token.accessToken, float(getattr(token, "expiresIn", 3600))
+
+
+_sharepoint_connection: Optional[SharePointConnection] = None
+
+
+def get_sharepoint_connection() -> SharePointConnection:
+    """Get the process-wide SharePoint connection, creating it on first use"""
+    global _sharepoint_connection
+    if _sharepoint_connection is None:
+        _sharepoint_connection = SharePointConnection(
+            settings.SHAREPOINT_SITE_URL,
+            settings.SHAREPOINT_CLIENT_ID,
+            settings.SHAREPOINT_CLIENT_SECRET
+        )
+        logger.info("sharepoint_connection_created", pool_size=_sharepoint_connection.pool_size)
+    return _sharepoint_connection
+
+
+def close_sharepoint_connection():
+    """Close the process-wide SharePoint connection"""
+    global _sharepoint_connection
+    if _sharepoint_connection is not None:
+        logger.info("sharepoint_connection_closing", **_sharepoint_connection.stats())
+        _sharepoint_connection.close()
+        _sharepoint_connection = None
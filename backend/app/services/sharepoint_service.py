@@ -1,66 +1,318 @@
 """
 SharePoint Integration Service
 """
-from office365.runtime.auth.client_credential import ClientCredential
-from office365.sharepoint.client_context import ClientContext
+import asyncio
+from office365.runtime.client_request_exception import ClientRequestException
+from office365.runtime.odata.request import ODataRequest
+from office365.runtime.odata.v3.batch_request import ODataBatchV3Request
+from office365.runtime.odata.v3.json_light_format import JsonLightFormat
+from office365.sharepoint.changes.query import ChangeQuery
+from office365.sharepoint.changes.token import ChangeToken
 from office365.sharepoint.listitems.listitem import ListItem
+from office365.sharepoint.lists.list import List as SPList
+from requests.exceptions import HTTPError
 import structlog
-from typing import Optional, List
+from typing import AsyncIterator, Dict, NamedTuple, Optional, List, Tuple, Union
 from datetime import datetime
 
 from app.config import get_settings
-from app.models import SharePointEntry, ResourceStatus
+from app.models import CloudPlatform, ResourceStatus, ResourceType, SharePointEntry
+from app.services.sharepoint_context import PooledRequestMixin, SharePointConnection, get_sharepoint_connection
+from app.utils.streaming import iterate_in_thread
 
 logger = structlog.get_logger()
 settings = get_settings()
 
 
+# Columns read by _item_to_entry; reads request only these
+ENTRY_FIELDS = [
+    "ID",
+    "UserName",
+    "CloudPlatform",
+    "ResourceType",
+    "ResourceGroupName",
+    "ProjectName",
+    "DateOfCreation",
+    "Status",
+    "AzureResourceGroupId",
+    "ResourceId",
+    "GitHubRepoUrl",
+    "ErrorMessage",
+    "SubscriptionId"
+]
+
+
+# Column value -> enum member (item conversion runs per row of the whole list)
+CLOUD_PLATFORMS = {member.value: member for member in CloudPlatform}
+RESOURCE_TYPES = {member.value: member for member in ResourceType}
+STATUSES = {member.value: member for member in ResourceStatus}
+
+
+def item_date(value: str) -> datetime:
+    """
+    Parse a SharePoint date column value
+    
+    Args:
+        value: ISO 8601 string, possibly with a "Z" suffix
+    
+    Returns:
+        Timezone-aware datetime
+    """
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def default_resource_type(cloud_platform: CloudPlatform) -> str:
+    """ResourceType value assumed for items created before the column existed"""
+    return "Resource Group" if cloud_platform == CloudPlatform.AZURE else "Project"
+
+
+def item_filter(status: Optional[str] = None, user_name: Optional[str] = None) -> Optional[str]:
+    """
+    Build an OData $filter for list items
+    
+    Status is matched exactly against the indexed Status column, which keeps
+    filtered reads under the list view threshold. A user name substring is
+    only added alongside a status: on its own it can not use an index.
+    
+    Args:
+        status: Status value (matched case-insensitively by SharePoint)
+        user_name: Substring of UserName
+    
+    Returns:
+        Filter expression, or None if nothing can be filtered on the server
+    """
+    if not status:
+        return None
+    
+    def quote(value: str) -> str:
+        return "'" + value.replace("'", "''") + "'"
+    
+    clauses = [f"Status eq {quote(status)}"]
+    if user_name:
+        clauses.append(f"substringof({quote(user_name)}, UserName)")
+    return " and ".join(clauses)
+
+
+class ItemWrite(NamedTuple):
+    """A list item create (item_id None) or update"""
+    item_id: Optional[str]
+    fields: dict
+
+
+class _PerRequestBatch(PooledRequestMixin, ODataBatchV3Request):
+    """$batch request recording each failed part instead of stopping at the first"""
+    
+    def __init__(self, connection: SharePointConnection):
+        super().__init__(connection, JsonLightFormat())
+        self.failures: Dict[int, Exception] = {}  # id(item) -> error
+    
+    def process_response(self, response, query):
+        for part_query, part_response in self._extract_response(response, query):
+            item = part_query.return_type if part_query.return_type is not None else part_query.binding_type
+            try:
+                try:
+                    part_response.raise_for_status()
+                except HTTPError as e:
+                    raise ClientRequestException(*e.args, response=e.response)
+                ODataRequest.process_response(self, part_response, part_query)
+            except Exception as e:
+                self.failures[id(item)] = e
+
+
 class SharePointService:
     """Service for SharePoint list management"""
     
-    def __init__(self):
-        """Initialize SharePoint service with credentials"""
+    def __init__(self, connection: Optional[SharePointConnection] = None):
+        """
+        Initialize SharePoint service on the shared connection
+        
+        Args:
+            connection: Connection to use (the process-wide one if omitted)
+        """
         self.site_url = settings.SHAREPOINT_SITE_URL
         self.list_name = settings.SHAREPOINT_LIST_NAME
-        
-        credentials = ClientCredential(
-            settings.SHAREPOINT_CLIENT_ID,
-            settings.SHAREPOINT_CLIENT_SECRET
-        )
-        
-        self.ctx = ClientContext(self.site_url).with_credentials(credentials)
+        self.connection = connection or get_sharepoint_connection()
+        self.ctx = self.connection.create_context()
     
     async def get_pending_items(self) -> List[SharePointEntry]:
         """
         Get all pending items from SharePoint list
         
+        Items that can not be parsed are skipped; a failed listing is raised
+        rather than returned as an empty list, so callers can tell "nothing
+        pending" from "could not look".
+        
         Returns:
             List of SharePointEntry models with status=PENDING
+        
+        Raises:
+            Exception: If the list can not be read
         """
         try:
-            list_obj = self.ctx.web.lists.get_by_title(self.list_name)
+            entries = []
+            async for items in self.iter_item_pages(filter_query=item_filter(ResourceStatus.PENDING.value)):
+                for item in items:
+                    try:
+                        entries.append(self._item_to_entry(item))
+                    except Exception as e:
+                        logger.warning(
+                            "failed_to_parse_item",
+                            item_id=item.properties.get("ID"),
+                            error=str(e)
+                        )
             
-            # Query for pending items
-            items = list_obj.items.filter("Status eq 'Pending'").get().execute_query()
+            logger.info("retrieved_pending_items", count=len(entries))
+            return entries
             
-            entries = []
+        except Exception as e:
+            logger.error("get_pending_items_failed", error=str(e))
+            raise
+    
+    async def get_current_change_token(self) -> str:
+        """
+        Get the list's current change token
+        
+        Returns:
+            Serialized change token marking "now" in the list's change log
+        """
+        def load() -> str:
+            list_obj = self._get_list()
+            list_obj.select(["CurrentChangeToken"]).get().execute_query()
+            return list_obj.current_change_token.StringValue
+        
+        return await asyncio.to_thread(load)
+    
+    async def get_changed_item_ids(
+        self,
+        change_token: str,
+        page_size: Optional[int] = None
+    ) -> Tuple[List[str], str]:
+        """
+        Get IDs of items added or updated since a change token
+        
+        GetChanges returns at most page_size changes per call; calls are
+        repeated from the last change's token until a short page comes back
+        or the token stops advancing, so a burst of changes is read in full.
+        
+        Args:
+            change_token: Token from get_current_change_token or a previous call
+            page_size: Changes per GetChanges call (defaults to settings)
+        
+        Returns:
+            Tuple of (unique item IDs in change order, token to resume from)
+        
+        Raises:
+            Exception: If SharePoint rejects the token (e.g. expired from the change log)
+        """
+        page_size = page_size or settings.SHAREPOINT_PAGE_SIZE
+        
+        def load_page(token: str) -> list:
+            query = ChangeQuery(
+                item=True,
+                add=True,
+                update=True,
+                system_update=False,
+                delete_object=False,
+                role_assignment_add=False,
+                role_assignment_delete=False,
+                change_token_start=ChangeToken(token),
+                fetch_limit=page_size
+            )
+            return list(self._get_list().get_changes(query).execute_query())
+        
+        item_ids = []
+        seen = set()
+        next_token = change_token
+        pages = 0
+        total = 0
+        while True:
+            changes = await asyncio.to_thread(load_page, next_token)
+            pages += 1
+            total += len(changes)
+            page_start = next_token
+            for change in changes:
+                item_id = change.properties.get("ItemId")
+                if item_id is not None and str(item_id) not in seen:
+                    seen.add(str(item_id))
+                    item_ids.append(str(item_id))
+                next_token = change.change_token.StringValue or next_token
+            if len(changes) < page_size or next_token == page_start:
+                break
+        
+        logger.info("retrieved_list_changes", changes=total, items=len(item_ids), pages=pages)
+        return item_ids, next_token
+    
+    async def get_pending_items_by_ids(self, item_ids: List[str], chunk_size: int = 50) -> List[SharePointEntry]:
+        """
+        Get the pending items among the given item IDs
+        
+        Args:
+            item_ids: SharePoint list item IDs
+            chunk_size: IDs per filter query (keeps URLs within limits)
+        
+        Returns:
+            List of SharePointEntry models with status=PENDING
+        """
+        def load_chunk(chunk: List[str]) -> List[ListItem]:
+            id_filter = " or ".join(f"ID eq {int(item_id)}" for item_id in chunk)
+            return list(
+                self._get_list().items
+                .select(ENTRY_FIELDS)
+                .filter(f"{item_filter(ResourceStatus.PENDING.value)} and ({id_filter})")
+                .top(chunk_size)
+                .get()
+                .execute_query()
+            )
+        
+        entries = []
+        for start in range(0, len(item_ids), chunk_size):
+            items = await asyncio.to_thread(load_chunk, item_ids[start:start + chunk_size])
             for item in items:
                 try:
-                    entry = self._item_to_entry(item)
-                    entries.append(entry)
+                    entries.append(self._item_to_entry(item))
                 except Exception as e:
                     logger.warning(
                         "failed_to_parse_item",
                         item_id=item.properties.get("ID"),
                         error=str(e)
                     )
-            
-            logger.info("retrieved_pending_items", count=len(entries))
-            return entries
-            
-        except Exception as e:
-            logger.error("get_pending_items_failed", error=str(e))
-            return []
+        
+        logger.info("retrieved_changed_pending_items", changed=len(item_ids), pending=len(entries))
+        return entries
+    
+    async def iter_item_pages(
+        self,
+        page_size: Optional[int] = None,
+        filter_query: Optional[str] = None
+    ) -> AsyncIterator[List[ListItem]]:
+        """
+        Yield list items page by page as SharePoint returns them
+        
+        Only the ENTRY_FIELDS columns are requested. Pages are followed
+        through SharePoint's skip tokens, so lists past the 5000-item view
+        threshold can be read; a filter must use indexed columns (see
+        item_filter) to do the same.
+        
+        Args:
+            page_size: Items per page (defaults to settings)
+            filter_query: OData $filter applied on the server (all items if omitted)
+        
+        Yields:
+            Lists of ListItem, one per server page
+        """
+        page_size = page_size or settings.SHAREPOINT_PAGE_SIZE
+        
+        def produce(emit):
+            items = self._get_list().items.select(ENTRY_FIELDS)
+            if filter_query:
+                items = items.filter(filter_query)
+            items.get_all(
+                page_size,
+                lambda page: emit(list(page.current_page))
+            ).execute_query()
+        
+        async for page in iterate_in_thread(produce):
+            yield page
     
     async def get_item_by_id(self, item_id: str) -> Optional[SharePointEntry]:
         """
@@ -68,13 +320,13 @@ class SharePointService:
         
         Args:
             item_id: SharePoint list item ID
-            
+        
         Returns:
             SharePointEntry model or None if not found
         """
         try:
-            list_obj = self.ctx.web.lists.get_by_title(self.list_name)
-            item = list_obj.items.get_by_id(item_id).get().execute_query()
+            list_obj = self._get_list()
+            item = list_obj.items.get_by_id(item_id).select(ENTRY_FIELDS).get().execute_query()
             
             return self._item_to_entry(item)
             
@@ -103,14 +355,11 @@ class SharePointService:
             resource_id: Cloud resource ID (optional)
             github_repo_url: GitHub repository URL (optional)
             error_message: Error message if failed (optional)
-            
+        
         Returns:
             True if updated successfully
         """
         try:
-            list_obj = self.ctx.web.lists.get_by_title(self.list_name)
-            item = list_obj.items.get_by_id(item_id)
-            
             update_data = {
                 "Status": status.value
             }
@@ -126,7 +375,7 @@ class SharePointService:
             if error_message:
                 update_data["ErrorMessage"] = error_message
             
-            item.update(update_data).execute_query()
+            await self._write(ItemWrite(item_id, update_data))
             
             logger.info(
                 "sharepoint_item_updated",
@@ -149,13 +398,11 @@ class SharePointService:
         
         Args:
             entry: SharePointEntry model
-            
+        
         Returns:
             Item ID if created successfully, None otherwise
         """
         try:
-            list_obj = self.ctx.web.lists.get_by_title(self.list_name)
-            
             item_data = {
                 "Title": entry.project_name,
                 "UserName": entry.user_name,
@@ -170,9 +417,7 @@ class SharePointService:
             if entry.subscription_id:
                 item_data["SubscriptionId"] = entry.subscription_id
             
-            item = list_obj.add_item(item_data).execute_query()
-            
-            item_id = str(item.properties["ID"])
+            item_id = await self._write(ItemWrite(None, item_data))
             logger.info("sharepoint_item_created", item_id=item_id)
             
             return item_id
@@ -181,37 +426,102 @@ class SharePointService:
             logger.error("create_item_failed", error=str(e))
             return None
     
+    def write_items_batch(self, writes: List[ItemWrite]) -> List[Union[str, Exception]]:
+        """
+        Send item creates and updates as one $batch request (blocking)
+        
+        Args:
+            writes: Creates and updates, applied in order
+        
+        Returns:
+            Per write, the item ID or the error SharePoint returned for it
+        
+        Raises:
+            Exception: If the batch request itself failed
+        """
+        list_obj = self._get_list()
+        items = [self._queue_write(list_obj, write) for write in writes]
+        
+        batch = _PerRequestBatch(self.connection)
+        # Same request pipeline as ClientContext.execute_batch
+        batch.beforeExecute += self.ctx._authenticate_request
+        batch.beforeExecute += self.ctx._ensure_form_digest
+        try:
+            while self.ctx.has_pending_request:
+                batch.execute_query(self.ctx._get_next_query(len(writes)))
+        finally:
+            self.ctx.clear()
+        
+        return [
+            batch.failures.get(id(item)) or self._written_id(write, item)
+            for write, item in zip(writes, items)
+        ]
+    
+    def write_item(self, write: ItemWrite) -> str:
+        """
+        Apply one item create or update in its own request (blocking)
+        
+        Args:
+            write: Create or update
+        
+        Returns:
+            ID of the created or updated item
+        """
+        item = self._queue_write(self._get_list(), write)
+        try:
+            self.ctx.execute_query()
+        finally:
+            self.ctx.clear()
+        return self._written_id(write, item)
+    
+    async def _write(self, write: ItemWrite) -> str:
+        """Apply a write, through the shared $batch writer if enabled"""
+        if settings.SHAREPOINT_BATCH_ENABLED:
+            from app.services.sharepoint_batch import get_sharepoint_write_batcher
+            return await get_sharepoint_write_batcher().submit(write)
+        return self.write_item(write)
+    
+    def _get_list(self) -> SPList:
+        """Get the list by its cached GUID, with the properties item writes need"""
+        return self.connection.get_list(self.ctx, self.list_name)
+    
+    def _queue_write(self, list_obj: SPList, write: ItemWrite) -> ListItem:
+        """Add the query for a write to the context without sending it"""
+        if write.item_id is None:
+            return list_obj.add_item(write.fields)
+        
+        item = list_obj.items.get_by_id(write.item_id)
+        item.set_property("ParentList", list_obj, False)
+        for name, value in write.fields.items():
+            item.set_property(name, value)
+        return item.update()
+    
+    @staticmethod
+    def _written_id(write: ItemWrite, item: ListItem) -> str:
+        """ID of the item a write applied to"""
+        return write.item_id if write.item_id is not None else str(item.properties["ID"])
+    
     def _item_to_entry(self, item: ListItem) -> SharePointEntry:
         """
         Convert SharePoint list item to SharePointEntry model
         
         Args:
             item: SharePoint list item
-            
+        
         Returns:
             SharePointEntry model
         """
-        from app.models import CloudPlatform, ResourceType
         props = item.properties
         
         # Parse datetime
         date_str = props.get("DateOfCreation")
-        date_of_creation = (
-            datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            if date_str
-            else datetime.utcnow()
-        )
+        date_of_creation = item_date(date_str) if date_str else datetime.utcnow()
         
         # Get cloud platform with fallback to Azure for backward compatibility
-        cloud_platform_str = props.get("CloudPlatform", "Azure")
-        cloud_platform = CloudPlatform(cloud_platform_str)
+        cloud_platform = CloudPlatform(props.get("CloudPlatform", "Azure"))
         
         # Get resource type with fallback based on platform
-        resource_type_str = props.get("ResourceType")
-        if not resource_type_str:
-            # Fallback to default resource type based on platform
-            resource_type_str = "Resource Group" if cloud_platform == CloudPlatform.AZURE else "Project"
-        resource_type = ResourceType(resource_type_str)
+        resource_type = ResourceType(props.get("ResourceType") or default_resource_type(cloud_platform))
         
         return SharePointEntry(
             id=str(props.get("ID")),
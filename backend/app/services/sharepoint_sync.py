@@ -0,0 +1,146 @@
+"""
+SharePoint Change-Log Sync
+"""
+import asyncio
+import structlog
+from typing import List, Optional
+
+from app.config import get_settings
+from app.models import SharePointEntry
+from app.services.job_queue import get_job_queue
+from app.services.provisioning import PROCESS_SHAREPOINT_UPDATE
+from app.services.resource_store import get_resource_store
+from app.services.sharepoint_service import SharePointService
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+class SharePointChangeSync:
+    """Finds the pending list items changed since the last webhook notification"""
+    
+    def __init__(self):
+        """Initialize sync state"""
+        # Syncs are serialized so a burst of notifications reads each change once
+        self._lock = asyncio.Lock()
+        # Used when no resource store is configured (token is then lost on restart)
+        self._memory_token: Optional[str] = None
+        self.syncs = 0
+        self.full_scans = 0
+        self.changed_items = 0
+        self.pending_items = 0
+    
+    @property
+    def list_key(self) -> str:
+        """Key identifying the list the change token belongs to"""
+        return f"{settings.SHAREPOINT_SITE_URL}|{settings.SHAREPOINT_LIST_NAME}"
+    
+    async def pending_changes(self, sharepoint_service: Optional[SharePointService] = None) -> List[SharePointEntry]:
+        """
+        Get pending items added or updated since the previous call
+        
+        Without a stored change token (first run, or the token expired from
+        the change log) every pending item is returned once and a new token
+        is taken before the scan, so changes made during it are not missed.
+        The token is only saved once the items were read, so a failed scan
+        is repeated on the next call.
+        
+        Args:
+            sharepoint_service: Service to use (a new one if omitted)
+        
+        Returns:
+            List of SharePointEntry models with status=PENDING
+        
+        Raises:
+            Exception: If the full scan fails (the stored token is kept)
+        """
+        async with self._lock:
+            sharepoint_service = sharepoint_service or SharePointService()
+            self.syncs += 1
+            
+            token = await self._load_token()
+            entries = None
+            if token is not None:
+                try:
+                    item_ids, next_token = await sharepoint_service.get_changed_item_ids(token)
+                    entries = await sharepoint_service.get_pending_items_by_ids(item_ids) if item_ids else []
+                    self.changed_items += len(item_ids)
+                except Exception as e:
+                    logger.warning("sharepoint_change_sync_failed", error=str(e))
+            
+            full_scan = entries is None
+            if full_scan:
+                next_token = await sharepoint_service.get_current_change_token()
+                entries = await sharepoint_service.get_pending_items()
+                self.full_scans += 1
+            
+            await self._save_token(next_token)
+            self.pending_items += len(entries)
+            logger.info("sharepoint_changes_synced", pending=len(entries), full_scan=full_scan)
+            return entries
+    
+    def stats(self) -> dict:
+        """Return sync counters"""
+        return {
+            "syncs": self.syncs,
+            "full_scans": self.full_scans,
+            "changed_items": self.changed_items,
+            "pending_items": self.pending_items
+        }
+    
+    async def _load_token(self) -> Optional[str]:
+        """Read the last processed change token"""
+        store = get_resource_store()
+        if store is None:
+            return self._memory_token
+        try:
+            return await store.get_change_token(self.list_key)
+        except Exception as e:
+            logger.warning("change_token_read_failed", error=str(e))
+            return self._memory_token
+    
+    async def _save_token(self, token: str):
+        """Persist the last processed change token"""
+        self._memory_token = token
+        store = get_resource_store()
+        if store is None:
+            return
+        try:
+            await store.set_change_token(self.list_key, token)
+        except Exception as e:
+            logger.warning("change_token_write_failed", error=str(e))
+
+
+_sharepoint_change_sync: Optional[SharePointChangeSync] = None
+
+
+def get_sharepoint_change_sync() -> SharePointChangeSync:
+    """Get the process-wide SharePoint change sync"""
+    global _sharepoint_change_sync
+    if _sharepoint_change_sync is None:
+        _sharepoint_change_sync = SharePointChangeSync()
+    return _sharepoint_change_sync
+
+
+async def queue_changed_items() -> List[str]:
+    """
+    Queue a provisioning job per pending item changed since the last sync
+    
+    Items whose job is already queued or running are not queued again.
+    
+    Returns:
+        IDs of the queued (or already active) jobs
+    """
+    pending_items = await get_sharepoint_change_sync().pending_changes()
+    
+    job_queue = get_job_queue()
+    job_ids = []
+    for item in pending_items:
+        if item.id:
+            job = await job_queue.enqueue(
+                PROCESS_SHAREPOINT_UPDATE,
+                {"item_id": item.id},
+                dedupe_key=f"sharepoint:{item.id}"
+            )
+            job_ids.append(job.id)
+    return job_ids
@@ -0,0 +1,170 @@
+"""
+Resource Group Tag Index
+"""
+import asyncio
+import time
+import structlog
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from app.models import AzureResourceGroup
+
+logger = structlog.get_logger()
+
+
+class TagIndex:
+    """In-memory inverted index from resource group tags to resource IDs"""
+    
+    def __init__(self):
+        """Initialize an empty index"""
+        # Tag keys and values are matched case-insensitively, like Azure tag keys
+        self._by_tag: Dict[tuple, Set[str]] = defaultdict(set)
+        self._by_key: Dict[str, Set[str]] = defaultdict(set)
+        self._resources: Dict[str, AzureResourceGroup] = {}
+        self.built_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None  # One relisting at a time
+    
+    @staticmethod
+    def _resource_key(resource_id: str) -> str:
+        """Normalize a resource ID (ARM IDs are case-insensitive)"""
+        return resource_id.lower()
+    
+    @property
+    def is_built(self) -> bool:
+        """True once the index has been loaded from an inventory"""
+        return self.built_at is not None
+    
+    def is_fresh(self, max_age: float) -> bool:
+        """True if the index was loaded within the last max_age seconds"""
+        return self.built_at is not None and time.monotonic() - self.built_at < max_age
+    
+    def refresh_in_background(self, refresh: Callable[[], Awaitable]) -> asyncio.Task:
+        """
+        Start a relisting in a background task unless one is already running
+        
+        Args:
+            refresh: Coroutine function that relists and rebuilds the index
+        
+        Returns:
+            The running refresh task (shared by concurrent callers)
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(refresh())
+        return self._refresh_task
+    
+    async def close(self):
+        """Cancel a running background refresh"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+    
+    def rebuild(self, resource_groups: Iterable[AzureResourceGroup], complete: bool = True):
+        """
+        Load the index from an inventory listing
+        
+        Args:
+            resource_groups: Resource groups from a listing
+            complete: False if some subscriptions could not be listed; existing
+                entries are then kept and only updated, never dropped
+        """
+        if complete:
+            self._by_tag.clear()
+            self._by_key.clear()
+            self._resources.clear()
+        
+        count = 0
+        for rg in resource_groups:
+            self.add(rg)
+            count += 1
+        
+        self.built_at = time.monotonic()
+        logger.info("tag_index_rebuilt", resources=count, complete=complete, size=len(self._resources))
+    
+    def add(self, rg: AzureResourceGroup):
+        """
+        Add or replace a resource group in the index
+        
+        Args:
+            rg: AzureResourceGroup model
+        """
+        resource_key = self._resource_key(rg.id)
+        if resource_key in self._resources:
+            self.remove(rg.id)
+        
+        self._resources[resource_key] = rg
+        for key, value in (rg.tags or {}).items():
+            key = key.lower()
+            self._by_key[key].add(resource_key)
+            self._by_tag[(key, str(value).lower())].add(resource_key)
+    
+    def remove(self, resource_id: str) -> bool:
+        """
+        Remove a resource group from the index
+        
+        Args:
+            resource_id: ARM resource ID
+        
+        Returns:
+            True if the resource was indexed
+        """
+        resource_key = self._resource_key(resource_id)
+        rg = self._resources.pop(resource_key, None)
+        if rg is None:
+            return False
+        
+        for key, value in (rg.tags or {}).items():
+            key = key.lower()
+            for index, index_key in ((self._by_key, key), (self._by_tag, (key, str(value).lower()))):
+                ids = index.get(index_key)
+                if ids is not None:
+                    ids.discard(resource_key)
+                    if not ids:
+                        del index[index_key]
+        return True
+    
+    def lookup(self, key: str, value: Optional[str] = None) -> List[AzureResourceGroup]:
+        """
+        Find resource groups by tag
+        
+        Args:
+            key: Tag key (case-insensitive)
+            value: Tag value (case-insensitive); any value if omitted
+        
+        Returns:
+            Matching AzureResourceGroup models
+        """
+        key = key.lower()
+        if value is None:
+            ids = self._by_key.get(key, ())
+        else:
+            ids = self._by_tag.get((key, value.lower()), ())
+        return [self._resources[resource_key] for resource_key in ids]
+    
+    def stats(self) -> dict:
+        """Return index size and age"""
+        return {
+            "resources": len(self._resources),
+            "tag_keys": len(self._by_key),
+            "tag_values": len(self._by_tag),
+            "age_seconds": round(time.monotonic() - self.built_at, 1) if self.built_at else None
+        }
+
+
+_tag_index: Optional[TagIndex] = None
+
+
+def get_tag_index() -> TagIndex:
+    """Get the process-wide tag index"""
+    global _tag_index
+    if _tag_index is None:
+        _tag_index = TagIndex()
+    return _tag_index
+
+
+async def close_tag_index():
+    """Stop the process-wide index's background refresh and drop it (on shutdown)"""
+    global _tag_index
+    if _tag_index is not None:
+        await _tag_index.close()
+        _tag_index = None
@@ -0,0 +1,117 @@
+"""
+Webhook Notification Coalescing
+"""
+import asyncio
+import structlog
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from app.config import get_settings
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+class WebhookCoalescer:
+    """Debounces webhook notifications into one sync per key per window"""
+    
+    def __init__(self, sync: Callable[[str], Awaitable[Any]], window: float):
+        """
+        Initialize coalescer
+        
+        The first notification for a key opens a window; notifications for the
+        same key arriving before it closes are absorbed, and one sync runs when
+        it closes. A notification arriving while that sync runs opens a new
+        window, since the sync may already have read the change log.
+        
+        Args:
+            sync: Coroutine function run once per window with the key
+            window: Debounce window in seconds
+        """
+        self._sync = sync
+        self.window = window
+        self._scheduled: Dict[str, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.received = 0
+        self.coalesced = 0
+        self.executed = 0
+        self.failed = 0
+    
+    def submit(self, key: str) -> bool:
+        """
+        Record a notification
+        
+        Args:
+            key: Coalescing key (e.g. subscription and list)
+        
+        Returns:
+            True if this notification opened a new window, False if it was coalesced
+        """
+        self.received += 1
+        if key in self._scheduled:
+            self.coalesced += 1
+            return False
+        
+        task = asyncio.create_task(self._debounce(key))
+        self._scheduled[key] = task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+    
+    async def close(self):
+        """Run syncs for open windows now and wait for running syncs (on shutdown)"""
+        pending = list(self._scheduled)
+        for key in pending:
+            self._scheduled.pop(key).cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for key in pending:
+            await self._run(key)
+    
+    def stats(self) -> dict:
+        """Return notification and sync counters"""
+        return {
+            "window_seconds": self.window,
+            "received": self.received,
+            "coalesced": self.coalesced,
+            "executed": self.executed,
+            "failed": self.failed,
+            "open_windows": len(self._scheduled)
+        }
+    
+    async def _debounce(self, key: str):
+        """Wait for the window to close, then sync"""
+        await asyncio.sleep(self.window)
+        self._scheduled.pop(key, None)
+        await self._run(key)
+    
+    async def _run(self, key: str):
+        """Run one sync; failures are logged (the next notification retries from the same change token)"""
+        self.executed += 1
+        try:
+            await self._sync(key)
+        except Exception as e:
+            self.failed += 1
+            logger.error("webhook_sync_failed", key=key, error=str(e))
+
+
+_webhook_coalescer: Optional[WebhookCoalescer] = None
+
+
+def get_webhook_coalescer() -> WebhookCoalescer:
+    """Get the process-wide coalescer running SharePoint change syncs"""
+    global _webhook_coalescer
+    if _webhook_coalescer is None:
+        from app.services.sharepoint_sync import queue_changed_items
+        
+        async def sync(key: str):
+            await queue_changed_items()
+        
+        _webhook_coalescer = WebhookCoalescer(sync, settings.WEBHOOK_DEBOUNCE_SECONDS)
+    return _webhook_coalescer
+
+
+async def close_webhook_coalescer():
+    """Flush and drop the process-wide coalescer (on shutdown)"""
+    global _webhook_coalescer
+    if _webhook_coalescer is not None:
+        await _webhook_coalescer.close()
+    _webhook_coalescer = None
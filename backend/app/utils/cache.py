@@ -0,0 +1,156 @@
+"""
+In-Process Caching Utilities
+"""
+import asyncio
+import time
+import structlog
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+
+logger = structlog.get_logger()
+
+
+class CacheResult(NamedTuple):
+    """Value returned by the cache with how it was served"""
+    value: Any
+    status: str  # "hit", "stale" or "miss"
+    age: float  # Seconds since the value was loaded
+
+
+class SWRCache:
+    """Stale-while-revalidate cache for async loaders"""
+    
+    def __init__(self, ttl: float, stale_ttl: float):
+        """
+        Initialize cache
+        
+        Fresh entries (younger than ttl) are served directly. Entries within
+        the stale window are served immediately while a background refresh
+        runs. Concurrent refreshes of the same key share a single loader call.
+        
+        Args:
+            ttl: Seconds an entry is considered fresh
+            stale_ttl: Additional seconds an entry may be served while refreshing
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: Dict[str, tuple] = {}
+        self._refreshes: Dict[str, asyncio.Task] = {}
+        self._generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+    
+    async def get(self, key: str, loader: Callable[[], Awaitable[Any]]) -> CacheResult:
+        """
+        Get a value, loading or revalidating it as needed
+        
+        Args:
+            key: Cache key
+            loader: Coroutine function producing a fresh value
+        
+        Returns:
+            CacheResult with the value, how it was served and its age
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, loaded_at = entry
+            age = time.monotonic() - loaded_at
+            if age < self.ttl:
+                self.hits += 1
+                return CacheResult(value, "hit", age)
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._refresh(key, loader)
+                return CacheResult(value, "stale", age)
+        
+        self.misses += 1
+        # Shield so a cancelled request does not cancel a refresh other callers share
+        value = await asyncio.shield(self._refresh(key, loader))
+        return CacheResult(value, "miss", 0.0)
+    
+    def peek(self, key: str) -> Optional[CacheResult]:
+        """Return the cached entry without loading, or None if absent or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, loaded_at = entry
+        age = time.monotonic() - loaded_at
+        if age >= self.ttl + self.stale_ttl:
+            return None
+        return CacheResult(value, "hit" if age < self.ttl else "stale", age)
+    
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every invalidation"""
+        return self._generation
+    
+    def set(self, key: str, value: Any, generation: Optional[int] = None, age: float = 0.0):
+        """
+        Store a freshly loaded value
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            generation: Generation the load started in; the value is dropped
+                if the cache was invalidated since
+            age: Seconds since the value was loaded (for values restored from elsewhere)
+        """
+        if generation is not None and generation != self._generation:
+            return
+        self._entries[key] = (value, time.monotonic() - age)
+    
+    def invalidate(self, key: Optional[str] = None):
+        """
+        Drop one entry (or all entries)
+        
+        Refreshes already in flight are detached so their results are not stored.
+        
+        Args:
+            key: Key to invalidate; invalidates everything if omitted
+        """
+        self._generation += 1
+        if key is None:
+            self._entries.clear()
+            self._refreshes.clear()
+        else:
+            self._entries.pop(key, None)
+            self._refreshes.pop(key, None)
+        logger.info("cache_invalidated", key=key or "*")
+    
+    def stats(self) -> dict:
+        """Return cache counters"""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "refreshing": len(self._refreshes)
+        }
+    
+    def _refresh(self, key: str, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Start a refresh for key unless one is already in flight"""
+        task = self._refreshes.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, loader, self._generation))
+            self._refreshes[key] = task
+            task.add_done_callback(lambda t: self._refresh_done(key, t))
+        return task
+    
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        """Run the loader and store its result unless invalidated meanwhile"""
+        self.refreshes += 1
+        value = await loader()
+        self.set(key, value, generation)
+        return value
+    
+    def _refresh_done(self, key: str, task: asyncio.Task):
+        """Clear the in-flight marker and record background failures"""
+        if self._refreshes.get(key) is task:
+            del self._refreshes[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.refresh_failures += 1
+            logger.warning("cache_refresh_failed", key=key, error=str(task.exception()))
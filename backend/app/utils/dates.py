@@ -0,0 +1,22 @@
+"""
+Date Helpers
+"""
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Convert an aware datetime to naive UTC so mixed sources compare"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def parse_datetime(value) -> Optional[datetime]:
+    """Parse an ISO timestamp into a naive UTC datetime (None if missing or invalid)"""
+    if not value:
+        return None
+    try:
+        return to_naive_utc(datetime.fromisoformat(str(value).replace("Z", "+00:00")))
+    except ValueError:
+        return None
@@ -0,0 +1,76 @@
+"""
+Cursor Pagination Helpers
+"""
+import base64
+import json
+from typing import Optional
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(sort: str, key: tuple) -> str:
+    """
+    Encode a keyset cursor
+    
+    Args:
+        sort: Sort expression the cursor belongs to (e.g. "-date_of_creation")
+        key: Sort key of the last row on the page
+    
+    Returns:
+        Opaque URL-safe cursor string
+    """
+    raw = json.dumps([sort, list(key)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple:
+    """
+    Decode a keyset cursor
+    
+    Args:
+        cursor: Cursor produced by encode_cursor
+        sort: Sort expression of the current request
+    
+    Returns:
+        Sort key of the last row on the previous page
+    
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, key = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(key, list):
+            raise TypeError(f"Cursor key must be a list, not {type(key).__name__}")
+        key = tuple(key)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+    
+    if cursor_sort != sort:
+        raise InvalidCursorError("Cursor was issued for a different sort order")
+    return key
+
+
+def parse_sort(sort: Optional[str], allowed: set, default: str) -> tuple[str, str, bool]:
+    """
+    Parse a sort expression such as "user_name" or "-date_of_creation"
+    
+    Args:
+        sort: Sort expression from the request (default used if empty)
+        allowed: Field names that may be sorted on
+        default: Default sort expression
+    
+    Returns:
+        Tuple of (normalized expression, field name, descending)
+    
+    Raises:
+        ValueError: If the field is not sortable
+    """
+    sort = sort or default
+    descending = sort.startswith("-")
+    field = sort.lstrip("-+")
+    if field not in allowed:
+        raise ValueError(f"Cannot sort by '{field}'. Allowed: {', '.join(sorted(allowed))}")
+    return ("-" if descending else "") + field, field, descending
@@ -0,0 +1,53 @@
+"""
+Rate Limiting Utilities
+"""
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Async token bucket limiting how often an operation may start"""
+    
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize a full bucket
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (the allowed burst)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        # Waiters are served in arrival order
+        self._lock = asyncio.Lock()
+    
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available"""
+        self._refill()
+        return self._tokens
+    
+    async def acquire(self) -> float:
+        """
+        Take a token, waiting until one is available
+        
+        Returns:
+            Seconds spent waiting for the token
+        """
+        async with self._lock:
+            self._refill()
+            waited = 0.0
+            if self._tokens < 1:
+                waited = (1 - self._tokens) / self.rate
+                await asyncio.sleep(waited)
+                self._refill()
+            self._tokens -= 1
+            return waited
+    
+    def _refill(self):
+        """Add the tokens accrued since the last update"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
@@ -0,0 +1,172 @@
+"""
+Concurrent Step Graph Execution
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+
+class Step(NamedTuple):
+    """A named unit of work and the steps it waits for"""
+    name: str
+    func: Callable[["StepRun"], Awaitable[Any]]
+    after: Sequence[str]
+    always: bool  # Run even if a step it waits for failed or was skipped
+
+
+class StepRun:
+    """Outcome of a step graph run"""
+    
+    def __init__(self, order: List[str]):
+        """
+        Initialize run state
+        
+        Args:
+            order: Step names in the order they were added
+        """
+        self._order = order
+        self.results: Dict[str, Any] = {}
+        self.errors: Dict[str, Exception] = {}
+        self.skipped: List[str] = []
+        self.timings: Dict[str, float] = {}  # Seconds per executed step
+        self.elapsed = 0.0
+    
+    @property
+    def failed(self) -> bool:
+        """True if any step raised"""
+        return bool(self.errors)
+    
+    def first_error(self) -> Optional[Exception]:
+        """Return the error of the earliest added step that failed"""
+        for name in self._order:
+            if name in self.errors:
+                return self.errors[name]
+        return None
+
+
+class StepGraph:
+    """Runs async steps concurrently as soon as the steps they wait for finish"""
+    
+    def __init__(self):
+        """Initialize an empty graph"""
+        self._steps: Dict[str, Step] = {}
+    
+    def add(
+        self,
+        name: str,
+        func: Callable[[StepRun], Awaitable[Any]],
+        after: Sequence[str] = (),
+        always: bool = False
+    ) -> "StepGraph":
+        """
+        Add a step
+        
+        Steps may only wait for steps added before them, so a graph can not
+        contain cycles. The step function receives the run, whose results
+        hold the return values of the steps it waited for.
+        
+        Args:
+            name: Unique step name
+            func: Coroutine function taking the StepRun
+            after: Names of steps that must finish first
+            always: Run even if a step in after failed or was skipped (e.g. to record the outcome)
+        
+        Returns:
+            The graph, for chaining
+        
+        Raises:
+            ValueError: If the name is taken or after names an unknown step
+        """
+        if name in self._steps:
+            raise ValueError(f"Duplicate step: {name}")
+        unknown = [dep for dep in after if dep not in self._steps]
+        if unknown:
+            raise ValueError(f"Step {name} waits for unknown steps: {', '.join(unknown)}")
+        self._steps[name] = Step(name, func, tuple(after), always)
+        return self
+    
+    async def run(self) -> StepRun:
+        """
+        Run all steps
+        
+        A step failing does not stop steps that do not wait for it; steps
+        that do are skipped unless added with always=True.
+        
+        Returns:
+            StepRun with results, errors, skipped steps and per-step timings
+        """
+        run = StepRun(list(self._steps))
+        waiting = dict(self._steps)
+        running: Dict[asyncio.Task, str] = {}
+        started = time.monotonic()
+        
+        while waiting or running:
+            for step in list(waiting.values()):
+                if any(dep in waiting or dep in running.values() for dep in step.after):
+                    continue
+                del waiting[step.name]
+                blocked = any(dep in run.errors or dep in run.skipped for dep in step.after)
+                if blocked and not step.always:
+                    run.skipped.append(step.name)
+                    continue
+                running[asyncio.create_task(self._run_step(step, run))] = step.name
+            
+            if not running:
+                # Everything left was skipped; loop again to skip its dependents
+                continue
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                del running[task]
+        
+        run.elapsed = time.monotonic() - started
+        return run
+    
+    async def _run_step(self, step: Step, run: StepRun):
+        """Run one step, recording its result or error and its duration"""
+        started = time.monotonic()
+        try:
+            run.results[step.name] = await step.func(run)
+        except Exception as e:
+            run.errors[step.name] = e
+        finally:
+            run.timings[step.name] = time.monotonic() - started
+
+
+class StepTimings:
+    """Aggregates step durations across runs"""
+    
+    def __init__(self):
+        """Initialize counters"""
+        self._steps: Dict[str, List[float]] = {}  # name -> [count, total, max, failures]
+        self.runs = 0
+    
+    def record(self, name: str, run: StepRun):
+        """
+        Add a run's timings
+        
+        Args:
+            name: Graph name (e.g. "create_resources")
+            run: Finished run
+        """
+        self.runs += 1
+        for step, seconds in [("total", run.elapsed), *run.timings.items()]:
+            counters = self._steps.setdefault(f"{name}.{step}", [0, 0.0, 0.0, 0])
+            counters[0] += 1
+            counters[1] += seconds
+            counters[2] = max(counters[2], seconds)
+            counters[3] += step in run.errors
+    
+    def stats(self) -> dict:
+        """Return count, average and max milliseconds and failures per step"""
+        return {
+            "runs": self.runs,
+            "steps": {
+                step: {
+                    "count": count,
+                    "avg_ms": round(total / count * 1000, 2),
+                    "max_ms": round(longest * 1000, 2),
+                    "failures": failures
+                }
+                for step, (count, total, longest, failures) in self._steps.items()
+            }
+        }
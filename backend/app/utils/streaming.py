@@ -0,0 +1,50 @@
+"""
+Async Streaming Helpers
+"""
+import asyncio
+from typing import Any, AsyncIterator, Callable
+
+_DONE = object()
+
+
+async def iterate_in_thread(producer: Callable[[Callable[[Any], None]], None]) -> AsyncIterator[Any]:
+    """
+    Bridge a blocking, callback-driven producer into an async iterator
+    
+    The producer runs in a worker thread and calls emit(value) for each
+    value (e.g. once per SDK page). Values are yielded on the event loop as
+    soon as they are emitted; producer exceptions are re-raised here.
+    
+    Args:
+        producer: Blocking function receiving an emit callback
+    
+    Yields:
+        Values passed to emit, in order
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    def emit(value: Any):
+        loop.call_soon_threadsafe(queue.put_nowait, value)
+    
+    def run():
+        try:
+            producer(emit)
+        except BaseException as e:
+            loop.call_soon_threadsafe(queue.put_nowait, (_DONE, e))
+        else:
+            loop.call_soon_threadsafe(queue.put_nowait, (_DONE, None))
+    
+    worker = loop.run_in_executor(None, run)
+    try:
+        while True:
+            value = await queue.get()
+            if isinstance(value, tuple) and len(value) == 2 and value[0] is _DONE:
+                if value[1] is not None:
+                    raise value[1]
+                return
+            yield value
+    finally:
+        # The thread cannot be interrupted; let it finish in the background
+        if not worker.done():
+            worker.add_done_callback(lambda f: f.exception())
@@ -0,0 +1,64 @@
+"""
+Provisioning Job Worker
+
+Runs queued provisioning jobs outside the API process:
+
+    python -m app.worker [--concurrency N]
+
+Set JOB_WORKER_IN_PROCESS=False on the API when running separate workers.
+Requires the SQLite broker so the API and workers share one queue.
+"""
+import argparse
+import asyncio
+import signal
+import structlog
+
+from app.config import get_settings
+from app.services.job_queue import JobWorker, get_job_queue
+from app.services.lifecycle import close_services
+from app.services.provisioning import JOB_HANDLERS, resume_account_creations
+from app.utils.logger import setup_logging
+
+setup_logging()
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+async def run(concurrency: int):
+    """Run a worker until SIGINT or SIGTERM"""
+    worker = JobWorker(get_job_queue(), JOB_HANDLERS, concurrency=concurrency)
+    task = asyncio.create_task(worker.run_until_cancelled())
+    await resume_account_creations()
+    
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, task.cancel)
+    
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await close_services()
+
+
+def main():
+    """Parse arguments and run the worker"""
+    parser = argparse.ArgumentParser(description="Run provisioning jobs from the job queue")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.JOB_WORKER_CONCURRENCY,
+        help="Jobs run at once (default JOB_WORKER_CONCURRENCY)"
+    )
+    args = parser.parse_args()
+    
+    if settings.JOB_BROKER == "memory":
+        parser.error("JOB_BROKER=memory is per-process; use the sqlite broker with a separate worker")
+    
+    logger.info("worker_starting", concurrency=args.concurrency, broker=settings.JOB_BROKER)
+    asyncio.run(run(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
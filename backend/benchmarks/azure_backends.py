@@ -0,0 +1,112 @@
+"""
+Benchmark: concurrent request latency with the sync and async Azure backends
+
+Simulates ARM round-trips with a fixed latency and fires concurrent
+get_resource_group calls through AzureService (blocking SDK) and
+AsyncAzureService (aio SDK). With the sync SDK every call stalls the
+event loop, so concurrent requests are served one after another.
+
+Usage (from backend/):
+    python -m benchmarks.azure_backends --requests 50 --latency 0.05
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from types import SimpleNamespace
+
+# Settings require these at import time; the benchmark never talks to Azure
+for _name in ("AZURE_SUBSCRIPTION_ID", "AZURE_TENANT_ID", "AZURE_CLIENT_ID",
+              "AZURE_CLIENT_SECRET", "GITHUB_TOKEN", "GITHUB_ORG"):
+    os.environ.setdefault(_name, "benchmark")
+
+from app.services.azure_service import AzureService  # noqa: E402
+from app.services.azure_async_service import AsyncAzureService  # noqa: E402
+
+
+def _fake_resource_group(name: str):
+    """Build an SDK-like resource group object"""
+    return SimpleNamespace(
+        id=f"/subscriptions/benchmark/resourceGroups/{name}",
+        name=name,
+        location="eastus",
+        tags={},
+        properties=SimpleNamespace(provisioning_state="Succeeded")
+    )
+
+
+class _FakePool:
+    """Client pool stand-in returning one fake resource client"""
+    
+    def __init__(self, resource_groups):
+        self.credential = None
+        self.subscription_client = None
+        self.client = SimpleNamespace(resource_groups=resource_groups)
+    
+    def get_resource_client(self, subscription_id: str):
+        return self.client
+
+
+class _SyncResourceGroups:
+    """Blocking resource_groups operations with simulated latency"""
+    
+    def __init__(self, latency: float):
+        self.latency = latency
+    
+    def get(self, name: str):
+        time.sleep(self.latency)
+        return _fake_resource_group(name)
+
+
+class _AsyncResourceGroups:
+    """Async resource_groups operations with simulated latency"""
+    
+    def __init__(self, latency: float):
+        self.latency = latency
+    
+    async def get(self, name: str):
+        await asyncio.sleep(self.latency)
+        return _fake_resource_group(name)
+
+
+async def _run(service, requests: int) -> dict:
+    """Fire concurrent requests and collect per-request latency from a common arrival time"""
+    async def timed(index: int) -> float:
+        await service.get_resource_group(f"rg-{index}")
+        return time.perf_counter() - started
+    
+    started = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(timed(i) for i in range(requests))))
+    wall = time.perf_counter() - started
+    
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "wall_ms": wall * 1000
+    }
+
+
+async def main(requests: int, latency: float):
+    """Run both backends and print a comparison table"""
+    results = {
+        "sync": await _run(AzureService(pool=_FakePool(_SyncResourceGroups(latency))), requests),
+        "async": await _run(AsyncAzureService(pool=_FakePool(_AsyncResourceGroups(latency))), requests),
+    }
+    
+    print(f"{requests} concurrent get_resource_group calls, {latency * 1000:.0f} ms simulated ARM latency")
+    print(f"{'backend':<8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'wall ms':>10}")
+    for backend, stats in results.items():
+        print(
+            f"{backend:<8}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+            f"{stats['max_ms']:>10.1f}{stats['wall_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.latency))
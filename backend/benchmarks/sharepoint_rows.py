@@ -0,0 +1,98 @@
+"""
+Benchmark: converting SharePoint list items to inventory rows
+
+Compares the per-item path (validated SharePointEntry per item, then
+entry_to_row) with the bulk properties_to_rows path on synthetic items
+shaped like a $select-projected list page.
+
+Usage (from backend/):
+    python -m benchmarks.sharepoint_rows --items 10000 --repeat 5
+"""
+import argparse
+import os
+import statistics
+import time
+from types import SimpleNamespace
+
+# Settings require these at import time; the benchmark never talks to SharePoint
+for _name in ("AZURE_SUBSCRIPTION_ID", "AZURE_TENANT_ID", "AZURE_CLIENT_ID",
+              "AZURE_CLIENT_SECRET", "GITHUB_TOKEN", "GITHUB_ORG"):
+    os.environ.setdefault(_name, "benchmark")
+
+from app.services.inventory_service import entry_to_row, properties_to_rows  # noqa: E402
+from app.services.sharepoint_service import SharePointService  # noqa: E402
+
+PLATFORMS = [("Azure", "Resource Group"), ("GCP", "Project"), ("AWS", "Account")]
+STATUSES = ["Pending", "In Progress", "Completed", "Failed"]
+
+
+def _items(count: int) -> list:
+    """Build list items with realistic column values"""
+    items = []
+    for index in range(count):
+        platform, resource_type = PLATFORMS[index % len(PLATFORMS)]
+        items.append(SimpleNamespace(properties={
+            "ID": index + 1,
+            "UserName": f"User {index % 250}",
+            "CloudPlatform": platform,
+            "ResourceType": resource_type,
+            "ResourceGroupName": f"rg-project-{index}",
+            "ProjectName": f"Project {index % 900}",
+            "DateOfCreation": f"2026-{index % 12 + 1:02d}-{index % 28 + 1:02d}T{index % 24:02d}:00:00Z",
+            "Status": STATUSES[index % len(STATUSES)],
+            "AzureResourceGroupId": f"/subscriptions/s/resourceGroups/rg-project-{index}" if platform == "Azure" else None,
+            "ResourceId": None,
+            "GitHubRepoUrl": f"https://github.com/org/rg-project-{index}" if index % 2 else None,
+            "ErrorMessage": None,
+            "SubscriptionId": None
+        }))
+    return items
+
+
+def _per_item(items: list) -> list:
+    """Current path: validated entry per item, then a row per entry"""
+    service = SharePointService.__new__(SharePointService)
+    return [entry_to_row(service._item_to_entry(item)) for item in items]
+
+
+def _bulk(items: list) -> list:
+    """Bulk path straight from item properties"""
+    rows, _ = properties_to_rows(item.properties for item in items)
+    return rows
+
+
+def _time(convert, items: list, repeat: int) -> float:
+    """Median milliseconds per conversion of all items"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        convert(items)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main(count: int, repeat: int):
+    """Run both paths and print a comparison table"""
+    items = _items(count)
+    assert _per_item(items) == _bulk(items)
+    
+    results = {
+        "per-item": _time(_per_item, items, repeat),
+        "bulk": _time(_bulk, items, repeat)
+    }
+    
+    print(f"{count} items, median of {repeat} runs")
+    print(f"{'path':<10}{'total ms':>10}{'us/item':>10}{'speedup':>10}")
+    for path, total_ms in results.items():
+        print(
+            f"{path:<10}{total_ms:>10.1f}{total_ms * 1000 / count:>10.2f}"
+            f"{results['per-item'] / total_ms:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.items, args.repeat)
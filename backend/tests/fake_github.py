@@ -0,0 +1,292 @@
+"""
+Local fake GitHub REST API for tests
+
+Serves the endpoints both GitHub services use on 127.0.0.1, with
+token auth, rate-limit headers, ETags and 304 responses, so clients are
+exercised over real sockets. Run it standalone with
+python -m tests.fake_github --port 8765 (from backend/).
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+Response = Tuple[int, Dict[str, str], Optional[Any]]
+
+
+class FakeGitHub:
+    """GitHub REST API subset served on a local port"""
+    
+    def __init__(
+        self,
+        token: str = "test-token",
+        org: Optional[str] = "test-org",
+        user: str = "test-user",
+        latency: float = 0.0,
+        rate_limit: int = 5000,
+        port: int = 0
+    ):
+        """
+        Initialize the fake
+        
+        Args:
+            token: Token accepted in the Authorization header
+            org: Organization the token belongs to (None for a personal account)
+            user: Login of the token's user
+            latency: Seconds every request takes (requests are served concurrently)
+            rate_limit: Primary rate limit budget
+            port: Port to listen on (any free port by default)
+        """
+        self.token = token
+        self.org = org
+        self.user = user
+        self.latency = latency
+        self.users: Set[str] = {user}
+        self.repos: Dict[str, dict] = {}  # Lower-cased full name -> repository JSON
+        self.collaborators: Dict[str, Dict[str, str]] = {}  # Lower-cased full name -> login -> permission
+        self.requests: List[Tuple[str, str]] = []
+        self.not_modified = 0
+        self.connections = 0
+        self.max_in_flight = 0
+        self.limit = rate_limit
+        self.remaining = rate_limit
+        self.reset_at = int(time.time()) + 3600
+        self._in_flight = 0
+        self._ids = itertools.count(1000)
+        self._lock = threading.RLock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), _handler(self))
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        """API root URL"""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "FakeGitHub":
+        """Serve requests in a background thread"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """Stop serving and close the socket"""
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def __enter__(self) -> "FakeGitHub":
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def add_repo(self, owner: str, name: str, created_at: Optional[datetime] = None, **fields) -> dict:
+        """Create a repository directly (no request is recorded)"""
+        created_at = created_at or datetime.now(timezone.utc)
+        repo = {
+            "id": next(self._ids),
+            "name": name,
+            "full_name": f"{owner}/{name}",
+            "url": f"{self.url}/repos/{owner}/{name}",
+            "html_url": f"https://github.com/{owner}/{name}",
+            "clone_url": f"https://github.com/{owner}/{name}.git",
+            "description": None,
+            "private": False,
+            "created_at": created_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            **fields
+        }
+        with self._lock:
+            self.repos[repo["full_name"].lower()] = repo
+        return repo
+    
+    def handle(
+        self,
+        method: str,
+        path: str,
+        headers: Dict[str, str],
+        body: Optional[dict],
+        query: Optional[Dict[str, str]] = None
+    ) -> Response:
+        """Serve one request"""
+        with self._lock:
+            self.requests.append((method, path))
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if headers.get("authorization") not in (f"Bearer {self.token}", f"token {self.token}"):
+                return 401, {}, {"message": "Bad credentials"}
+            
+            status, response_headers, payload = self._route(method, path, headers, body or {}, query or {})
+            with self._lock:
+                # Conditional requests answered with 304 are free
+                if status != 304:
+                    self.remaining = max(self.remaining - 1, 0)
+                response_headers.update({
+                    "X-RateLimit-Limit": str(self.limit),
+                    "X-RateLimit-Remaining": str(self.remaining),
+                    "X-RateLimit-Reset": str(self.reset_at)
+                })
+            return status, response_headers, payload
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+    
+    def _route(self, method: str, path: str, headers: Dict[str, str], body: dict, query: Dict[str, str]) -> Response:
+        """Dispatch to the endpoint matching the request"""
+        if method == "GET" and path == "/user":
+            return 200, {}, self._account(self.user, "User")
+        
+        match = re.fullmatch(r"/users/([^/]+)", path)
+        if method == "GET" and match:
+            if match.group(1) not in self.users:
+                return 404, {}, {"message": "Not Found"}
+            return 200, {}, self._account(match.group(1), "User")
+        
+        match = re.fullmatch(r"/orgs/([^/]+)", path)
+        if method == "GET" and match:
+            if self.org and match.group(1).lower() == self.org.lower():
+                return 200, {}, self._account(self.org, "Organization")
+            return 404, {}, {"message": "Not Found"}
+        
+        match = re.fullmatch(r"/orgs/([^/]+)/repos|/user/repos", path)
+        if method in ("GET", "POST") and match:
+            owner = match.group(1) or self.user
+            if match.group(1) and (not self.org or owner.lower() != self.org.lower()):
+                return 404, {}, {"message": "Not Found"}
+            if method == "GET":
+                return self._list_repos(owner, query)
+            return self._create_repo(owner, body)
+        
+        match = re.fullmatch(r"/repos/([^/]+)/([^/]+)", path)
+        if match:
+            key = f"{match.group(1)}/{match.group(2)}".lower()
+            if key not in self.repos:
+                return 404, {}, {"message": "Not Found"}
+            if method == "GET":
+                repo = self.repos[key]
+                etag = 'W/"' + hashlib.sha1(json.dumps(repo, sort_keys=True).encode()).hexdigest() + '"'
+                if headers.get("if-none-match") == etag:
+                    with self._lock:
+                        self.not_modified += 1
+                    return 304, {"ETag": etag}, None
+                return 200, {"ETag": etag}, repo
+            if method == "DELETE":
+                with self._lock:
+                    self.repos.pop(key)
+                    self.collaborators.pop(key, None)
+                return 204, {}, None
+        
+        match = re.fullmatch(r"/repos/([^/]+)/([^/]+)/collaborators/([^/]+)", path)
+        if method == "PUT" and match:
+            key = f"{match.group(1)}/{match.group(2)}".lower()
+            if key not in self.repos or match.group(3) not in self.users:
+                return 404, {}, {"message": "Not Found"}
+            with self._lock:
+                self.collaborators.setdefault(key, {})[match.group(3)] = body.get("permission", "push")
+            return 201, {}, {"id": next(self._ids), "permissions": body.get("permission", "push")}
+        
+        return 404, {}, {"message": "Not Found"}
+    
+    def _account(self, login: str, kind: str) -> dict:
+        """Build an organization or user JSON object"""
+        path = "orgs" if kind == "Organization" else "users"
+        return {"login": login, "type": kind, "url": f"{self.url}/{path}/{login}"}
+    
+    def _list_repos(self, owner: str, query: Dict[str, str]) -> Response:
+        """List an owner's repositories a page at a time, newest first when sorted by creation"""
+        with self._lock:
+            repos = [repo for key, repo in self.repos.items() if key.split("/")[0] == owner.lower()]
+        if query.get("sort") == "created":
+            repos.sort(key=lambda repo: (repo["created_at"], repo["id"]), reverse=query.get("direction") != "asc")
+        per_page = min(int(query.get("per_page", 30)), 100)
+        page = int(query.get("page", 1))
+        return 200, {}, repos[(page - 1) * per_page:page * per_page]
+    
+    def _create_repo(self, owner: str, body: dict) -> Response:
+        """Create a repository unless the name is taken"""
+        name = body.get("name")
+        if not name:
+            return 422, {}, {
+                "message": "Repository creation failed.",
+                "errors": [{"resource": "Repository", "field": "name", "code": "missing_field"}]
+            }
+        with self._lock:
+            if f"{owner}/{name}".lower() in self.repos:
+                return 422, {}, {
+                    "message": "Repository creation failed.",
+                    "errors": [{
+                        "resource": "Repository",
+                        "field": "name",
+                        "message": "name already exists on this account"
+                    }]
+                }
+            repo = self.add_repo(
+                owner,
+                name,
+                description=body.get("description"),
+                private=bool(body.get("private", False))
+            )
+        return 201, {}, repo
+
+
+def _handler(fake: FakeGitHub) -> type:
+    """Build a request handler class bound to a fake"""
+    
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, so connection reuse by the client is observable
+        protocol_version = "HTTP/1.1"
+        
+        def setup(self):
+            super().setup()
+            with fake._lock:
+                fake.connections += 1
+        
+        def _serve(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            body = json.loads(raw) if raw else None
+            headers = {name.lower(): value for name, value in self.headers.items()}
+            url = urlsplit(self.path)
+            status, response_headers, payload = fake.handle(
+                self.command, url.path, headers, body, dict(parse_qsl(url.query))
+            )
+            
+            data = json.dumps(payload).encode() if payload is not None else b""
+            self.send_response(status)
+            for name, value in response_headers.items():
+                self.send_header(name, value)
+            if data:
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _serve
+        
+        def log_message(self, format, *args):
+            pass
+    
+    return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local fake GitHub REST API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--token", default="test-token")
+    parser.add_argument("--org", default="test-org")
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    
+    fake = FakeGitHub(token=args.token, org=args.org, latency=args.latency, port=args.port)
+    print(f"Fake GitHub API on {fake.url} (token {args.token!r}, org {args.org!r})")
+    fake.server.serve_forever()
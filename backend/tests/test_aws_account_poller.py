@@ -0,0 +1,225 @@
+"""
+Unit tests for AWS account creation polling
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database import create_engine_for_url
+from app.models import CloudPlatform, OperationStatus, ResourceCreationRequest, ResourceStatus, SharePointEntry
+from app.services import provisioning
+from app.services.aws_account_poller import AccountCreationPoller, track_account_creation
+from app.services.operation_tracker import OperationTracker, PollPolicy
+from app.services.resource_store import ResourceStore
+
+
+class FakeOrganizations:
+    """Organizations API holding create-account requests in memory"""
+    
+    def __init__(self):
+        self.requests = {}
+        self.list_calls = 0
+        self.describe_calls = 0
+        self.throttled = set()  # Request IDs whose next describe call fails
+    
+    def create_account(self, Email, AccountName, RoleName, Tags=None):
+        request_id = f"car-{len(self.requests):08d}"
+        self.requests[request_id] = {"Id": request_id, "AccountName": AccountName, "State": "IN_PROGRESS"}
+        return {"CreateAccountStatus": dict(self.requests[request_id])}
+    
+    def finish(self, request_id, failure_reason=None):
+        status = self.requests[request_id]
+        if failure_reason:
+            status.update(State="FAILED", FailureReason=failure_reason)
+        else:
+            status.update(State="SUCCEEDED", AccountId=f"{int(request_id[4:]) + 100000000000:012d}")
+    
+    def list_create_account_status(self, States, MaxResults=20, NextToken=None):
+        self.list_calls += 1
+        matching = [dict(status) for status in self.requests.values() if status["State"] in States]
+        start = int(NextToken or 0)
+        response = {"CreateAccountStatuses": matching[start:start + MaxResults]}
+        if start + MaxResults < len(matching):
+            response["NextToken"] = str(start + MaxResults)
+        return response
+    
+    def describe_create_account_status(self, CreateAccountRequestId):
+        if CreateAccountRequestId in self.throttled:
+            self.throttled.discard(CreateAccountRequestId)
+            raise RuntimeError("TooManyRequestsException")
+        self.describe_calls += 1
+        return {"CreateAccountStatus": dict(self.requests[CreateAccountRequestId])}
+
+
+class FakeAWSService:
+    """AWSService stand-in creating accounts through the fake Organizations API"""
+    
+    def __init__(self, organizations):
+        self.organizations_client = organizations
+    
+    async def create_account(self, account_name, email, tags=None):
+        request_id = self.organizations_client.create_account(email, account_name, "Role")["CreateAccountStatus"]["Id"]
+        operation = self.track_account_creation(request_id, account_name)
+        return {"request_id": request_id, "account_id": None, "operation_id": operation.id}
+    
+    def track_account_creation(self, request_id, account_name):
+        return track_account_creation(self.organizations_client, request_id, account_name)
+
+
+@pytest.fixture
+def aws():
+    """Fake Organizations API with a fast tracker and poller installed"""
+    organizations = FakeOrganizations()
+    tracker = OperationTracker(policies={
+        provider: PollPolicy(initial=0.01, maximum=0.05, multiplier=2.0) for provider in CloudPlatform
+    })
+    with patch('app.services.aws_account_poller.get_operation_tracker', return_value=tracker), \
+         patch('app.services.provisioning.get_operation_tracker', return_value=tracker), \
+         patch('app.services.aws_account_poller._account_creation_poller',
+               AccountCreationPoller(organizations, min_interval=0.005)):
+        yield organizations, tracker
+
+
+def provisioning_poller():
+    """The poller installed by the aws fixture"""
+    from app.services import aws_account_poller
+    return aws_account_poller._account_creation_poller
+
+
+def _store(tmp_path):
+    """
+    Build a store on a private SQLite file
+    
+    In-memory SQLite shares one connection between sessions, so a read
+    rolling back could discard a callback's concurrent write.
+    """
+    engine = create_engine_for_url(f"sqlite:///{tmp_path / 'store.db'}")
+    return ResourceStore(async_sessionmaker(engine, expire_on_commit=False))
+
+
+@pytest.mark.asyncio
+async def test_outstanding_requests_are_polled_in_batches(aws):
+    """Test many requests are followed with listings, describing each only once it finished"""
+    organizations, tracker = aws
+    request_ids = [
+        organizations.create_account(f"a{i}@example.com", f"account-{i}", "Role")["CreateAccountStatus"]["Id"]
+        for i in range(45)
+    ]
+    operations = [track_account_creation(organizations, request_id, "account") for request_id in request_ids]
+    
+    for request_id in request_ids[:40]:
+        organizations.finish(request_id)
+    for request_id in request_ids[40:]:
+        organizations.finish(request_id, failure_reason="EMAIL_ALREADY_EXISTS")
+    finished = [await tracker.wait(operation.id, timeout=2) for operation in operations]
+    
+    assert [operation.status for operation in finished] == [OperationStatus.SUCCEEDED] * 40 + [OperationStatus.FAILED] * 5
+    assert finished[0].result["account_id"] == "100000000000"
+    assert finished[-1].error == "EMAIL_ALREADY_EXISTS"
+    assert organizations.describe_calls == 45
+    assert organizations.list_calls < 45
+    poller = provisioning_poller()
+    assert poller.stats()["outstanding"] == 0
+    assert poller._finished == {}
+
+
+@pytest.mark.asyncio
+async def test_describe_error_only_delays_its_own_request(aws):
+    """Test a failed describe leaves that request outstanding without failing the others"""
+    organizations, tracker = aws
+    request_ids = [
+        organizations.create_account(f"a{i}@example.com", f"account-{i}", "Role")["CreateAccountStatus"]["Id"]
+        for i in range(3)
+    ]
+    for request_id in request_ids:
+        organizations.finish(request_id)
+    organizations.throttled.add(request_ids[1])
+    operations = [track_account_creation(organizations, request_id, "account") for request_id in request_ids]
+    
+    finished = [await tracker.wait(operation.id, timeout=2) for operation in operations]
+    
+    assert [operation.status for operation in finished] == [OperationStatus.SUCCEEDED] * 3
+    assert tracker.stats()["poll_errors"] == 0
+    assert provisioning_poller().stats()["describe_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_account_id_is_pushed_to_sharepoint_and_store(aws, tmp_path):
+    """Test create_resources reports In Progress and the final account ID is written back"""
+    organizations, tracker = aws
+    store = _store(tmp_path)
+    sharepoint = MagicMock()
+    sharepoint.create_item = AsyncMock(return_value="42")
+    sharepoint.update_item_status = AsyncMock(return_value=True)
+    request = ResourceCreationRequest(
+        user_name="Jane Doe",
+        cloud_platform="AWS",
+        resource_type="Account",
+        resource_group_name="demo-account",
+        project_name="Demo"
+    )
+    
+    with patch('app.services.provisioning.settings') as settings, \
+         patch('app.services.provisioning.AWS_AVAILABLE', True), \
+         patch('app.services.provisioning.AWSService', lambda: FakeAWSService(organizations), create=True), \
+         patch('app.services.provisioning.SharePointService', return_value=sharepoint), \
+         patch('app.services.resource_store.get_resource_store', return_value=store):
+        settings.SHAREPOINT_ENABLED = True
+        settings.SHAREPOINT_SITE_URL = "https://example.sharepoint.com"
+        response = await provisioning.create_resources(request)
+        
+        assert response.status == ResourceStatus.IN_PROGRESS
+        assert response.resource_group_id == "car-00000000"
+        assert (await store.get_request("42")).status == ResourceStatus.IN_PROGRESS
+        
+        organizations.finish("car-00000000")
+        await tracker.wait(response.operation_id, timeout=2)
+    
+    stored = await store.get_request("42")
+    assert stored.status == ResourceStatus.COMPLETED
+    assert stored.resource_id == "100000000000"
+    sharepoint.update_item_status.assert_awaited_with(
+        "42",
+        ResourceStatus.COMPLETED,
+        resource_id="100000000000",
+        github_repo_url=None,
+        error_message=None
+    )
+
+
+@pytest.mark.asyncio
+async def test_in_progress_requests_are_resumed(aws, tmp_path):
+    """Test requests left In Progress by a previous process are followed again"""
+    organizations, tracker = aws
+    store = _store(tmp_path)
+    request_id = organizations.create_account("a@example.com", "demo", "Role")["CreateAccountStatus"]["Id"]
+    await store.upsert_request(SharePointEntry(
+        id="7",
+        user_name="Jane Doe",
+        cloud_platform="AWS",
+        resource_type="Account",
+        resource_group_name="demo",
+        project_name="Demo",
+        status=ResourceStatus.IN_PROGRESS,
+        resource_id=request_id
+    ))
+    
+    with patch('app.services.provisioning.AWS_AVAILABLE', True), \
+         patch('app.services.provisioning.AWSService', lambda: FakeAWSService(organizations), create=True), \
+         patch('app.services.provisioning.get_resource_store', return_value=store), \
+         patch('app.services.resource_store.get_resource_store', return_value=store), \
+         patch('app.services.provisioning.settings') as settings:
+        settings.SHAREPOINT_ENABLED = False
+        assert await provisioning.resume_account_creations() == 1
+        
+        organizations.finish(request_id, failure_reason="ACCOUNT_LIMIT_EXCEEDED")
+        for _ in range(200):
+            stored = await store.get_request("7")
+            if stored.status != ResourceStatus.IN_PROGRESS:
+                break
+            await asyncio.sleep(0.01)
+    
+    assert stored.status == ResourceStatus.FAILED
+    assert stored.error_message == "ACCOUNT_LIMIT_EXCEEDED"
+    assert stored.resource_id == request_id
@@ -0,0 +1,142 @@
+"""
+Unit tests for the AWS account inventory
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.models import AzureResourceGroup
+from app.services import aws_inventory
+from app.services.aws_inventory import AWSAccountInventory, account_closed, account_created
+from app.services.inventory_service import InventoryService
+
+
+class FakeOrganizations:
+    """Organizations API listing accounts in pages"""
+    
+    def __init__(self, count):
+        self.accounts = [self._account(f"{100000000000 + i:012d}", f"account-{i}") for i in range(count)]
+        self.list_calls = 0
+        self.describe_calls = 0
+    
+    @staticmethod
+    def _account(account_id, name):
+        return {
+            "Id": account_id,
+            "Arn": f"arn:aws:organizations::111111111111:account/o-test/{account_id}",
+            "Name": name,
+            "Email": f"{name}@example.com",
+            "Status": "ACTIVE",
+            "JoinedMethod": "CREATED",
+            "JoinedTimestamp": datetime(2026, 3, 1, 12, 0)
+        }
+    
+    def add(self, account_id, name):
+        self.accounts.append(self._account(account_id, name))
+    
+    def list_accounts(self, MaxResults=20, NextToken=None):
+        self.list_calls += 1
+        start = int(NextToken or 0)
+        response = {"Accounts": [dict(account) for account in self.accounts[start:start + MaxResults]]}
+        if start + MaxResults < len(self.accounts):
+            response["NextToken"] = str(start + MaxResults)
+        return response
+    
+    def describe_account(self, AccountId):
+        self.describe_calls += 1
+        return {"Account": next(dict(account) for account in self.accounts if account["Id"] == AccountId)}
+
+
+@pytest.mark.asyncio
+async def test_inventory_streams_pages_and_serves_cache_until_ttl():
+    """Test pages are streamed, a complete listing is cached, and an abandoned one is not"""
+    organizations = FakeOrganizations(45)
+    inventory = AWSAccountInventory(organizations, ttl=60)
+    
+    stream = inventory.iter_accounts()
+    first_page = await stream.__anext__()
+    await stream.aclose()
+    assert len(first_page) == 20
+    assert organizations.list_calls == 1
+    assert not inventory.fresh
+    
+    pages = [len(page) async for page in inventory.iter_accounts()]
+    assert pages == [20, 20, 5]
+    assert organizations.list_calls == 4
+    
+    accounts = await inventory.get_accounts()
+    assert len(accounts) == 45
+    assert accounts[0]["account_id"] == "100000000000"
+    assert organizations.list_calls == 4
+    assert inventory.stats()["hits"] == 1
+    
+    inventory.ttl = 0
+    await inventory.get_accounts()
+    assert organizations.list_calls == 7
+    assert inventory.stats()["full_loads"] == 2
+
+
+@pytest.mark.asyncio
+async def test_created_and_closed_accounts_update_loaded_inventory():
+    """Test accounts created or closed by the service are applied without relisting"""
+    organizations = FakeOrganizations(3)
+    inventory = AWSAccountInventory(organizations, ttl=60)
+    
+    with patch('app.services.aws_inventory._aws_account_inventory', inventory):
+        # Nothing loaded yet: no call is made
+        await account_created("100000000000")
+        assert organizations.describe_calls == 0
+        
+        await inventory.get_accounts()
+        organizations.add("200000000000", "new-account")
+        await account_created("200000000000")
+        account_closed("100000000001")
+        accounts = {account["account_id"]: account for account in await inventory.get_accounts()}
+    
+    assert organizations.list_calls == 1
+    assert organizations.describe_calls == 1
+    assert accounts["200000000000"]["account_name"] == "new-account"
+    assert accounts["100000000001"]["status"] == "PENDING_CLOSURE"
+    assert inventory.stats()["incremental_updates"] == 2
+
+
+@pytest.mark.asyncio
+async def test_discovered_inventory_includes_aws_accounts():
+    """Test AWS accounts follow Azure resource groups in /api/resources when enabled"""
+    async def iter_resource_groups(inventory):
+        inventory.subscriptions_total = 1
+        inventory.completed = True
+        yield [AzureResourceGroup(id="/rg/rg-a", name="rg-a", location="eastus", tags={}, provisioning_state="Succeeded")]
+    
+    azure_service = Mock()
+    azure_service.iter_resource_groups = iter_resource_groups
+    store = Mock()
+    store.replace_source = AsyncMock()
+    failing = Mock()
+    failing.iter_accounts = Mock(side_effect=RuntimeError("AccessDenied"))
+    
+    with patch('app.services.inventory_service.get_azure_service', return_value=azure_service), \
+         patch('app.services.inventory_service.get_resource_store', return_value=store), \
+         patch('app.services.inventory_service.settings.SHAREPOINT_ENABLED', False), \
+         patch('app.services.inventory_service.settings.AWS_INVENTORY_ENABLED', True):
+        with patch('app.services.inventory_service.get_aws_account_inventory',
+                   return_value=AWSAccountInventory(FakeOrganizations(25), ttl=60)):
+            batches = [rows async for rows in InventoryService().iter_rows()]
+        
+        with patch('app.services.inventory_service.get_aws_account_inventory', return_value=failing):
+            service = InventoryService()
+            partial = [rows async for rows in service.iter_rows()]
+            headers = service.peek().value.headers
+    
+    assert [len(rows) for rows in batches] == [1, 20, 5]
+    aws_row = batches[1][0]
+    assert aws_row["cloud_platform"] == "AWS"
+    assert aws_row["id"].endswith("/100000000000")
+    assert aws_row["status"] == "Completed"
+    assert aws_row["date_of_creation"] == "2026-03-01T12:00:00"
+    
+    assert [len(rows) for rows in partial] == [1]
+    assert headers["X-AWS-Accounts-Failed"] == "true"
+    assert headers["X-Partial-Results"] == "true"
+    assert store.replace_source.await_args.kwargs == {"complete": False}
+    assert aws_inventory._aws_account_inventory is None
@@ -0,0 +1,90 @@
+"""
+Unit tests for async Azure service
+"""
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+from app.services.azure_async_service import AsyncAzureService
+from azure.core.exceptions import AzureError
+
+
+class _AsyncPager:
+    """Async iterator standing in for an aio SDK pager"""
+    
+    def __init__(self, items, delay=0.0):
+        self.items = items
+        self.delay = delay
+    
+    def __aiter__(self):
+        return self._iterate()
+    
+    async def _iterate(self):
+        await asyncio.sleep(self.delay)
+        for item in self.items:
+            yield item
+
+
+def _mock_resource_group(name):
+    """Build a mock SDK resource group"""
+    rg = Mock()
+    rg.id = f"/subscriptions/sub/resourceGroups/{name}"
+    rg.name = name
+    rg.location = "eastus"
+    rg.tags = {}
+    rg.properties.provisioning_state = "Succeeded"
+    return rg
+
+
+@pytest.fixture
+def pool():
+    """Fixture for a client pool returning per-subscription mock clients"""
+    pool = Mock()
+    pool.clients = {}
+    
+    def get_resource_client(subscription_id):
+        return pool.clients.setdefault(subscription_id, Mock())
+    
+    pool.get_resource_client = get_resource_client
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_get_resource_group(pool):
+    """Test getting a resource group awaits the aio client"""
+    service = AsyncAzureService(pool=pool)
+    service.resource_client.resource_groups.get = AsyncMock(
+        return_value=_mock_resource_group("test-rg")
+    )
+    
+    result = await service.get_resource_group("test-rg")
+    
+    assert result is not None
+    assert result.name == "test-rg"
+
+
+@pytest.mark.asyncio
+async def test_list_resource_groups_detailed_cancels_slow_subscriptions(pool):
+    """Test slow subscriptions are cancelled and reported"""
+    subscriptions = []
+    for subscription_id in ("sub-ok", "sub-slow", "sub-error"):
+        sub = Mock(subscription_id=subscription_id, display_name=subscription_id, state="Enabled")
+        subscriptions.append(sub)
+    pool.subscription_client.subscriptions.list = Mock(return_value=_AsyncPager(subscriptions))
+    
+    pool.get_resource_client("sub-ok").resource_groups.list = Mock(
+        return_value=_AsyncPager([_mock_resource_group("rg-1")])
+    )
+    pool.get_resource_client("sub-slow").resource_groups.list = Mock(
+        return_value=_AsyncPager([_mock_resource_group("rg-2")], delay=5)
+    )
+    pool.get_resource_client("sub-error").resource_groups.list = Mock(
+        side_effect=AzureError("Forbidden")
+    )
+    service = AsyncAzureService(pool=pool)
+    
+    with patch('app.services.azure_async_service.settings.AZURE_LIST_SUBSCRIPTION_TIMEOUT', 0.05):
+        inventory = await service.list_resource_groups_detailed()
+    
+    assert [rg.name for rg in inventory.resource_groups] == ["rg-1"]
+    failures = {f.subscription_id: f.reason for f in inventory.failed_subscriptions}
+    assert failures == {"sub-slow": "timeout", "sub-error": "error"}
@@ -81,3 +81,158 @@ async def test_get_resource_group(azure_service):
     # Assertions
     assert result is not None
     assert result.name == "test-rg"
+
+
+def _mock_subscription(subscription_id, state="Enabled"):
+    """Build a mock subscription"""
+    sub = Mock()
+    sub.subscription_id = subscription_id
+    sub.display_name = f"Subscription {subscription_id}"
+    sub.state = state
+    return sub
+
+
+def _mock_resource_group(subscription_id, name):
+    """Build a mock SDK resource group"""
+    rg = Mock()
+    rg.id = f"/subscriptions/{subscription_id}/resourceGroups/{name}"
+    rg.name = name
+    rg.location = "eastus"
+    rg.tags = {}
+    rg.properties.provisioning_state = "Succeeded"
+    return rg
+
+
+@pytest.mark.asyncio
+async def test_list_resource_groups_detailed_reports_partial_results(azure_service):
+    """Test fan-out keeps successful subscriptions and reports failed ones"""
+    import time
+    
+    azure_service.subscription_client = Mock()
+    azure_service.subscription_client.subscriptions.list = Mock(return_value=[
+        _mock_subscription("sub-ok"),
+        _mock_subscription("sub-error"),
+        _mock_subscription("sub-slow"),
+        _mock_subscription("sub-disabled", state="Disabled"),
+    ])
+    
+    def resource_client_for(subscription_id):
+        client = Mock()
+        if subscription_id == "sub-error":
+            client.resource_groups.list = Mock(side_effect=AzureError("Forbidden"))
+        elif subscription_id == "sub-slow":
+            client.resource_groups.list = Mock(side_effect=lambda: time.sleep(0.5) or [])
+        else:
+            client.resource_groups.list = Mock(return_value=[
+                _mock_resource_group(subscription_id, "rg-1"),
+                _mock_resource_group(subscription_id, "rg-2"),
+            ])
+        return client
+    
+    azure_service._resource_client_for = resource_client_for
+    
+    with patch('app.services.azure_service.settings.AZURE_LIST_SUBSCRIPTION_TIMEOUT', 0.1):
+        inventory = await azure_service.list_resource_groups_detailed()
+    
+    assert inventory.subscriptions_total == 3
+    assert [rg.name for rg in inventory.resource_groups] == ["rg-1", "rg-2"]
+    assert inventory.partial
+    failures = {f.subscription_id: f.reason for f in inventory.failed_subscriptions}
+    assert failures == {"sub-error": "error", "sub-slow": "timeout"}
+
+
+@pytest.mark.asyncio
+async def test_listing_reports_any_error_and_holds_slot_until_thread_returns(azure_service):
+    """Test non-Azure errors are per-subscription failures and a timed-out thread keeps its slot"""
+    import time
+    import requests
+    
+    azure_service.subscription_client = Mock()
+    azure_service.subscription_client.subscriptions.list = Mock(return_value=[
+        _mock_subscription("sub-slow"),
+        _mock_subscription("sub-broken"),
+    ])
+    started = {}
+    
+    def resource_client_for(subscription_id):
+        started[subscription_id] = time.monotonic()
+        client = Mock()
+        if subscription_id == "sub-slow":
+            client.resource_groups.list = Mock(side_effect=lambda: time.sleep(0.3) or [])
+        else:
+            client.resource_groups.list = Mock(side_effect=requests.ConnectionError("connection reset"))
+        return client
+    
+    azure_service._resource_client_for = resource_client_for
+    
+    with patch('app.services.azure_service.settings.AZURE_LIST_SUBSCRIPTION_TIMEOUT', 0.05), \
+         patch('app.services.azure_service.settings.AZURE_LIST_CONCURRENCY', 1):
+        inventory = await azure_service.list_resource_groups_detailed()
+    
+    failures = {f.subscription_id: f.reason for f in inventory.failed_subscriptions}
+    assert failures == {"sub-slow": "timeout", "sub-broken": "error"}
+    assert started["sub-broken"] - started["sub-slow"] >= 0.25
+
+
+@pytest.mark.asyncio
+async def test_failed_subscription_listing_is_not_a_complete_listing(azure_service):
+    """Test a subscription listing error is recorded instead of reading as an empty tenant"""
+    from unittest.mock import AsyncMock
+    from app.services.inventory_service import InventoryService
+    
+    azure_service.subscription_client = Mock()
+    azure_service.subscription_client.subscriptions.list = Mock(side_effect=AzureError("Unauthorized"))
+    store = Mock()
+    store.replace_source = AsyncMock()
+    
+    with patch('app.services.inventory_service.get_azure_service', return_value=azure_service), \
+         patch('app.services.inventory_service.get_resource_store', return_value=store), \
+         patch('app.services.inventory_service.settings.SHAREPOINT_ENABLED', False), \
+         patch('app.services.azure_service.settings.AZURE_INVENTORY_BACKEND', "arm"):
+        inventory = await azure_service.list_resource_groups_detailed()
+        service = InventoryService()
+        rows = [row async for batch in service.iter_rows() for row in batch]
+    
+    assert inventory.partial
+    assert [(f.subscription_id, f.reason) for f in inventory.failed_subscriptions] == [("*", "subscriptions_error")]
+    assert rows == []
+    assert service.peek().value.headers["X-Partial-Results"] == "true"
+    assert store.replace_source.await_args.kwargs == {"complete": False}
+
+
+def test_client_pool_reuses_and_evicts_clients():
+    """Test the client pool caches clients per subscription with LRU eviction"""
+    from app.services.azure_service import AzureClientPool
+    
+    with patch('app.services.azure_service.ClientSecretCredential'), \
+         patch('app.services.azure_service.SubscriptionClient'), \
+         patch('app.services.azure_service.ResourceManagementClient', side_effect=lambda **kw: Mock()):
+        pool = AzureClientPool(max_clients=2)
+        
+        first = pool.get_resource_client("sub-1")
+        assert pool.get_resource_client("sub-1") is first
+        pool.get_resource_client("sub-2")
+        pool.get_resource_client("sub-3")  # Evicts sub-1
+        assert pool.get_resource_client("sub-1") is not first
+    
+    stats = pool.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 4
+    assert stats["evictions"] == 2
+    assert stats["size"] == 2
+
+
+def test_azure_service_reuses_pool_client_for_other_subscription():
+    """Test create_resource_group uses the pooled client for non-default subscriptions"""
+    from app.services.azure_service import AzureClientPool
+    
+    with patch('app.services.azure_service.ClientSecretCredential'), \
+         patch('app.services.azure_service.SubscriptionClient'), \
+         patch('app.services.azure_service.ResourceManagementClient', side_effect=lambda **kw: Mock()):
+        pool = AzureClientPool()
+        first = AzureService(pool=pool)
+        second = AzureService(pool=pool)
+    
+    assert first.credential is second.credential
+    assert first.resource_client is second.resource_client
+    assert first._resource_client_for("other-sub") is second._resource_client_for("other-sub")
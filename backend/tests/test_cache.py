@@ -0,0 +1,82 @@
+"""
+Unit tests for the stale-while-revalidate cache
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+from app.utils.cache import SWRCache
+
+
+class CountingLoader:
+    """Async loader that counts calls and can be held open"""
+    
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+    
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return f"value-{self.calls}"
+
+
+@pytest.mark.asyncio
+async def test_miss_then_hit():
+    """Test first read loads and second read is served from cache"""
+    cache = SWRCache(ttl=60, stale_ttl=60)
+    loader = CountingLoader()
+    
+    first = await cache.get("k", loader)
+    second = await cache.get("k", loader)
+    
+    assert (first.value, first.status) == ("value-1", "miss")
+    assert (second.value, second.status) == ("value-1", "hit")
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    """Test single-flight deduplication of concurrent refreshes"""
+    cache = SWRCache(ttl=60, stale_ttl=60)
+    loader = CountingLoader()
+    loader.release.clear()
+    
+    waiters = [asyncio.create_task(cache.get("k", loader)) for _ in range(5)]
+    await asyncio.sleep(0)
+    loader.release.set()
+    results = await asyncio.gather(*waiters)
+    
+    assert loader.calls == 1
+    assert {result.value for result in results} == {"value-1"}
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_refreshing():
+    """Test stale entries are returned immediately and refreshed in background"""
+    cache = SWRCache(ttl=10, stale_ttl=100)
+    loader = CountingLoader()
+    await cache.get("k", loader)
+    
+    with patch('app.utils.cache.time.monotonic', return_value=cache._entries["k"][1] + 20):
+        stale = await cache.get("k", loader)
+        assert (stale.value, stale.status) == ("value-1", "stale")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        fresh = await cache.get("k", loader)
+    
+    assert (fresh.value, fresh.status) == ("value-2", "hit")
+    assert cache.stats()["stale_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_forces_reload():
+    """Test invalidation drops the entry and ignores in-flight results"""
+    cache = SWRCache(ttl=60, stale_ttl=60)
+    loader = CountingLoader()
+    await cache.get("k", loader)
+    
+    cache.invalidate()
+    result = await cache.get("k", loader)
+    
+    assert (result.value, result.status) == ("value-2", "miss")
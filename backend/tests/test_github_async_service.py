@@ -0,0 +1,134 @@
+"""
+Unit tests for async GitHub service against a local fake GitHub API
+"""
+import asyncio
+import time
+import pytest
+from datetime import datetime, timedelta, timezone
+from github import BadCredentialsException, GithubException
+
+from app.services.github_async_service import AsyncGitHubClient, AsyncGitHubService
+from app.services.github_scheduler import GitHubScheduler
+from tests.fake_github import FakeGitHub
+
+
+@pytest.fixture
+def fake_github():
+    """Fixture for a running fake GitHub API"""
+    with FakeGitHub() as fake:
+        yield fake
+
+
+def _service(fake, token="test-token", org="test-org", pool_size=4):
+    """Build a service on a private client and scheduler pointed at the fake"""
+    # The fake speaks HTTP/1.1 over plain TCP, so HTTP/2 is not negotiated
+    client = AsyncGitHubClient(token, org, base_url=fake.url, pool_size=pool_size, http2=False)
+    scheduler = GitHubScheduler(max_concurrent=50, writes_per_minute=60000, write_burst=50, reserve=0)
+    return AsyncGitHubService(client=client, scheduler=scheduler)
+
+
+@pytest.mark.asyncio
+async def test_repository_lifecycle(fake_github):
+    """Test create, conditional get, collaborators and delete"""
+    service = _service(fake_github)
+    
+    created = await service.create_repository("rg-demo", description="Demo", private=True)
+    assert created.full_name == "test-org/rg-demo"
+    assert created.private
+    
+    # The second read revalidates with If-None-Match and gets a free 304
+    assert (await service.get_repository("rg-demo")).id == created.id
+    assert (await service.get_repository("rg-demo")).id == created.id
+    assert fake_github.not_modified == 1
+    assert service.client.cache.stats()["not_modified"] == 1
+    
+    assert await service.add_collaborator("rg-demo", "test-user", "admin")
+    assert not await service.add_collaborator("rg-demo", "nobody")
+    assert fake_github.collaborators["test-org/rg-demo"] == {"test-user": "admin"}
+    
+    assert await service.delete_repository("rg-demo")
+    assert await service.get_repository("rg-demo") is None
+    assert not await service.delete_repository("rg-demo")
+    
+    # The owner was looked up once across all calls
+    assert fake_github.requests.count(("GET", "/orgs/test-org")) == 1
+    await service.client.close()
+
+
+@pytest.mark.asyncio
+async def test_repository_creations_overlap():
+    """Test many creations run concurrently over a few pooled connections"""
+    with FakeGitHub(latency=0.1) as fake:
+        service = _service(fake, pool_size=10)
+        await service.client.owner()
+        
+        started = time.monotonic()
+        repos = await asyncio.gather(*(service.create_repository(f"rg-{i}") for i in range(30)))
+        elapsed = time.monotonic() - started
+        await service.client.close()
+    
+    assert len({repo.id for repo in repos}) == 30
+    assert elapsed < 1.5  # 3.0s one at a time
+    assert fake.max_in_flight == 10
+    assert fake.connections == 10
+
+
+@pytest.mark.asyncio
+async def test_personal_account_and_duplicate_name():
+    """Test a token without the organization creates repositories for its user"""
+    with FakeGitHub(org=None) as fake:
+        service = _service(fake, org="test-org")
+        
+        created = await service.create_repository("rg-demo")
+        with pytest.raises(GithubException) as error:
+            await service.create_repository("rg-demo")
+        await service.client.close()
+    
+    assert created.full_name == "test-user/rg-demo"
+    assert error.value.status == 422
+
+
+@pytest.mark.asyncio
+async def test_rejected_token_is_not_cached(fake_github):
+    """Test a bad token raises BadCredentialsException and the owner is looked up again"""
+    service = _service(fake_github, token="wrong")
+    
+    for _ in range(2):
+        with pytest.raises(BadCredentialsException):
+            await service.create_repository("rg-demo")
+    
+    assert service.client.stats()["owner_lookups"] == 2
+    assert service.client.stats()["auth_failures"] == 2
+    await service.client.close()
+
+
+@pytest.mark.asyncio
+async def test_repository_names_are_listed_newest_first(fake_github):
+    """Test listing pages through every repository or stops at older ones"""
+    now = datetime.now(timezone.utc)
+    for i in range(250):
+        fake_github.add_repo("test-org", f"repo-{i}", created_at=now - timedelta(hours=250 - i))
+    service = _service(fake_github)
+    
+    names = await service.list_repository_names()
+    recent = await service.list_repository_names(created_after=now - timedelta(hours=3, minutes=30))
+    await service.client.close()
+    
+    assert len(names) == 250
+    assert names[0] == "repo-249"
+    assert recent == ["repo-249", "repo-248", "repo-247"]
+
+
+@pytest.mark.asyncio
+async def test_http2_falls_back_without_h2(fake_github):
+    """Test a client asking for HTTP/2 is still built, over HTTP/1.1, when h2 is missing"""
+    from unittest.mock import patch
+    
+    with patch('app.services.github_async_service.importlib.util.find_spec', return_value=None):
+        client = AsyncGitHubClient("test-token", "test-org", base_url=fake_github.url, http2=True)
+    
+    try:
+        assert client.http2 is False
+        assert client.stats()["http2"] is False
+    finally:
+        await client.close()
@@ -0,0 +1,95 @@
+"""
+Unit tests for the GitHub rate-limit scheduler
+"""
+import asyncio
+import time
+import pytest
+from github import GithubException
+
+from app.services.github_scheduler import GitHubScheduler
+
+
+def _scheduler(**kwargs):
+    """Build a scheduler with fast writes and no reserve"""
+    options = {"max_concurrent": 4, "writes_per_minute": 600, "write_burst": 2, "reserve": 0, "max_retries": 2}
+    return GitHubScheduler(**{**options, **kwargs})
+
+
+@pytest.mark.asyncio
+async def test_writes_beyond_burst_are_spaced():
+    """Test content-creating calls are paced by the token bucket and reads are not"""
+    scheduler = _scheduler()
+    
+    started = time.monotonic()
+    await asyncio.gather(*(scheduler.call(lambda: "created", write=True) for _ in range(4)))
+    await asyncio.gather(*(scheduler.call(lambda: "read") for _ in range(10)))
+    elapsed = time.monotonic() - started
+    
+    stats = scheduler.stats()
+    assert 0.18 <= elapsed < 1.0  # Two writes beyond the burst, 0.1s apart
+    assert stats["calls"] == 14
+    assert stats["write_calls"] == 4
+    assert stats["delayed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_secondary_rate_limit_is_retried_after_retry_after():
+    """Test a call rejected with Retry-After is retried instead of failing"""
+    scheduler = _scheduler()
+    attempts = []
+    
+    def create_repo():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise GithubException(
+                403,
+                {"message": "You have exceeded a secondary rate limit"},
+                headers={"Retry-After": "0.2"}
+            )
+        return "created"
+    
+    assert await scheduler.call(create_repo, write=True) == "created"
+    assert attempts[1] - attempts[0] >= 0.2
+    assert scheduler.stats()["rate_limited"] == 1
+
+
+@pytest.mark.asyncio
+async def test_calls_wait_for_reset_when_budget_is_low():
+    """Test calls queue until X-RateLimit-Reset once the remaining budget hits the reserve"""
+    scheduler = _scheduler(reserve=10)
+    
+    def missing():
+        raise GithubException(404, {"message": "Not Found"}, headers={
+            "X-RateLimit-Remaining": "5",
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Reset": str(time.time() + 0.3)
+        })
+    
+    with pytest.raises(GithubException):
+        await scheduler.call(missing)
+    assert scheduler.stats()["remaining"] == 5
+    
+    started = time.monotonic()
+    call = asyncio.create_task(scheduler.call(lambda: "ok"))
+    await asyncio.sleep(0.05)
+    assert scheduler.stats()["queue_depth"] == 1
+    
+    assert await call == "ok"
+    assert time.monotonic() - started >= 0.25
+    assert scheduler.stats()["remaining"] == 5000
+    assert scheduler.stats()["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_other_errors_are_raised_at_once():
+    """Test a 403 that is not a rate limit is not retried"""
+    scheduler = _scheduler()
+    attempts = []
+    
+    def forbidden():
+        attempts.append(1)
+        raise GithubException(403, {"message": "Resource not accessible by integration"}, headers={})
+    
+    with pytest.raises(GithubException):
+        await scheduler.call(forbidden, write=True)
+    assert len(attempts) == 1
@@ -3,8 +3,11 @@ Unit tests for GitHub service
 """
 import pytest
 from unittest.mock import Mock, patch
-from app.services.github_service import GitHubService
-from github import GithubException
+from app.services import github_service as github_module
+from app.services.github_cache import GitHubObjectCache
+from app.services.github_service import GitHubConnection, GitHubService
+from tests.fake_github import FakeGitHub
+from github import BadCredentialsException, GithubException
 
 
 @pytest.fixture
@@ -79,3 +82,118 @@ async def test_get_repository(github_service):
     # Assertions
     assert result is not None
     assert result.name == "test-repo"
+
+
+def _connection():
+    """Build a connection on a mocked PyGithub client"""
+    with patch('app.services.github_service.Github'):
+        return GitHubConnection("token", "test-org", pool_size=4)
+
+
+@pytest.mark.asyncio
+async def test_owner_resolved_once_and_refreshed_after_auth_error():
+    """Test services share the owner lookup until the token is rejected"""
+    connection = _connection()
+    org = connection.client.get_organization.return_value
+    
+    services = [GitHubService(connection) for _ in range(3)]
+    
+    assert all(service.owner is org and service.is_org for service in services)
+    assert connection.client.get_organization.call_count == 1
+    
+    org.get_repo = Mock(side_effect=BadCredentialsException(401, {"message": "Bad credentials"}))
+    assert await services[0].get_repository("test-repo") is None
+    
+    GitHubService(connection)
+    
+    stats = connection.stats()
+    assert connection.client.get_organization.call_count == 2
+    assert stats["owner_lookups"] == 2
+    assert stats["owner_reuses"] == 2
+    assert stats["auth_failures"] == 1
+    assert stats["client_reuses"] == 3
+
+
+def test_user_owner_when_org_not_found():
+    """Test a token without the organization falls back to its user"""
+    connection = _connection()
+    connection.client.get_organization.side_effect = GithubException(404, {"message": "Not Found"})
+    
+    first = GitHubService(connection)
+    second = GitHubService(connection)
+    
+    assert not first.is_org
+    assert second.owner is connection.client.get_user.return_value
+    assert connection.client.get_user.call_count == 1
+
+
+def _repo(name="test-repo"):
+    """Build a PyGithub-like repository"""
+    repo = Mock(
+        id=123456,
+        full_name=f"org/{name}",
+        html_url=f"https://github.com/org/{name}",
+        clone_url=f"https://github.com/org/{name}.git",
+        created_at="2026-02-10T10:30:00Z",
+        private=False
+    )
+    repo.name = name  # Mock(name=...) names the mock itself
+    repo.update.return_value = False  # 304 Not Modified
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_repository_reads_are_revalidated_from_shared_cache():
+    """Test repeated reads across services send conditional GETs instead of refetching"""
+    connection = _connection()
+    org = connection.client.get_organization.return_value
+    repo = _repo()
+    org.get_repo = Mock(return_value=repo)
+    
+    for _ in range(3):
+        result = await GitHubService(connection).get_repository("Test-Repo")
+        assert result.name == "test-repo"
+    
+    assert org.get_repo.call_count == 1
+    assert repo.update.call_count == 2
+    assert connection.cache.stats()["not_modified"] == 2
+    
+    # A repository deleted elsewhere fails revalidation and leaves the cache
+    repo.update.side_effect = GithubException(404, {"message": "Not Found"})
+    assert await GitHubService(connection).get_repository("test-repo") is None
+    assert connection.cache.stats()["entries"] == 0
+
+
+def test_object_cache_evicts_least_recently_used():
+    """Test the cache stays within its bound"""
+    cache = GitHubObjectCache(max_entries=2)
+    
+    cache.put("repo:a", _repo("a"))
+    cache.put("repo:b", _repo("b"))
+    assert cache.get("repo:a") is not None
+    cache.put("repo:c", _repo("c"))
+    
+    assert cache.get("repo:b") is None
+    assert cache.get("repo:a") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_service_against_fake_api():
+    """Test the PyGithub service over HTTP against the local fake GitHub API"""
+    with FakeGitHub() as fake, patch.object(github_module.settings, 'GITHUB_API_URL', fake.url):
+        service = GitHubService(GitHubConnection("test-token", "test-org", pool_size=2))
+        
+        created = await service.create_repository("rg-demo", auto_init=False)
+        assert (await service.get_repository("rg-demo")).id == created.id
+        assert (await service.get_repository("rg-demo")).id == created.id
+        assert await service.add_collaborator("rg-demo", "test-user")
+        for i in range(120):
+            fake.add_repo("test-org", f"repo-{i}")
+        assert len(await service.list_repository_names()) == 121
+        assert await service.delete_repository("rg-demo")
+        service.connection.close()
+    
+    assert created.full_name == "test-org/rg-demo"
+    assert fake.not_modified == 3  # Every repository read after the first revalidation
+    assert fake.connections == 1
@@ -0,0 +1,236 @@
+"""
+Unit tests for inventory filtering and pagination
+"""
+import base64
+import json
+import pytest
+from datetime import datetime
+from app.services.inventory_service import InventorySnapshot, InventoryFilter
+from app.utils.pagination import InvalidCursorError
+
+
+def _row(index, user_name="Jane Doe", status="Completed", cloud_platform="Azure", day=1):
+    """Build an inventory row"""
+    return {
+        "id": f"id-{index:03d}",
+        "user_name": user_name,
+        "resource_group_name": f"rg-{index:03d}",
+        "date_of_creation": f"2026-02-{day:02d}T10:00:00",
+        "project_name": f"Project {index}",
+        "status": status,
+        "cloud_platform": cloud_platform,
+        "location": "eastus"
+    }
+
+
+@pytest.fixture
+def snapshot():
+    """Fixture for an inventory snapshot"""
+    rows = [_row(i, day=(i % 28) + 1) for i in range(50)]
+    rows.append(_row(50, user_name="John Smith", status="Failed", cloud_platform="GCP", day=3))
+    return InventorySnapshot(source="azure", rows=rows)
+
+
+def test_query_without_options_returns_all_rows(snapshot):
+    """Test unpaginated, unsorted queries keep source order"""
+    rows, next_cursor = snapshot.query(InventoryFilter())
+    
+    assert rows == snapshot.rows
+    assert next_cursor is None
+
+
+def test_query_filters(snapshot):
+    """Test filters are case-insensitive and combine"""
+    rows, _ = snapshot.query(InventoryFilter(user_name="smith", status="failed", cloud_platform="gcp"))
+    assert [row["id"] for row in rows] == ["id-050"]
+    
+    rows, _ = snapshot.query(InventoryFilter(
+        created_after=datetime(2026, 2, 27),
+        created_before=datetime(2026, 2, 28, 23, 59)
+    ))
+    assert {row["date_of_creation"][:10] for row in rows} == {"2026-02-27", "2026-02-28"}
+
+
+def test_cursor_pagination_walks_every_row_once(snapshot):
+    """Test pages follow the sort order without gaps or duplicates"""
+    seen = []
+    cursor = None
+    while True:
+        rows, cursor = snapshot.query(InventoryFilter(), sort="-date_of_creation", limit=7, cursor=cursor)
+        seen.extend(rows)
+        if cursor is None:
+            break
+    
+    assert len(seen) == len(snapshot.rows)
+    assert len({row["id"] for row in seen}) == len(snapshot.rows)
+    dates = [row["date_of_creation"] for row in seen]
+    assert dates == sorted(dates, reverse=True)
+
+
+def test_missing_values_sort_last_in_both_directions():
+    """Test undated rows follow dated ones whether sorting ascending or descending"""
+    rows = [_row(0, day=1), _row(1), _row(2, day=5)]
+    rows[1]["date_of_creation"] = None
+    snapshot = InventorySnapshot(source="azure", rows=rows)
+    
+    for sort, expected in (("date_of_creation", ["id-000", "id-002", "id-001"]),
+                           ("-date_of_creation", ["id-002", "id-000", "id-001"])):
+        all_rows, _ = snapshot.query(InventoryFilter(), sort=sort)
+        first, cursor = snapshot.query(InventoryFilter(), sort=sort, limit=2)
+        rest, _ = snapshot.query(InventoryFilter(), sort=sort, limit=2, cursor=cursor)
+        assert [row["id"] for row in all_rows] == expected
+        assert [row["id"] for row in first + rest] == expected
+
+
+def test_cursor_pagination_with_filter(snapshot):
+    """Test filtered pages end with no cursor"""
+    rows, cursor = snapshot.query(InventoryFilter(status="Completed"), sort="resource_group_name", limit=40)
+    assert len(rows) == 40
+    rows, cursor = snapshot.query(InventoryFilter(status="Completed"), sort="resource_group_name", limit=40, cursor=cursor)
+    assert [row["id"] for row in rows] == [f"id-{i:03d}" for i in range(40, 50)]
+    assert cursor is None
+
+
+def test_invalid_sort_and_cursor(snapshot):
+    """Test unknown sort fields and mismatched cursors are rejected"""
+    with pytest.raises(ValueError):
+        snapshot.query(InventoryFilter(), sort="secret", limit=5)
+    
+    _, cursor = snapshot.query(InventoryFilter(), sort="user_name", limit=5)
+    with pytest.raises(InvalidCursorError):
+        snapshot.query(InventoryFilter(), sort="project_name", limit=5, cursor=cursor)
+    with pytest.raises(InvalidCursorError):
+        snapshot.query(InventoryFilter(), sort="user_name", limit=5, cursor="not-a-cursor")
+    
+    # Well-formed JSON whose key is not a list
+    bad_key = base64.urlsafe_b64encode(json.dumps(["-date_of_creation", 5]).encode()).decode()
+    with pytest.raises(InvalidCursorError):
+        snapshot.query(InventoryFilter(), sort="-date_of_creation", limit=5, cursor=bad_key)
+
+
+@pytest.mark.asyncio
+async def test_iter_rows_streams_batches_and_caches_snapshot():
+    """Test live streaming yields per-subscription batches and caches the result"""
+    from unittest.mock import AsyncMock, Mock, patch
+    from app.models import AzureResourceGroup
+    from app.services.inventory_service import InventoryService
+    
+    def resource_group(name):
+        return AzureResourceGroup(id=f"/rg/{name}", name=name, location="eastus", tags={}, provisioning_state="Succeeded")
+    
+    async def iter_resource_groups(inventory):
+        inventory.subscriptions_total = 2
+        inventory.completed = True
+        yield [resource_group("rg-a"), resource_group("rg-b")]
+        yield [resource_group("rg-c")]
+    
+    azure_service = Mock()
+    azure_service.iter_resource_groups = iter_resource_groups
+    
+    store = Mock()
+    store.replace_source = AsyncMock()
+    
+    with patch('app.services.inventory_service.get_azure_service', return_value=azure_service), \
+         patch('app.services.inventory_service.get_resource_store', return_value=store), \
+         patch('app.services.inventory_service.settings.SHAREPOINT_ENABLED', False):
+        service = InventoryService()
+        batches = [[row["resource_group_name"] for row in rows] async for rows in service.iter_rows()]
+        cached = service.peek()
+    
+    assert batches == [["rg-a", "rg-b"], ["rg-c"]]
+    assert cached is not None
+    assert len(cached.value.rows) == 3
+    assert cached.value.headers["X-Subscriptions-Total"] == "2"
+    store.replace_source.assert_awaited_once_with(cached.value, complete=True)
+
+
+@pytest.mark.asyncio
+async def test_iter_rows_pushes_status_filter_to_sharepoint():
+    """Test a filtered SharePoint stream is filtered on the server and not cached"""
+    from unittest.mock import Mock, patch
+    from app.services.inventory_service import InventoryService
+    
+    filters_sent = []
+    
+    async def iter_item_pages(filter_query=None):
+        filters_sent.append(filter_query)
+        yield []
+    
+    sharepoint_service = Mock()
+    sharepoint_service.iter_item_pages = iter_item_pages
+    
+    with patch('app.services.inventory_service.SharePointService', return_value=sharepoint_service), \
+         patch('app.services.inventory_service.settings.SHAREPOINT_ENABLED', True), \
+         patch('app.services.inventory_service.settings.SHAREPOINT_SITE_URL', "https://test.sharepoint.com"):
+        service = InventoryService()
+        filters = InventoryFilter(status="in progress", user_name="Jane")
+        [rows async for rows in service.iter_rows(filters)]
+        cached = service.peek()
+    
+    assert filters_sent == ["Status eq 'In Progress' and substringof('jane', UserName)"]
+    assert cached is None
+
+
+def test_properties_to_rows_matches_entry_conversion():
+    """Test the bulk path yields the rows and rejections of the per-item path"""
+    from types import SimpleNamespace
+    from app.services.inventory_service import entry_to_row, properties_to_rows
+    from app.services.sharepoint_service import SharePointService
+    
+    base = {
+        "ID": 1,
+        "UserName": "Jane Doe",
+        "CloudPlatform": "Azure",
+        "ResourceType": "Resource Group",
+        "ResourceGroupName": "rg-demo",
+        "ProjectName": "Demo",
+        "DateOfCreation": "2026-02-01T10:00:00Z",
+        "Status": "Completed",
+        "AzureResourceGroupId": "/subscriptions/s/resourceGroups/rg-demo",
+        "ResourceId": None,
+        "GitHubRepoUrl": None,
+        "ErrorMessage": None,
+        "SubscriptionId": None
+    }
+    properties = [
+        base,
+        {**base, "ID": 2, "CloudPlatform": "GCP", "ResourceType": None, "Status": "In Progress"},
+        {"ID": 3, "UserName": "Legacy", "ResourceGroupName": "rg-old", "ProjectName": "Old", "DateOfCreation": "2025-01-01T00:00:00"},
+        {**base, "ID": 4, "CloudPlatform": "Oracle"},
+        {**base, "ID": 5, "Status": None},
+        {**base, "ID": 6, "GitHubRepoUrl": {"Url": "https://github.com/o/r"}},
+        {**base, "ID": 7, "UserName": None},
+        {**base, "ID": 8, "DateOfCreation": "not a date"}
+    ]
+    
+    service = SharePointService.__new__(SharePointService)
+    expected = []
+    rejected = []
+    for props in properties:
+        try:
+            expected.append(entry_to_row(service._item_to_entry(SimpleNamespace(properties=props))))
+        except Exception:
+            rejected.append(props["ID"])
+    
+    rows, failures = properties_to_rows(properties)
+    
+    assert rows == expected
+    assert [item_id for item_id, _ in failures] == rejected == [4, 5, 6, 7, 8]
+
+
+@pytest.mark.asyncio
+async def test_iterate_in_thread_propagates_values_and_errors():
+    """Test the thread bridge yields emitted values and re-raises failures"""
+    from app.utils.streaming import iterate_in_thread
+    
+    def produce(emit):
+        emit([1, 2])
+        emit([3])
+        raise RuntimeError("page 3 failed")
+    
+    received = []
+    with pytest.raises(RuntimeError):
+        async for page in iterate_in_thread(produce):
+            received.append(page)
+    
+    assert received == [[1, 2], [3]]
@@ -0,0 +1,153 @@
+"""
+Unit tests for the provisioning job queue
+"""
+import asyncio
+import sqlite3
+import pytest
+from unittest.mock import patch
+
+from app.models import JobStatus
+from app.services.job_queue import JobQueue, JobWorker, MemoryJobBroker, SQLiteJobBroker, retry_delay
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def queue(request, tmp_path):
+    """Fixture for a job queue on each broker"""
+    if request.param == "memory":
+        broker = MemoryJobBroker()
+    else:
+        broker = SQLiteJobBroker(str(tmp_path / "jobs.db"))
+    job_queue = JobQueue(broker)
+    yield job_queue
+    job_queue.close()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_deduplicates_active_jobs(queue):
+    """Test an item already queued is not queued twice"""
+    first = await queue.enqueue("process_sharepoint_update", {"item_id": "1"}, dedupe_key="sharepoint:1")
+    second = await queue.enqueue("process_sharepoint_update", {"item_id": "1"}, dedupe_key="sharepoint:1")
+    
+    assert second.id == first.id
+    assert (await queue.stats())["queued"] == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed(queue):
+    """Test a job whose worker stopped extending its lease is handed out again"""
+    job = await queue.enqueue("create_resources", {}, max_attempts=2)
+    
+    first = await queue.reserve(visibility_timeout=0.0)
+    assert first.id == job.id and first.attempts == 1
+    
+    second = await queue.reserve(visibility_timeout=60.0)
+    assert second.id == job.id and second.attempts == 2
+    assert await queue.reserve(visibility_timeout=60.0) is None
+    
+    # The first lease is gone, so its late completion is ignored
+    assert not await queue.complete(first, {"late": True})
+    assert await queue.complete(second, {"ok": True})
+    assert (await queue.get(job.id)).result == {"ok": True}
+
+
+@pytest.mark.asyncio
+async def test_worker_retries_with_backoff_then_succeeds(queue):
+    """Test failed attempts are requeued with backoff and results are stored"""
+    calls = []
+    
+    async def flaky(payload):
+        calls.append(payload)
+        if len(calls) < 3:
+            raise RuntimeError("SharePoint unavailable")
+        return {"item_id": payload["item_id"]}
+    
+    job = await queue.enqueue("flaky", {"item_id": "7"}, max_attempts=3)
+    worker = JobWorker(queue, {"flaky": flaky}, concurrency=2, visibility_timeout=30.0, poll_interval=0.01)
+    
+    with patch('app.services.job_queue.settings.JOB_RETRY_BACKOFF_SECONDS', 0.01):
+        worker.start()
+        finished = await queue.wait(job.id, timeout=5.0, poll_interval=0.01)
+        await worker.stop()
+    
+    assert finished.status == JobStatus.SUCCEEDED
+    assert finished.attempts == 3
+    assert finished.result == {"item_id": "7"}
+    assert worker.stats()["retried"] == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_fails_job_after_max_attempts(queue):
+    """Test a job that keeps failing ends up failed with its last error"""
+    async def broken(payload):
+        raise ValueError("bad request")
+    
+    job = await queue.enqueue("broken", {}, max_attempts=1)
+    worker = JobWorker(queue, {"broken": broken}, concurrency=1, visibility_timeout=30.0, poll_interval=0.01)
+    worker.start()
+    finished = await queue.wait(job.id, timeout=5.0, poll_interval=0.01)
+    await worker.stop()
+    
+    assert finished.status == JobStatus.FAILED
+    assert finished.last_error == "bad request"
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_an_outcome_that_can_not_be_recorded(queue):
+    """Test a failed complete() leaves the loop running and the job is retried after its lease expires"""
+    complete = queue.complete
+    calls = 0
+    
+    async def locked_once(job, result):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return await complete(job, result)
+    
+    async def ok(payload):
+        return {"ok": True}
+    
+    job = await queue.enqueue("ok", {}, max_attempts=3)
+    worker = JobWorker(queue, {"ok": ok}, concurrency=1, visibility_timeout=0.1, poll_interval=0.01)
+    
+    with patch.object(queue, 'complete', new=locked_once):
+        worker.start()
+        finished = await queue.wait(job.id, timeout=5.0, poll_interval=0.01)
+        alive = not any(task.done() for task in worker._tasks)
+        await worker.stop()
+    
+    assert alive
+    assert finished.status == JobStatus.SUCCEEDED
+    assert finished.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_concurrency_is_bounded():
+    """Test no more than `concurrency` jobs run at once"""
+    queue = JobQueue(MemoryJobBroker())
+    running = 0
+    peak = 0
+    
+    async def slow(payload):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+    
+    jobs = [await queue.enqueue("slow", {"n": n}) for n in range(8)]
+    worker = JobWorker(queue, {"slow": slow}, concurrency=3, visibility_timeout=30.0, poll_interval=0.01)
+    worker.start()
+    for job in jobs:
+        await queue.wait(job.id, timeout=5.0, poll_interval=0.01)
+    await worker.stop()
+    
+    assert peak == 3
+    assert (await queue.stats())["succeeded"] == 8
+
+
+def test_retry_delay_is_exponential_and_capped():
+    """Test backoff doubles per attempt up to the maximum"""
+    with patch('app.services.job_queue.settings.JOB_RETRY_BACKOFF_SECONDS', 2.0), \
+         patch('app.services.job_queue.settings.JOB_RETRY_BACKOFF_MAX_SECONDS', 10.0):
+        assert [retry_delay(attempt) for attempt in range(1, 5)] == [2.0, 4.0, 8.0, 10.0]
@@ -0,0 +1,158 @@
+"""
+Unit tests for the long-running operation tracker
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from fastapi import HTTPException
+
+from app.config import get_settings
+from app.models import CloudPlatform, OperationStatus
+from app.routers.operations import get_operation
+from app.services.azure_service import AzureOperationHandle, track_resource_group_delete
+from app.services.operation_tracker import OperationFailed, OperationHandle, OperationTracker, PollPolicy
+
+FAST = PollPolicy(initial=0.01, maximum=0.04, multiplier=2.0)
+
+
+def _tracker(**kwargs):
+    """Build a tracker polling every provider on a fast schedule"""
+    return OperationTracker(policies={provider: FAST for provider in CloudPlatform}, **kwargs)
+
+
+class CountdownHandle(OperationHandle):
+    """Operation that finishes after a number of polls"""
+    
+    def __init__(self, polls, fail_with=None):
+        self.remaining = polls
+        self.fail_with = fail_with
+        self.polled = 0
+    
+    async def poll(self):
+        self.polled += 1
+        if isinstance(self.fail_with, Exception) and not isinstance(self.fail_with, OperationFailed):
+            raise self.fail_with
+        self.remaining -= 1
+        if self.remaining > 0:
+            return None
+        if self.fail_with is not None:
+            raise self.fail_with
+        return {"done": True}
+
+
+@pytest.mark.asyncio
+async def test_operations_are_polled_until_done():
+    """Test many operations share one schedule and each is polled until it finishes"""
+    tracker = _tracker()
+    finished = []
+    
+    async def on_complete(operation):
+        finished.append(operation.id)
+    
+    handles = [CountdownHandle(polls=1 + i % 4) for i in range(200)]
+    operations = [
+        tracker.track(CloudPlatform.GCP, "create_project", f"project-{i}", handle, on_complete=on_complete)
+        for i, handle in enumerate(handles)
+    ]
+    assert operations[0].status == OperationStatus.RUNNING
+    
+    results = await asyncio.gather(*(tracker.wait(operation.id, timeout=5) for operation in operations))
+    
+    assert all(result.status == OperationStatus.SUCCEEDED for result in results)
+    assert [handle.polled for handle in handles] == [1 + i % 4 for i in range(200)]
+    assert results[3].polls == 4
+    assert results[3].result == {"done": True}
+    assert results[3].next_poll_at is None
+    assert len(finished) == 200
+    assert tracker.stats()["running"] == 0
+    assert tracker.stats()["polls"] == sum(handle.polled for handle in handles)
+    await tracker.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_operation_raises_provider_error():
+    """Test a provider-reported failure fails the operation and result() re-raises its cause"""
+    tracker = _tracker()
+    cause = ValueError("Project already exists")
+    try:
+        raise OperationFailed(str(cause)) from cause
+    except OperationFailed as e:
+        failure = e
+    operation = tracker.track(CloudPlatform.GCP, "create_project", "demo", CountdownHandle(polls=2, fail_with=failure))
+    
+    with pytest.raises(ValueError, match="already exists"):
+        await tracker.result(operation.id)
+    
+    operation = tracker.get(operation.id)
+    assert operation.status == OperationStatus.FAILED
+    assert operation.error == "Project already exists"
+    await tracker.close()
+
+
+@pytest.mark.asyncio
+async def test_poll_errors_pause_only_that_provider():
+    """Test failing polls back off the provider's other operations and fail after the limit"""
+    tracker = _tracker(max_poll_errors=2)
+    tracker.policies[CloudPlatform.AWS] = PollPolicy(initial=0.05, maximum=1.0, multiplier=2.0)
+    throttling = CountdownHandle(1, RuntimeError("Throttling"))
+    throttled = tracker.track(CloudPlatform.AWS, "create_account", "a", throttling)
+    while not throttling.polled:
+        await asyncio.sleep(0.001)
+    assert tracker.stats()["paused_providers"] == ["AWS"]
+    
+    # Operations of the paused provider wait; other providers are polled as usual
+    waiting = CountdownHandle(polls=1)
+    tracker.track(CloudPlatform.AWS, "create_account", "b", waiting)
+    azure_operation = tracker.track(CloudPlatform.AZURE, "delete_resource_group", "rg", CountdownHandle(polls=1))
+    assert (await tracker.wait(azure_operation.id, timeout=1)).status == OperationStatus.SUCCEEDED
+    assert waiting.polled == 0
+    
+    operation = await tracker.wait(throttled.id, timeout=1)
+    assert operation.status == OperationStatus.FAILED
+    assert operation.error == "Polling failed: Throttling"
+    assert waiting.polled == 1
+    assert tracker.stats()["poll_errors"] == 2
+    await tracker.close()
+
+
+class FakePolling:
+    """ARM polling method whose status advances on each update"""
+    
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.current = "InProgress"
+    
+    def update_status(self):
+        self.current = self.statuses.pop(0)
+    
+    def finished(self):
+        return self.current.lower() in ("succeeded", "failed", "canceled")
+    
+    def status(self):
+        return self.current
+
+
+@pytest.mark.asyncio
+async def test_resource_group_delete_is_tracked():
+    """Test a tracked Azure delete finishes and leaves the tag index, or fails on Canceled"""
+    tracker = _tracker()
+    with patch('app.services.azure_service.get_operation_tracker', return_value=tracker), \
+         patch('app.services.azure_service.get_tag_index') as tag_index, \
+         patch('app.routers.operations.get_operation_tracker', return_value=tracker):
+        deleted = track_resource_group_delete("rg-demo", AzureOperationHandle(FakePolling(["Deleting", "Succeeded"])))
+        canceled = track_resource_group_delete("rg-other", AzureOperationHandle(FakePolling(["Canceled"])))
+        
+        assert await tracker.result(deleted.id) == {"status": "Succeeded"}
+        with pytest.raises(OperationFailed, match="Canceled"):
+            await tracker.result(canceled.id)
+        
+        assert (await get_operation(deleted.id)).polls == 2
+        with pytest.raises(HTTPException) as error:
+            await get_operation("unknown")
+        assert error.value.status_code == 404
+    
+    tag_index.return_value.remove.assert_called_once_with(
+        f"/subscriptions/{get_settings().AZURE_SUBSCRIPTION_ID}/resourceGroups/rg-demo"
+    )
+    await tracker.close()
@@ -0,0 +1,139 @@
+"""
+Unit tests for the GitHub repository name index
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models import RepoNameStatus, ResourceCreationRequest, ResourceStatus
+from app.services import provisioning
+from app.services.repo_name_index import RepoNameIndex
+
+
+class FakeLister:
+    """GitHub service listing a fixed set of repositories"""
+    
+    def __init__(self, names):
+        self.names = list(names)
+        self.calls = []
+    
+    async def list_repository_names(self, created_after=None):
+        self.calls.append(created_after)
+        return list(self.names)
+
+
+@pytest.mark.asyncio
+async def test_names_are_checked_in_bulk():
+    """Test statuses for taken, available, invalid and repeated names"""
+    index = RepoNameIndex(ttl=60, full_refresh=3600)
+    await index.ensure_fresh(FakeLister(["rg-demo", "Existing.Repo"]))
+    
+    names = [f"rg-new-{i}" for i in range(500)] + ["RG-DEMO", "existing.repo", "has space", "rg-new-1", "RG-NEW-2"]
+    results = index.check(names)
+    
+    assert sum(status == RepoNameStatus.AVAILABLE for status in results.values()) == 500
+    assert results["RG-DEMO"] == RepoNameStatus.TAKEN
+    assert results["existing.repo"] == RepoNameStatus.TAKEN
+    assert results["has space"] == RepoNameStatus.INVALID
+    assert results["rg-new-1"] == RepoNameStatus.AVAILABLE
+    assert results["RG-NEW-2"] == RepoNameStatus.DUPLICATE
+    assert index.check([".."])[".."] == RepoNameStatus.INVALID
+
+
+@pytest.mark.asyncio
+async def test_refreshes_are_incremental_between_full_reloads():
+    """Test stale checks list only new repositories and full reloads drop deleted ones"""
+    lister = FakeLister(["a"])
+    index = RepoNameIndex(ttl=60, full_refresh=3600)
+    await index.ensure_fresh(lister)
+    await index.ensure_fresh(lister)
+    assert lister.calls == [None]
+    
+    # Stale: only repositories created since the last listing are requested
+    index.refreshed_at -= 61
+    lister.names = ["b"]
+    await index.ensure_fresh(lister)
+    assert lister.calls[1] > datetime.now(timezone.utc) - timedelta(minutes=6)
+    assert index.check(["a", "b"]) == {"a": RepoNameStatus.TAKEN, "b": RepoNameStatus.TAKEN}
+    
+    # Full reload replaces the set
+    index.built_at -= 3601
+    await index.ensure_fresh(lister)
+    assert lister.calls[2] is None
+    assert index.check(["a"])["a"] == RepoNameStatus.AVAILABLE
+    
+    index.add("c")
+    index.remove("b")
+    assert index.check(["b", "c"]) == {"b": RepoNameStatus.AVAILABLE, "c": RepoNameStatus.TAKEN}
+    assert index.stats()["full_loads"] == 2
+    assert index.stats()["incremental_refreshes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_serving_built_index():
+    """Test a listing error only fails checks before the first load"""
+    lister = FakeLister(["a"])
+    lister.list_repository_names = AsyncMock(side_effect=RuntimeError("GitHub unavailable"))
+    index = RepoNameIndex(ttl=0, full_refresh=3600)
+    
+    with pytest.raises(RuntimeError):
+        await index.ensure_fresh(lister)
+    
+    await index.ensure_fresh(FakeLister(["a"]))
+    await index.ensure_fresh(lister)
+    assert index.check(["a"])["a"] == RepoNameStatus.TAKEN
+    assert index.stats()["refresh_failures"] == 2
+
+
+@pytest.mark.asyncio
+async def test_taken_repository_name_fails_before_cloud_work():
+    """Test create_resources rejects an existing repository name without touching Azure"""
+    index = RepoNameIndex(ttl=60, full_refresh=3600)
+    await index.ensure_fresh(FakeLister(["rg-demo"]))
+    github = FakeLister(["rg-demo"])
+    github.get_repository = AsyncMock()
+    azure = MagicMock()
+    azure.create_resource_group = AsyncMock()
+    request = ResourceCreationRequest(
+        user_name="Jane Doe",
+        cloud_platform="Azure",
+        resource_type="Resource Group",
+        resource_group_name="rg-demo",
+        project_name="Demo",
+        create_github_repo=True
+    )
+    
+    with patch('app.services.provisioning.get_repo_name_index', return_value=index), \
+         patch('app.services.provisioning.get_github_service', return_value=github), \
+         patch('app.services.provisioning.get_azure_service', return_value=azure):
+        response = await provisioning.create_resources(request)
+    
+    assert response.status == ResourceStatus.FAILED
+    assert "already exists" in response.message
+    azure.create_resource_group.assert_not_awaited()
+    # Answered from memory: no read and no listing
+    github.get_repository.assert_not_awaited()
+    assert github.calls == []
+
+
+@pytest.mark.asyncio
+async def test_name_check_never_waits_for_a_listing():
+    """Test conflict checks refresh the index in the background and read one name before the first build"""
+    index = RepoNameIndex(ttl=60, full_refresh=3600)
+    github = FakeLister(["rg-demo"])
+    github.get_repository = AsyncMock(return_value=SimpleNamespace(name="rg-demo"))
+    
+    with patch('app.services.provisioning.get_repo_name_index', return_value=index), \
+         patch('app.services.provisioning.get_github_service', return_value=github):
+        assert "already exists" in await provisioning.repository_name_conflict("rg-demo")
+        assert not index.is_built
+        github.get_repository.assert_awaited_once_with("rg-demo")
+        
+        await index._refresh_task
+        assert await provisioning.repository_name_conflict("rg-new") is None
+        # Fresh: no further listing is started
+        assert index.refresh_in_background() is None
+    
+    assert github.calls == [None]
+    github.get_repository.assert_awaited_once()
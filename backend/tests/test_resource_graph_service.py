@@ -0,0 +1,145 @@
+"""
+Unit tests for Resource Graph service
+"""
+import json
+import httpx
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from app.services.resource_graph_service import ResourceGraphService, RESOURCE_GROUPS_QUERY
+
+
+class FakeResourceGraph:
+    """Local fake of the Resource Graph resources endpoint with skip-token paging"""
+    
+    def __init__(self, rows, page_size=2):
+        self.rows = rows
+        self.page_size = page_size
+        self.requests = []
+    
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path != "/providers/Microsoft.ResourceGraph/resources":
+            return httpx.Response(404)
+        if request.headers.get("Authorization") != "Bearer fake-token":
+            return httpx.Response(401, json={"error": {"code": "AuthenticationFailed"}})
+        
+        body = json.loads(request.content)
+        self.requests.append(body)
+        start = int(body["options"].get("$skipToken") or 0)
+        page = self.rows[start:start + self.page_size]
+        
+        payload = {"totalRecords": len(self.rows), "count": len(page), "data": page}
+        if start + self.page_size < len(self.rows):
+            payload["$skipToken"] = str(start + self.page_size)
+        return httpx.Response(200, json=payload)
+
+
+def _row(subscription_id, name, tags=None):
+    """Build a Resource Graph resource group row"""
+    return {
+        "id": f"/subscriptions/{subscription_id}/resourceGroups/{name}",
+        "name": name,
+        "location": "eastus",
+        "tags": tags,
+        "subscriptionId": subscription_id,
+        "provisioningState": "Succeeded"
+    }
+
+
+@pytest.fixture
+def credential():
+    """Fixture for a credential returning a fixed token"""
+    credential = Mock()
+    credential.get_token = Mock(return_value=Mock(token="fake-token"))
+    return credential
+
+
+@pytest.mark.asyncio
+async def test_list_resource_groups_follows_skip_tokens(credential):
+    """Test all pages are fetched and rows mapped to AzureResourceGroup"""
+    fake = FakeResourceGraph([
+        _row("sub-1", "rg-a", {"CreatedBy": "Jane"}),
+        _row("sub-1", "rg-b"),
+        _row("sub-2", "rg-c"),
+    ])
+    service = ResourceGraphService(credential, transport=httpx.MockTransport(fake))
+    
+    inventory = await service.list_resource_groups()
+    
+    assert [rg.name for rg in inventory.resource_groups] == ["rg-a", "rg-b", "rg-c"]
+    assert inventory.resource_groups[0].tags == {"CreatedBy": "Jane"}
+    assert inventory.resource_groups[1].tags == {}
+    assert inventory.subscriptions_total == 2
+    assert len(fake.requests) == 2
+    assert fake.requests[0]["query"] == RESOURCE_GROUPS_QUERY
+    assert fake.requests[1]["options"]["$skipToken"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_list_resource_groups_http_error(credential):
+    """Test a failed query returns an empty inventory"""
+    credential.get_token = Mock(return_value=Mock(token="expired-token"))
+    service = ResourceGraphService(credential, transport=httpx.MockTransport(FakeResourceGraph([])))
+    
+    inventory = await service.list_resource_groups()
+    
+    assert inventory.resource_groups == []
+    assert inventory.partial
+    assert inventory.failed_subscriptions[0].reason == "resource_graph_error"
+
+
+@pytest.mark.asyncio
+async def test_server_error_mid_paging_gives_partial_snapshot(credential):
+    """Test a 500 after the first page leaves a partial snapshot that does not wipe the tag index"""
+    from app.models import AzureResourceGroup
+    from app.services.inventory_service import InventoryService
+    from app.services.tag_index import TagIndex
+    
+    fake = FakeResourceGraph([_row("sub-1", f"rg-{i}") for i in range(4)])
+    
+    def failing_second_page(request):
+        if json.loads(request.content)["options"].get("$skipToken"):
+            return httpx.Response(500, json={"error": {"code": "InternalServerError"}})
+        return fake(request)
+    
+    service = ResourceGraphService(credential, transport=httpx.MockTransport(failing_second_page))
+    azure_service = Mock()
+    azure_service.iter_resource_groups = service.iter_resource_groups
+    tag_index = TagIndex()
+    tag_index.add(AzureResourceGroup(id="/rg/rg-old", name="rg-old", location="eastus",
+                                     tags={"Team": "infra"}, provisioning_state="Succeeded"))
+    store = Mock()
+    store.replace_source = AsyncMock()
+    
+    with patch('app.services.inventory_service.get_azure_service', return_value=azure_service), \
+         patch('app.services.inventory_service.get_tag_index', return_value=tag_index), \
+         patch('app.services.inventory_service.get_resource_store', return_value=store), \
+         patch('app.services.inventory_service.settings.SHAREPOINT_ENABLED', False):
+        inventory_service = InventoryService()
+        rows = [row async for batch in inventory_service.iter_rows() for row in batch]
+        snapshot = inventory_service.peek().value
+    
+    assert [row["resource_group_name"] for row in rows] == ["rg-0", "rg-1"]
+    assert snapshot.headers["X-Partial-Results"] == "true"
+    assert "*:resource_graph_error" in snapshot.headers["X-Failed-Subscriptions"]
+    assert store.replace_source.await_args.kwargs == {"complete": False}
+    assert [rg.name for rg in tag_index.lookup("Team", "infra")] == ["rg-old"]
+
+
+@pytest.mark.asyncio
+async def test_azure_service_selects_resource_graph_backend(credential):
+    """Test AZURE_INVENTORY_BACKEND routes listing through Resource Graph"""
+    from app.services.azure_service import AzureService
+    
+    fake = FakeResourceGraph([_row("sub-1", "rg-a")])
+    
+    with patch('app.services.azure_service.ClientSecretCredential', return_value=credential), \
+         patch('app.services.azure_service.ResourceManagementClient'), \
+         patch('app.services.azure_service.settings.AZURE_INVENTORY_BACKEND', "resource_graph"), \
+         patch('app.services.azure_service.ResourceGraphService',
+               side_effect=lambda cred: ResourceGraphService(cred, transport=httpx.MockTransport(fake))):
+        service = AzureService()
+        
+        result = await service.list_resource_groups()
+    
+    assert [rg.name for rg in result] == ["rg-a"]
+    assert len(fake.requests) == 1
@@ -0,0 +1,126 @@
+"""
+Unit tests for the persistent resource store
+"""
+import pytest
+from datetime import datetime
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database import async_database_url, create_engine_for_url
+from app.models import SharePointEntry, ResourceStatus, ResourceType
+from app.services.inventory_service import InventorySnapshot
+from app.services.resource_store import ResourceStore
+
+
+def _store():
+    """Build a store on a private in-memory SQLite database"""
+    return ResourceStore(async_sessionmaker(create_engine_for_url("sqlite://"), expire_on_commit=False))
+
+
+def _row(index, status="Completed"):
+    """Build a SharePoint-backed inventory row"""
+    return {
+        "id": str(index),
+        "user_name": "Jane Doe",
+        "resource_group_name": f"rg-{index}",
+        "date_of_creation": f"2026-02-{index:02d}T10:00:00",
+        "project_name": f"Project {index}",
+        "status": status,
+        "azure_resource_group_id": None,
+        "github_repo_url": None,
+        "error_message": None,
+        "cloud_platform": "Azure",
+        "location": None
+    }
+
+
+def test_async_database_url_selects_async_drivers():
+    """Test plain URLs are mapped to aiosqlite and asyncpg"""
+    assert async_database_url("sqlite:///./azure_tracker.db") == "sqlite+aiosqlite:///./azure_tracker.db"
+    assert async_database_url("postgresql://u:p@db/tracker") == "postgresql+asyncpg://u:p@db/tracker"
+    assert async_database_url("postgresql+asyncpg://db/tracker") == "postgresql+asyncpg://db/tracker"
+
+
+@pytest.mark.asyncio
+async def test_replace_source_round_trip_and_prunes_missing_rows():
+    """Test a complete sync replaces the stored rows, a partial one keeps them"""
+    store = _store()
+    await store.replace_source(InventorySnapshot(
+        source="sharepoint",
+        rows=[_row(1), _row(2), _row(3)],
+        headers={"X-Partial-Results": "false"}
+    ))
+    
+    stored = await store.load_source("sharepoint")
+    assert [row["id"] for row in stored.rows] == ["3", "2", "1"]  # Newest first
+    assert stored.rows[0] == _row(3)
+    assert stored.headers == {"X-Partial-Results": "false"}
+    
+    await store.replace_source(InventorySnapshot(source="sharepoint", rows=[_row(1, status="Failed")]), complete=False)
+    assert len((await store.load_source("sharepoint")).rows) == 3
+    
+    await store.replace_source(InventorySnapshot(source="sharepoint", rows=[_row(1, status="Failed")]))
+    stored = await store.load_source("sharepoint")
+    assert [(row["id"], row["status"]) for row in stored.rows] == [("1", "Failed")]
+    assert await store.load_source("azure") is None
+
+
+@pytest.mark.asyncio
+async def test_empty_complete_sync_does_not_prune_stored_rows():
+    """Test a listing that returned nothing never empties the stored source"""
+    store = _store()
+    await store.replace_source(InventorySnapshot(source="azure", rows=[_row(1), _row(2)]))
+    
+    await store.replace_source(InventorySnapshot(source="azure", rows=[]))
+    
+    stored = await store.load_source("azure")
+    assert [row["id"] for row in stored.rows] == ["2", "1"]
+
+
+@pytest.mark.asyncio
+async def test_get_request_serves_stored_entry():
+    """Test request details survive a later inventory sync"""
+    store = _store()
+    await store.upsert_request(SharePointEntry(
+        id="7",
+        user_name="Jane Doe",
+        cloud_platform="GCP",
+        resource_type=ResourceType.GCP_PROJECT,
+        resource_group_name="my-project",
+        project_name="My Project",
+        date_of_creation=datetime(2026, 2, 7, 10),
+        status=ResourceStatus.IN_PROGRESS,
+        resource_id="my-project"
+    ))
+    await store.replace_source(InventorySnapshot(
+        source="sharepoint",
+        rows=[{**_row(7, status="Completed"), "cloud_platform": "GCP"}]
+    ))
+    
+    entry = await store.get_request("7")
+    assert entry.status == ResourceStatus.COMPLETED
+    assert entry.resource_type == ResourceType.GCP_PROJECT
+    assert entry.resource_id == "my-project"
+    assert await store.get_request("8") is None
+    assert store.stats()["request_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_from_store_serves_stored_inventory_as_stale():
+    """Test inventory persisted before a restart is served without a remote call"""
+    from unittest.mock import patch
+    from app.services.inventory_service import InventoryService
+    
+    store = _store()
+    with patch('app.services.inventory_service.get_resource_store', return_value=store), \
+         patch('app.services.inventory_service.settings.SHAREPOINT_ENABLED', True), \
+         patch('app.services.inventory_service.settings.SHAREPOINT_SITE_URL', "https://test.sharepoint.com"):
+        await store.replace_source(InventorySnapshot(source="sharepoint", rows=[_row(1), _row(2)]))
+        service = InventoryService()
+        service.cache.ttl = 0.0
+        
+        assert await service.warm_from_store()
+        cached = service.peek()
+    
+    assert cached.status == "stale"
+    assert [row["id"] for row in cached.value.rows] == ["2", "1"]
+
@@ -0,0 +1,163 @@
+"""
+Unit tests for batched SharePoint writes
+"""
+import asyncio
+import pytest
+import requests
+from unittest.mock import patch
+
+from app.services.sharepoint_batch import SharePointWriteBatcher
+from app.services.sharepoint_context import SharePointConnection
+from app.services.sharepoint_service import ItemWrite, SharePointService
+
+
+class FakeWriter:
+    """Service recording batch and single writes"""
+    
+    def __init__(self, rejected=(), batch_error=None):
+        self.batches = []
+        self.single = []
+        self.rejected = set(rejected)
+        self.batch_error = batch_error
+        self.next_id = 100
+    
+    def _apply(self, write):
+        if write.item_id is not None:
+            return write.item_id
+        self.next_id += 1
+        return str(self.next_id)
+    
+    def write_items_batch(self, writes):
+        self.batches.append(list(writes))
+        if self.batch_error:
+            raise self.batch_error
+        return [
+            RuntimeError("rejected") if write.item_id in self.rejected else self._apply(write)
+            for write in writes
+        ]
+    
+    def write_item(self, write):
+        self.single.append(write)
+        if write.item_id in self.rejected:
+            raise RuntimeError("still rejected")
+        return self._apply(write)
+
+
+def _part(status, body=""):
+    """One application/http part of a $batch response"""
+    return (
+        "--batchresponse_1\r\nContent-Type: application/http\r\nContent-Transfer-Encoding: binary\r\n\r\n"
+        f"HTTP/1.1 {status}\r\nCONTENT-TYPE: application/json;odata=verbose;charset=utf-8\r\n"
+        + (f"\r\n{body}\r\n" if body else "\r\n")
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_one_batch():
+    """Test writes submitted within the window go out as one request"""
+    writer = FakeWriter()
+    batcher = SharePointWriteBatcher(writer, window=0.02, max_operations=50)
+    
+    results = await asyncio.gather(
+        batcher.submit(ItemWrite(None, {"Title": "a"})),
+        batcher.submit(ItemWrite("7", {"Status": "Completed"})),
+        batcher.submit(ItemWrite("8", {"Status": "Failed"}))
+    )
+    
+    assert results == ["101", "7", "8"]
+    assert len(writer.batches) == 1
+    assert batcher.stats()["avg_batch_size"] == 3
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting():
+    """Test reaching max_operations sends a batch before the window closes"""
+    writer = FakeWriter()
+    batcher = SharePointWriteBatcher(writer, window=60.0, max_operations=2)
+    
+    results = await asyncio.wait_for(asyncio.gather(
+        batcher.submit(ItemWrite("1", {})),
+        batcher.submit(ItemWrite("2", {}))
+    ), timeout=1.0)
+    
+    assert results == ["1", "2"]
+    assert [len(batch) for batch in writer.batches] == [2]
+    await batcher.close()
+
+
+@pytest.mark.asyncio
+async def test_rejected_writes_are_retried_individually():
+    """Test only the writes SharePoint rejected fall back to single requests"""
+    writer = FakeWriter(rejected={"9"})
+    batcher = SharePointWriteBatcher(writer, window=0.01, max_operations=50)
+    
+    ok, rejected = await asyncio.gather(
+        batcher.submit(ItemWrite("1", {})),
+        batcher.submit(ItemWrite("9", {})),
+        return_exceptions=True
+    )
+    
+    assert ok == "1"
+    assert str(rejected) == "still rejected"
+    assert [write.item_id for write in writer.single] == ["9"]
+    stats = batcher.stats()
+    assert stats["fallback_operations"] == 1
+    assert stats["failed_operations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_request_falls_back_to_single_writes():
+    """Test a batch request failing as a whole still applies every write"""
+    writer = FakeWriter(batch_error=ConnectionError("reset"))
+    batcher = SharePointWriteBatcher(writer, window=0.01, max_operations=50)
+    
+    results = await asyncio.gather(
+        batcher.submit(ItemWrite(None, {"Title": "a"})),
+        batcher.submit(ItemWrite("4", {}))
+    )
+    
+    assert results == ["101", "4"]
+    assert len(writer.single) == 2
+    assert batcher.stats()["batches"] == 0
+
+
+def test_batch_response_parts_map_to_writes():
+    """Test each $batch response part resolves its own write"""
+    connection = SharePointConnection("https://contoso.sharepoint.com/sites/cloud", "client", "secret")
+    service = SharePointService(connection)
+    sent = []
+    
+    def respond(request):
+        sent.append(request)
+        response = requests.Response()
+        response.status_code = 200
+        if "$batch" not in request.url:
+            response.headers["Content-Type"] = "application/json;odata=verbose"
+            response._content = b'{"d":{"Id":"list-guid","ListItemEntityTypeFullName":"SP.Data.ResourceRequestsListItem"}}'
+            return response
+        response.headers["Content-Type"] = "multipart/mixed; boundary=batchresponse_1"
+        response._content = (
+            _part("204 No Content")
+            + _part("400 Bad Request", '{"error":{"code":"-1","message":{"value":"Column Missing does not exist"}}}')
+            + _part("201 Created", '{"d":{"ID":11,"Id":11}}')
+            + "--batchresponse_1--\r\n"
+        ).encode()
+        return response
+    
+    with patch.object(connection, "send", respond), \
+         patch.object(connection, "_acquire_token", return_value=("token", 3600)), \
+         patch.object(connection, "form_digest", return_value="digest"):
+        results = service.write_items_batch([
+            ItemWrite("5", {"Status": "Completed"}),
+            ItemWrite("6", {"Missing": 1}),
+            ItemWrite(None, {"Title": "New"})
+        ])
+    
+    assert len(sent) == 2  # List metadata, then one $batch
+    assert sent[1].headers["Authorization"] == "Bearer token"
+    assert b"GetById('list-guid')" in sent[1].data
+    assert b'"Status": "Completed"' in sent[1].data
+    assert results[0] == "5"
+    assert "Column Missing does not exist" in str(results[1])
+    assert results[2] == "11"
+    assert not service.ctx.has_pending_request
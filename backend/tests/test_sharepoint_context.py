@@ -0,0 +1,89 @@
+"""
+Unit tests for the shared SharePoint connection
+"""
+import json
+import requests
+from unittest.mock import patch
+
+from app.services.sharepoint_context import SharePointConnection
+
+SITE_URL = "https://contoso.sharepoint.com/sites/cloud"
+
+
+def _response(status_code=200, body=None):
+    """Build a verbose-JSON OData response"""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers["Content-Type"] = "application/json;odata=verbose"
+    response._content = json.dumps({"d": body or {}}).encode()
+    return response
+
+
+class FakeSharePoint:
+    """Records requests and answers list metadata and item reads"""
+    
+    def __init__(self, unauthorized=0):
+        self.requests = []
+        self.unauthorized = unauthorized
+    
+    def send(self, request):
+        self.requests.append((request.url, request.headers.get("Authorization")))
+        if self.unauthorized:
+            self.unauthorized -= 1
+            return _response(401)
+        if "GetByTitle" in request.url:
+            return _response(body={"Id": "list-guid", "ListItemEntityTypeFullName": "SP.Data.ResourceRequestsListItem"})
+        return _response(body={"ID": 1, "Status": "Pending"})
+
+
+def _read_item(connection):
+    """Read one item through a fresh context, as each SharePointService does"""
+    ctx = connection.create_context()
+    connection.get_list(ctx, "ResourceRequests").items.get_by_id(1).get().execute_query()
+
+
+def test_token_and_list_metadata_are_shared_across_contexts():
+    """Test contexts reuse one token and resolve the list by its cached GUID"""
+    connection = SharePointConnection(SITE_URL, "client", "secret")
+    sharepoint = FakeSharePoint()
+    
+    with patch.object(connection, "send", sharepoint.send), \
+         patch.object(connection, "_acquire_token", return_value=("token", 3600)) as acquire:
+        for _ in range(3):
+            _read_item(connection)
+    
+    urls = [url for url, _ in sharepoint.requests]
+    assert len(urls) == 4  # One metadata load, then one read per context
+    assert "GetByTitle('ResourceRequests')" in urls[0]
+    assert all("GetById('list-guid')" in url for url in urls[1:])
+    assert acquire.call_count == 1
+    stats = connection.stats()
+    assert stats["contexts_created"] == 3
+    assert stats["list_metadata_loads"] == 1
+    assert stats["list_metadata_reuses"] == 2
+    assert stats["token_reuses"] == 3
+
+
+def test_token_is_renewed_before_expiry():
+    """Test a token inside the refresh margin is replaced"""
+    connection = SharePointConnection(SITE_URL, "client", "secret")
+    
+    with patch.object(connection, "_acquire_token", side_effect=[("first", 60), ("second", 3600)]):
+        assert connection.authorization_header() == "Bearer first"
+        assert connection.authorization_header() == "Bearer second"
+        assert connection.authorization_header() == "Bearer second"
+    
+    assert connection.stats()["token_acquisitions"] == 2
+
+
+def test_unauthorized_response_renews_token_and_resends():
+    """Test a 401 drops the cached token and retries once with a new one"""
+    connection = SharePointConnection(SITE_URL, "client", "secret")
+    sharepoint = FakeSharePoint(unauthorized=1)
+    
+    with patch.object(connection, "send", sharepoint.send), \
+         patch.object(connection, "_acquire_token", side_effect=[("revoked", 3600), ("renewed", 3600)]):
+        _read_item(connection)
+    
+    assert [auth for _, auth in sharepoint.requests[:2]] == ["Bearer revoked", "Bearer renewed"]
+    assert connection.stats()["token_invalidations"] == 1
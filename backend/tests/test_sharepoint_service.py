@@ -0,0 +1,97 @@
+"""
+Unit tests for SharePoint list reads
+"""
+import json
+import pytest
+import requests
+from unittest.mock import patch
+
+from app.services.sharepoint_context import SharePointConnection
+from app.services.sharepoint_service import ENTRY_FIELDS, SharePointService, item_filter
+
+SITE_URL = "https://contoso.sharepoint.com/sites/cloud"
+LIST_URL = f"{SITE_URL}/_api/Web/lists/GetById('list-guid')/items"
+
+
+def _json_response(body):
+    """Build a verbose-JSON OData response"""
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json;odata=verbose"
+    response._content = json.dumps({"d": body}).encode()
+    return response
+
+
+def test_item_filter_uses_indexed_status():
+    """Test filters start from Status and quote values"""
+    assert item_filter() is None
+    assert item_filter(user_name="jane") is None
+    assert item_filter("Pending") == "Status eq 'Pending'"
+    assert item_filter("Failed", "o'neil") == "Status eq 'Failed' and substringof('o''neil', UserName)"
+
+
+@pytest.mark.asyncio
+async def test_item_pages_are_projected_and_follow_skip_tokens():
+    """Test reads select entry columns, filter on the server and page by skip token"""
+    connection = SharePointConnection(SITE_URL, "client", "secret")
+    urls = []
+    
+    def respond(request):
+        if "GetByTitle" in request.url:
+            return _json_response({"Id": "list-guid", "ListItemEntityTypeFullName": "SP.Data.ResourceRequestsListItem"})
+        urls.append(request.url)
+        page = len(urls)
+        body = {"results": [
+            {"ID": page * 10 + offset, "Status": "Pending", "__metadata": {"type": "SP.Data.ResourceRequestsListItem"}}
+            for offset in range(2)
+        ]}
+        if page < 3:
+            body["__next"] = f"{LIST_URL}?%24skiptoken=Paged%3dTRUE%26p_ID%3d{page * 10 + 1}&%24top=2"
+        return _json_response(body)
+    
+    with patch.object(connection, "send", respond), \
+         patch.object(connection, "_acquire_token", return_value=("token", 3600)):
+        service = SharePointService(connection)
+        pages = [
+            [item.properties["ID"] for item in items]
+            async for items in service.iter_item_pages(page_size=2, filter_query=item_filter("Pending"))
+        ]
+    
+    assert pages == [[10, 11], [20, 21], [30, 31]]
+    assert urls[0].startswith(LIST_URL)
+    assert f"$select={','.join(ENTRY_FIELDS)}" in urls[0]
+    assert "$filter=Status eq 'Pending'" in urls[0]
+    assert "$top=2" in urls[0]
+    assert "skiptoken=Paged%3dTRUE%26p_ID%3d11" in urls[1]
+
+
+@pytest.mark.asyncio
+async def test_changed_item_ids_page_through_a_burst():
+    """Test GetChanges is repeated from the last change token until a short page"""
+    connection = SharePointConnection(SITE_URL, "client", "secret")
+    changes = [(f"1;3;list;{i};-1", str(100 + i % 5)) for i in range(1, 8)]
+    starts = []
+    
+    def respond(request):
+        if "GetByTitle" in request.url:
+            return _json_response({"Id": "list-guid", "ListItemEntityTypeFullName": "SP.Data.ResourceRequestsListItem"})
+        query = request.data["query"]
+        start = query["ChangeTokenStart"]["StringValue"]
+        starts.append((start, query["FetchLimit"]))
+        position = next((i + 1 for i, (token, _) in enumerate(changes) if token == start), 0)
+        page = changes[position:position + int(query["FetchLimit"])]
+        return _json_response({"results": [
+            {"ItemId": int(item_id), "ChangeToken": {"StringValue": token}, "__metadata": {"type": "SP.ChangeItem"}}
+            for token, item_id in page
+        ]})
+    
+    with patch.object(connection, "send", respond), \
+         patch.object(connection, "_acquire_token", return_value=("token", 3600)), \
+         patch.object(connection, "form_digest", return_value="digest"):
+        service = SharePointService(connection)
+        item_ids, next_token = await service.get_changed_item_ids("1;3;list;0;-1", page_size=3)
+    
+    assert [start for start, _ in starts] == ["1;3;list;0;-1", "1;3;list;3;-1", "1;3;list;6;-1"]
+    assert starts[0][1] == "3"
+    assert item_ids == ["101", "102", "103", "104", "100"]
+    assert next_token == "1;3;list;7;-1"
@@ -0,0 +1,141 @@
+"""
+Unit tests for SharePoint change-log sync
+"""
+import pytest
+from unittest.mock import patch
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database import create_engine_for_url
+from app.models import SharePointEntry
+from app.services.job_queue import JobQueue, MemoryJobBroker
+from app.services.resource_store import ResourceStore
+from app.services.sharepoint_sync import SharePointChangeSync
+
+
+def _entry(item_id):
+    """Build a pending SharePoint entry"""
+    return SharePointEntry(
+        id=item_id,
+        user_name="Jane Doe",
+        cloud_platform="Azure",
+        resource_type="Resource Group",
+        resource_group_name=f"rg-{item_id}",
+        project_name="Project"
+    )
+
+
+class FakeSharePoint:
+    """SharePoint list with a change log"""
+    
+    def __init__(self, pending_ids):
+        self.pending_ids = set(pending_ids)
+        self.changes = []  # (token, item_id)
+        self.full_scans = 0
+        self.expired_tokens = set()
+        self.scan_error = None
+    
+    def change(self, item_id, pending=True):
+        self.changes.append((f"token-{len(self.changes) + 1}", item_id))
+        if pending:
+            self.pending_ids.add(item_id)
+        else:
+            self.pending_ids.discard(item_id)
+    
+    async def get_current_change_token(self):
+        return f"token-{len(self.changes)}"
+    
+    async def get_changed_item_ids(self, change_token):
+        if change_token in self.expired_tokens:
+            raise RuntimeError("The change token is invalid")
+        start = int(change_token.split("-")[1])
+        changes = self.changes[start:]
+        item_ids = list(dict.fromkeys(item_id for _, item_id in changes))
+        return item_ids, changes[-1][0] if changes else change_token
+    
+    async def get_pending_items_by_ids(self, item_ids):
+        return [_entry(item_id) for item_id in item_ids if item_id in self.pending_ids]
+    
+    async def get_pending_items(self):
+        self.full_scans += 1
+        if self.scan_error:
+            raise self.scan_error
+        return [_entry(item_id) for item_id in sorted(self.pending_ids)]
+
+
+def _store():
+    """Build a store on a private in-memory SQLite database"""
+    return ResourceStore(async_sessionmaker(create_engine_for_url("sqlite://"), expire_on_commit=False))
+
+
+@pytest.mark.asyncio
+async def test_only_changed_pending_items_are_returned():
+    """Test the first sync scans everything and later syncs follow the change log"""
+    sharepoint = FakeSharePoint(pending_ids=["1", "2"])
+    store = _store()
+    
+    with patch('app.services.sharepoint_sync.get_resource_store', return_value=store):
+        sync = SharePointChangeSync()
+        assert [e.id for e in await sync.pending_changes(sharepoint)] == ["1", "2"]
+        
+        # A burst of notifications with no new changes produces no work
+        for _ in range(5):
+            assert await sync.pending_changes(sharepoint) == []
+        
+        sharepoint.change("3")
+        sharepoint.change("3")
+        sharepoint.change("1", pending=False)  # Picked up by the worker
+        assert [e.id for e in await sync.pending_changes(sharepoint)] == ["3"]
+        
+        # The token survives a restart
+        restarted = SharePointChangeSync()
+        assert await restarted.pending_changes(sharepoint) == []
+    
+    assert sharepoint.full_scans == 1
+    assert sync.stats()["full_scans"] == 1
+    assert await store.get_change_token(sync.list_key) == "token-3"
+
+
+@pytest.mark.asyncio
+async def test_expired_token_falls_back_to_full_scan():
+    """Test a token rejected by SharePoint triggers a single full scan"""
+    sharepoint = FakeSharePoint(pending_ids=["1"])
+    
+    with patch('app.services.sharepoint_sync.get_resource_store', return_value=None):
+        sync = SharePointChangeSync()
+        await sync.pending_changes(sharepoint)
+        sharepoint.expired_tokens.add("token-0")
+        
+        assert [e.id for e in await sync.pending_changes(sharepoint)] == ["1"]
+    
+    assert sharepoint.full_scans == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_full_scan_keeps_the_old_token():
+    """Test a full scan that fails raises and is repeated instead of skipping its items"""
+    sharepoint = FakeSharePoint(pending_ids=["1"])
+    
+    with patch('app.services.sharepoint_sync.get_resource_store', return_value=None):
+        sync = SharePointChangeSync()
+        sharepoint.scan_error = RuntimeError("503 Service Unavailable")
+        with pytest.raises(RuntimeError):
+            await sync.pending_changes(sharepoint)
+        
+        sharepoint.change("2")
+        sharepoint.scan_error = None
+        assert [e.id for e in await sync.pending_changes(sharepoint)] == ["1", "2"]
+    
+    assert sharepoint.full_scans == 2
+
+
+@pytest.mark.asyncio
+async def test_items_already_queued_are_skipped():
+    """Test re-queuing an item that is queued or running returns the active job"""
+    queue = JobQueue(MemoryJobBroker())
+    first = await queue.enqueue("process_sharepoint_update", {"item_id": "1"}, dedupe_key="sharepoint:1")
+    await queue.reserve(visibility_timeout=60.0)
+    
+    again = await queue.enqueue("process_sharepoint_update", {"item_id": "1"}, dedupe_key="sharepoint:1")
+    
+    assert again.id == first.id
+    assert (await queue.stats())["deduplicated"] == 1
@@ -0,0 +1,273 @@
+"""
+Unit tests for the step graph executor and concurrent provisioning
+"""
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+from github import GithubException
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models import ResourceCreationRequest, ResourceStatus, SharePointEntry
+from app.services import provisioning
+from app.utils.steps import StepGraph, StepTimings
+
+
+def _sleeper(seconds, result=None, error=None):
+    """Build a step that sleeps, then returns or raises"""
+    async def step(run):
+        await asyncio.sleep(seconds)
+        if error:
+            raise error
+        return result
+    return step
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently():
+    """Test the run takes about as long as its slowest chain"""
+    graph = (
+        StepGraph()
+        .add("a", _sleeper(0.1, "a"))
+        .add("b", _sleeper(0.1, "b"))
+        .add("c", _sleeper(0.1, "c"))
+        .add("d", _sleeper(0.05, "d"), after=["a", "b"])
+    )
+    
+    started = time.monotonic()
+    run = await graph.run()
+    
+    assert time.monotonic() - started < 0.25
+    assert run.results == {"a": "a", "b": "b", "c": "c", "d": "d"}
+    assert set(run.timings) == {"a", "b", "c", "d"}
+    assert not run.failed
+
+
+@pytest.mark.asyncio
+async def test_failure_skips_dependents_but_not_always_steps():
+    """Test a failed step skips what waits for it, except always steps"""
+    seen = {}
+    
+    async def outcome(run):
+        seen["errors"] = dict(run.errors)
+    
+    graph = (
+        StepGraph()
+        .add("create", _sleeper(0, error=RuntimeError("quota exceeded")))
+        .add("other", _sleeper(0, "ok"))
+        .add("configure", _sleeper(0), after=["create"])
+        .add("tag", _sleeper(0), after=["configure"])
+        .add("outcome", outcome, after=["tag", "other"], always=True)
+    )
+    run = await graph.run()
+    
+    assert run.skipped == ["configure", "tag"]
+    assert run.results["other"] == "ok"
+    assert str(run.first_error()) == "quota exceeded"
+    assert list(seen["errors"]) == ["create"]
+
+
+def test_steps_must_follow_their_dependencies():
+    """Test unknown or duplicate steps are rejected"""
+    graph = StepGraph().add("a", _sleeper(0))
+    
+    with pytest.raises(ValueError):
+        graph.add("b", _sleeper(0), after=["c"])
+    with pytest.raises(ValueError):
+        graph.add("a", _sleeper(0))
+
+
+@pytest.mark.asyncio
+async def test_timings_are_aggregated():
+    """Test per-step stats accumulate across runs"""
+    timings = StepTimings()
+    graph = StepGraph().add("a", _sleeper(0)).add("b", _sleeper(0, error=RuntimeError("x")))
+    
+    for _ in range(2):
+        timings.record("job", await graph.run())
+    
+    stats = timings.stats()
+    assert stats["runs"] == 2
+    assert stats["steps"]["job.a"]["count"] == 2
+    assert stats["steps"]["job.b"]["failures"] == 2
+    assert "job.total" in stats["steps"]
+
+
+@pytest.mark.asyncio
+async def test_create_resources_runs_steps_concurrently():
+    """Test SharePoint, Azure and GitHub work overlaps and the response is unchanged"""
+    async def create_item(entry):
+        await asyncio.sleep(0.2)
+        return "42"
+    
+    async def create_resource_group(**kwargs):
+        await asyncio.sleep(0.1)
+        return SimpleNamespace(id="/subscriptions/s/resourceGroups/rg-demo")
+    
+    async def create_repository(**kwargs):
+        await asyncio.sleep(0.1)
+        return SimpleNamespace(html_url="https://github.com/o/rg-demo")
+    
+    sharepoint = MagicMock()
+    sharepoint.create_item = create_item
+    sharepoint.update_item_status = AsyncMock(return_value=True)
+    azure = MagicMock()
+    azure.create_resource_group = create_resource_group
+    github = MagicMock()
+    github.create_repository = create_repository
+    
+    request = ResourceCreationRequest(
+        user_name="Jane Doe",
+        cloud_platform="Azure",
+        resource_type="Resource Group",
+        resource_group_name="rg-demo",
+        project_name="Demo",
+        create_github_repo=True
+    )
+    
+    with patch.object(provisioning.settings, 'SHAREPOINT_ENABLED', True), \
+         patch.object(provisioning.settings, 'SHAREPOINT_SITE_URL', "https://test.sharepoint.com"), \
+         patch('app.services.provisioning.SharePointService', return_value=sharepoint), \
+         patch('app.services.provisioning.get_azure_service', return_value=azure), \
+         patch('app.services.provisioning.get_github_service', return_value=github), \
+         patch('app.services.provisioning.record_request', new=AsyncMock()), \
+         patch('app.services.provisioning.get_inventory_service'):
+        started = time.monotonic()
+        response = await provisioning.create_resources(request)
+        elapsed = time.monotonic() - started
+    
+    assert elapsed < 0.3
+    assert response.status == ResourceStatus.COMPLETED
+    assert response.resource_group_id == "/subscriptions/s/resourceGroups/rg-demo"
+    assert response.github_repo_url == "https://github.com/o/rg-demo"
+    assert response.sharepoint_item_id == "42"
+    sharepoint.update_item_status.assert_awaited_once_with(
+        "42",
+        ResourceStatus.COMPLETED,
+        resource_id="/subscriptions/s/resourceGroups/rg-demo",
+        github_repo_url="https://github.com/o/rg-demo",
+        error_message=None
+    )
+
+
+@pytest.mark.asyncio
+async def test_process_sharepoint_update_records_failure():
+    """Test a failed resource group marks the item Failed and deletes the repository created alongside"""
+    entry = SharePointEntry(
+        id="7",
+        user_name="Jane Doe",
+        cloud_platform="Azure",
+        resource_type="Resource Group",
+        resource_group_name="rg-demo",
+        project_name="Demo"
+    )
+    sharepoint = MagicMock()
+    sharepoint.get_item_by_id = AsyncMock(return_value=entry)
+    sharepoint.update_item_status = AsyncMock(return_value=True)
+    azure = MagicMock()
+    azure.create_resource_group = AsyncMock(side_effect=RuntimeError("quota exceeded"))
+    github = MagicMock()
+    github.create_repository = AsyncMock(return_value=SimpleNamespace(html_url="https://github.com/o/rg-demo"))
+    github.delete_repository = AsyncMock(return_value=True)
+    
+    with patch('app.services.provisioning.SharePointService', return_value=sharepoint), \
+         patch('app.services.provisioning.get_azure_service', return_value=azure), \
+         patch('app.services.provisioning.get_github_service', return_value=github), \
+         patch('app.services.provisioning.record_request', new=AsyncMock()):
+        await provisioning.process_sharepoint_update("7")
+    
+    assert sharepoint.update_item_status.await_args_list[-1].args == ("7", ResourceStatus.FAILED)
+    assert sharepoint.update_item_status.await_args_list[-1].kwargs == {"error_message": "quota exceeded"}
+    github.create_repository.assert_awaited_once()
+    github.delete_repository.assert_awaited_once_with("rg-demo")
+
+
+@pytest.mark.asyncio
+async def test_process_sharepoint_update_retry_reuses_existing_repository():
+    """Test a retry that finds the repository from its earlier attempt completes the item"""
+    entry = SharePointEntry(
+        id="7",
+        user_name="Jane Doe",
+        cloud_platform="Azure",
+        resource_type="Resource Group",
+        resource_group_name="rg-demo",
+        project_name="Demo"
+    )
+    sharepoint = MagicMock()
+    sharepoint.get_item_by_id = AsyncMock(return_value=entry)
+    sharepoint.update_item_status = AsyncMock(return_value=True)
+    azure = MagicMock()
+    azure.create_resource_group = AsyncMock(return_value=SimpleNamespace(id="/subscriptions/s/resourceGroups/rg-demo"))
+    github = MagicMock()
+    github.create_repository = AsyncMock(side_effect=GithubException(422, {"message": "name already exists on this account"}, None))
+    github.get_repository = AsyncMock(return_value=SimpleNamespace(html_url="https://github.com/o/rg-demo"))
+    github.delete_repository = AsyncMock()
+    
+    with patch('app.services.provisioning.SharePointService', return_value=sharepoint), \
+         patch('app.services.provisioning.get_azure_service', return_value=azure), \
+         patch('app.services.provisioning.get_github_service', return_value=github), \
+         patch('app.services.provisioning.record_request', new=AsyncMock()), \
+         patch('app.services.provisioning.get_inventory_service'):
+        await provisioning.process_sharepoint_update("7")
+    
+    assert sharepoint.update_item_status.await_args_list[-1].args == ("7", ResourceStatus.COMPLETED)
+    assert sharepoint.update_item_status.await_args_list[-1].kwargs["github_repo_url"] == "https://github.com/o/rg-demo"
+    github.delete_repository.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_resources_failure_leaves_no_repository():
+    """Test the repository created alongside a failed cloud resource is deleted again"""
+    azure = MagicMock()
+    azure.create_resource_group = AsyncMock(side_effect=RuntimeError("quota exceeded"))
+    github = MagicMock()
+    github.create_repository = AsyncMock(return_value=SimpleNamespace(html_url="https://github.com/o/rg-demo"))
+    github.delete_repository = AsyncMock(return_value=True)
+    request = ResourceCreationRequest(
+        user_name="Jane Doe",
+        cloud_platform="Azure",
+        resource_type="Resource Group",
+        resource_group_name="rg-demo",
+        project_name="Demo",
+        create_github_repo=True
+    )
+    
+    with patch.object(provisioning.settings, 'SHAREPOINT_ENABLED', False), \
+         patch('app.services.provisioning.repository_name_conflict', new=AsyncMock(return_value=None)), \
+         patch('app.services.provisioning.get_azure_service', return_value=azure), \
+         patch('app.services.provisioning.get_github_service', return_value=github):
+        response = await provisioning.create_resources(request)
+    
+    assert response.status == ResourceStatus.FAILED
+    assert response.github_repo_url is None
+    github.delete_repository.assert_awaited_once_with("rg-demo")
+
+
+@pytest.mark.asyncio
+async def test_process_sharepoint_update_raises_when_status_is_rejected():
+    """Test a final status SharePoint did not accept is raised so the job is retried"""
+    entry = SharePointEntry(
+        id="7",
+        user_name="Jane Doe",
+        cloud_platform="Azure",
+        resource_type="Resource Group",
+        resource_group_name="rg-demo",
+        project_name="Demo"
+    )
+    sharepoint = MagicMock()
+    sharepoint.get_item_by_id = AsyncMock(return_value=entry)
+    sharepoint.update_item_status = AsyncMock(return_value=False)
+    azure = MagicMock()
+    azure.create_resource_group = AsyncMock(return_value=SimpleNamespace(id="/subscriptions/s/resourceGroups/rg-demo"))
+    github = MagicMock()
+    github.create_repository = AsyncMock(return_value=SimpleNamespace(html_url="https://github.com/o/rg-demo"))
+    record_request = AsyncMock()
+    
+    with patch('app.services.provisioning.SharePointService', return_value=sharepoint), \
+         patch('app.services.provisioning.get_azure_service', return_value=azure), \
+         patch('app.services.provisioning.get_github_service', return_value=github), \
+         patch('app.services.provisioning.record_request', new=record_request):
+        with pytest.raises(RuntimeError, match="could not be marked Completed"):
+            await provisioning.process_sharepoint_update("7")
+    
+    record_request.assert_not_awaited()
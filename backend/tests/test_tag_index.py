@@ -0,0 +1,124 @@
+"""
+Unit tests for the tag index
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.models import AzureResourceGroup
+from app.services.tag_index import TagIndex
+
+
+def _rg(name, **tags):
+    """Build a resource group"""
+    return AzureResourceGroup(
+        id=f"/subscriptions/sub/resourceGroups/{name}",
+        name=name,
+        location="eastus",
+        tags=tags,
+        provisioning_state="Succeeded"
+    )
+
+
+def test_lookup_by_key_and_value():
+    """Test lookups are case-insensitive on key and value"""
+    index = TagIndex()
+    index.rebuild([
+        _rg("rg-a", CreatedBy="Jane", ProjectName="Apollo"),
+        _rg("rg-b", CreatedBy="jane", ProjectName="Gemini"),
+        _rg("rg-c", CreatedBy="John"),
+    ])
+    
+    assert sorted(rg.name for rg in index.lookup("createdby", "JANE")) == ["rg-a", "rg-b"]
+    assert [rg.name for rg in index.lookup("ProjectName", "Gemini")] == ["rg-b"]
+    assert sorted(rg.name for rg in index.lookup("ProjectName")) == ["rg-a", "rg-b"]
+    assert index.lookup("Owner", "nobody") == []
+
+
+def test_incremental_add_and_remove():
+    """Test create and delete keep postings in sync"""
+    index = TagIndex()
+    index.rebuild([_rg("rg-a", CreatedBy="Jane")])
+    
+    index.add(_rg("rg-a", CreatedBy="John"))  # Re-tagged
+    index.add(_rg("rg-b", CreatedBy="Jane"))
+    assert [rg.name for rg in index.lookup("CreatedBy", "John")] == ["rg-a"]
+    assert [rg.name for rg in index.lookup("CreatedBy", "Jane")] == ["rg-b"]
+    
+    assert index.remove("/SUBSCRIPTIONS/sub/resourceGroups/RG-B")
+    assert index.lookup("CreatedBy", "Jane") == []
+    assert index.stats()["resources"] == 1
+
+
+def test_partial_rebuild_keeps_existing_entries():
+    """Test a partial listing does not drop resources from failed subscriptions"""
+    index = TagIndex()
+    index.rebuild([_rg("rg-a", CreatedBy="Jane")])
+    
+    index.rebuild([_rg("rg-b", CreatedBy="Jane")], complete=False)
+    
+    assert sorted(rg.name for rg in index.lookup("CreatedBy", "Jane")) == ["rg-a", "rg-b"]
+
+
+@pytest.mark.asyncio
+async def test_by_tag_rebuilds_a_stale_index_and_reports_failures():
+    """Test the route relists Azure in the background once the index is too old, and never serves an unbuilt index"""
+    from fastapi import HTTPException, Response
+    from app.models import ResourceGroupInventory
+    from app.routers.resources import list_resources_by_tag
+    
+    index = TagIndex()
+    azure_service = Mock()
+    azure_service.list_resource_groups_detailed = AsyncMock(side_effect=RuntimeError("Unauthorized"))
+    
+    with patch('app.routers.resources.get_tag_index', return_value=index), \
+         patch('app.routers.resources.get_azure_service', return_value=azure_service), \
+         patch('app.routers.resources.settings.TAG_INDEX_MAX_AGE_SECONDS', 60):
+        with pytest.raises(HTTPException) as raised:
+            await list_resources_by_tag(Response(), key="CreatedBy", value="Jane")
+        assert raised.value.status_code == 503
+        
+        azure_service.list_resource_groups_detailed = AsyncMock(return_value=ResourceGroupInventory(
+            resource_groups=[_rg("rg-a", CreatedBy="Jane")], subscriptions_total=1, completed=True
+        ))
+        matches = await list_resources_by_tag(Response(), key="CreatedBy", value="Jane")
+        assert [rg.name for rg in matches] == ["rg-a"]
+        
+        # Fresh: no relisting
+        await list_resources_by_tag(Response(), key="CreatedBy", value="Jane")
+        assert azure_service.list_resource_groups_detailed.await_count == 1
+        
+        # Stale: served at once while a single relisting runs in the background
+        index.built_at -= 120
+        listed = asyncio.Event()
+        
+        async def slow_listing():
+            await listed.wait()
+            return ResourceGroupInventory(
+                resource_groups=[_rg("rg-b", CreatedBy="Jane")], subscriptions_total=1, completed=True
+            )
+        
+        azure_service.list_resource_groups_detailed = AsyncMock(side_effect=slow_listing)
+        responses = [Response(), Response()]
+        stale = [await list_resources_by_tag(response, key="CreatedBy", value="Jane") for response in responses]
+        assert [[rg.name for rg in matches] for matches in stale] == [["rg-a"], ["rg-a"]]
+        assert all(response.headers["X-Index-Stale"] == "true" for response in responses)
+        
+        listed.set()
+        await index._refresh_task
+        assert azure_service.list_resource_groups_detailed.await_count == 1
+        response = Response()
+        matches = await list_resources_by_tag(response, key="CreatedBy", value="Jane")
+        assert [rg.name for rg in matches] == ["rg-b"]
+        assert "X-Index-Stale" not in response.headers
+        
+        # A failed relisting keeps serving the existing index
+        index.built_at -= 120
+        azure_service.list_resource_groups_detailed = AsyncMock(return_value=ResourceGroupInventory())
+        response = Response()
+        matches = await list_resources_by_tag(response, key="CreatedBy", value="Jane")
+        await index._refresh_task
+    
+    assert [rg.name for rg in matches] == ["rg-b"]
+    assert response.headers["X-Index-Stale"] == "true"
+    assert not index.is_fresh(60)
@@ -0,0 +1,103 @@
+"""
+Unit tests for webhook notification coalescing
+"""
+import asyncio
+import pytest
+
+from app.models import WebhookPayload
+from app.services.webhook_ingest import WebhookCoalescer
+
+
+class RecordingSync:
+    """Sync function recording each call and optionally blocking until released"""
+    
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+        self.release.set()
+    
+    async def __call__(self, key):
+        self.calls.append(key)
+        await self.release.wait()
+
+
+@pytest.mark.asyncio
+async def test_burst_runs_one_sync_per_key():
+    """Test notifications within one window are coalesced per key"""
+    sync = RecordingSync()
+    coalescer = WebhookCoalescer(sync, window=0.05)
+    
+    opened = [coalescer.submit("sub-1:list-a") for _ in range(20)]
+    coalescer.submit("sub-1:list-b")
+    await asyncio.sleep(0.15)
+    
+    assert opened.count(True) == 1
+    assert sorted(sync.calls) == ["sub-1:list-a", "sub-1:list-b"]
+    stats = coalescer.stats()
+    assert stats["received"] == 21
+    assert stats["coalesced"] == 19
+    assert stats["executed"] == 2
+    assert stats["open_windows"] == 0
+
+
+@pytest.mark.asyncio
+async def test_notification_during_sync_opens_new_window():
+    """Test a change arriving while the sync runs gets its own sync"""
+    sync = RecordingSync()
+    sync.release.clear()
+    coalescer = WebhookCoalescer(sync, window=0.01)
+    
+    coalescer.submit("key")
+    await asyncio.sleep(0.05)
+    assert sync.calls == ["key"]
+    
+    assert coalescer.submit("key") is True
+    sync.release.set()
+    await asyncio.sleep(0.05)
+    
+    assert sync.calls == ["key", "key"]
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_open_windows():
+    """Test shutdown runs the pending sync instead of dropping it"""
+    sync = RecordingSync()
+    coalescer = WebhookCoalescer(sync, window=60.0)
+    
+    coalescer.submit("key")
+    coalescer.submit("key")
+    await coalescer.close()
+    
+    assert sync.calls == ["key"]
+    assert coalescer.stats()["open_windows"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_is_counted():
+    """Test a failing sync does not break later windows"""
+    async def failing(key):
+        raise RuntimeError("SharePoint unavailable")
+    
+    coalescer = WebhookCoalescer(failing, window=0.01)
+    coalescer.submit("key")
+    await asyncio.sleep(0.05)
+    
+    assert coalescer.stats()["failed"] == 1
+    assert coalescer.submit("key") is True
+    await coalescer.close()
+
+
+def test_payload_accepts_sharepoint_field_names():
+    """Test notifications parse from the camelCase names SharePoint sends"""
+    payload = WebhookPayload(**{
+        "subscriptionId": "sub-1",
+        "clientState": "state",
+        "expirationDateTime": "2026-01-01T00:00:00Z",
+        "resource": "list-a",
+        "tenantId": "tenant",
+        "siteUrl": "/sites/cloud",
+        "webId": "web"
+    })
+    
+    assert payload.subscription_id == "sub-1"
+    assert WebhookPayload(**payload.model_dump()).site_url == "/sites/cloud"
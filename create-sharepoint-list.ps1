@@ -132,6 +132,13 @@ try {
     Write-Host "✅ ErrorMessage added" -ForegroundColor Green
     Write-Host ""
 
+    # Index the columns the backend filters on, so filtered reads keep working past 5000 items
+    Write-Host "Indexing columns: Status, UserName..." -ForegroundColor Yellow
+    Set-PnPField -List $ListName -Identity "Status" -Values @{Indexed=$true}
+    Set-PnPField -List $ListName -Identity "UserName" -Values @{Indexed=$true}
+    Write-Host "✅ Columns indexed" -ForegroundColor Green
+    Write-Host ""
+
     # Create default views
     Write-Host "Creating custom views..." -ForegroundColor Yellow
     